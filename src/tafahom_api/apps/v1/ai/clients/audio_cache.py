@@ -0,0 +1,224 @@
+import contextlib
+import fcntl
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_tts_text(text: str) -> str:
+    """Collapse whitespace so trivially different strings share an entry."""
+    return " ".join((text or "").split())
+
+
+def _touch(path):
+    """
+    Mark ``path`` as just used. The time is set explicitly: the kernel's own
+    file timestamps are only tick-accurate, too coarse to order LRU entries.
+    """
+    now = time.time_ns()
+    os.utime(path, ns=(now, now))
+
+
+class TTSAudioCache:
+    """
+    On-disk, content-addressed cache for synthesized audio.
+
+    Each entry is stored under the SHA-256 of (model, voice, normalized text),
+    so the same sentence spoken with the same voice is synthesized once and
+    then served from disk. Total size is capped at ``max_bytes``; when it is
+    exceeded the least recently used files are evicted.
+
+    The directory is shared by every worker process, so it is the only source
+    of truth: recency is the file mtime (bumped on each hit) and eviction
+    rescans the directory under an exclusive ``flock``. Each process only
+    keeps an estimate of the total size (last scan plus its own writes) to
+    decide when to scan; it also rescans after writing ``1 / scan_fraction``
+    of the budget, which bounds how far N workers together can overshoot.
+    """
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        extension: str = "mp3",
+        scan_fraction: int = 16,
+    ):
+        self.root = Path(
+            root or getattr(settings, "TTS_AUDIO_CACHE_DIR", "/app/media/tts_cache")
+        )
+        self.max_bytes = max_bytes or getattr(
+            settings, "TTS_AUDIO_CACHE_MAX_BYTES", 512 * 1024 * 1024
+        )
+        self.extension = extension
+        self.scan_every = max(self.max_bytes // scan_fraction, 1)
+
+        self._lock = threading.Lock()
+        self._evict_lock = threading.Lock()
+        self._entries: Optional[int] = None  # as of the last scan
+        self._size: Optional[int] = None  # last scan + this process's writes
+        self._written_since_scan = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # --------------------------------------------------
+    # KEYS / PATHS
+    # --------------------------------------------------
+
+    def make_key(self, text: str, voice: str = "", model: str = "") -> str:
+        payload = "\x1f".join([model or "", voice or "", normalize_tts_text(text)])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, digest: str) -> Path:
+        return self.root / digest[:2] / f"{digest}.{self.extension}"
+
+    def _files(self) -> List[Tuple[float, Path, int]]:
+        """``(mtime, path, size)`` of every entry on disk, whichever process wrote it."""
+        entries = []
+        if self.root.exists():
+            for path in self.root.glob(f"*/*.{self.extension}"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue  # evicted by another worker meanwhile
+                entries.append((stat.st_mtime, path, stat.st_size))
+        return entries
+
+    @contextlib.contextmanager
+    def _directory_lock(self) -> Iterator[None]:
+        """Exclusive across worker processes sharing ``root``."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / ".lock", "a") as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+    # --------------------------------------------------
+    # READ / WRITE
+    # --------------------------------------------------
+
+    def get(self, text: str, voice: str = "", model: str = "") -> Optional[bytes]:
+        path = self._path(self.make_key(text, voice, model))
+        try:
+            data = path.read_bytes()
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        try:
+            _touch(path)
+        except OSError:
+            pass
+        return data
+
+    def set(self, text: str, audio: bytes, voice: str = "", model: str = ""):
+        if not audio or len(audio) > self.max_bytes:
+            return
+
+        digest = self.make_key(text, voice, model)
+        path = self._path(digest)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write-then-rename so readers never see a partial file
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".part")
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(audio)
+            _touch(tmp)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning("Could not write TTS cache entry %s: %s", digest[:12], e)
+            return
+
+        with self._lock:
+            self._written_since_scan += len(audio)
+            if self._size is not None:
+                self._size += len(audio)
+            due = (
+                self._size is None
+                or self._size > self.max_bytes
+                or self._written_since_scan >= self.scan_every
+            )
+        if due:
+            self._evict()
+
+    def _evict(self):
+        """Rescan the directory and drop the oldest files until it fits the budget."""
+        with self._evict_lock:
+            try:
+                with self._directory_lock():
+                    files = sorted(self._files(), key=lambda entry: entry[0])
+                    total = sum(size for _, _, size in files)
+                    evicted = 0
+                    for _, path, size in files:
+                        if total <= self.max_bytes:
+                            break
+                        try:
+                            path.unlink()
+                        except FileNotFoundError:
+                            pass
+                        except OSError:
+                            continue
+                        total -= size
+                        evicted += 1
+            except OSError as e:
+                logger.warning("TTS cache eviction failed: %s", e)
+                return
+
+        with self._lock:
+            self._entries = len(files) - evicted
+            self._size = total
+            self._written_since_scan = 0
+            self.evictions += evicted
+
+    def clear(self):
+        with self._evict_lock, self._directory_lock():
+            for _, path, _ in self._files():
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+        with self._lock:
+            self._entries = 0
+            self._size = 0
+            self._written_since_scan = 0
+
+    def stats(self) -> dict:
+        """Counters of this process; ``entries`` / ``bytes`` as of the last scan."""
+        with self._lock:
+            return {
+                "entries": self._entries,
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_cache: Optional[TTSAudioCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_tts_audio_cache() -> TTSAudioCache:
+    """Process-wide audio cache shared by every TextToSpeechClient."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = TTSAudioCache()
+    return _cache
@@ -1,8 +1,66 @@
+import asyncio
+import threading
+import weakref
+from typing import Optional
+
 import httpx
 
+from .circuit_breaker import get_breaker
+
+_shared_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+_shared_clients_lock = threading.Lock()
+
+
+def shared_http_client() -> httpx.AsyncClient:
+    """
+    Pooled ``httpx.AsyncClient`` of the running event loop.
+
+    Opening a client per request costs a TLS context (~30 ms of CPU loading
+    the CA bundle) and a fresh connection, all on the event loop; under load
+    that alone serializes the ASGI worker. One client per loop keeps
+    connections alive across requests. Callers pass their own ``timeout``
+    per request. A client cannot be shared between loops, so management
+    commands and tests running their own loop get their own.
+    """
+    loop = asyncio.get_running_loop()
+    with _shared_clients_lock:
+        client = _shared_clients.get(loop)
+        if client is None or client.is_closed:
+            client = _shared_clients[loop] = httpx.AsyncClient(
+                timeout=60.0, limits=httpx.Limits(max_connections=200, max_keepalive_connections=50)
+            )
+        return client
+
+
 
 class BaseAIClient:
     base_url: str
+    # Name of the shared circuit breaker guarding this backend (None = unguarded)
+    backend: Optional[str] = None
+    # Shared connection pool for callers sending many requests (e.g. one per
+    # transcript chunk); None uses the loop's shared client
+    http: Optional[httpx.AsyncClient] = None
+
+    async def _guarded_post(self, url: str, **kwargs) -> httpx.Response:
+        breaker = get_breaker(self.backend) if self.backend else None
+        if breaker:
+            breaker.before_call()
+
+        try:
+            response = await (self.http or shared_http_client()).post(url, **kwargs)
+        except Exception:
+            if breaker:
+                breaker.record_failure()
+            raise
+
+        if breaker:
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+        return response
 
     async def _post_file(self, path: str, files: dict, data: dict | None = None):
         """
@@ -10,12 +68,11 @@ class BaseAIClient:
         """
         url = f"{self.base_url}{path}"
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                url,
-                files=files,
-                data=data,
-            )
+        response = await self._guarded_post(
+            url,
+            files=files,
+            data=data,
+        )
 
         # ❌ DO NOT raise here — let caller handle fallbacks
         if response.status_code >= 500:
@@ -36,12 +93,11 @@ class BaseAIClient:
         """
         url = f"{self.base_url}{path}"
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                url,
-                json=json,
-                headers={"Content-Type": "application/json"},
-            )
+        response = await self._guarded_post(
+            url,
+            json=json,
+            headers={"Content-Type": "application/json"},
+        )
 
         if response.status_code >= 500:
             response.raise_for_status()
@@ -0,0 +1,217 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+import httpx
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a backend whose breaker is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        self.name = name
+        self.retry_after = retry_after
+        super().__init__(f"{name} circuit open, retry in {retry_after:.1f}s")
+
+
+class InvalidRequestError(ValueError):
+    """The caller's input was rejected; says nothing about the backend's health."""
+
+
+class BackendUnavailableError(RuntimeError):
+    """The backend could not produce an answer (e.g. every model replica failed)."""
+
+
+# 4xx answers that still point at the backend (overloaded, too slow)
+_BACKEND_CLIENT_STATUSES = (408, 429)
+
+
+def is_caller_error(exc: BaseException) -> bool:
+    """Bad input: retrying cannot help and the breaker must not count it."""
+    if isinstance(exc, InvalidRequestError):
+        return True
+    if isinstance(exc, httpx.HTTPStatusError):
+        code = exc.response.status_code
+        return 400 <= code < 500 and code not in _BACKEND_CLIENT_STATUSES
+    return False
+
+
+def is_backend_failure(exc: BaseException) -> bool:
+    """Transport errors, timeouts and 5xx answers: the failures a breaker counts."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return not is_caller_error(exc)
+    # TimeoutError and ConnectionError are OSError subclasses
+    return isinstance(exc, (OSError, httpx.TransportError, BackendUnavailableError))
+
+
+class CircuitBreaker:
+    """
+    Process-wide closed / open / half-open breaker for one AI backend.
+
+    Outcomes are kept in a rolling time window. Once the window holds at least
+    ``min_calls`` outcomes and the failure ratio reaches ``failure_ratio`` the
+    breaker opens and every caller fails fast for ``open_seconds``. After that
+    a limited number of probe calls are let through (half-open): a success
+    closes the breaker, a failure re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window_seconds: Optional[float] = None,
+        min_calls: Optional[int] = None,
+        failure_ratio: Optional[float] = None,
+        open_seconds: Optional[float] = None,
+        half_open_calls: Optional[int] = None,
+    ):
+        self.name = name
+        self.window_seconds = window_seconds or getattr(
+            settings, "CIRCUIT_BREAKER_WINDOW_SECONDS", 30
+        )
+        self.min_calls = min_calls or getattr(settings, "CIRCUIT_BREAKER_MIN_CALLS", 5)
+        self.failure_ratio = failure_ratio or getattr(
+            settings, "CIRCUIT_BREAKER_FAILURE_RATIO", 0.5
+        )
+        self.open_seconds = open_seconds or getattr(
+            settings, "CIRCUIT_BREAKER_OPEN_SECONDS", 30
+        )
+        self.half_open_calls = half_open_calls or getattr(
+            settings, "CIRCUIT_BREAKER_HALF_OPEN_CALLS", 1
+        )
+
+        self._lock = threading.Lock()
+        self._outcomes: deque = deque()  # (timestamp, success)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+
+    # --------------------------------------------------
+    # STATE
+    # --------------------------------------------------
+
+    def _trim(self, now: float):
+        cutoff = now - self.window_seconds
+        while self._outcomes and self._outcomes[0][0] < cutoff:
+            self._outcomes.popleft()
+
+    def _transition(self, state: str, now: float):
+        if state == self._state:
+            return
+        logger.warning("circuit_breaker %s: %s -> %s", self.name, self._state, state)
+        self._state = state
+        if state == OPEN:
+            self._opened_at = now
+            self._probes_in_flight = 0
+        elif state == HALF_OPEN:
+            self._opened_at = now
+            self._probes_in_flight = 0
+        elif state == CLOSED:
+            self._outcomes.clear()
+            self._probes_in_flight = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh(time.monotonic())
+            return self._state
+
+    def _refresh(self, now: float):
+        if self._state == OPEN and now - self._opened_at >= self.open_seconds:
+            self._transition(HALF_OPEN, now)
+        elif self._state == HALF_OPEN and now - self._opened_at >= self.open_seconds:
+            # A probe never reported back (e.g. it was cancelled); allow a new one
+            self._opened_at = now
+            self._probes_in_flight = 0
+
+    # --------------------------------------------------
+    # CALL PROTOCOL
+    # --------------------------------------------------
+
+    def before_call(self):
+        """Raise CircuitOpenError if the backend should not be called right now."""
+        now = time.monotonic()
+        with self._lock:
+            self._refresh(now)
+            if self._state == OPEN:
+                raise CircuitOpenError(
+                    self.name, self.open_seconds - (now - self._opened_at)
+                )
+            if self._state == HALF_OPEN:
+                if self._probes_in_flight >= self.half_open_calls:
+                    raise CircuitOpenError(
+                        self.name, self.open_seconds - (now - self._opened_at)
+                    )
+                self._probes_in_flight += 1
+
+    def record_success(self):
+        now = time.monotonic()
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._transition(CLOSED, now)
+                return
+            self._outcomes.append((now, True))
+            self._trim(now)
+
+    def record_failure(self):
+        now = time.monotonic()
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._transition(OPEN, now)
+                return
+            self._outcomes.append((now, False))
+            self._trim(now)
+
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            if (
+                self._state == CLOSED
+                and len(self._outcomes) >= self.min_calls
+                and failures / len(self._outcomes) >= self.failure_ratio
+            ):
+                self._transition(OPEN, now)
+
+    def snapshot(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            self._refresh(now)
+            self._trim(now)
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            return {
+                "state": self._state,
+                "calls_in_window": len(self._outcomes),
+                "failures_in_window": failures,
+                "retry_after_seconds": (
+                    round(max(self.open_seconds - (now - self._opened_at), 0), 1)
+                    if self._state == OPEN
+                    else 0
+                ),
+            }
+
+
+BACKENDS = ("cv", "nlp", "tts", "stt", "text_to_gloss")
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Return the shared breaker for a backend (cv, nlp, tts, stt, text_to_gloss …)."""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        with _registry_lock:
+            breaker = _breakers.setdefault(name, CircuitBreaker(name))
+    return breaker
+
+
+def breaker_states() -> Dict[str, dict]:
+    for name in BACKENDS:
+        get_breaker(name)
+    return {name: breaker.snapshot() for name, breaker in sorted(_breakers.items())}
@@ -7,6 +7,7 @@ from typing import Optional
 
 from django.conf import settings
 
+from tafahom_api.apps.v1.ai.clients.circuit_breaker import InvalidRequestError
 from tafahom_api.apps.v1.translation.services.dtos import CVResponse
 
 logger = logging.getLogger(__name__)
@@ -151,7 +152,7 @@ class CVModalRESTClient(CVModelClient):
 
     async def receive_gloss(self, sequence: Optional[list] = None) -> CVResponse:
         if not sequence:
-            raise ValueError("No landmarks sequence provided for Modal API prediction.")
+            raise InvalidRequestError("No landmarks sequence provided for Modal API prediction.")
 
         import numpy as np
         import httpx
@@ -0,0 +1,174 @@
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from tafahom_api.common.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "nlp_gloss_"
+
+
+def normalize_gloss(gloss: str) -> str:
+    """Collapse whitespace and upper-case so equivalent glosses share a key."""
+    if not gloss:
+        return ""
+    return re.sub(r"\s+", " ", gloss).strip().upper()
+
+
+class GlossTranslationCache:
+    """
+    Two-tier cache for gloss → text translations.
+
+    Tier 1 is a bounded in-process LRU, tier 2 is the Django cache (Redis in
+    PROD). Entries are ``{"text": ..., "model": ...}`` dicts keyed by the
+    normalized gloss and the configured model-set version, so bumping
+    ``NLP_MODEL_SET_VERSION`` invalidates everything produced by older models.
+
+    Concurrent misses for the same key are collapsed into a single call to
+    the compute factory, within the process and across workers
+    (``SingleFlight``).
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        default_ttl: Optional[int] = None,
+        version: Optional[str] = None,
+    ):
+        self.max_entries = max_entries or getattr(
+            settings, "NLP_GLOSS_CACHE_MAX_ENTRIES", 2048
+        )
+        self.default_ttl = default_ttl or getattr(
+            settings, "NLP_GLOSS_CACHE_TTL", 60 * 60 * 24 * 7
+        )
+        self.version = version or getattr(settings, "NLP_MODEL_SET_VERSION", "v1")
+
+        self._lru: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._flight = SingleFlight("nlp_gloss")
+
+    # --------------------------------------------------
+    # KEYS
+    # --------------------------------------------------
+
+    def make_key(self, gloss: str) -> str:
+        digest = hashlib.sha1(normalize_gloss(gloss).encode("utf-8")).hexdigest()
+        return f"{CACHE_PREFIX}{self.version}_{digest}"
+
+    # --------------------------------------------------
+    # TIER 1 — IN-PROCESS LRU
+    # --------------------------------------------------
+
+    def _local_get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            item = self._lru.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._lru[key]
+                return None
+            self._lru.move_to_end(key)
+            return value
+
+    def _local_set(self, key: str, value: dict, ttl: int):
+        with self._lock:
+            self._lru[key] = (time.monotonic() + ttl, value)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    # --------------------------------------------------
+    # PUBLIC API
+    # --------------------------------------------------
+
+    async def get(self, gloss: str) -> Tuple[Optional[dict], str]:
+        """
+        Look the gloss up in both tiers.
+        Returns ``(entry, source)`` where source is "memory", "redis" or "miss".
+        """
+        key = self.make_key(gloss)
+
+        value = self._local_get(key)
+        if value is not None:
+            return value, "memory"
+
+        try:
+            value = await cache.aget(key)
+        except Exception as e:
+            logger.error("Error retrieving gloss from cache: %s", e)
+            value = None
+
+        if value is not None:
+            # Promote into tier 1; the remaining Redis TTL is unknown, so use default
+            self._local_set(key, value, self.default_ttl)
+            return value, "redis"
+
+        return None, "miss"
+
+    async def set(self, gloss: str, value: dict, ttl: Optional[int] = None):
+        if not value or not value.get("text"):
+            return
+
+        key = self.make_key(gloss)
+        ttl = ttl or self.default_ttl
+        entry = {"text": value["text"], "model": value.get("model", "")}
+        self._local_set(key, entry, ttl)
+
+        try:
+            await cache.aset(key, entry, timeout=ttl)
+        except Exception as e:
+            logger.error("Error setting gloss cache: %s", e)
+
+    async def get_or_compute(
+        self,
+        gloss: str,
+        factory: Callable[[], Awaitable[dict]],
+        ttl: Optional[int] = None,
+    ) -> Tuple[dict, str]:
+        """
+        Return a cached entry or run ``factory`` once for all concurrent callers.
+        Returns ``(entry, source)``; source is "memory", "redis", "coalesced" or "miss".
+        """
+        value, source = await self.get(gloss)
+        if value is not None:
+            return value, source
+
+        computed = False
+
+        async def load():
+            value, _ = await self.get(gloss)
+            return value
+
+        async def compute():
+            nonlocal computed
+            value = await factory()
+            await self.set(gloss, value, ttl=ttl)
+            computed = True
+            return value
+
+        value = await self._flight.ado(self.make_key(gloss), load, compute)
+        return value, "miss" if computed else "coalesced"
+
+    def clear(self):
+        with self._lock:
+            self._lru.clear()
+
+
+_gloss_cache: Optional[GlossTranslationCache] = None
+
+
+def get_gloss_cache() -> GlossTranslationCache:
+    """Process-wide cache instance shared by every NLPModelClient."""
+    global _gloss_cache
+    if _gloss_cache is None:
+        _gloss_cache = GlossTranslationCache()
+    return _gloss_cache
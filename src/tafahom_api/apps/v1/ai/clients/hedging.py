@@ -0,0 +1,217 @@
+import logging
+import random
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+NLP_MODELS = ("mbart", "mt5", "nllb")
+
+
+class ModelStats:
+    """Rolling latency / error window for a single NLP model."""
+
+    def __init__(self, window: int):
+        self.latencies: deque = deque(maxlen=window)
+        self.outcomes: deque = deque(maxlen=window)
+
+    def record(self, latency_ms: Optional[int], success: bool):
+        self.outcomes.append(success)
+        if success and latency_ms is not None:
+            self.latencies.append(latency_ms)
+
+    def record_censored(self, elapsed_ms: int):
+        """
+        A call cancelled after ``elapsed_ms`` (a hedge loser): its latency is
+        only known to be at least that. It is kept as a latency sample, never
+        as an outcome, and only when it is already above the model's p90; a
+        loser cancelled a few ms after it started says nothing about its
+        speed and would drag its percentiles down.
+        """
+        p90 = self.percentile(0.9)
+        if p90 is not None and elapsed_ms > p90:
+            self.latencies.append(elapsed_ms)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        idx = int(round(pct * (len(ordered) - 1)))
+        return float(ordered[idx])
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return 1.0 - (sum(self.outcomes) / len(self.outcomes))
+
+
+class HedgingScheduler:
+    """
+    Decides which NLP model to call first and when to hedge with the next one.
+
+    Models are ranked by expected latency (p50 inflated by error rate). The
+    best model is started alone; the next one only starts once the running
+    model has exceeded its own p90 latency, or has failed. A small shadow
+    sample still races every model so the quality comparison data in
+    MultiModelTranslationMetric keeps flowing.
+    """
+
+    def __init__(
+        self,
+        window: Optional[int] = None,
+        shadow_rate: Optional[float] = None,
+        default_delay_ms: Optional[int] = None,
+        min_delay_ms: Optional[int] = None,
+    ):
+        self.window = window or getattr(settings, "NLP_HEDGE_WINDOW", 200)
+        self.shadow_rate = (
+            shadow_rate
+            if shadow_rate is not None
+            else getattr(settings, "NLP_HEDGE_SHADOW_RATE", 0.05)
+        )
+        self.default_delay_ms = default_delay_ms or getattr(
+            settings, "NLP_HEDGE_DEFAULT_DELAY_MS", 1500
+        )
+        self.min_delay_ms = min_delay_ms or getattr(
+            settings, "NLP_HEDGE_MIN_DELAY_MS", 50
+        )
+
+        self._stats: Dict[str, ModelStats] = {
+            name: ModelStats(self.window) for name in NLP_MODELS
+        }
+        self._lock = threading.Lock()
+        self._seeded = False
+
+        # Load accounting: backend calls we would have made by racing every
+        # model vs. the calls actually started.
+        self.requests = 0
+        self.calls_started = 0
+        self.calls_if_raced = 0
+        self.shadow_requests = 0
+
+    # --------------------------------------------------
+    # SEEDING
+    # --------------------------------------------------
+
+    async def ensure_seeded(self):
+        if self._seeded:
+            return
+        self._seeded = True
+
+        try:
+            # Not thread-sensitive: callers may be running inside asyncio.run on
+            # the request's sync thread, which would deadlock waiting on itself.
+            rows = await sync_to_async(self._load_history, thread_sensitive=False)()
+        except Exception as e:
+            logger.warning("Could not seed NLP hedging stats: %s", e)
+            return
+
+        for row in reversed(rows):
+            for name in NLP_MODELS:
+                output = row.get(f"{name}_output")
+                latency = row.get(f"{name}_latency_ms")
+                if output is None:
+                    continue
+                self.record(name, latency, output != "ERROR")
+
+    def _load_history(self) -> List[dict]:
+        from tafahom_api.apps.v1.ai.models import MultiModelTranslationMetric
+
+        fields = []
+        for name in NLP_MODELS:
+            fields.extend([f"{name}_output", f"{name}_latency_ms"])
+
+        return list(
+            MultiModelTranslationMetric.objects.filter(cache_hit=False)
+            .order_by("-created_at")
+            .values(*fields)[: self.window]
+        )
+
+    # --------------------------------------------------
+    # OBSERVATIONS
+    # --------------------------------------------------
+
+    def record(self, model: str, latency_ms: Optional[int], success: bool):
+        stats = self._stats.get(model)
+        if stats is None:
+            return
+        with self._lock:
+            stats.record(latency_ms, success)
+
+    def record_censored(self, model: str, elapsed_ms: int):
+        stats = self._stats.get(model)
+        if stats is None:
+            return
+        with self._lock:
+            stats.record_censored(elapsed_ms)
+
+    def record_dispatch(self, available: int, started: int, shadow: bool):
+        with self._lock:
+            self.requests += 1
+            self.calls_started += started
+            self.calls_if_raced += available
+            if shadow:
+                self.shadow_requests += 1
+
+    # --------------------------------------------------
+    # DECISIONS
+    # --------------------------------------------------
+
+    def should_shadow(self) -> bool:
+        return random.random() < self.shadow_rate
+
+    def _expected_latency(self, model: str) -> float:
+        stats = self._stats[model]
+        p50 = stats.percentile(0.5)
+        if p50 is None:
+            p50 = float(self.default_delay_ms)
+        return p50 / max(1.0 - stats.error_rate, 0.05)
+
+    def rank(self, models: Iterable[str]) -> List[str]:
+        with self._lock:
+            return sorted(models, key=self._expected_latency)
+
+    def hedge_delay(self, model: str) -> float:
+        """Seconds to wait on ``model`` before starting the next one (its p90)."""
+        with self._lock:
+            p90 = self._stats[model].percentile(0.9)
+        delay_ms = p90 if p90 is not None else self.default_delay_ms
+        return max(delay_ms, self.min_delay_ms) / 1000.0
+
+    def stats(self) -> dict:
+        with self._lock:
+            saved = self.calls_if_raced - self.calls_started
+            return {
+                "requests": self.requests,
+                "shadow_requests": self.shadow_requests,
+                "calls_started": self.calls_started,
+                "calls_saved": saved,
+                "load_saved_ratio": (
+                    round(saved / self.calls_if_raced, 4) if self.calls_if_raced else 0.0
+                ),
+                "models": {
+                    name: {
+                        "samples": len(s.outcomes),
+                        "p50_ms": s.percentile(0.5),
+                        "p90_ms": s.percentile(0.9),
+                        "error_rate": round(s.error_rate, 4),
+                    }
+                    for name, s in self._stats.items()
+                },
+            }
+
+
+_scheduler: Optional[HedgingScheduler] = None
+
+
+def get_hedging_scheduler() -> HedgingScheduler:
+    """Process-wide scheduler shared by every NLPModelClient."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = HedgingScheduler()
+    return _scheduler
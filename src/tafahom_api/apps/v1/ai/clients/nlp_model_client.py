@@ -1,25 +1,41 @@
 import asyncio
+import functools
 import logging
 import time
-from typing import Optional, Set
+from typing import List, Optional, Set, Tuple
 
 import httpx
-from asgiref.sync import sync_to_async
 from django.conf import settings
 
-from tafahom_api.apps.v1.ai.clients.base import BaseAIClient
+from tafahom_api.apps.v1.ai.clients.base import BaseAIClient, shared_http_client
+from tafahom_api.apps.v1.ai.clients.circuit_breaker import (
+    BackendUnavailableError,
+    CircuitOpenError,
+    InvalidRequestError,
+    get_breaker,
+)
+from tafahom_api.apps.v1.ai.clients.gloss_cache import get_gloss_cache
+from tafahom_api.apps.v1.ai.clients.hedging import get_hedging_scheduler
 from tafahom_api.apps.v1.translation.services.dtos import NLPResponse
 from tafahom_api.apps.v1.ai.models import MultiModelTranslationMetric
+from tafahom_api.apps.v1.ai.telemetry import get_telemetry_sink, record_ai_request
 
 logger = logging.getLogger(__name__)
 
+# Strong references to metric tasks so they are not garbage-collected mid-flight
+_background_tasks: Set[asyncio.Task] = set()
+
 class NLPModelClient(BaseAIClient):
     """
     Multi-Model Client for the NLP translation service.
     """
 
-    def __init__(self, timeout: Optional[int] = None):
+    def __init__(self, timeout: Optional[int] = None, cache=None, scheduler=None):
         self.request_timeout = timeout or getattr(settings, "NLP_REQUEST_TIMEOUT", 30)
+        self.cache = cache or get_gloss_cache()
+        self.scheduler = scheduler or get_hedging_scheduler()
+        # "hedged": best model first, hedge after its p90 — "race": all models at once
+        self.dispatch_mode = getattr(settings, "NLP_DISPATCH_MODE", "hedged")
         self.mbart_url = getattr(settings, "AI_GLOSS_TO_TEXT_BASE_URL_1", "")
         self.mt5_url = getattr(settings, "AI_GLOSS_TO_TEXT_BASE_URL_2", "")
         self.nllb_url = getattr(settings, "AI_GLOSS_TO_TEXT_BASE_URL_3", "")
@@ -30,6 +46,14 @@ class NLPModelClient(BaseAIClient):
         url = f"{base_url.rstrip('/')}/translate"
         start_time = time.perf_counter()
 
+        # Each model has its own breaker so a dead backend fails fast and
+        # the scheduler moves straight on to the next model.
+        breaker = get_breaker(f"nlp_{model_name}")
+        try:
+            breaker.before_call()
+        except CircuitOpenError as e:
+            raise RuntimeError(f"{model_name} failed: {e}|0") from e
+
         timeout = httpx.Timeout(
             connect=30.0,
             read=120.0,
@@ -37,37 +61,99 @@ class NLPModelClient(BaseAIClient):
             pool=30.0,
         )
 
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            try:
-                response = await client.post(
-                    url,
-                    json={"gloss": gloss},
-                    headers={"Content-Type": "application/json"},
-                )
-                response.raise_for_status()
-                data = response.json()
-                latency_ms = int((time.perf_counter() - start_time) * 1000)
+        client = shared_http_client()
+        try:
+            response = await client.post(
+                url,
+                json={"gloss": gloss},
+                headers={"Content-Type": "application/json"},
+                timeout=timeout,
+            )
+            response.raise_for_status()
+            data = response.json()
+            latency_ms = int((time.perf_counter() - start_time) * 1000)
 
-                text = data.get("text", "") or data.get("translation", "") or data.get("gloss_translation", "")
-                if not text:
-                    raise ValueError(f"{model_name} returned empty text")
+            text = data.get("text", "") or data.get("translation", "") or data.get("gloss_translation", "")
+            if not text:
+                raise ValueError(f"{model_name} returned empty text")
 
-                return {
-                    "model": model_name,
-                    "text": text,
-                    "latency_ms": latency_ms,
-                    "raw": data,
-                }
-            except Exception as e:
-                latency_ms = int((time.perf_counter() - start_time) * 1000)
-                raise RuntimeError(f"{model_name} failed: {e}|{latency_ms}") from e
+            breaker.record_success()
+            return {
+                "model": model_name,
+                "text": text,
+                "latency_ms": latency_ms,
+                "raw": data,
+            }
+        except Exception as e:
+            breaker.record_failure()
+            latency_ms = int((time.perf_counter() - start_time) * 1000)
+            raise RuntimeError(f"{model_name} failed: {e}|{latency_ms}") from e
 
 
+    @staticmethod
+    def _parse_failure(exc: BaseException) -> Optional[Tuple[str, int]]:
+        # RuntimeError format: "<model_name> failed: <msg>|<latency_ms>"
+        err_str = str(exc)
+        try:
+            model_name = err_str.split(" failed:")[0]
+            latency = int(err_str.split("|")[-1])
+            return model_name, latency
+        except (IndexError, ValueError):
+            logger.warning("Could not parse metric from error: %s", err_str)
+            return None
+
+    def _record_outcome(self, model: str, started: float, task: asyncio.Task):
+        """Done-callback feeding every finished model call into the scheduler."""
+        if task.cancelled():
+            # A cancelled hedge loser was at least this slow; past its p90 that
+            # bound is kept, so slow models are not judged by winners alone.
+            elapsed_ms = int((time.perf_counter() - started) * 1000)
+            self.scheduler.record_censored(model, elapsed_ms)
+            return
+        exc = task.exception()
+        if exc is None:
+            result = task.result()
+            self.scheduler.record(result["model"], result["latency_ms"], True)
+            return
+        parsed = self._parse_failure(exc)
+        if parsed:
+            self.scheduler.record(parsed[0], parsed[1], False)
+
+    def _start_model(self, name: str, url: str, gloss: str) -> asyncio.Task:
+        task = asyncio.create_task(self._post_to_model(name, url, gloss))
+        task.add_done_callback(
+            functools.partial(self._record_outcome, name, time.perf_counter())
+        )
+        return task
+
+    def _configured_models(self) -> List[Tuple[str, str]]:
+        return [
+            (name, url)
+            for name, url in (
+                ("mbart", self.mbart_url),
+                ("mt5", self.mt5_url),
+                ("nllb", self.nllb_url),
+            )
+            if url
+        ]
+
+    def _save_metrics(self, gloss: str, winner_result: dict, pending: Set[asyncio.Task], done: Set[asyncio.Task]):
+        if not pending:
+            self._record_metrics(gloss, winner_result, done)
+            return
+
+        # Shadow samples still have models running; wait for them off the hot path
+        task = asyncio.create_task(self._gather_and_save_metrics(gloss, winner_result, pending, done))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
     async def _gather_and_save_metrics(self, gloss: str, winner_result: dict, pending: Set[asyncio.Task], done: Set[asyncio.Task]):
         # Wait for all remaining to finish (or timeout)
         if pending:
             await asyncio.wait(pending, timeout=self.request_timeout)
-        
+        self._record_metrics(gloss, winner_result, done.union(pending))
+
+    def _record_metrics(self, gloss: str, winner_result: dict, tasks: Set[asyncio.Task]):
         # Collect all results
         metrics = {
             "gloss": gloss,
@@ -75,8 +161,7 @@ class NLPModelClient(BaseAIClient):
             "winner_latency_ms": winner_result["latency_ms"],
         }
         
-        all_tasks = done.union(pending)
-        for task in all_tasks:
+        for task in tasks:
             try:
                 if task.done() and not task.cancelled():
                     res = task.result()
@@ -84,48 +169,95 @@ class NLPModelClient(BaseAIClient):
                     metrics[f"{model}_output"] = res["text"]
                     metrics[f"{model}_latency_ms"] = res["latency_ms"]
             except Exception as e:
-                # RuntimeError format: "<model_name> failed: <msg>|<latency_ms>"
-                err_str = str(e)
-                try:
-                    model_name = err_str.split(" failed:")[0]
-                    latency_part = err_str.split("|")[-1]
-                    latency = int(latency_part)
+                parsed = self._parse_failure(e)
+                if parsed:
+                    model_name, latency = parsed
                     metrics[f"{model_name}_output"] = "ERROR"
                     metrics[f"{model_name}_latency_ms"] = latency
-                except (IndexError, ValueError):
-                    logger.warning("Could not parse metric from error: %s", err_str)
 
-        @sync_to_async
-        def save_to_db():
-            MultiModelTranslationMetric.objects.create(**metrics)
-            
-        try:
-            await save_to_db()
-        except Exception as e:
-            logger.error(f"Failed to save MultiModelTranslationMetric: {e}")
+        get_telemetry_sink().record(MultiModelTranslationMetric(**metrics))
 
-    async def translate_gloss(self, gloss: str) -> NLPResponse:
-        if not gloss or not gloss.strip():
-            raise ValueError("Gloss text must not be empty")
-
-        gloss = gloss.strip()
-        tasks = []
-        
-        if self.mbart_url:
-            tasks.append(asyncio.create_task(self._post_to_model("mbart", self.mbart_url, gloss)))
-        if self.mt5_url:
-            tasks.append(asyncio.create_task(self._post_to_model("mt5", self.mt5_url, gloss)))
-        if self.nllb_url:
-            tasks.append(asyncio.create_task(self._post_to_model("nllb", self.nllb_url, gloss)))
-
-        if not tasks:
+    async def _dispatch(self, gloss: str) -> dict:
+        models = self._configured_models()
+        if not models:
             raise ValueError("No NLP models are configured.")
 
+        await self.scheduler.ensure_seeded()
+
+        if self.dispatch_mode == "race" or len(models) == 1:
+            return await self._race_models(gloss, models, shadow=False)
+        if self.scheduler.should_shadow():
+            return await self._race_models(gloss, models, shadow=True)
+        return await self._hedge_models(gloss, models)
+
+    async def _race_models(
+        self, gloss: str, models: List[Tuple[str, str]], shadow: bool
+    ) -> dict:
+        """
+        Start every model at once. Losers are cancelled, except for shadow
+        samples where they run to completion so their outputs are recorded.
+        """
+        tasks = [self._start_model(name, url, gloss) for name, url in models]
+
         winner_result = None
         pending = set(tasks)
+        finished: Set[asyncio.Task] = set()
 
         while pending:
             done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            finished |= done
+
+            for task in done:
+                try:
+                    result = task.result()
+                    if not winner_result:
+                        winner_result = result
+                except Exception as e:
+                    logger.warning("A model failed: %s", e)
+
+            if winner_result:
+                if not shadow:
+                    # Cancel remaining pending tasks
+                    for t in pending:
+                        t.cancel()
+                    if pending:
+                        await asyncio.wait(pending, timeout=5)
+                break
+
+        self.scheduler.record_dispatch(len(models), len(tasks), shadow=shadow)
+
+        if not winner_result:
+            raise BackendUnavailableError("All NLP models failed to return a translation.")
+
+        # Metrics are deferred while shadow models are still running
+        self._save_metrics(gloss, winner_result, pending, finished)
+
+        winner_result["dispatch"] = "shadow" if shadow else "race"
+        winner_result["models_started"] = len(tasks)
+        return winner_result
+
+    async def _hedge_models(self, gloss: str, models: List[Tuple[str, str]]) -> dict:
+        """
+        Start the best-ranked model alone and only add the next one once the
+        running model has exceeded its p90 latency or failed.
+        """
+        urls = dict(models)
+        remaining = self.scheduler.rank(urls)
+
+        tasks: List[asyncio.Task] = []
+        current = remaining.pop(0)
+        tasks.append(self._start_model(current, urls[current], gloss))
+
+        winner_result = None
+        pending = set(tasks)
+        finished: Set[asyncio.Task] = set()
+
+        while pending:
+            timeout = self.scheduler.hedge_delay(current) if remaining else None
+            done, pending = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            finished |= done
 
             for task in done:
                 try:
@@ -136,18 +268,85 @@ class NLPModelClient(BaseAIClient):
                     logger.warning("A model failed: %s", e)
 
             if winner_result:
-                # Cancel remaining pending tasks
                 for t in pending:
                     t.cancel()
                 if pending:
                     await asyncio.wait(pending, timeout=5)
                 break
 
+            # Either the hedge delay elapsed or every finished model failed
+            if remaining:
+                current = remaining.pop(0)
+                task = self._start_model(current, urls[current], gloss)
+                tasks.append(task)
+                pending.add(task)
+
+        self.scheduler.record_dispatch(len(models), len(tasks), shadow=False)
+
         if not winner_result:
-            raise ValueError("All NLP models failed to return a translation.")
+            raise BackendUnavailableError("All NLP models failed to return a translation.")
+
+        self._save_metrics(gloss, winner_result, pending, finished)
+
+        winner_result["dispatch"] = "hedged"
+        winner_result["models_started"] = len(tasks)
+        return winner_result
+
+    async def translate_gloss(self, gloss: str) -> NLPResponse:
+        if not gloss or not gloss.strip():
+            raise InvalidRequestError("Gloss text must not be empty")
+
+        gloss = gloss.strip()
+        start_time = time.perf_counter()
 
-        # Background save of metrics
-        asyncio.create_task(self._gather_and_save_metrics(gloss, winner_result, pending, done))
+        # Identical glosses always produce the same text, so a cache hit
+        # skips the model race entirely.
+        try:
+            winner_result, cache_source = await self.cache.get_or_compute(
+                gloss, lambda: self._dispatch(gloss)
+            )
+        except Exception as e:
+            record_ai_request(
+                "nlp",
+                "translate_gloss",
+                "failed",
+                (time.perf_counter() - start_time) * 1000,
+                error_message=str(e),
+            )
+            raise
+
+        record_ai_request(
+            "nlp", "translate_gloss", "success", (time.perf_counter() - start_time) * 1000
+        )
+
+        if cache_source != "miss":
+            latency_ms = int((time.perf_counter() - start_time) * 1000)
+            get_telemetry_sink().record(
+                MultiModelTranslationMetric(
+                    gloss=gloss,
+                    winner_model=winner_result.get("model", ""),
+                    winner_latency_ms=latency_ms,
+                    cache_hit=True,
+                )
+            )
+            logger.info(
+                "nlp_translate_cache_hit",
+                extra={
+                    "gloss": gloss,
+                    "text": winner_result["text"],
+                    "winner_model": winner_result.get("model", ""),
+                    "cache": cache_source,
+                    "latency_ms": latency_ms,
+                },
+            )
+            return NLPResponse(
+                text=winner_result["text"],
+                raw={
+                    "winner_model": winner_result.get("model", ""),
+                    "latency_ms": latency_ms,
+                    "cache": cache_source,
+                },
+            )
 
         logger.info(
             "nlp_translate_success_multi",
@@ -155,12 +354,17 @@ class NLPModelClient(BaseAIClient):
                 "gloss": gloss,
                 "text": winner_result["text"],
                 "winner_model": winner_result["model"],
-                "latency_ms": winner_result["latency_ms"]
+                "latency_ms": winner_result["latency_ms"],
+                "dispatch": winner_result.get("dispatch", ""),
+                "models_started": winner_result.get("models_started", 1),
             },
         )
         
-        raw_output = winner_result.get("raw", {})
+        raw_output = dict(winner_result.get("raw", {}))
         raw_output["winner_model"] = winner_result["model"]
         raw_output["latency_ms"] = winner_result["latency_ms"]
+        raw_output["cache"] = cache_source
+        raw_output["dispatch"] = winner_result.get("dispatch", "")
+        raw_output["models_started"] = winner_result.get("models_started", 1)
 
         return NLPResponse(text=winner_result["text"], raw=raw_output)
@@ -0,0 +1,198 @@
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set
+
+from django.conf import settings
+
+from tafahom_api.apps.v1.translation.services.normalization import normalize_arabic
+from tafahom_api.apps.v1.translation.sign_map import ANIMATION_MAP, SIGN_MAP, SYNONYM_MAP
+
+
+def char_ngrams(word: str, n: int = 3) -> Set[str]:
+    """Character n-grams of a word padded with spaces, so short words still have some."""
+    padded = f" {word} "
+    return {padded[i : i + n] for i in range(max(len(padded) - n + 1, 1))}
+
+
+@dataclass
+class PromptLexicon:
+    """Dictionary subset relevant to one input."""
+
+    animation_keys: List[str] = field(default_factory=list)
+    sign_keys: List[str] = field(default_factory=list)
+    synonyms: Dict[str, Optional[str]] = field(default_factory=dict)
+
+    def __len__(self):
+        return len(self.animation_keys) + len(self.sign_keys) + len(self.synonyms)
+
+
+class LexiconIndex:
+    """
+    Character n-gram index over the sign dictionary.
+
+    Every word of every ``ANIMATION_MAP`` / ``SIGN_MAP`` key and of every
+    ``SYNONYM_MAP`` key is indexed after ``normalize_arabic``. An input word
+    is scored against the indexed words by Dice similarity of their trigram
+    sets, which tolerates the prefixes, suffixes and spelling variants the
+    LLM is there to resolve. Multi-word phrases are candidates as soon as
+    one of their words is.
+    """
+
+    def __init__(
+        self,
+        animation_keys: Iterable[str],
+        sign_keys: Iterable[str],
+        synonyms: Dict[str, Optional[str]],
+        n: int = 3,
+    ):
+        self.n = n
+        # entry: (kind, original key)
+        self.entries = [("animation", key) for key in animation_keys]
+        self.entries += [("sign", key) for key in sign_keys]
+        self.entries += [("synonym", key) for key in synonyms]
+        self.synonyms = synonyms
+
+        self._words: List[str] = []  # indexed word → entry ids
+        self._word_entries: List[List[int]] = []
+        self._word_grams: List[int] = []  # trigram count per indexed word
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+
+        word_ids: Dict[str, int] = {}
+        for entry_id, (_, key) in enumerate(self.entries):
+            for word in normalize_arabic(key).split():
+                word_id = word_ids.get(word)
+                if word_id is None:
+                    word_id = word_ids[word] = len(self._words)
+                    grams = char_ngrams(word, n)
+                    self._words.append(word)
+                    self._word_entries.append([])
+                    self._word_grams.append(len(grams))
+                    for gram in grams:
+                        self._postings[gram].append(word_id)
+                self._word_entries[word_id].append(entry_id)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _score_words(self, word: str) -> Dict[int, float]:
+        grams = char_ngrams(word, self.n)
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for word_id in self._postings.get(gram, ()):
+                shared[word_id] += 1
+        return {
+            word_id: 2 * count / (len(grams) + self._word_grams[word_id])
+            for word_id, count in shared.items()
+        }
+
+    def candidates(
+        self,
+        text: str,
+        top_k: int,
+        per_word: int = 6,
+        min_score: float = 0.35,
+    ) -> PromptLexicon:
+        """The ``top_k`` entries most similar to the words of ``text``."""
+        return self._lexicon(self._ranked(text, top_k, per_word, min_score))
+
+    def candidates_many(
+        self,
+        texts: Iterable[str],
+        top_k: int,
+        max_entries: int,
+        per_word: int = 6,
+        min_score: float = 0.35,
+    ) -> PromptLexicon:
+        """
+        The ``top_k`` entries of each of ``texts``, merged round-robin (every
+        text's best entry first, then every text's second, ...) up to
+        ``max_entries``, so no text of a batch is left without candidates.
+        """
+        rankings = [self._ranked(text, top_k, per_word, min_score) for text in texts]
+        chosen: Dict[int, None] = {}
+        for rank in range(top_k):
+            for ranked in rankings:
+                if len(chosen) >= max_entries:
+                    return self._lexicon(chosen)
+                if rank < len(ranked):
+                    chosen.setdefault(ranked[rank])
+        return self._lexicon(chosen)
+
+    def _ranked(self, text: str, top_k: int, per_word: int, min_score: float) -> List[int]:
+        best: Dict[int, float] = {}
+        for word in dict.fromkeys(normalize_arabic(text).split()):
+            scored = sorted(
+                self._score_words(word).items(), key=lambda item: item[1], reverse=True
+            )
+            for word_id, score in scored[:per_word]:
+                if score < min_score:
+                    break
+                for entry_id in self._word_entries[word_id]:
+                    if score > best.get(entry_id, 0.0):
+                        best[entry_id] = score
+
+        return sorted(best, key=lambda entry_id: (-best[entry_id], entry_id))[:top_k]
+
+    def _lexicon(self, entry_ids: Iterable[int]) -> PromptLexicon:
+        lexicon = PromptLexicon()
+        for entry_id in sorted(entry_ids):
+            kind, key = self.entries[entry_id]
+            if kind == "animation":
+                lexicon.animation_keys.append(key)
+            elif kind == "sign":
+                lexicon.sign_keys.append(key)
+            else:
+                lexicon.synonyms[key] = self.synonyms[key]
+        return lexicon
+
+
+_index: Optional[LexiconIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_lexicon_index() -> LexiconIndex:
+    """Process-wide index over the sign map, built on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = LexiconIndex(ANIMATION_MAP.keys(), SIGN_MAP.keys(), SYNONYM_MAP)
+    return _index
+
+
+def relevant_lexicon(text: str) -> Optional[PromptLexicon]:
+    """
+    Dictionary entries worth sending to the LLM for ``text``, or ``None``
+    when retrieval is disabled (``TEXT_TO_GLOSS_PROMPT_TOP_K = 0``) or finds
+    nothing, in which case the caller sends the full dictionary.
+    """
+    top_k = getattr(settings, "TEXT_TO_GLOSS_PROMPT_TOP_K", 40)
+    if top_k <= 0:
+        return None
+    lexicon = get_lexicon_index().candidates(
+        text,
+        top_k,
+        per_word=getattr(settings, "TEXT_TO_GLOSS_PROMPT_PER_WORD", 6),
+        min_score=getattr(settings, "TEXT_TO_GLOSS_PROMPT_MIN_SCORE", 0.35),
+    )
+    return lexicon or None
+
+
+def relevant_lexicon_many(texts: List[str]) -> Optional[PromptLexicon]:
+    """
+    ``relevant_lexicon`` for a batch prompt: each text keeps its own
+    ``TEXT_TO_GLOSS_PROMPT_TOP_K`` candidates, up to
+    ``TEXT_TO_GLOSS_PROMPT_BATCH_MAX`` entries in total.
+    """
+    top_k = getattr(settings, "TEXT_TO_GLOSS_PROMPT_TOP_K", 40)
+    if top_k <= 0:
+        return None
+    lexicon = get_lexicon_index().candidates_many(
+        texts,
+        top_k,
+        max_entries=getattr(settings, "TEXT_TO_GLOSS_PROMPT_BATCH_MAX", 200),
+        per_word=getattr(settings, "TEXT_TO_GLOSS_PROMPT_PER_WORD", 6),
+        min_score=getattr(settings, "TEXT_TO_GLOSS_PROMPT_MIN_SCORE", 0.35),
+    )
+    return lexicon or None
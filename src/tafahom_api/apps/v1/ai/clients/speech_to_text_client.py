@@ -1,62 +1,39 @@
-import tempfile
-import subprocess
-import os
+import time
 from django.conf import settings
 from .base import BaseAIClient
+from ..telemetry import record_ai_request
+from ..utils.audio_ingest import ingest_audio
 
 
 class SpeechToTextClient(BaseAIClient):
     base_url = settings.AI_STT_BASE_URL
+    backend = "stt"
 
     async def speech_to_text(self, audio_file):
         """
         Converts uploaded audio to PCM16 WAV (mono, 16kHz)
         and sends it to the STT service with REQUIRED params.
-        """
 
-        # -------------------------------------------------
-        # 1️⃣ Save uploaded audio bytes to temp file
-        # -------------------------------------------------
-        with tempfile.NamedTemporaryFile(suffix=".input", delete=False) as raw:
-            raw.write(audio_file.read())
-            raw.flush()
-            raw_path = raw.name
+        ``audio_file`` is either the ``IngestedAudio`` produced by
+        ``ingest_audio`` (sent as-is) or a raw upload, which is ingested here.
+        """
 
         # -------------------------------------------------
-        # 2️⃣ Convert to clean WAV (PCM16, mono, 16kHz)
+        # 1️⃣ Convert to clean WAV (PCM16, mono, 16kHz) — once
         # -------------------------------------------------
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as wav:
-            subprocess.run(
-                [
-                    "ffmpeg",
-                    "-y",
-                    "-i",
-                    raw_path,
-                    "-ac",
-                    "1",  # mono
-                    "-ar",
-                    "16000",  # 16kHz
-                    "-sample_fmt",
-                    "s16",  # PCM16
-                    wav.name,
-                ],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                check=True,
-            )
-            wav_path = wav.name
-            print("FINAL WAV SIZE:", os.path.getsize(wav_path))
+        audio = await ingest_audio(audio_file)
 
         # -------------------------------------------------
-        # 3️⃣ Send WAV to STT service (FIXED)
+        # 2️⃣ Send WAV to STT service
         # -------------------------------------------------
-        with open(wav_path, "rb") as f:
-            return await self._post_file(
+        start = time.perf_counter()
+        try:
+            result = await self._post_file(
                 "/",
                 files={
                     "file": (
                         "audio.wav",  # ✅ filename REQUIRED
-                        f,  # ✅ file bytes
+                        audio.wav,  # ✅ file bytes
                         "audio/wav",  # ✅ MIME type
                     ),
                 },
@@ -64,4 +41,16 @@ class SpeechToTextClient(BaseAIClient):
                     "language": "ar",  # 🔥 REQUIRED FOR ARABIC
                     "task": "transcribe",  # 🔥 REQUIRED FOR WHISPER-LIKE MODELS
                 },
-            )
\ No newline at end of file
+            )
+        except Exception as e:
+            record_ai_request(
+                "speech",
+                "speech_to_text",
+                "failed",
+                (time.perf_counter() - start) * 1000,
+                error_message=str(e),
+            )
+            raise
+
+        record_ai_request("speech", "speech_to_text", "success", (time.perf_counter() - start) * 1000)
+        return result
@@ -1,15 +1,16 @@
 import json
+import logging
+from typing import List, Optional
+
 from django.conf import settings
 from .base import BaseAIClient
+from .circuit_breaker import InvalidRequestError
+from .prompt_lexicon import relevant_lexicon, relevant_lexicon_many
 from tafahom_api.apps.v1.translation.sign_map import ANIMATION_MAP, SIGN_MAP, SYNONYM_MAP
 
+logger = logging.getLogger(__name__)
 
-# Build once at import time — these don't change at runtime
-_ANIMATION_MAP_KEYS = " ".join(ANIMATION_MAP.keys())
-_SIGN_MAP_KEYS      = " ".join(SIGN_MAP.keys())
-_SYNONYM_MAP_STR    = json.dumps(SYNONYM_MAP, ensure_ascii=False)
-
-_SYSTEM_PROMPT = """\
+_PROMPT_TEMPLATE = """\
 You are an Arabic Sign Language gloss translator for a Unity avatar system.
 
 Your task:
@@ -59,25 +60,117 @@ IMPORTANT:
 * Never generate unseen words.
 * Never change unknown emotional words.
 * If unsure, preserve the original word exactly.
-""".format(
-    animation_keys=_ANIMATION_MAP_KEYS,
-    sign_keys=_SIGN_MAP_KEYS,
-    synonym_map=_SYNONYM_MAP_STR,
-)
+"""
+
+
+def _render_prompt(animation_keys, sign_keys, synonym_map) -> str:
+    return _PROMPT_TEMPLATE.format(
+        animation_keys=" ".join(animation_keys),
+        sign_keys=" ".join(sign_keys),
+        synonym_map=json.dumps(synonym_map, ensure_ascii=False),
+    )
+
+
+# Full dictionary, built once at import time — used when retrieval finds nothing
+_SYSTEM_PROMPT = _render_prompt(ANIMATION_MAP.keys(), SIGN_MAP.keys(), SYNONYM_MAP)
+
+
+def build_prompt(text: str) -> tuple[str, bool]:
+    """
+    Prompt for ``text`` and whether its dictionary was filtered.
+
+    Only the entries the lexicon index finds relevant to the input words are
+    embedded; that is a few dozen words instead of the whole sign map.
+    """
+    lexicon = relevant_lexicon(text)
+    if lexicon is None:
+        system_prompt, filtered = _SYSTEM_PROMPT, False
+    else:
+        system_prompt = _render_prompt(
+            lexicon.animation_keys, lexicon.sign_keys, lexicon.synonyms
+        )
+        filtered = True
+    return system_prompt + f"\nUser Input:\n{text.strip()}\n", filtered
+
+
+_BATCH_INSTRUCTIONS = """
+BATCH MODE:
+* The input below has one entry per line; every entry is translated on its own.
+* Output exactly one line per input line, in the same order.
+* If an entry has no sign in the dictionary, output - on its line.
+"""
+
+
+def build_batch_prompt(entries: List[str]) -> str:
+    """
+    Prompt that glosses each of ``entries`` on its own output line. The
+    dictionary is retrieved per entry, so a long batch does not share one
+    entry's worth of candidates.
+    """
+    lexicon = relevant_lexicon_many(entries)
+    if lexicon is None:
+        system_prompt = _SYSTEM_PROMPT
+    else:
+        system_prompt = _render_prompt(
+            lexicon.animation_keys, lexicon.sign_keys, lexicon.synonyms
+        )
+    return system_prompt + _BATCH_INSTRUCTIONS + "\nUser Input:\n" + "\n".join(entries) + "\n"
+
+
+def _gloss_text(result) -> str:
+    if not isinstance(result, dict):
+        return ""
+    return str(
+        result.get("gloss_translation") or result.get("gloss") or result.get("text") or ""
+    ).strip()
 
 
 class TextToGlossClient(BaseAIClient):
     base_url = settings.AI_TEXT_TO_GLOSS_BASE_URL
+    backend = "text_to_gloss"
 
     async def text_to_gloss(self, text: str):
         if not text or not text.strip():
-            raise ValueError("Text is empty")
+            raise InvalidRequestError("Text is empty")
 
-        prompt = _SYSTEM_PROMPT + f"\nUser Input:\n{text.strip()}\n"
-
-        payload = {"prompt": prompt}
+        prompt, filtered = build_prompt(text)
 
         try:
-            return await self._post_json("/generate", json=payload)
+            result = await self._post_json("/generate", json={"prompt": prompt})
+            if filtered and not _gloss_text(result):
+                # The short dictionary may have missed the right entry
+                logger.info("Filtered gloss prompt gave no output; retrying with the full dictionary")
+                full_prompt = _SYSTEM_PROMPT + f"\nUser Input:\n{text.strip()}\n"
+                result = await self._post_json("/generate", json={"prompt": full_prompt})
+            return result
         except Exception:
             return {"gloss": ""}
+
+    async def text_to_gloss_batch(self, entries: List[str]) -> Optional[List[str]]:
+        """
+        Gloss several unknown words or phrases with one LLM call.
+
+        Returns one gloss string per entry, ``""`` for entries the model
+        marked as having no sign, or ``None`` when the call failed or the
+        answer cannot be aligned with the input line by line.
+        """
+        if not entries:
+            return []
+
+        try:
+            result = await self._post_json(
+                "/generate", json={"prompt": build_batch_prompt(entries)}
+            )
+        except Exception as e:
+            logger.warning("Batch gloss call failed: %s", e)
+            return None
+
+        lines = [line.strip() for line in _gloss_text(result).splitlines() if line.strip()]
+        if len(lines) != len(entries):
+            logger.warning(
+                "Batch gloss answer has %s lines for %s entries; discarding it",
+                len(lines),
+                len(entries),
+            )
+            return None
+        return ["" if line == "-" else line for line in lines]
@@ -1,8 +1,16 @@
+import asyncio
 import logging
+import time
+from typing import AsyncIterator, Optional
 
 import httpx
 from django.conf import settings
 
+from ..telemetry import record_ai_request
+from .audio_cache import TTSAudioCache, get_tts_audio_cache
+from .base import shared_http_client
+from .circuit_breaker import CircuitOpenError, get_breaker
+
 logger = logging.getLogger(__name__)
 
 
@@ -10,32 +18,159 @@ class TextToSpeechClient:
     """
     Text-to-Speech client.
     POSTs text to AI_TTS_BASE_URL and returns raw audio bytes.
+
+    Results are stored in the on-disk audio cache keyed by text, voice and
+    model, so a phrase that was already synthesized never reaches the backend.
     """
 
-    def __init__(self):
+    def __init__(self, cache: Optional[TTSAudioCache] = None):
         self.base_url = getattr(settings, "AI_TTS_BASE_URL", "")
+        self.voice = getattr(settings, "TTS_VOICE_ID", "")
+        self.model = getattr(settings, "TTS_MODEL_ID", "")
         self.timeout = 60.0
+        self.cache = cache or get_tts_audio_cache()
 
-    async def text_to_speech(self, text: str) -> bytes | None:
+    async def cached_audio(self, text: str) -> bytes | None:
+        """Audio for ``text`` from the disk cache, without calling the backend."""
         if not text or not text.strip():
             return None
+        return await asyncio.to_thread(self.cache.get, text, self.voice, self.model)
+
+    async def text_to_speech(self, text: str, use_cache: bool = True) -> bytes | None:
+        if not text or not text.strip():
+            return None
+
+        if use_cache:
+            cached = await self.cached_audio(text)
+            if cached:
+                return cached
 
         if not self.base_url:
             logger.warning("AI_TTS_BASE_URL is not configured.")
             return None
 
+        breaker = get_breaker("tts")
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    self.base_url,
-                    json={"text": text.strip()},
-                    headers={"Content-Type": "application/json"},
-                )
-                response.raise_for_status()
-                return response.content
+            breaker.before_call()
+        except CircuitOpenError as e:
+            logger.warning("TTS skipped: %s", e)
+            return None
+
+        start = time.perf_counter()
+        try:
+            response = await shared_http_client().post(
+                self.base_url,
+                json=self._payload(text),
+                headers={"Content-Type": "application/json"},
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            breaker.record_success()
+            record_ai_request("speech", "text_to_speech", "success", (time.perf_counter() - start) * 1000)
+            audio = response.content
         except httpx.TimeoutException:
+            breaker.record_failure()
             logger.warning("TTS timed out for text: %r", text[:50])
+            record_ai_request("speech", "text_to_speech", "timeout", (time.perf_counter() - start) * 1000)
             return None
         except Exception as e:
+            breaker.record_failure()
             logger.error("TTS error: %s", e)
+            record_ai_request(
+                "speech",
+                "text_to_speech",
+                "failed",
+                (time.perf_counter() - start) * 1000,
+                error_message=str(e),
+            )
             return None
+
+        if audio:
+            await asyncio.to_thread(self.cache.set, text, audio, self.voice, self.model)
+        return audio
+
+    async def stream_text_to_speech(
+        self, text: str, use_cache: bool = True
+    ) -> AsyncIterator[bytes]:
+        """
+        Yield audio chunks as the backend produces them.
+
+        The first chunk is available as soon as the backend starts sending,
+        regardless of sentence length. A cache hit is yielded in one piece; a
+        completed stream is written to the cache. Nothing is yielded when the
+        backend is unavailable, and a failure mid-stream ends the iteration
+        early; partial audio is never cached.
+        """
+        if not text or not text.strip():
+            return
+
+        if use_cache:
+            cached = await self.cached_audio(text)
+            if cached:
+                yield cached
+                return
+
+        if not self.base_url:
+            logger.warning("AI_TTS_BASE_URL is not configured.")
+            return
+
+        breaker = get_breaker("tts")
+        try:
+            breaker.before_call()
+        except CircuitOpenError as e:
+            logger.warning("TTS skipped: %s", e)
+            return
+
+        start = time.perf_counter()
+        parts = []
+        status, error = "success", ""
+        try:
+            async with shared_http_client().stream(
+                "POST",
+                self.base_url,
+                json=self._payload(text),
+                headers={"Content-Type": "application/json"},
+                timeout=self.timeout,
+            ) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes():
+                    if not chunk:
+                        continue
+                    parts.append(chunk)
+                    yield chunk
+            breaker.record_success()
+        except (GeneratorExit, asyncio.CancelledError):
+            # The caller stopped listening; not the backend's fault
+            status, error = "failed", "stream abandoned by caller"
+            raise
+        except httpx.TimeoutException:
+            breaker.record_failure()
+            logger.warning("TTS stream timed out for text: %r", text[:50])
+            status = "timeout"
+            return
+        except Exception as e:
+            breaker.record_failure()
+            logger.error("TTS stream error: %s", e)
+            status, error = "failed", str(e)
+            return
+        finally:
+            record_ai_request(
+                "speech",
+                "text_to_speech_stream",
+                status,
+                (time.perf_counter() - start) * 1000,
+                error_message=error,
+            )
+
+        if parts:
+            await asyncio.to_thread(
+                self.cache.set, text, b"".join(parts), self.voice, self.model
+            )
+
+    def _payload(self, text: str) -> dict:
+        payload = {"text": text.strip()}
+        if self.voice:
+            payload["voice_id"] = self.voice
+        if self.model:
+            payload["model_id"] = self.model
+        return payload
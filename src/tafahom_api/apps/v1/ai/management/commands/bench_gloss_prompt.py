@@ -0,0 +1,128 @@
+import asyncio
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from tafahom_api.apps.v1.ai.clients.text_to_gloss_client import (
+    TextToGlossClient,
+    build_prompt,
+)
+
+SAMPLES = [
+    "حرائق كبيره",
+    "الإسعاف وصل",
+    "انا مبسوط جدا النهارده",
+    "في نار في البيت والشرطه جات بسرعه",
+    "مقهور جرح",
+    "ممكن تساعدني اروح المستشفى",
+    "اخويا تعبان ومحتاج دكتور",
+    "انا جعان و مش عارف اكل ايه",
+]
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return round(values[min(int(q * len(values)), len(values) - 1)], 1)
+
+
+class StubModel:
+    """
+    Local stand-in for the LLM server. Response time grows with prompt
+    length (prefill), which is the cost the filtered dictionary removes.
+    """
+
+    def __init__(self, base_ms: float, ms_per_kchar: float):
+        self.base_ms = base_ms
+        self.ms_per_kchar = ms_per_kchar
+        self.server = None
+
+    async def _handle(self, reader, writer):
+        headers = await reader.readuntil(b"\r\n\r\n")
+        length = 0
+        for line in headers.split(b"\r\n"):
+            if line.lower().startswith(b"content-length:"):
+                length = int(line.split(b":", 1)[1])
+        prompt = json.loads(await reader.readexactly(length))["prompt"]
+
+        await asyncio.sleep((self.base_ms + self.ms_per_kchar * len(prompt) / 1000) / 1000)
+
+        body = json.dumps({"gloss": "مرحبا"}).encode()
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+            b"Content-Length: %d\r\nConnection: close\r\n\r\n%s" % (len(body), body)
+        )
+        await writer.drain()
+        writer.close()
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the text-to-gloss prompt with the full sign dictionary against "
+        "the relevance-filtered one: prompt size, retrieval time and latency "
+        "against a local stub model whose latency grows with prompt length."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rounds", type=int, default=5)
+        parser.add_argument("--base-ms", type=float, default=50.0)
+        parser.add_argument(
+            "--ms-per-kchar",
+            type=float,
+            default=40.0,
+            help="Stub prefill cost per 1000 prompt characters",
+        )
+
+    def handle(self, *args, **options):
+        asyncio.run(self._run(options))
+
+    async def _measure(self, client, rounds):
+        sizes, build_ms, latencies = [], [], []
+        for _ in range(rounds):
+            for text in SAMPLES:
+                start = time.perf_counter()
+                prompt, _ = build_prompt(text)
+                build_ms.append((time.perf_counter() - start) * 1000)
+                sizes.append(len(prompt))
+
+                start = time.perf_counter()
+                await client.text_to_gloss(text)
+                latencies.append((time.perf_counter() - start) * 1000)
+        return {
+            "prompt_chars": round(sum(sizes) / len(sizes)),
+            # Arabic BPE tokenizers average roughly 2-3 characters per token
+            "prompt_tokens_est": round(sum(sizes) / len(sizes) / 2.5),
+            "build_ms": round(sum(build_ms) / len(build_ms), 3),
+            "p50_ms": _percentile(latencies, 0.5),
+            "p95_ms": _percentile(latencies, 0.95),
+        }
+
+    async def _run(self, options):
+        stub = StubModel(options["base_ms"], options["ms_per_kchar"])
+        client = TextToGlossClient()
+        client.base_url = await stub.start()
+        client.backend = None  # keep the shared circuit breaker out of the benchmark
+
+        try:
+            with override_settings(TEXT_TO_GLOSS_PROMPT_TOP_K=0):
+                full = await self._measure(client, options["rounds"])
+            filtered = await self._measure(client, options["rounds"])
+        finally:
+            await stub.stop()
+
+        self.stdout.write(f"full dictionary : {full}")
+        self.stdout.write(f"filtered (top-K): {filtered}")
+        self.stdout.write(
+            f"prompt {full['prompt_chars'] / filtered['prompt_chars']:.1f}x smaller, "
+            f"p50 {full['p50_ms'] / filtered['p50_ms']:.2f}x faster"
+        )
@@ -0,0 +1,30 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from tafahom_api.apps.v1.ai.telemetry import telemetry_user
+
+
+class TelemetryUserMiddleware:
+    """
+    Bind the request's user to the AI telemetry recorded while serving it.
+
+    The user is read when a row is recorded, not here: DRF authenticates
+    (JWT) inside the view and only then sets ``request.user``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with telemetry_user(lambda: getattr(request, "user", None)):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with telemetry_user(lambda: getattr(request, "user", None)):
+            return await self.get_response(request)
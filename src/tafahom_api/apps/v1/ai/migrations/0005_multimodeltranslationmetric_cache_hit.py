@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 23:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai', '0004_multimodeltranslationmetric'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='multimodeltranslationmetric',
+            name='cache_hit',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -127,6 +127,8 @@ class MultiModelTranslationMetric(models.Model):
     nllb_output = models.TextField(blank=True, null=True)
     nllb_latency_ms = models.PositiveIntegerField(blank=True, null=True)
     
+    cache_hit = models.BooleanField(default=False)
+    
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
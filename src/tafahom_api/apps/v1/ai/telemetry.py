@@ -0,0 +1,241 @@
+import atexit
+import contextlib
+import contextvars
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Iterator, Optional
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+logger = logging.getLogger(__name__)
+
+
+class TelemetrySink:
+    """
+    Process-wide buffered writer for AI telemetry rows.
+
+    Callers enqueue unsaved model instances (``AIRequest``,
+    ``MultiModelTranslationMetric``) without touching the database. A single
+    background thread flushes them with ``bulk_create`` every ``batch_size``
+    rows or ``flush_interval_ms``, whichever comes first. The queue is bounded:
+    when it is full new rows are dropped and counted rather than blocking the
+    caller. ``close()`` drains whatever is left on shutdown.
+    """
+
+    def __init__(
+        self,
+        max_queue: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval_ms: Optional[int] = None,
+        start_thread: bool = True,
+    ):
+        self.max_queue = max_queue or getattr(settings, "TELEMETRY_MAX_QUEUE", 10000)
+        self.batch_size = batch_size or getattr(settings, "TELEMETRY_BATCH_SIZE", 200)
+        self.flush_interval = (
+            flush_interval_ms or getattr(settings, "TELEMETRY_FLUSH_INTERVAL_MS", 1000)
+        ) / 1000.0
+        self.start_thread = start_thread
+
+        self._queue: queue.Queue = queue.Queue(maxsize=self.max_queue)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+
+        # Producers run on request threads and event loops alike
+        self._counter_lock = threading.Lock()
+        self.written = 0
+        self.dropped = 0
+
+    # --------------------------------------------------
+    # PRODUCERS
+    # --------------------------------------------------
+
+    def record(self, instance) -> bool:
+        """Enqueue an unsaved model instance. Never blocks; returns False if dropped."""
+        if self._stop.is_set():
+            self._count(dropped=1)
+            return False
+
+        try:
+            self._queue.put_nowait(instance)
+        except queue.Full:
+            self._count(dropped=1)
+            logger.warning("Telemetry queue full, dropping %s row", type(instance).__name__)
+            return False
+
+        if self.start_thread:
+            self._ensure_thread()
+        return True
+
+    # --------------------------------------------------
+    # FLUSHER
+    # --------------------------------------------------
+
+    def _ensure_thread(self):
+        if self._thread and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="telemetry-sink", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        try:
+            while not (self._stop.is_set() and self._queue.empty()):
+                batch = self._collect()
+                if batch:
+                    close_old_connections()
+                    self._write(batch)
+        finally:
+            connection.close()
+
+    def _collect(self) -> list:
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 and not self._stop.is_set():
+                break
+            try:
+                batch.append(self._queue.get(timeout=max(remaining, 0.01)))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch: list):
+        by_model = defaultdict(list)
+        for instance in batch:
+            by_model[type(instance)].append(instance)
+
+        for model, rows in by_model.items():
+            try:
+                model.objects.bulk_create(rows, batch_size=self.batch_size)
+                self._count(written=len(rows))
+            except Exception as e:
+                self._count(dropped=len(rows))
+                logger.error("Failed to write %d %s rows: %s", len(rows), model.__name__, e)
+
+    def _count(self, written: int = 0, dropped: int = 0):
+        with self._counter_lock:
+            self.written += written
+            self.dropped += dropped
+
+    def flush(self):
+        """Synchronously write everything currently queued (caller's thread)."""
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._write(batch)
+
+    def close(self, timeout: float = 5.0):
+        """Stop accepting rows and drain the queue."""
+        self._stop.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+        else:
+            self.flush()
+
+    def stats(self) -> dict:
+        with self._counter_lock:
+            return {
+                "queued": self._queue.qsize(),
+                "written": self.written,
+                "dropped": self.dropped,
+            }
+
+
+_sink: Optional[TelemetrySink] = None
+_sink_lock = threading.Lock()
+
+
+def get_telemetry_sink() -> TelemetrySink:
+    global _sink
+    if _sink is None:
+        with _sink_lock:
+            if _sink is None:
+                _sink = TelemetrySink()
+                atexit.register(_sink.close)
+    return _sink
+
+
+def shutdown_telemetry_sink():
+    """Drain the sink; called from the ASGI lifespan shutdown event."""
+    if _sink is not None:
+        _sink.close()
+
+
+# --------------------------------------------------
+# REQUEST USER
+# --------------------------------------------------
+
+# The AI clients are called deep inside services that never see the request;
+# the user their rows belong to is bound once per HTTP request / WebSocket.
+_current_user: contextvars.ContextVar[Any] = contextvars.ContextVar(
+    "telemetry_user", default=None
+)
+
+
+@contextlib.contextmanager
+def telemetry_user(user) -> Iterator[None]:
+    """
+    Attribute the AI requests recorded in the enclosed code to ``user``.
+
+    ``user`` may also be a zero-argument callable, resolved when a row is
+    recorded: HTTP requests are only authenticated by DRF inside the view.
+    """
+    token = _current_user.set(user)
+    try:
+        yield
+    finally:
+        _current_user.reset(token)
+
+
+def current_telemetry_user():
+    user = _current_user.get()
+    if callable(user):
+        try:
+            user = user()
+        except Exception:
+            return None
+    return user
+
+
+def record_ai_request(
+    service: str,
+    endpoint: str,
+    status: str,
+    latency_ms: float,
+    user=None,
+    error_message: str = "",
+):
+    """
+    Enqueue an ``AIRequest`` row. ``status`` is success / failed / timeout.
+    Without an explicit ``user`` the row goes to the one bound by
+    ``telemetry_user``, if any.
+    """
+    from tafahom_api.apps.v1.ai.models import AIRequest
+
+    if user is None:
+        user = current_telemetry_user()
+
+    get_telemetry_sink().record(
+        AIRequest(
+            user=user if getattr(user, "is_authenticated", False) else None,
+            service=service,
+            endpoint=endpoint[:100],
+            status=status,
+            latency_ms=max(int(latency_ms), 0),
+            error_message=error_message,
+        )
+    )
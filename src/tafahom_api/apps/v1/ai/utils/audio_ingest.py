@@ -0,0 +1,72 @@
+import os
+from dataclasses import dataclass
+
+from .transcode import (
+    STT_CHANNELS,
+    STT_SAMPLE_RATE,
+    STT_SAMPLE_WIDTH,
+    transcode_to_stt_wav,
+    wav_header,
+    wav_pcm,
+)
+
+WAV_HEADER_SIZE = 44
+
+
+@dataclass(frozen=True)
+class IngestedAudio:
+    """
+    Voice input decoded once into the STT target format (PCM16 mono 16 kHz
+    WAV), always with the canonical 44-byte header in front of the samples.
+    """
+
+    wav: bytes
+    transcoded: bool
+
+    @property
+    def pcm(self) -> bytes:
+        return self.wav[WAV_HEADER_SIZE:]
+
+    @classmethod
+    def from_pcm(cls, pcm: bytes) -> "IngestedAudio":
+        return cls(wav=wav_header(len(pcm)) + pcm, transcoded=False)
+
+    @property
+    def duration_seconds(self) -> float:
+        pcm = max(len(self.wav) - WAV_HEADER_SIZE, 0)
+        return pcm / (STT_SAMPLE_RATE * STT_CHANNELS * STT_SAMPLE_WIDTH)
+
+
+async def ingest_audio(upload) -> IngestedAudio:
+    """
+    The single decode step for every voice entry point.
+
+    ``upload`` may be raw bytes, a file path, a Django upload or any
+    file-like object. Paths and uploads Django already spooled to disk are
+    decoded in place; everything else is read once and piped through
+    ffmpeg. Input that is already in the target format is passed through
+    untouched, only re-wrapped in the canonical header when it carries
+    other chunks (``LIST``, ``fact``, ...). The result is handed straight to
+    ``SpeechToTextClient.speech_to_text``, which then skips decoding.
+    """
+    if isinstance(upload, IngestedAudio):
+        return upload
+
+    if isinstance(upload, (bytes, bytearray)):
+        source = bytes(upload)
+    elif hasattr(upload, "temporary_file_path"):
+        source = upload.temporary_file_path()
+    elif isinstance(upload, (str, os.PathLike)):
+        source = os.fspath(upload)
+    else:
+        source = upload.read()
+
+    wav = await transcode_to_stt_wav(source)
+    if wav is not source:
+        return IngestedAudio(wav=wav, transcoded=True)
+
+    # Passed through: ``pcm`` and the duration rely on samples starting at byte 44
+    pcm = wav_pcm(wav)
+    if wav[36:40] == b"data" and len(wav) == WAV_HEADER_SIZE + len(pcm):
+        return IngestedAudio(wav=wav, transcoded=False)
+    return IngestedAudio.from_pcm(pcm)
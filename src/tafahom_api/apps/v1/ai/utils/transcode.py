@@ -0,0 +1,238 @@
+import asyncio
+import contextlib
+import logging
+import struct
+import threading
+import time
+import weakref
+from typing import Optional, Union
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+STT_SAMPLE_RATE = 16000
+STT_CHANNELS = 1
+STT_SAMPLE_WIDTH = 2  # bytes, PCM16
+
+
+class TranscodeError(RuntimeError):
+    """ffmpeg could not decode the input into the STT target format."""
+
+
+# --------------------------------------------------
+# WAV HEADER
+# --------------------------------------------------
+
+
+def is_stt_wav(data: bytes) -> bool:
+    """
+    True if ``data`` is a RIFF/WAVE file that is already PCM16, mono, 16 kHz.
+
+    Only the chunk headers are inspected, so this is cheap enough to run on
+    every request before deciding whether ffmpeg is needed at all.
+    """
+    if len(data) < 12 or data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        return False
+
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk_id = data[offset : offset + 4]
+        (chunk_size,) = struct.unpack_from("<I", data, offset + 4)
+        if chunk_id == b"fmt ":
+            if chunk_size < 16 or offset + 24 > len(data):
+                return False
+            audio_format, channels, sample_rate, _, _, bits = struct.unpack_from(
+                "<HHIIHH", data, offset + 8
+            )
+            return (
+                audio_format == 1
+                and channels == STT_CHANNELS
+                and sample_rate == STT_SAMPLE_RATE
+                and bits == STT_SAMPLE_WIDTH * 8
+            )
+        # Chunks are word-aligned
+        offset += 8 + chunk_size + (chunk_size & 1)
+    return False
+
+
+def wav_pcm(data: bytes) -> bytes:
+    """
+    Samples of the ``data`` chunk of a RIFF/WAVE file, wherever it sits
+    after ``fmt``, ``LIST``, ``fact`` or other chunks. A size running past
+    the end of the file (streamed or truncated WAVs) is clamped to it.
+    """
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk_id = data[offset : offset + 4]
+        (chunk_size,) = struct.unpack_from("<I", data, offset + 4)
+        if chunk_id == b"data":
+            return data[offset + 8 : offset + 8 + chunk_size]
+        offset += 8 + chunk_size + (chunk_size & 1)
+    return b""
+
+
+def wav_header(pcm_size: int) -> bytes:
+    """44-byte canonical header for ``pcm_size`` bytes of PCM16 mono 16 kHz."""
+    byte_rate = STT_SAMPLE_RATE * STT_CHANNELS * STT_SAMPLE_WIDTH
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + pcm_size,
+        b"WAVE",
+        b"fmt ",
+        16,
+        1,
+        STT_CHANNELS,
+        STT_SAMPLE_RATE,
+        byte_rate,
+        STT_CHANNELS * STT_SAMPLE_WIDTH,
+        STT_SAMPLE_WIDTH * 8,
+        b"data",
+        pcm_size,
+    )
+
+
+# --------------------------------------------------
+# CONCURRENCY LIMIT
+# --------------------------------------------------
+
+
+class ProcessLimiter:
+    """
+    Process-wide cap on concurrently running ffmpeg processes.
+
+    An ``asyncio.Semaphore`` per event loop. Under the ASGI server every
+    request runs on its single loop (sync views' ``async_to_sync`` calls are
+    scheduled onto it too), so that one semaphore is the process-wide cap;
+    code with an event loop of its own (management commands, tests) gets
+    its own semaphore, as a semaphore cannot be shared between loops.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+        self._active = 0
+        self.waited = 0
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._semaphores[loop] = asyncio.Semaphore(self.limit)
+            return semaphore
+
+    async def acquire(self) -> float:
+        """Wait for a slot; returns how long the caller queued, in ms."""
+        semaphore = self._semaphore()
+        start = time.perf_counter()
+        if semaphore.locked():
+            self.waited += 1
+        await semaphore.acquire()
+        with self._lock:
+            self._active += 1
+        return (time.perf_counter() - start) * 1000
+
+    def release(self):
+        with self._lock:
+            self._active = max(self._active - 1, 0)
+        self._semaphore().release()
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+
+_limiter: Optional[ProcessLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_ffmpeg_limiter() -> ProcessLimiter:
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = ProcessLimiter(
+                    getattr(settings, "STT_FFMPEG_MAX_CONCURRENCY", 4)
+                )
+    return _limiter
+
+
+# --------------------------------------------------
+# TRANSCODING
+# --------------------------------------------------
+
+
+async def transcode_to_stt_wav(
+    source: Union[bytes, str], timeout: Optional[float] = None
+) -> bytes:
+    """
+    Decode ``source`` to PCM16 mono 16 kHz WAV bytes.
+
+    ``source`` is either the raw audio bytes, which are piped through ffmpeg's
+    stdin, or a path to a file that is already on disk (e.g. a large Django
+    upload), which ffmpeg reads directly. ffmpeg writes raw PCM to stdout and
+    the WAV header is added here, so nothing touches the filesystem. Input
+    that is already in the target format is returned unchanged.
+    """
+    if isinstance(source, bytes) and is_stt_wav(source):
+        return source
+
+    timeout = timeout or getattr(settings, "STT_FFMPEG_TIMEOUT", 30)
+    from_pipe = isinstance(source, bytes)
+    cmd = [
+        "ffmpeg",
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-i",
+        "pipe:0" if from_pipe else source,
+        "-vn",
+        "-ac",
+        str(STT_CHANNELS),
+        "-ar",
+        str(STT_SAMPLE_RATE),
+        "-f",
+        "s16le",
+        "pipe:1",
+    ]
+
+    limiter = get_ffmpeg_limiter()
+    queued_ms = await limiter.acquire()
+    try:
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.PIPE if from_pipe else asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except FileNotFoundError as e:
+            raise TranscodeError("ffmpeg is not installed") from e
+
+        try:
+            pcm, err = await asyncio.wait_for(
+                proc.communicate(source if from_pipe else None), timeout=timeout
+            )
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            # ffmpeg may have exited on its own meanwhile; keep the original error
+            with contextlib.suppress(ProcessLookupError):
+                proc.kill()
+            await proc.wait()
+            raise
+    finally:
+        limiter.release()
+
+    if proc.returncode != 0 or not pcm:
+        message = err.decode("utf-8", "replace").strip()[-300:]
+        raise TranscodeError(f"ffmpeg exited with {proc.returncode}: {message}")
+
+    logger.debug(
+        "audio_transcoded",
+        extra={"queued_ms": round(queued_ms, 1), "pcm_bytes": len(pcm)},
+    )
+    return wav_header(len(pcm)) + pcm
@@ -12,6 +12,8 @@ from channels.db import database_sync_to_async
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 
+from tafahom_api.apps.v1.ai.telemetry import telemetry_user
+
 # Set up logging to track connection rejections
 logger = logging.getLogger(__name__)
 User = get_user_model()
@@ -92,7 +94,9 @@ class JWTAuthMiddleware(BaseMiddleware):
                 logger.warning(f"WebSocket JWT Validation Failed: {e}")
                 scope["user"] = cast(Any, AnonymousUser())
 
-        return await super().__call__(scope, receive, send)
+        # AI telemetry recorded by the consumer belongs to this user
+        with telemetry_user(lambda: scope.get("user")):
+            return await super().__call__(scope, receive, send)
 
 
 def JWTAuthMiddlewareStack(inner):
@@ -4,4 +4,5 @@ from . import views
 urlpatterns = [
     path("health/", views.health_check, name="health_check"),
     path("ready/", views.readiness_check, name="readiness_check"),
+    path("diagnostics/", views.diagnostics, name="diagnostics"),
 ]
\ No newline at end of file
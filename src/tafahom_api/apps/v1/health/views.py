@@ -3,9 +3,15 @@ from django.conf import settings
 from django.core.cache import caches
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework.response import Response
 
+from tafahom_api.apps.v1.ai.clients.audio_cache import get_tts_audio_cache
+from tafahom_api.apps.v1.ai.clients.circuit_breaker import breaker_states
+from tafahom_api.apps.v1.ai.clients.hedging import get_hedging_scheduler
+from tafahom_api.apps.v1.ai.telemetry import get_telemetry_sink
+from tafahom_api.apps.v1.translation.services.matcher_pool import get_sign_matcher
+
 
 @api_view(["GET"])
 @permission_classes([AllowAny])
@@ -34,6 +40,22 @@ def readiness_check(request):
     )
 
 
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def diagnostics(request):
+    """Process-local AI backend stats, for staff only."""
+    return Response(
+        {
+            "environment": settings.ENVIRONMENT,
+            "nlp_dispatch": get_hedging_scheduler().stats(),
+            "telemetry": get_telemetry_sink().stats(),
+            "circuit_breakers": breaker_states(),
+            "tts_audio_cache": get_tts_audio_cache().stats(),
+            "sign_matcher": get_sign_matcher().stats(),
+        }
+    )
+
+
 def check_database():
     try:
         with db.connection.cursor() as cursor:
@@ -52,6 +52,17 @@ class TranslationKeyAdmin(admin.ModelAdmin):
         # FIX: Correct method name is clear_translation_cache
         TranslationKeyService.clear_translation_cache(obj.key)
 
+    def delete_model(self, request, obj):
+        """Clear cache when deleting"""
+        super().delete_model(request, obj)
+        TranslationKeyService.clear_translation_cache(obj.key)
+
+    def delete_queryset(self, request, queryset):
+        keys = list(queryset.values_list("key", flat=True))
+        super().delete_queryset(request, queryset)
+        for key in keys:
+            TranslationKeyService.clear_translation_cache(key)
+
     actions = ["export_as_json", "clear_cache_action"]
 
     def export_as_json(self, request, queryset):
@@ -1,16 +1,54 @@
-from typing import List, Dict
+import json
+from typing import Callable, Dict, List, Optional, Tuple
 from django.core.cache import cache
 from django.conf import settings
 
 from tafahom_api.apps.v1.localization.models import TranslationKey
+from tafahom_api.common.cache import CacheNamespace, pack, stable_hash, unpack
+from tafahom_api.common.singleflight import SingleFlight
 
 
 class TranslationKeyService:
     CACHE_TIMEOUT = 60 * 60 * 24  # 24 hours
 
+    BUNDLE_TIMEOUT = 60 * 60 * 24  # 24 hours
+
+    # Concurrent misses for the same keys share one database query
+    _flight = SingleFlight("localization")
+
+    # In-process copies of the language bundles: (language, fallback) → bundle
+    _bundles: Dict[Tuple[str, str], dict] = {}
+
+    @staticmethod
+    def _namespace() -> CacheNamespace:
+        return CacheNamespace(
+            "localization:translation",
+            getattr(settings, "LOCALIZATION_CACHE_VERSION", "v1"),
+        )
+
+    @staticmethod
+    def _cache_key(key: str, language: str, generation: Optional[int] = None) -> str:
+        return TranslationKeyService._namespace().key(key, language, generation=generation)
+
+    @staticmethod
+    def _stored_cache_key(key: str, language: str, generation: Optional[int] = None) -> str:
+        return TranslationKeyService._namespace().key(key, language, "stored", generation=generation)
+
+    @staticmethod
+    def _bundle_namespace() -> CacheNamespace:
+        return CacheNamespace(
+            "localization:bundle",
+            getattr(settings, "LOCALIZATION_CACHE_VERSION", "v1"),
+        )
+
     @staticmethod
-    def _cache_key(key: str, language: str) -> str:
-        return f"localization:translation:{key}:{language}"
+    def _resolve_text(obj: TranslationKey, language: str, fallback: str) -> str:
+        text = obj.text_ar if language == "ar" else obj.text_en
+
+        if not text and fallback != language:
+            text = obj.text_ar if fallback == "ar" else obj.text_en
+
+        return text or obj.key
 
     @staticmethod
     def get_translation(
@@ -22,26 +60,73 @@ class TranslationKeyService:
         key = key.lower()
         cache_key = TranslationKeyService._cache_key(key, language)
 
-        cached_value = cache.get(cache_key)
+        cached_value = unpack(cache.get(cache_key))
         if cached_value is not None:
             return cached_value
 
-        try:
-            obj = TranslationKey.objects.get(key=key)
+        def compute():
+            try:
+                obj = TranslationKey.objects.get(key=key)
+            except TranslationKey.DoesNotExist:
+                return key
 
-            text = obj.text_ar if language == "ar" else obj.text_en
+            text = TranslationKeyService._resolve_text(obj, language, fallback)
+            cache.set(cache_key, pack(text), TranslationKeyService.CACHE_TIMEOUT)
+            return text
 
-            if not text and fallback != language:
-                text = obj.text_ar if fallback == "ar" else obj.text_en
+        return TranslationKeyService._flight.do(
+            cache_key, lambda: unpack(cache.get(cache_key)), compute
+        )
 
-            if not text:
-                text = key
+    @staticmethod
+    def _get_many_cached(
+        cache_keys: Dict[str, str],
+        language: str,
+        fetch: Callable[[List[str]], Dict[str, str]],
+    ) -> Dict[str, str]:
+        """
+        ``cache_keys`` (translation key → cache key) in one ``get_many``;
+        misses are filled by one ``fetch`` of the missing keys, shared by
+        concurrent callers, and cached with one ``set_many``. Keys ``fetch``
+        does not return come back as themselves and are not cached.
+        """
+        cached = cache.get_many(list(cache_keys.values()))
+        translations: Dict[str, str] = {}
+        missing_cache_keys: Dict[str, str] = {}
 
-            cache.set(cache_key, text, TranslationKeyService.CACHE_TIMEOUT)
-            return text
+        for key, cache_key in cache_keys.items():
+            if cache_key in cached:
+                translations[key] = unpack(cached[cache_key])
+            else:
+                missing_cache_keys[key] = cache_key
+
+        if missing_cache_keys:
+            missing_keys = list(missing_cache_keys)
+
+            def load():
+                found = cache.get_many(list(missing_cache_keys.values()))
+                if len(found) < len(missing_cache_keys):
+                    return None
+                return {
+                    key: unpack(found[cache_key])
+                    for key, cache_key in missing_cache_keys.items()
+                }
+
+            def compute():
+                filled = fetch(missing_keys)
+                cache.set_many(
+                    {missing_cache_keys[key]: pack(text) for key, text in filled.items()},
+                    TranslationKeyService.CACHE_TIMEOUT,
+                )
 
-        except TranslationKey.DoesNotExist:
-            return key
+                for key in missing_keys:
+                    filled.setdefault(key, key)
+                return filled
+
+            flight_key = stable_hash("\x1f".join([language, *sorted(missing_cache_keys.values())]))
+            translations.update(TranslationKeyService._flight.do(flight_key, load, compute))
+
+        return translations
 
     @staticmethod
     def get_bulk_translations(
@@ -49,81 +134,114 @@ class TranslationKeyService:
         language: str = "en",
         fallback: str = "en",
     ) -> Dict[str, str]:
+        """
+        Translations of lower-cased ``keys``, as ``get_translation`` resolves
+        them: empty text falls back to ``fallback``, then to the key.
+        """
 
         keys = [key.lower() for key in keys]
 
-        translations: Dict[str, str] = {}
-        missing_keys: List[str] = []
-
-        for key in keys:
-            cache_key = TranslationKeyService._cache_key(key, language)
-            cached_value = cache.get(cache_key)
-
-            if cached_value is not None:
-                translations[key] = cached_value
-            else:
-                missing_keys.append(key)
+        generation = TranslationKeyService._namespace().generation()
+        cache_keys = {
+            key: TranslationKeyService._cache_key(key, language, generation)
+            for key in keys
+        }
 
-        if missing_keys:
-            queryset = TranslationKey.objects.filter(key__in=missing_keys)
-            found_keys = set()
+        def fetch(missing_keys: List[str]) -> Dict[str, str]:
+            return {
+                obj.key: TranslationKeyService._resolve_text(obj, language, fallback)
+                for obj in TranslationKey.objects.filter(key__in=missing_keys)
+            }
 
-            for obj in queryset:
-                text = obj.text_ar if language == "ar" else obj.text_en
+        return TranslationKeyService._get_many_cached(cache_keys, language, fetch)
 
-                if not text and fallback != language:
-                    text = obj.text_ar if fallback == "ar" else obj.text_en
+    @staticmethod
+    def get_stored_translations(keys: List[str], language: str = "en") -> Dict[str, str]:
+        """
+        Text stored for each key, matched exactly (keys created in the admin
+        may be mixed-case) and without fallback, so an empty translation is
+        returned empty. Missing keys map to themselves.
+        """
+        generation = TranslationKeyService._namespace().generation()
+        cache_keys = {
+            key: TranslationKeyService._stored_cache_key(key, language, generation)
+            for key in keys
+        }
 
-                if not text:
-                    text = obj.key
+        def fetch(missing_keys: List[str]) -> Dict[str, str]:
+            return {
+                obj.key: obj.text_ar if language == "ar" else obj.text_en
+                for obj in TranslationKey.objects.filter(key__in=missing_keys)
+            }
 
-                translations[obj.key] = text
-                found_keys.add(obj.key)
+        return TranslationKeyService._get_many_cached(cache_keys, language, fetch)
 
-                cache.set(
-                    TranslationKeyService._cache_key(obj.key, language),
-                    text,
-                    TranslationKeyService.CACHE_TIMEOUT,
-                )
+    @staticmethod
+    def get_bundle(language: str = "en", fallback: str = "en") -> dict:
+        """
+        Every translation of one language, with a content-hash ETag.
 
-            for key in missing_keys:
-                if key not in found_keys:
-                    translations[key] = key
+        The bundle version lives in the cache; each call reads it once and
+        serves the in-process copy while it matches. Otherwise the bundle
+        comes from the shared cache, or is built from the database by one
+        caller at a time.
+        """
+        namespace = TranslationKeyService._bundle_namespace()
+        version = namespace.generation()
+
+        local = TranslationKeyService._bundles.get((language, fallback))
+        if local is not None and local["version"] == version:
+            return local
+
+        cache_key = namespace.key(language, fallback, generation=version)
+
+        def load():
+            return unpack(cache.get(cache_key))
+
+        def compute():
+            translations = {
+                obj.key: TranslationKeyService._resolve_text(obj, language, fallback)
+                for obj in TranslationKey.objects.only("key", "text_en", "text_ar")
+            }
+            content = json.dumps(translations, sort_keys=True, ensure_ascii=False)
+            bundle = {
+                "language": language,
+                "version": version,
+                "etag": stable_hash(content),
+                "translations": translations,
+            }
+            cache.set(cache_key, pack(bundle), TranslationKeyService.BUNDLE_TIMEOUT)
+            return bundle
+
+        bundle = load() or TranslationKeyService._flight.do(cache_key, load, compute)
+        TranslationKeyService._bundles[(language, fallback)] = bundle
+        return bundle
 
-        return translations
+    @staticmethod
+    def invalidate_bundles():
+        """Make every worker rebuild its language bundles on the next request."""
+        TranslationKeyService._bundle_namespace().bump()
 
     @staticmethod
     def clear_translation_cache(key: str):
-        key = key.lower()
         # Fallback if settings.LANGUAGES is not defined, prevents crash
         languages = getattr(
             settings, "LANGUAGES", [("en", "English"), ("ar", "Arabic")]
         )
 
+        generation = TranslationKeyService._namespace().generation()
+        cache_keys = []
         for lang_code, _ in languages:
-            cache.delete(TranslationKeyService._cache_key(key, lang_code))
+            cache_keys.append(TranslationKeyService._cache_key(key.lower(), lang_code, generation))
+            cache_keys.append(TranslationKeyService._stored_cache_key(key, lang_code, generation))
+        cache.delete_many(cache_keys)
+        TranslationKeyService.invalidate_bundles()
 
     @staticmethod
     def clear_all_translation_cache():
         """
-        Safely clears translation cache.
-        Tries to use wildcard deletion if supported (Redis),
-        otherwise iterates through database keys to avoid wiping the entire cache.
+        Invalidate every cached translation in O(1) by bumping the namespace
+        generation; works the same on Redis, Memcached and LocMemCache.
         """
-        # 1. Fast path: Wildcard deletion (Works with django-redis)
-        if hasattr(cache, "delete_pattern"):
-            # Matches pattern: localization:translation:*
-            # This is O(1) or optimized scan depending on backend
-            try:
-                cache.delete_pattern("localization:translation:*")
-                return
-            except NotImplementedError:
-                pass  # Fallback to manual deletion
-
-        # 2. Universal fallback: Database iteration
-        # Safe for Memcached or LocMemCache where wildcards aren't supported.
-        # We only fetch the key strings to keep memory usage low.
-        keys = TranslationKey.objects.values_list("key", flat=True)
-
-        for key in keys:
-            TranslationKeyService.clear_translation_cache(key)
+        TranslationKeyService._namespace().bump()
+        TranslationKeyService.invalidate_bundles()
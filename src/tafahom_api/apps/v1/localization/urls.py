@@ -4,6 +4,7 @@ from .views import (
     SetLanguageView,
     CurrentLanguageView,
     BulkTranslationKeyView,
+    TranslationBundleView,
     TranslationKeyListView,
     TranslationKeyDetailView,
 )
@@ -14,6 +15,11 @@ urlpatterns = [
     path("set-language/", SetLanguageView.as_view(), name="set-language"),
     path("current-language/", CurrentLanguageView.as_view(), name="current-language"),
     path("translations/bulk/", BulkTranslationKeyView.as_view(), name="bulk"),
+    path(
+        "translations/bundle/<str:language>/",
+        TranslationBundleView.as_view(),
+        name="bundle",
+    ),
     # Admin
     path("keys/", TranslationKeyListView.as_view(), name="keys"),
     path("keys/<int:pk>/", TranslationKeyDetailView.as_view(), name="key-detail"),
@@ -4,6 +4,7 @@ from rest_framework.permissions import AllowAny, IsAdminUser
 
 from django.db import models
 from django.utils import translation
+from django.utils.http import parse_etags, quote_etag
 from django.conf import settings
 
 from .models import TranslationKey
@@ -105,6 +106,12 @@ class BulkTranslationKeyView(generics.GenericAPIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        if not all(isinstance(key, str) for key in keys):
+            return Response(
+                {"detail": "Keys must be strings."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
         if len(keys) > 100:
             return Response(
                 {"detail": "Too many keys requested."},
@@ -112,22 +119,10 @@ class BulkTranslationKeyView(generics.GenericAPIView):
             )
 
         # -------------------------------------------------
-        # ✅ FETCH TRANSLATIONS
+        # ✅ FETCH TRANSLATIONS (missing key → the key itself)
         # -------------------------------------------------
 
-        translations = {}
-        found_keys = {
-            obj.key: obj for obj in TranslationKey.objects.filter(key__in=keys)
-        }
-
-        for key in keys:
-            obj = found_keys.get(key)
-
-            if not obj:
-                # ✅ REQUIRED: missing key → return key itself
-                translations[key] = key
-            else:
-                translations[key] = obj.text_ar if language == "ar" else obj.text_en
+        translations = TranslationKeyService.get_stored_translations(keys, language)
 
         return Response(
             {"translations": translations},
@@ -135,6 +130,47 @@ class BulkTranslationKeyView(generics.GenericAPIView):
         )
 
 
+class TranslationBundleView(generics.GenericAPIView):
+    """
+    Every translation of one language in a single response.
+
+    GET /localization/translations/bundle/<language>/
+
+    Clients send back the ETag in ``If-None-Match`` and get an empty 304
+    while no translation has changed.
+    """
+
+    permission_classes = [AllowAny]
+
+    def get(self, request, language):
+        supported = [lang["code"] for lang in LanguageService.get()["languages"]]
+        if language not in supported:
+            return Response(
+                {"detail": "Unsupported language."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        bundle = TranslationKeyService.get_bundle(language)
+        etag = quote_etag(bundle["etag"])
+
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(
+                {
+                    "language": bundle["language"],
+                    "version": bundle["version"],
+                    "translations": bundle["translations"],
+                },
+                status=status.HTTP_200_OK,
+            )
+
+        response["ETag"] = etag
+        # Cacheable, but always revalidated (cheap thanks to the ETag)
+        response["Cache-Control"] = "no-cache"
+        return response
+
+
 # ---------------- ADMIN KEYS ----------------
 
 
@@ -168,4 +204,5 @@ class TranslationKeyDetailView(generics.RetrieveUpdateAPIView):
 
     def perform_update(self, serializer):
         instance = serializer.save()
+        # Also bumps the bundle version, so every worker drops its copy
         TranslationKeyService.clear_translation_cache(instance.key)
@@ -1,10 +1,17 @@
+import asyncio
 import json
+import logging
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from .models import Meeting, Participant
+from .ice import IceBatcher
+from .presence import get_presence_store, load_meeting_meta, role_for
+from .registry import get_channel_registry
+from .vad import UtteranceSegmenter
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
 
 
 class MeetingConsumer(AsyncWebsocketConsumer):
@@ -13,12 +20,39 @@ class MeetingConsumer(AsyncWebsocketConsumer):
     - Allows all plans (free/GO)
     - Consumes 10 tokens on join
     - Supports WebRTC, chat, text-to-sign, speech-to-text
+
+    Binary audio is run through a per-participant VAD: speaking indicators
+    come from the VAD and only finished utterances are sent to STT. Clients
+    that send raw PCM16 mono 16 kHz announce it with
+    ``{"type": "audio_config", "format": "pcm16"}``; anything else is
+    decoded first.
+
+    Signaling (offer / answer / ice_candidate) that names a ``target`` is sent
+    to that participant's channel only, looked up in the channel registry;
+    the meeting group is reserved for real broadcasts (chat, join / leave,
+    speaking indicators, results). ICE candidates are coalesced per target
+    over a short window and cross the channel layer as one batch; clients
+    that announce ``{"type": "capabilities", "ice_batching": true}`` receive
+    it as a single ``ice_candidates`` message, older clients still get one
+    ``ice_candidate`` message per candidate. That client flag only chooses
+    the delivery format; coalescing itself is switched by
+    ``MEETING_ICE_BATCHING_ENABLED``.
+
+    Joining costs one DB round trip (tokens; meeting metadata is cached) and
+    one Redis round trip (presence, registry and group in parallel). The
+    participant list is the live roster from the presence store, kept fresh
+    by a heartbeat.
     """
 
+    SIGNALING_TYPES = ("offer", "answer")
+
     async def connect(self):
-        import logging
-        logger = logging.getLogger(__name__)
-        
+        self.audio_format = "encoded"
+        self.segmenter = UtteranceSegmenter()
+        self._stt_tasks = set()
+        self.ice_batching = False
+        self.ice_batcher = IceBatcher(self._send_ice_batch)
+
         self.user = self.scope["user"]
         logger.info(f"WebSocket connect attempt - user: {self.user}, anonymous: {self.user.is_anonymous}")
 
@@ -28,45 +62,49 @@ class MeetingConsumer(AsyncWebsocketConsumer):
             await self.close(code=4001)
             return
 
-        # Check plan and tokens (allow free plan, 10 tokens per meeting)
-        allowed, message = await self._check_access()
-        logger.info(f"Access check - allowed: {allowed}, message: {message}")
-        if not allowed:
-            await self.accept()
-            await self.send(text_data=json.dumps({"type": "error", "message": message}))
-            await self.close(code=4003)
-            return
-
-        # Consume tokens (10 tokens per meeting for all plans)
-        consumed = await self._consume_tokens()
-        logger.info(f"Token consumption - consumed: {consumed}")
-        if not consumed:
-            await self.close(code=4003)
-            return
-
-        # Join meeting room group
         self.meeting_code = self.scope["url_route"]["kwargs"]["code"]
         self.room_group_name = f"meeting_{self.meeting_code}"
-        logger.info(f"Joining room: {self.room_group_name}")
 
-        # Verify meeting exists and is active
-        meeting = await self._get_meeting(self.meeting_code)
-        if not meeting or not meeting.is_active:
-            logger.warning(f"Meeting not found or inactive: {self.meeting_code}")
-            await self.close(code=4004)
+        # One DB hop: tokens + cached meeting metadata (10 tokens per meeting)
+        meta, close_code, message = await self._admit(self.meeting_code)
+        logger.info(f"Admission - code: {close_code}, message: {message}")
+        if close_code is not None:
+            if message:
+                await self.accept()
+                await self.send(text_data=json.dumps({"type": "error", "message": message}))
+            await self.close(code=close_code)
             return
 
-        await self.channel_layer.group_add(self.room_group_name, self.channel_name)
+        role = role_for(meta, self.user.username)
+        store = get_presence_store()
+
+        # One Redis round trip: group, channel registry and presence in parallel
+        _, _, online = await asyncio.gather(
+            self.channel_layer.group_add(self.room_group_name, self.channel_name),
+            get_channel_registry().register(
+                self.meeting_code, self.user.username, self.channel_name
+            ),
+            store.join(self.meeting_code, self.user.username, role),
+        )
+        self.presence_joined = True
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
         await self.accept()
         logger.info(f"WebSocket connected successfully to {self.room_group_name}")
 
-        # Send existing participants to the new user
-        existing_participants = await self._get_participants(meeting)
+        # Send online participants to the new user
+        known = meta.get("participants", {})
         await self.send(text_data=json.dumps({
             "type": "connection_established",
             "message": f"Welcome to meeting {self.meeting_code}. 10 tokens deducted.",
             "user": self.user.username,
-            "participants": existing_participants
+            "participants": [
+                {
+                    "id": known.get(member["username"], {}).get("id"),
+                    "user__username": member["username"],
+                    "role": member["role"],
+                }
+                for member in online
+            ],
         }))
 
         # Notify others that user joined
@@ -77,14 +115,39 @@ class MeetingConsumer(AsyncWebsocketConsumer):
                 "message": {
                     "type": "user_joined",
                     "user": self.user.username,
-                    "role": await self._get_user_role(self.user, meeting),
+                    "role": role,
                 }
             }
         )
 
     async def disconnect(self, close_code):
-        # Notify others that user left
-        if hasattr(self, 'room_group_name') and hasattr(self, 'user'):
+        # Only a participant who got past admission is in the group and registry
+        joined = getattr(self, "presence_joined", False)
+
+        if hasattr(self, "segmenter"):
+            logger.info(
+                "meeting_audio",
+                extra={
+                    "frames_seen": self.segmenter.frames_seen,
+                    "stt_saved_ratio": self.segmenter.stt_saved_ratio,
+                },
+            )
+            if self.segmenter.speaking and joined:
+                # Hanging up mid-sentence still transcribes the last utterance
+                event = self.segmenter.flush()
+                await self._broadcast({"type": "speaking_stop", "user": self.user.username})
+                if event.utterance:
+                    self._start_transcription(event.utterance)
+            await self._drain_stt()
+
+        if hasattr(self, "ice_batcher"):
+            await self.ice_batcher.close()
+
+        if joined:
+            self._heartbeat_task.cancel()
+            await get_presence_store().leave(self.meeting_code, self.user.username)
+
+            # Notify others that user left
             await self.channel_layer.group_send(
                 self.room_group_name,
                 {
@@ -96,6 +159,9 @@ class MeetingConsumer(AsyncWebsocketConsumer):
                 }
             )
             await self.channel_layer.group_discard(self.room_group_name, self.channel_name)
+            await get_channel_registry().unregister(
+                self.meeting_code, self.user.username, self.channel_name
+            )
 
     async def receive(self, text_data=None, bytes_data=None):
         if text_data:
@@ -103,20 +169,33 @@ class MeetingConsumer(AsyncWebsocketConsumer):
             message_type = data.get("type")
 
             # === WEBRTC SIGNALING ===
-            if message_type in ["offer", "answer", "ice_candidate"]:
-                await self.channel_layer.group_send(
-                    self.room_group_name,
+            if message_type in self.SIGNALING_TYPES:
+                # Candidates already queued for this peer must not be overtaken
+                await self.ice_batcher.flush_target(data.get("target"))
+                await self._send_signaling(
                     {
-                        "type": "broadcast_message",
-                        "message": {
-                            "type": message_type,
-                            "data": data.get("data"),
-                            "user": self.user.username,
-                            "target": data.get("target")
-                        }
+                        "type": message_type,
+                        "data": data.get("data"),
+                        "user": self.user.username,
+                        "target": data.get("target")
                     }
                 )
 
+            elif message_type == "ice_candidate":
+                await self.ice_batcher.add(data.get("target"), data.get("data"))
+
+            elif message_type == "ice_candidates":
+                for candidate in data.get("candidates") or []:
+                    await self.ice_batcher.add(data.get("target"), candidate)
+
+            # === CLIENT CAPABILITIES ===
+            elif message_type == "capabilities":
+                self.ice_batching = bool(data.get("ice_batching"))
+
+            # === AUDIO CAPABILITIES ===
+            elif message_type == "audio_config":
+                self.audio_format = "pcm16" if data.get("format") == "pcm16" else "encoded"
+
             # === CHAT MESSAGES ===
             elif message_type == "chat":
                 await self.channel_layer.group_send(
@@ -149,48 +228,86 @@ class MeetingConsumer(AsyncWebsocketConsumer):
 
         # === SPEECH TO TEXT (BINARY AUDIO DATA) ===
         if bytes_data:
-            from io import BytesIO
-            from tafahom_api.apps.v1.ai.clients.speech_to_text_client import SpeechToTextClient
-            client = SpeechToTextClient()
-            result = await client.speech_to_text(BytesIO(bytes_data))
-            text = result.get("text", "").strip()
+            await self._handle_audio(bytes_data)
 
-            # Broadcast speech result
-            await self.channel_layer.group_send(
-                self.room_group_name,
-                {
-                    "type": "broadcast_message",
-                    "message": {
-                        "type": "speech_result",
-                        "text": text,
-                        "user": self.user.username
-                    }
-                }
-            )
+    async def _send_signaling(self, message, handler="broadcast_message"):
+        """Deliver to the target's channel; group fan-out only if it is unknown."""
+        target = message.get("target")
+        channel = None
+        if target:
+            channel = await get_channel_registry().lookup(self.meeting_code, target)
 
-            # Broadcast speaking status (highlight user if speaking)
-            if text:  # Only if speech detected
-                await self.channel_layer.group_send(
-                    self.room_group_name,
-                    {
-                        "type": "broadcast_message",
-                        "message": {
-                            "type": "speaking_start",
-                            "user": self.user.username
-                        }
-                    }
-                )
-            else:
-                await self.channel_layer.group_send(
-                    self.room_group_name,
-                    {
-                        "type": "broadcast_message",
-                        "message": {
-                            "type": "speaking_stop",
-                            "user": self.user.username
-                        }
-                    }
-                )
+        event = {"type": handler, "message": message}
+        if channel:
+            await self.channel_layer.send(channel, event)
+        else:
+            await self.channel_layer.group_send(self.room_group_name, event)
+
+    async def _send_ice_batch(self, target, candidates):
+        await self._send_signaling(
+            {
+                "type": "ice_candidates",
+                "candidates": candidates,
+                "user": self.user.username,
+                "target": target,
+            },
+            handler="ice_batch",
+        )
+
+    async def _broadcast(self, message):
+        await self.channel_layer.group_send(
+            self.room_group_name,
+            {"type": "broadcast_message", "message": message},
+        )
+
+    async def _handle_audio(self, bytes_data):
+        if self.audio_format == "pcm16":
+            pcm = bytes_data
+        else:
+            from tafahom_api.apps.v1.ai.utils.audio_ingest import ingest_audio
+            try:
+                pcm = (await ingest_audio(bytes_data)).pcm
+            except Exception as e:
+                logger.warning("Meeting audio chunk could not be decoded: %s", e)
+                return
+
+        for event in self.segmenter.feed(pcm):
+            # Speaking indicators come straight from the VAD
+            if event.kind != "utterance":
+                await self._broadcast({"type": event.kind, "user": self.user.username})
+            if event.utterance:
+                self._start_transcription(event.utterance)
+
+    def _start_transcription(self, pcm):
+        task = asyncio.create_task(self._transcribe_utterance(pcm))
+        self._stt_tasks.add(task)
+        task.add_done_callback(self._stt_tasks.discard)
+
+    async def _drain_stt(self):
+        """Let running transcriptions finish, within MEETING_STT_DRAIN_TIMEOUT."""
+        if not self._stt_tasks:
+            return
+        _, pending = await asyncio.wait(
+            set(self._stt_tasks), timeout=getattr(settings, "MEETING_STT_DRAIN_TIMEOUT", 5)
+        )
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning("Dropped %d meeting transcriptions still running at disconnect", len(pending))
+
+    async def _transcribe_utterance(self, pcm):
+        from tafahom_api.apps.v1.ai.clients.speech_to_text_client import SpeechToTextClient
+        from tafahom_api.apps.v1.ai.utils.audio_ingest import IngestedAudio
+
+        try:
+            result = await SpeechToTextClient().speech_to_text(IngestedAudio.from_pcm(pcm))
+        except Exception as e:
+            logger.warning("Meeting STT failed: %s", e)
+            return
+
+        text = (result.get("text") or "").strip() if isinstance(result, dict) else ""
+        if text:
+            await self._broadcast({"type": "speech_result", "text": text, "user": self.user.username})
 
     # === Handler for group_send messages ===
     async def broadcast_message(self, event):
@@ -198,44 +315,59 @@ class MeetingConsumer(AsyncWebsocketConsumer):
         message = event.get("message", {})
         await self.send(text_data=json.dumps(message))
 
-    @database_sync_to_async
-    def _check_access(self):
-        """Check if user has sufficient tokens (allow all plans)"""
-        from tafahom_api.apps.v1.billing.models import Subscription
-        try:
-            subscription = Subscription.objects.get(user=self.user)
-            if subscription.remaining_tokens() < 10:
-                return False, "Insufficient tokens. Need 10 tokens to join meeting."
-            return True, None
-        except Subscription.DoesNotExist:
-            return False, "Subscription not found"
+    async def ice_batch(self, event):
+        """Batched ICE candidates, unpacked for clients without ice_batching"""
+        message = event.get("message", {})
+        if self.ice_batching:
+            await self.send(text_data=json.dumps(message))
+            return
+
+        for candidate in message.get("candidates", []):
+            await self.send(text_data=json.dumps({
+                "type": "ice_candidate",
+                "data": candidate,
+                "user": message.get("user"),
+                "target": message.get("target"),
+            }))
+
+    async def _heartbeat(self):
+        interval = getattr(settings, "MEETING_PRESENCE_HEARTBEAT", 30)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await get_presence_store().heartbeat(self.meeting_code, self.user.username)
+            except Exception:
+                logger.exception("Presence heartbeat failed")
 
     @database_sync_to_async
-    def _consume_tokens(self):
-        """Deduct 10 tokens for meeting"""
+    def _admit(self, code):
+        """
+        Admission in a single DB round trip.
+
+        Returns ``(meta, close_code, message)``; ``close_code`` is None when
+        the user may join. The meeting is checked before tokens are consumed,
+        so joining a dead meeting no longer costs anything.
+        """
         from tafahom_api.apps.v1.billing.models import Subscription
         from tafahom_api.apps.v1.billing.services import consume_meeting_token
-        try:
-            subscription = Subscription.objects.get(user=self.user)
-            return consume_meeting_token(subscription, amount=10)
-        except Exception:
-            return False
 
-    @database_sync_to_async
-    def _get_meeting(self, code):
-        return Meeting.objects.filter(meeting_code=code, is_active=True).first()
+        subscription = (
+            Subscription.objects.select_related("plan").filter(user=self.user).first()
+        )
+        if subscription is None:
+            return None, 4003, "Subscription not found"
+        if subscription.remaining_tokens() < 10:
+            return None, 4003, "Insufficient tokens. Need 10 tokens to join meeting."
 
-    @database_sync_to_async
-    def _get_user_role(self, user, meeting):
-        try:
-            participant = Participant.objects.get(user=user, meeting=meeting)
-            return participant.role
-        except Participant.DoesNotExist:
-            return "participant"
+        meta = load_meeting_meta(code)
+        if not meta or not meta["is_active"]:
+            logger.warning(f"Meeting not found or inactive: {code}")
+            return None, 4004, None
 
-    @database_sync_to_async
-    def _get_participants(self, meeting):
-        """Get all participants in the meeting"""
-        return list(
-            meeting.participants.values('id', 'user__username', 'role')
-        )
+        try:
+            consumed = consume_meeting_token(subscription, amount=10)
+        except Exception:
+            consumed = False
+        if not consumed:
+            return None, 4003, None
+        return meta, None, None
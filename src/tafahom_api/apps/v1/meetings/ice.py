@@ -0,0 +1,82 @@
+import asyncio
+import contextlib
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class IceBatcher:
+    """
+    Per-connection trickle-ICE coalescer.
+
+    ICE gathering emits bursts of candidates within a few hundred ms. Instead
+    of one channel-layer message per candidate, candidates are collected per
+    target for ``window_ms`` (or until ``max_batch`` is reached) and handed to
+    ``flush`` as one list. With ``MEETING_ICE_BATCHING_ENABLED`` off every
+    candidate is flushed on its own, as before batching existed.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[Optional[str], List], Awaitable[None]],
+        window_ms: Optional[int] = None,
+        max_batch: Optional[int] = None,
+        enabled: Optional[bool] = None,
+    ):
+        self.flush = flush
+        self.enabled = (
+            enabled
+            if enabled is not None
+            else getattr(settings, "MEETING_ICE_BATCHING_ENABLED", True)
+        )
+        self.window = (
+            window_ms or getattr(settings, "MEETING_ICE_BATCH_WINDOW_MS", 30)
+        ) / 1000.0
+        self.max_batch = max_batch or getattr(settings, "MEETING_ICE_BATCH_MAX", 32)
+
+        self._pending: Dict[Optional[str], List] = {}
+        self._timers: Dict[Optional[str], asyncio.Task] = {}
+
+    async def add(self, target: Optional[str], candidate):
+        if not self.enabled:
+            await self.flush(target, [candidate])
+            return
+
+        batch = self._pending.setdefault(target, [])
+        batch.append(candidate)
+
+        if len(batch) >= self.max_batch:
+            await self.flush_target(target)
+        elif target not in self._timers:
+            self._timers[target] = asyncio.create_task(self._flush_later(target))
+
+    async def _flush_later(self, target: Optional[str]):
+        await asyncio.sleep(self.window)
+        self._timers.pop(target, None)
+        try:
+            await self.flush_target(target)
+        except Exception:
+            # Nobody awaits this timer task; a failed send would otherwise
+            # only surface as "Task exception was never retrieved"
+            logger.exception("ICE batch for %s could not be sent", target)
+
+    async def flush_target(self, target: Optional[str]):
+        timer = self._timers.pop(target, None)
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+        candidates = self._pending.pop(target, None)
+        if candidates:
+            await self.flush(target, candidates)
+
+    async def close(self):
+        """Send whatever is still buffered (connection closing)."""
+        for timer in list(self._timers.values()):
+            timer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await timer
+        self._timers.clear()
+        for target in list(self._pending):
+            await self.flush_target(target)
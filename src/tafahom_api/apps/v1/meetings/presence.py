@@ -0,0 +1,239 @@
+import threading
+import time
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+# --------------------------------------------------
+# MEETING METADATA (loaded from the DB once, then cached)
+# --------------------------------------------------
+
+
+def meeting_meta_key(meeting_code: str) -> str:
+    return f"meeting_meta_{meeting_code}"
+
+
+def load_meeting_meta(meeting_code: str) -> Optional[dict]:
+    """
+    Meeting fields and participant roles needed on every join.
+
+    Sync (call from ``database_sync_to_async``). Served from the default cache;
+    the database is only queried on a miss. Inactive and unknown meetings are
+    cached too, so a bad code cannot hammer the database.
+    """
+    key = meeting_meta_key(meeting_code)
+    meta = cache.get(key)
+    if meta is not None:
+        return meta or None
+
+    from .models import Meeting
+
+    meeting = (
+        Meeting.objects.filter(meeting_code=meeting_code)
+        .select_related("host")
+        .first()
+    )
+    if meeting is None:
+        meta = {}
+    else:
+        meta = {
+            "id": str(meeting.id),
+            "title": meeting.title,
+            "host": meeting.host.username,
+            "is_active": meeting.is_active,
+            "participants": {
+                row["user__username"]: {"id": row["id"], "role": row["role"]}
+                for row in meeting.participants.values("id", "user__username", "role")
+            },
+        }
+    cache.set(key, meta, getattr(settings, "MEETING_META_CACHE_TTL", 300))
+    return meta or None
+
+
+def invalidate_meeting_meta(meeting_code: str):
+    cache.delete(meeting_meta_key(meeting_code))
+
+
+def role_for(meta: dict, username: str) -> str:
+    row = meta.get("participants", {}).get(username)
+    if row:
+        return row["role"]
+    return "host" if meta.get("host") == username else "participant"
+
+
+# --------------------------------------------------
+# LIVE PRESENCE
+# --------------------------------------------------
+
+
+def _keys(meeting_code: str) -> Dict[str, str]:
+    prefix = f"meeting:{meeting_code}"
+    return {
+        "online": f"{prefix}:online",  # sorted set: username → last heartbeat
+        "roles": f"{prefix}:roles",  # hash: username → role
+        "conns": f"{prefix}:conns",  # hash: username → open connections
+    }
+
+
+# KEYS: online, roles, conns   ARGV: username, meeting ttl
+_LEAVE_SCRIPT = """
+local left = redis.call('HINCRBY', KEYS[3], ARGV[1], -1)
+if left <= 0 then
+    redis.call('ZREM', KEYS[1], ARGV[1])
+    redis.call('HDEL', KEYS[2], ARGV[1])
+    redis.call('HDEL', KEYS[3], ARGV[1])
+    left = 0
+end
+for i = 1, 3 do redis.call('EXPIRE', KEYS[i], ARGV[2]) end
+return left
+"""
+
+
+class RedisPresenceStore:
+    """
+    Live meeting membership in Redis.
+
+    Per meeting: a sorted set of online usernames scored by last heartbeat,
+    a hash of roles and a hash of open connection counts (a user may have
+    several tabs open). Members whose heartbeat is older than ``member_ttl``
+    are pruned on every join, so a crashed worker never leaves ghosts behind.
+    Joining writes the member and reads the full roster in one pipeline.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        member_ttl: Optional[int] = None,
+        meeting_ttl: Optional[int] = None,
+    ):
+        self.url = url or getattr(
+            settings,
+            "MEETING_REDIS_URL",
+            f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}/2",
+        )
+        self.member_ttl = member_ttl or getattr(settings, "MEETING_PRESENCE_TTL", 90)
+        self.meeting_ttl = meeting_ttl or getattr(
+            settings, "MEETING_REGISTRY_TTL", 60 * 60 * 6
+        )
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            import redis.asyncio as redis
+
+            self._client = redis.from_url(self.url, decode_responses=True)
+        return self._client
+
+    async def join(self, meeting_code: str, username: str, role: str) -> List[dict]:
+        keys = _keys(meeting_code)
+        now = time.time()
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.zremrangebyscore(keys["online"], "-inf", now - self.member_ttl)
+            pipe.zadd(keys["online"], {username: now})
+            pipe.hset(keys["roles"], username, role)
+            pipe.hincrby(keys["conns"], username, 1)
+            for key in keys.values():
+                pipe.expire(key, self.meeting_ttl)
+            pipe.zrange(keys["online"], 0, -1)
+            pipe.hgetall(keys["roles"])
+            results = await pipe.execute()
+
+        online, roles = results[-2], results[-1]
+        return [{"username": name, "role": roles.get(name, "participant")} for name in online]
+
+    async def heartbeat(self, meeting_code: str, username: str):
+        keys = _keys(meeting_code)
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.zadd(keys["online"], {username: time.time()})
+            for key in keys.values():
+                pipe.expire(key, self.meeting_ttl)
+            await pipe.execute()
+
+    async def leave(self, meeting_code: str, username: str) -> int:
+        """Drop one connection; returns how many the user still has open."""
+        keys = _keys(meeting_code)
+        return await self.client.eval(
+            _LEAVE_SCRIPT,
+            3,
+            keys["online"],
+            keys["roles"],
+            keys["conns"],
+            username,
+            self.meeting_ttl,
+        )
+
+    async def participants(self, meeting_code: str) -> List[dict]:
+        keys = _keys(meeting_code)
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.zrangebyscore(keys["online"], time.time() - self.member_ttl, "+inf")
+            pipe.hgetall(keys["roles"])
+            online, roles = await pipe.execute()
+        return [{"username": name, "role": roles.get(name, "participant")} for name in online]
+
+
+class InMemoryPresenceStore:
+    """Single-process presence with the same semantics (DEV / tests)."""
+
+    def __init__(self, member_ttl: Optional[int] = None):
+        self.member_ttl = member_ttl or getattr(settings, "MEETING_PRESENCE_TTL", 90)
+        self._meetings: Dict[str, Dict[str, dict]] = {}
+        self._lock = threading.Lock()
+
+    def _online(self, meeting_code: str) -> List[dict]:
+        cutoff = time.time() - self.member_ttl
+        members = self._meetings.get(meeting_code, {})
+        for name in [n for n, m in members.items() if m["seen"] < cutoff]:
+            del members[name]
+        return [
+            {"username": name, "role": m["role"]}
+            for name, m in sorted(members.items(), key=lambda item: item[1]["seen"])
+        ]
+
+    async def join(self, meeting_code: str, username: str, role: str) -> List[dict]:
+        with self._lock:
+            members = self._meetings.setdefault(meeting_code, {})
+            self._online(meeting_code)
+            member = members.setdefault(username, {"conns": 0})
+            member.update(role=role, seen=time.time())
+            member["conns"] += 1
+            return self._online(meeting_code)
+
+    async def heartbeat(self, meeting_code: str, username: str):
+        with self._lock:
+            member = self._meetings.get(meeting_code, {}).get(username)
+            if member:
+                member["seen"] = time.time()
+
+    async def leave(self, meeting_code: str, username: str) -> int:
+        with self._lock:
+            members = self._meetings.get(meeting_code, {})
+            member = members.get(username)
+            if not member:
+                return 0
+            member["conns"] -= 1
+            if member["conns"] > 0:
+                return member["conns"]
+            del members[username]
+            if not members:
+                self._meetings.pop(meeting_code, None)
+            return 0
+
+    async def participants(self, meeting_code: str) -> List[dict]:
+        with self._lock:
+            return self._online(meeting_code)
+
+
+_store = None
+
+
+def get_presence_store():
+    """Redis-backed in PROD (shared by every worker), in-memory otherwise."""
+    global _store
+    if _store is None:
+        if getattr(settings, "ENVIRONMENT", "") == "PROD":
+            _store = RedisPresenceStore()
+        else:
+            _store = InMemoryPresenceStore()
+    return _store
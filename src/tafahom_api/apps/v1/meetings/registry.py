@@ -0,0 +1,97 @@
+import threading
+from typing import Dict, Optional
+
+from django.conf import settings
+
+# Compare-and-delete: a participant who reconnected on a new channel must not
+# be unregistered by the old connection's late disconnect.
+_UNREGISTER_SCRIPT = """
+if redis.call('HGET', KEYS[1], ARGV[1]) == ARGV[2] then
+    return redis.call('HDEL', KEYS[1], ARGV[1])
+end
+return 0
+"""
+
+
+def registry_key(meeting_code: str) -> str:
+    return f"meeting:{meeting_code}:channels"
+
+
+class RedisChannelRegistry:
+    """
+    Participant → ``channel_name`` map for one meeting, stored as a Redis hash.
+
+    Lets signaling (offer / answer / ICE) be sent to the recipient's channel
+    directly instead of fanning out through the meeting group. The hash
+    expires ``ttl`` seconds after the last registration so abandoned meetings
+    clean themselves up.
+    """
+
+    def __init__(self, url: Optional[str] = None, ttl: Optional[int] = None):
+        self.url = url or getattr(
+            settings,
+            "MEETING_REDIS_URL",
+            f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}/2",
+        )
+        self.ttl = ttl or getattr(settings, "MEETING_REGISTRY_TTL", 60 * 60 * 6)
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            import redis.asyncio as redis
+
+            self._client = redis.from_url(self.url, decode_responses=True)
+        return self._client
+
+    async def register(self, meeting_code: str, participant: str, channel_name: str):
+        key = registry_key(meeting_code)
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.hset(key, participant, channel_name)
+            pipe.expire(key, self.ttl)
+            await pipe.execute()
+
+    async def unregister(self, meeting_code: str, participant: str, channel_name: str):
+        await self.client.eval(
+            _UNREGISTER_SCRIPT, 1, registry_key(meeting_code), participant, channel_name
+        )
+
+    async def lookup(self, meeting_code: str, participant: str) -> Optional[str]:
+        return await self.client.hget(registry_key(meeting_code), participant)
+
+
+class InMemoryChannelRegistry:
+    """Single-process registry used with the in-memory channel layer (DEV / tests)."""
+
+    def __init__(self):
+        self._meetings: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+
+    async def register(self, meeting_code: str, participant: str, channel_name: str):
+        with self._lock:
+            self._meetings.setdefault(meeting_code, {})[participant] = channel_name
+
+    async def unregister(self, meeting_code: str, participant: str, channel_name: str):
+        with self._lock:
+            channels = self._meetings.get(meeting_code, {})
+            if channels.get(participant) == channel_name:
+                del channels[participant]
+            if not channels:
+                self._meetings.pop(meeting_code, None)
+
+    async def lookup(self, meeting_code: str, participant: str) -> Optional[str]:
+        return self._meetings.get(meeting_code, {}).get(participant)
+
+
+_registry = None
+
+
+def get_channel_registry():
+    """Redis-backed in PROD (matching the Redis channel layer), in-memory otherwise."""
+    global _registry
+    if _registry is None:
+        if getattr(settings, "ENVIRONMENT", "") == "PROD":
+            _registry = RedisChannelRegistry()
+        else:
+            _registry = InMemoryChannelRegistry()
+    return _registry
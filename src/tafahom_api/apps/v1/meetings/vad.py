@@ -0,0 +1,187 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+from django.conf import settings
+
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2  # PCM16
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+class VoiceActivityDetector:
+    """
+    Frame-level energy / zero-crossing-rate VAD over PCM16 mono 16 kHz audio.
+
+    A frame is voiced when its RMS energy clears both an absolute floor and a
+    multiple of the running noise estimate, and its zero-crossing rate is
+    below ``zcr_max`` (broadband hiss crosses zero far more often than
+    speech). All frames of a chunk are scored in one vectorized pass.
+    """
+
+    def __init__(
+        self,
+        frame_ms: Optional[int] = None,
+        energy_threshold: Optional[float] = None,
+        noise_ratio: Optional[float] = None,
+        zcr_max: Optional[float] = None,
+    ):
+        self.frame_ms = frame_ms or _setting("MEETING_VAD_FRAME_MS", 30)
+        self.frame_samples = SAMPLE_RATE * self.frame_ms // 1000
+        self.energy_threshold = energy_threshold or _setting(
+            "MEETING_VAD_ENERGY_THRESHOLD", 0.01
+        )
+        self.noise_ratio = noise_ratio or _setting("MEETING_VAD_NOISE_RATIO", 3.0)
+        self.zcr_max = zcr_max or _setting("MEETING_VAD_ZCR_MAX", 0.35)
+        self.noise_floor = self.energy_threshold / self.noise_ratio
+
+    def classify(self, samples: np.ndarray) -> np.ndarray:
+        """Boolean voiced flag per frame for ``samples`` (int16, whole frames only)."""
+        frames = samples.reshape(-1, self.frame_samples).astype(np.float32) / 32768.0
+        if not len(frames):
+            return np.zeros(0, dtype=bool)
+
+        energy = np.sqrt(np.mean(frames * frames, axis=1))
+        signs = np.signbit(frames)
+        zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+
+        threshold = max(self.energy_threshold, self.noise_floor * self.noise_ratio)
+        voiced = (energy > threshold) & (zcr < self.zcr_max)
+
+        quiet = energy[~voiced]
+        if len(quiet):
+            # Slow EMA so a long utterance cannot drag the floor upwards
+            self.noise_floor = 0.95 * self.noise_floor + 0.05 * float(np.median(quiet))
+        return voiced
+
+
+@dataclass
+class VADEvent:
+    kind: str  # "speaking_start" | "utterance" | "speaking_stop"
+    utterance: bytes = b""  # PCM16 to transcribe ("utterance" / "speaking_stop")
+
+
+class UtteranceSegmenter:
+    """
+    Per-participant audio pipeline: VAD frames in, utterances out.
+
+    Voiced frames (plus a short pre-roll) are buffered until ``silence_ms``
+    of silence closes the utterance; utterances shorter than
+    ``min_utterance_ms`` are discarded as clicks, and anything longer than
+    ``max_utterance_ms`` is cut so STT latency stays bounded. ``feed`` returns
+    the speaking transitions it observed, so indicators need no STT call.
+    """
+
+    def __init__(
+        self,
+        vad: Optional[VoiceActivityDetector] = None,
+        silence_ms: Optional[int] = None,
+        min_utterance_ms: Optional[int] = None,
+        max_utterance_ms: Optional[int] = None,
+        preroll_ms: Optional[int] = None,
+    ):
+        self.vad = vad or VoiceActivityDetector()
+        frame_ms = self.vad.frame_ms
+        self.silence_frames = max(
+            (silence_ms or _setting("MEETING_VAD_SILENCE_MS", 600)) // frame_ms, 1
+        )
+        self.min_frames = (
+            min_utterance_ms or _setting("MEETING_VAD_MIN_UTTERANCE_MS", 300)
+        ) // frame_ms
+        self.max_frames = (
+            max_utterance_ms or _setting("MEETING_VAD_MAX_UTTERANCE_MS", 15000)
+        ) // frame_ms
+        self.preroll_frames = (
+            preroll_ms or _setting("MEETING_VAD_PREROLL_MS", 200)
+        ) // frame_ms
+
+        self.frame_bytes = self.vad.frame_samples * SAMPLE_WIDTH
+        self._pending = b""  # partial frame carried over to the next chunk
+        self._preroll: List[bytes] = []
+        self._frames: List[bytes] = []
+        self._voiced_frames = 0
+        self._trailing_silence = 0
+        self.speaking = False
+
+        self.frames_seen = 0
+        self.frames_sent = 0
+
+    def feed(self, pcm: bytes) -> List[VADEvent]:
+        data = self._pending + pcm
+        usable = len(data) - len(data) % self.frame_bytes
+        self._pending = data[usable:]
+        if not usable:
+            return []
+
+        samples = np.frombuffer(data[:usable], dtype="<i2")
+        voiced = self.vad.classify(samples)
+
+        events: List[VADEvent] = []
+        for i, is_voiced in enumerate(voiced):
+            frame = data[i * self.frame_bytes : (i + 1) * self.frame_bytes]
+            self.frames_seen += 1
+            event = self._step(frame, bool(is_voiced))
+            if event:
+                events.append(event)
+        return events
+
+    def _step(self, frame: bytes, voiced: bool) -> Optional[VADEvent]:
+        if not self.speaking:
+            if not voiced:
+                self._preroll.append(frame)
+                if len(self._preroll) > self.preroll_frames:
+                    self._preroll.pop(0)
+                return None
+            self.speaking = True
+            self._frames = self._preroll + [frame]
+            self._preroll = []
+            self._voiced_frames = 1
+            self._trailing_silence = 0
+            return VADEvent("speaking_start")
+
+        self._frames.append(frame)
+        if voiced:
+            self._voiced_frames += 1
+            self._trailing_silence = 0
+        else:
+            self._trailing_silence += 1
+
+        if self._trailing_silence >= self.silence_frames:
+            return self._close()
+        if len(self._frames) >= self.max_frames:
+            # Hand off what we have but keep the speaking state
+            utterance = self._take()
+            return VADEvent("utterance", utterance) if utterance else None
+        return None
+
+    def _take(self) -> bytes:
+        frames = self._frames
+        if self._trailing_silence:
+            frames = frames[: len(frames) - self._trailing_silence]
+        voiced = self._voiced_frames
+        self._frames = []
+        self._voiced_frames = 0
+        self._trailing_silence = 0
+        if voiced < self.min_frames:
+            return b""
+        self.frames_sent += len(frames)
+        return b"".join(frames)
+
+    def _close(self) -> VADEvent:
+        self.speaking = False
+        return VADEvent("speaking_stop", self._take())
+
+    def flush(self) -> Optional[VADEvent]:
+        """Close an in-progress utterance (e.g. on disconnect)."""
+        if not self.speaking:
+            return None
+        return self._close()
+
+    @property
+    def stt_saved_ratio(self) -> float:
+        if not self.frames_seen:
+            return 0.0
+        return round(1 - self.frames_sent / self.frames_seen, 4)
@@ -5,6 +5,7 @@ from rest_framework import status
 from django.db import transaction
 
 from .models import Meeting, Participant
+from .presence import invalidate_meeting_meta
 from .services import generate_meeting_code
 
 
@@ -43,6 +44,7 @@ class CreateMeetingView(APIView):
                 meeting=meeting,
                 role="host",
             )
+        invalidate_meeting_meta(code)
 
         return Response(
             {
@@ -69,11 +71,13 @@ class JoinMeetingView(APIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        participant, _ = Participant.objects.get_or_create(
+        participant, created = Participant.objects.get_or_create(
             user=request.user,
             meeting=meeting,
             defaults={"role": "participant"},
         )
+        if created:
+            invalidate_meeting_meta(code)
 
         return Response(
             {
@@ -109,6 +113,7 @@ class LeaveMeetingView(APIView):
                 {"error": "You are not part of this meeting"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
+        invalidate_meeting_meta(code)
 
         return Response({"message": "Left successfully"})
 
@@ -165,5 +170,6 @@ class EndMeetingView(APIView):
 
         meeting.is_active = False
         meeting.save()
+        invalidate_meeting_meta(code)
 
         return Response({"message": "Meeting ended"})
\ No newline at end of file
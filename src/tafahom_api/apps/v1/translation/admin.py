@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import TranslationRequest, SignLanguageConfig
+from .models import TranslationRequest, SignLanguageConfig, UnknownWordResolution
 
 
 @admin.register(TranslationRequest)
@@ -22,3 +22,30 @@ class SignLanguageConfigAdmin(admin.ModelAdmin):
     list_display = ("name_en", "code", "region", "is_active")
     list_filter = ("is_active", "has_avatar_support", "has_video_support")
     search_fields = ("name_en", "name_ar", "code", "country_code")
+
+
+@admin.register(UnknownWordResolution)
+class UnknownWordResolutionAdmin(admin.ModelAdmin):
+    list_display = ("phrase", "gloss", "source", "lexicon_version", "updated_at")
+    list_filter = ("source",)
+    search_fields = ("phrase",)
+    readonly_fields = ("created_at", "updated_at")
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        from .services.unknown_words import get_unknown_word_store
+
+        get_unknown_word_store().forget([obj.phrase])
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        from .services.unknown_words import get_unknown_word_store
+
+        get_unknown_word_store().forget([obj.phrase])
+
+    def delete_queryset(self, request, queryset):
+        phrases = list(queryset.values_list("phrase", flat=True))
+        super().delete_queryset(request, queryset)
+        from .services.unknown_words import get_unknown_word_store
+
+        get_unknown_word_store().forget(phrases)
@@ -37,6 +37,9 @@ class SignTranslationConsumer(AsyncWebsocketConsumer):
     async def send_json(self, content: dict):
         await self.send(text_data=json.dumps(content))
 
+    async def send_bytes(self, data: bytes):
+        await self.send(bytes_data=data)
+
     async def connect(self):
         # -----------------------------
         # AUTH (FROM JWT MIDDLEWARE)
@@ -61,6 +64,7 @@ class SignTranslationConsumer(AsyncWebsocketConsumer):
         self.service = StreamingTranslationService(
             user=self.user,
             send_json=self.send_json,
+            send_bytes=self.send_bytes,
             close_ws=self.close,
             config={
                 "SEND_INTERVAL": SEND_INTERVAL,
@@ -151,7 +155,8 @@ class SignTranslationConsumer(AsyncWebsocketConsumer):
         try:
             if action == "start":
                 output_type = data.get("output_type", "text")
-                await self.service.start_translation(output_type)
+                audio_transport = data.get("audio_transport", "json")
+                await self.service.start_translation(output_type, audio_transport)
 
             elif action == "stop":
                 await self.service.stop_translation("client_request")
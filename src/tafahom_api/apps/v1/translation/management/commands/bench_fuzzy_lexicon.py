@@ -0,0 +1,107 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tafahom_api.apps.v1.translation.services.animation_service import lexicon_words
+from tafahom_api.apps.v1.translation.services.fuzzy_lexicon import get_fuzzy_lexicon
+from tafahom_api.apps.v1.translation.services.unknown_words import unknown_words_from_log
+
+ARABIC_LETTERS = "ابتثجحخدذرزسشصضطظعغفقكلمنهوي"
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return round(values[min(int(q * len(values)), len(values) - 1)], 1)
+
+
+def _typo(word, rng):
+    """One random edit: deletion, insertion, substitution or adjacent swap."""
+    i = rng.randrange(len(word))
+    kind = rng.choice(("delete", "insert", "substitute", "swap"))
+    if kind == "delete":
+        return word[:i] + word[i + 1 :]
+    if kind == "insert":
+        return word[:i] + rng.choice(ARABIC_LETTERS) + word[i:]
+    if kind == "substitute":
+        return word[:i] + rng.choice(ARABIC_LETTERS.replace(word[i], "")) + word[i + 1 :]
+    i = min(i, len(word) - 2)
+    return word[:i] + word[i + 1] + word[i] + word[i + 2 :]
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay unknown words through the fuzzy lexicon: lookup latency, hit "
+        "rate and how many text-to-gloss LLM calls it avoids. The corpus is "
+        "taken from translate-view logs (--from-log) or, by default, made of "
+        "random one-edit typos of the lexicon's own words."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--from-log", action="append", default=[], metavar="PATH")
+        parser.add_argument("--samples", type=int, default=2000, help="Synthetic typos")
+        parser.add_argument("--seed", type=int, default=7)
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        lexicon = get_fuzzy_lexicon()
+        self.stdout.write(
+            f"index: {len(lexicon)} entries, built in {(time.perf_counter() - start) * 1000:.0f} ms"
+        )
+
+        if options["from_log"]:
+            try:
+                requests = [
+                    words
+                    for path in options["from_log"]
+                    for words in unknown_words_from_log(path)
+                    if words
+                ]
+            except OSError as e:
+                raise CommandError(str(e))
+            self._replay(lexicon, requests, expected=None)
+        else:
+            rng = random.Random(options["seed"])
+            words = [w for w in lexicon_words().items() if len(w[0]) >= lexicon.min_length]
+            expected = {}
+            requests = []
+            for _ in range(options["samples"]):
+                word, animation = rng.choice(words)
+                typo = _typo(word, rng)
+                if typo in lexicon.words:
+                    continue  # the edit produced another entry, not a miss
+                expected[typo] = animation
+                requests.append([typo])
+            self._replay(lexicon, requests, expected)
+
+    def _replay(self, lexicon, requests, expected):
+        latencies, hits, correct = [], 0, 0
+        avoided = 0
+        total_words = 0
+        for words in requests:
+            resolved = 0
+            for word in words:
+                start = time.perf_counter()
+                match = lexicon.lookup(word)
+                latencies.append((time.perf_counter() - start) * 1_000_000)
+                if match is not None:
+                    resolved += 1
+                    if expected is not None and expected.get(word) == match.animation:
+                        correct += 1
+            hits += resolved
+            total_words += len(words)
+            # A request only skips the LLM when every unknown word was matched
+            if resolved == len(words):
+                avoided += 1
+
+        if not total_words:
+            raise CommandError("No unknown words in the corpus")
+        self.stdout.write(
+            f"words: {total_words}, matched: {hits} ({hits / total_words:.1%}), "
+            f"lookup p50 {_percentile(latencies, 0.5)} us, p99 {_percentile(latencies, 0.99)} us"
+        )
+        if expected is not None:
+            self.stdout.write(f"correct entry: {correct}/{hits} matches ({correct / max(hits, 1):.1%})")
+        self.stdout.write(
+            f"LLM calls avoided: {avoided}/{len(requests)} requests ({avoided / len(requests):.1%})"
+        )
@@ -0,0 +1,123 @@
+import asyncio
+import itertools
+import json
+import os
+import time
+
+import httpx
+from django.core.management.base import BaseCommand, CommandError
+
+
+def _percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(int(q * len(values)), len(values) - 1)], 1)
+
+
+async def _run_level(url, headers, body, concurrency, duration, counter):
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(headers=headers, limits=limits, timeout=60) as client:
+
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    payload = body.replace("{n}", str(next(counter))).encode()
+                    response = await client.post(url, content=payload)
+                    ok = response.status_code < 500
+                except httpx.HTTPError:
+                    ok = False
+                latencies.append((time.perf_counter() - start) * 1000)
+                if not ok:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": _percentile(latencies, 0.5),
+        "p95_ms": _percentile(latencies, 0.95),
+        "p99_ms": _percentile(latencies, 0.99),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "HTTP load benchmark for an endpoint of a running server. Run it once "
+        "against the old build (--label sync --save bench.json) and once against "
+        "the new one (--label async --save bench.json --compare sync) to compare "
+        "throughput at each concurrency level."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", required=True, help="Full endpoint URL")
+        parser.add_argument(
+            "--body", default="{}",
+            help="JSON request body; {n} is replaced by a request counter unique across runs (defeats caches)",
+        )
+        parser.add_argument("--token", default="", help="JWT access token")
+        parser.add_argument(
+            "--concurrency", type=int, nargs="+", default=[50, 200],
+            help="Concurrent clients per run",
+        )
+        parser.add_argument("--duration", type=float, default=20, help="Seconds per level")
+        parser.add_argument("--label", default="run", help="Name stored with the results")
+        parser.add_argument("--save", help="JSON file results are merged into")
+        parser.add_argument("--compare", help="Label in --save file to compare against")
+
+    def handle(self, *args, **options):
+        body = options["body"]
+        try:
+            json.loads(body.replace("{n}", "0"))
+        except ValueError as e:
+            raise CommandError(f"--body is not valid JSON: {e}")
+
+        headers = {"Content-Type": "application/json"}
+        if options["token"]:
+            headers["Authorization"] = f"Bearer {options['token']}"
+
+        # One counter for every level, starting at the clock, so no request of
+        # this run or an earlier one is served from a cache
+        counter = itertools.count(int(time.time() * 1000))
+        results = {}
+        for level in options["concurrency"]:
+            self.stdout.write(f"{options['label']}: {level} clients for {options['duration']}s ...")
+            results[str(level)] = asyncio.run(
+                _run_level(options["url"], headers, body, level, options["duration"], counter)
+            )
+            self.stdout.write(f"  {results[str(level)]}")
+
+        stored = {}
+        if options["save"]:
+            if os.path.exists(options["save"]):
+                with open(options["save"]) as f:
+                    stored = json.load(f)
+            stored[options["label"]] = results
+            with open(options["save"], "w") as f:
+                json.dump(stored, f, indent=2)
+
+        baseline = stored.get(options["compare"]) if options["compare"] else None
+        if options["compare"] and baseline is None:
+            raise CommandError(f"No results labelled {options['compare']!r} in {options['save']}")
+        if baseline:
+            for level, current in results.items():
+                before = baseline.get(level)
+                if not before or not before["rps"]:
+                    continue
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"{level} clients: {before['rps']} → {current['rps']} req/s "
+                        f"(×{current['rps'] / before['rps']:.2f}), "
+                        f"p95 {before['p95_ms']} → {current['p95_ms']} ms"
+                    )
+                )
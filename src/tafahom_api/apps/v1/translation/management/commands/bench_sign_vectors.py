@@ -0,0 +1,109 @@
+import random
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tafahom_api.apps.v1.translation.services.animation_service import (
+    lexicon_words,
+    translate_to_animation_names,
+)
+from tafahom_api.apps.v1.translation.services.fuzzy_lexicon import get_fuzzy_lexicon
+from tafahom_api.apps.v1.translation.services.vector_index import get_vector_index
+
+# Affixes the stemmer does not strip, or not all at once
+PREFIXES = ["", "ب", "وب", "ف", "وال", "لل"]
+SUFFIXES = ["", "اتهم", "اتنا", "ينهم", "هم", "كم", "ات", "تين"]
+
+# Common words that are not in the lexicon: any match is a false positive
+NEGATIVES = [
+    "يعني", "كلمه", "اتعورت", "زعلان", "ذهبت", "عايز", "النهارده", "محتاج", "بيتكلم",
+    "مكالمه", "جامعه", "شغل", "بكره", "امبارح", "دلوقتي", "ازاي", "فين", "ليه", "كمان",
+    "خلاص", "برضه", "علشان", "حاجه", "ناس", "كتير", "شويه", "اوي", "طيب",
+    "هنروح", "بنشتغل", "اتكلمنا", "قاعدين", "مستنيين", "الموضوع", "سيارات",
+]
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return round(values[min(int(q * len(values)), len(values) - 1)], 1)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the n-gram vector tier: lookup latency, and for inflected "
+        "lexicon words plus common out-of-lexicon words, which tier resolves "
+        "each word (sign map + stemmer, fuzzy, vector) and how many still "
+        "need the LLM."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--samples", type=int, default=2000)
+        parser.add_argument("--seed", type=int, default=7)
+        parser.add_argument("--min-score", type=float, default=None)
+
+    def handle(self, *args, **options):
+        import logging
+
+        logging.getLogger("tafahom_api").setLevel(logging.WARNING + 1)
+
+        min_score = options["min_score"]
+        if min_score is None:
+            min_score = getattr(settings, "SIGN_VECTOR_MIN_SCORE", 0.65)
+
+        start = time.perf_counter()
+        index = get_vector_index()
+        self.stdout.write(
+            f"index: {len(index)} entries x {index.matrix.shape[1]} n-grams, "
+            f"ready in {(time.perf_counter() - start) * 1000:.0f} ms, min score {min_score}"
+        )
+
+        rng = random.Random(options["seed"])
+        words = [w for w in lexicon_words().items() if len(w[0]) >= 3]
+        positives = {}
+        while len(positives) < options["samples"]:
+            word, animation = rng.choice(words)
+            prefix, suffix = rng.choice(PREFIXES), rng.choice(SUFFIXES)
+            if prefix or suffix:
+                positives[prefix + word + suffix] = animation
+
+        self._run("inflected lexicon words", positives, index, min_score)
+        self._run("out-of-lexicon words", dict.fromkeys(NEGATIVES), index, min_score)
+
+    def _run(self, label, corpus, index, min_score):
+        fuzzy = get_fuzzy_lexicon()
+        tiers = {"sign_map": 0, "fuzzy": 0, "vector": 0, "llm": 0}
+        correct = {"sign_map": 0, "fuzzy": 0, "vector": 0}
+        latencies = []
+
+        for word, expected in corpus.items():
+            matched = translate_to_animation_names(word)
+            if not matched["unknown_words"]:
+                tier, animation = "sign_map", matched["animations"][0] if matched["animations"] else None
+            else:
+                fuzzy_match = fuzzy.lookup(word)
+                start = time.perf_counter()
+                vector_match = index.nearest(word, min_score)
+                latencies.append((time.perf_counter() - start) * 1_000_000)
+                if fuzzy_match is not None:
+                    tier, animation = "fuzzy", fuzzy_match.animation
+                elif vector_match is not None:
+                    tier, animation = "vector", vector_match.animation
+                else:
+                    tier, animation = "llm", None
+            tiers[tier] += 1
+            if tier != "llm" and animation == expected:
+                correct[tier] += 1
+
+        total = len(corpus)
+        self.stdout.write(f"\n{label} ({total}):")
+        for tier, count in tiers.items():
+            line = f"  {tier:<9}{count:>6}  {count / total:6.1%}"
+            if tier != "llm" and count:
+                line += f"   correct {correct[tier] / count:.1%}"
+            self.stdout.write(line)
+        if latencies:
+            self.stdout.write(
+                f"  vector lookup p50 {_percentile(latencies, 0.5)} us, "
+                f"p99 {_percentile(latencies, 0.99)} us"
+            )
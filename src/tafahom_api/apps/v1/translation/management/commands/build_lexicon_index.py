@@ -0,0 +1,53 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from tafahom_api.apps.v1.translation.services.cache_service import lexicon_fingerprint
+from tafahom_api.apps.v1.translation.services.fuzzy_lexicon import get_fuzzy_lexicon
+from tafahom_api.apps.v1.translation.services.vector_index import (
+    SignVectorIndex,
+    build_vector_index,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the indexes derived from the sign map and write the n-gram "
+        "vector index to SIGN_VECTOR_INDEX_PATH, so workers load it instead of "
+        "building it. Run it whenever sign_map.py changes (the image build "
+        "does); a stale file is detected by its fingerprint and ignored."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", help="Defaults to SIGN_VECTOR_INDEX_PATH")
+
+    def handle(self, *args, **options):
+        output = options["output"] or getattr(settings, "SIGN_VECTOR_INDEX_PATH", None)
+        if not output:
+            raise CommandError("No --output and no SIGN_VECTOR_INDEX_PATH setting")
+
+        from tafahom_api.apps.v1.translation.services import animation_service
+
+        self.stdout.write(
+            f"sign map {lexicon_fingerprint()}: trie depth {animation_service._MAX_PHRASE_DEPTH}, "
+            f"{len(animation_service._STEM_INDEX)} stems, {len(get_fuzzy_lexicon())} fuzzy entries"
+        )
+
+        start = time.perf_counter()
+        index = build_vector_index()
+        index.save(output)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        # Check the file round-trips before anyone loads it
+        loaded = SignVectorIndex.load(output)
+        if loaded.fingerprint != index.fingerprint or loaded.matrix.shape != index.matrix.shape:
+            raise CommandError(f"{output} does not load back correctly")
+
+        rows, columns = index.matrix.shape
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"vector index: {rows} entries x {columns} n-grams, "
+                f"{index.matrix.nbytes / 1024:.0f} KiB float16, built in {elapsed:.0f} ms -> {output}"
+            )
+        )
@@ -0,0 +1,111 @@
+from collections import Counter
+
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand, CommandError
+
+from tafahom_api.apps.v1.translation.services.fuzzy_lexicon import fuzzy_resolve
+from tafahom_api.apps.v1.translation.services.vector_index import vector_resolve
+from tafahom_api.apps.v1.translation.services.unknown_words import (
+    get_unknown_word_store,
+    resolve_unknown_words,
+    unknown_words_from_log,
+)
+
+
+def _words_from_requests(limit):
+    from tafahom_api.apps.v1.translation.models import TranslationRequest
+    from tafahom_api.apps.v1.translation.services.animation_service import (
+        translate_to_animation_names,
+    )
+
+    texts = (
+        TranslationRequest.objects.exclude(input_text__isnull=True)
+        .exclude(input_text="")
+        .order_by("-created_at")
+        .values_list("input_text", flat=True)
+    )
+    if limit:
+        texts = texts[:limit]
+    for text in texts.iterator():
+        yield from translate_to_animation_names(text)["unknown_words"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Resolve words the sign map does not know, offline, and store the "
+        "results so live requests never send them to the LLM. Words are "
+        "collected from translate-view logs and/or past translation requests, "
+        "most frequent first; words already in the store are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--from-log",
+            action="append",
+            default=[],
+            metavar="PATH",
+            help="Log file with 'PHASE 1 (sign map): ... unknown=[...]' lines (repeatable)",
+        )
+        parser.add_argument(
+            "--from-requests",
+            type=int,
+            nargs="?",
+            const=10000,
+            metavar="N",
+            help="Match the N most recent TranslationRequest inputs (default 10000)",
+        )
+        parser.add_argument("--limit", type=int, default=0, help="Resolve at most this many words")
+        parser.add_argument("--batch-size", type=int, default=50, help="Words per LLM prompt")
+        parser.add_argument("--dry-run", action="store_true", help="Only list the words to resolve")
+
+    def handle(self, *args, **options):
+        if not options["from_log"] and options["from_requests"] is None:
+            raise CommandError("Give at least one source: --from-log PATH or --from-requests")
+
+        counts = Counter()
+        for path in options["from_log"]:
+            try:
+                for words in unknown_words_from_log(path):
+                    counts.update(words)
+            except OSError as e:
+                raise CommandError(f"Cannot read {path}: {e}")
+        if options["from_requests"] is not None:
+            counts.update(_words_from_requests(options["from_requests"]))
+        counts.pop("", None)
+
+        # Typos and close forms of lexicon entries are matched locally and never reach the LLM
+        local = fuzzy_resolve(counts)
+        local.update(vector_resolve(w for w in counts if w not in local))
+        known = get_unknown_word_store().lookup_many(w for w in counts if w not in local)
+        pending = [
+            word for word, _ in counts.most_common() if word not in known and word not in local
+        ]
+        if options["limit"]:
+            pending = pending[: options["limit"]]
+
+        self.stdout.write(
+            f"{len(counts)} distinct unknown words, {len(local)} matched locally, "
+            f"{len(known)} already stored, {len(pending)} to resolve"
+        )
+        if options["dry_run"]:
+            for word in pending:
+                self.stdout.write(f"{counts[word]:>6}  {word}")
+            return
+
+        batch_size = max(options["batch_size"], 1)
+        resolved = with_sign = 0
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start : start + batch_size]
+            result = async_to_sync(resolve_unknown_words)(batch, source="offline")
+            if not result.from_llm:
+                self.stderr.write(f"Batch {start // batch_size + 1}: no usable LLM answer, skipped")
+                continue
+            resolved += result.from_llm
+            with_sign += result.from_llm - len(result.unknown_words)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Stored {resolved} resolutions ({with_sign} with a sign, "
+                f"{resolved - with_sign} marked as no sign)"
+            )
+        )
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('translation', '0003_translationrequest_saved'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UnknownWordResolution',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('phrase', models.CharField(max_length=255, unique=True)),
+                ('gloss', models.JSONField(blank=True, default=list)),
+                ('source', models.CharField(choices=[('llm', 'LLM'), ('offline', 'Offline fill'), ('manual', 'Manual')], default='llm', max_length=10)),
+                ('lexicon_version', models.CharField(blank=True, max_length=32)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Unknown Word Resolution',
+                'verbose_name_plural': 'Unknown Word Resolutions',
+                'db_table': 'unknown_word_resolutions',
+            },
+        ),
+    ]
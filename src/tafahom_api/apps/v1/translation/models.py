@@ -164,3 +164,46 @@ class SignLanguageConfig(models.Model):
 
     def __str__(self):
         return f"{self.name_en} ({self.code})"
+
+
+# =========================
+# UNKNOWN WORD RESOLUTION
+# =========================
+
+
+class UnknownWordResolution(models.Model):
+    """
+    What a word or phrase the sign map does not know resolves to.
+
+    Filled from text-to-gloss LLM answers (online and by the
+    ``fill_unknown_words`` command) or by hand, and consulted before any LLM
+    call. An empty ``gloss`` is the "no sign" marker: the LLM was asked and
+    nothing in the dictionary matches.
+    """
+
+    SOURCES = [
+        ("llm", "LLM"),
+        ("offline", "Offline fill"),
+        ("manual", "Manual"),
+    ]
+
+    phrase = models.CharField(max_length=255, unique=True)
+    gloss = models.JSONField(default=list, blank=True)
+    source = models.CharField(max_length=10, choices=SOURCES, default="llm")
+    # Sign-map fingerprint the gloss was validated against
+    lexicon_version = models.CharField(max_length=32, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "unknown_word_resolutions"
+        verbose_name = _("Unknown Word Resolution")
+        verbose_name_plural = _("Unknown Word Resolutions")
+
+    @property
+    def has_sign(self) -> bool:
+        return bool(self.gloss)
+
+    def __str__(self):
+        return f"{self.phrase} → {' '.join(self.gloss) or '∅'}"
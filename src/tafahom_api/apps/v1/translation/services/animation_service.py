@@ -1,11 +1,15 @@
 import logging
 from collections import defaultdict
 
+from django.conf import settings
+
 from ..sign_map import (
-    ANIMATION_MAP
+    ANIMATION_MAP,
+    SYNONYM_MAP,
 )
 from .normalization import normalize_arabic, apply_synonyms
 from .fingerspelling import is_probable_name, fingerspell
+from .stemming import StemIndex
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +49,36 @@ def _build_trie(phrase_map):
 _TRIE, _MAX_PHRASE_DEPTH = _build_trie(ANIMATION_MAP)
 
 
+def lexicon_words():
+    """
+    Single-word lexicon entries as the matcher sees them (normalized, after
+    synonyms), mapped to their animation. Single-word synonym keys whose
+    target is such an entry are included too.
+    """
+    words = {word: node["_anim"] for word, node in _TRIE.items() if "_anim" in node}
+    for key in SYNONYM_MAP:
+        key = normalize_arabic(key)
+        target = apply_synonyms(key)
+        if key and " " not in key and target in words:
+            words.setdefault(key, words[target])
+    return words
+
+
+# Stem variants of every single-word entry, for the second-chance lookup
+_STEM_INDEX = StemIndex(lexicon_words())
+
+
+def _stem_match(word):
+    """Animation for an inflected form of a single-word entry, or None."""
+    if not getattr(settings, "ARABIC_STEMMER_ENABLED", True):
+        return None
+    match = _STEM_INDEX.lookup(word)
+    if match is None:
+        return None
+    logger.info("STEM MATCH       : %r -> %r (%s)", word, match[0], match[1])
+    return match[1]
+
+
 def translate_to_animation_names(text):
     animations = []
     unknown_words = []
@@ -69,9 +103,11 @@ def translate_to_animation_names(text):
     # 2️⃣ Recursive Longest-Match-First Strategy
     # This guarantees that the globally longest phrases in the sentence are prioritized.
     # It checks lengths from (end - start) down to 1.
+    # Each segment also returns, for every unknown word, how many of its
+    # animations come before it, so resolved words can be put back in place
     def match_segment(start, end):
         if start >= end:
-            return [], [], [], []
+            return [], [], [], [], []
             
         best_match = None
         best_i = -1
@@ -79,7 +115,8 @@ def translate_to_animation_names(text):
         best_phrase = None
         
         # Iterate over possible phrase lengths, from longest down to 1
-        for k in range(end - start, 0, -1):
+        # (nothing in the trie is deeper than _MAX_PHRASE_DEPTH words)
+        for k in range(min(end - start, _MAX_PHRASE_DEPTH), 0, -1):
             for i in range(start, end - k + 1):
                 node = _TRIE
                 found = True
@@ -103,12 +140,16 @@ def translate_to_animation_names(text):
                 
         if best_match:
             # Recursively process the segment before the match
-            left_anims, left_unknowns, left_mphrases, left_mwords = match_segment(start, best_i)
+            left_anims, left_unknowns, left_mphrases, left_mwords, left_positions = match_segment(start, best_i)
             # Recursively process the segment after the match
-            right_anims, right_unknowns, right_mphrases, right_mwords = match_segment(best_i + best_k, end)
+            right_anims, right_unknowns, right_mphrases, right_mwords, right_positions = match_segment(
+                best_i + best_k, end
+            )
             
             anims = left_anims + [best_match] + right_anims
             unknowns = left_unknowns + right_unknowns
+            offset = len(left_anims) + 1
+            positions = left_positions + [offset + p for p in right_positions]
             
             mphrases = list(left_mphrases)
             mwords = list(left_mwords)
@@ -122,11 +163,12 @@ def translate_to_animation_names(text):
             mphrases.extend(right_mphrases)
             mwords.extend(right_mwords)
             
-            return anims, unknowns, mphrases, mwords
+            return anims, unknowns, mphrases, mwords, positions
         else:
             # No match found in this segment at all.
             unmatched_anims = []
             unmatched_unknowns = []
+            unmatched_positions = []
             
             for idx in range(start, end):
                 u = words[idx]
@@ -136,13 +178,17 @@ def translate_to_animation_names(text):
                     f_anims = fingerspell(u)
                     unmatched_anims.extend(f_anims)
                     logger.info("FINGERSPELL NAME : %r -> %s", u, f_anims)
+                elif (stem_anim := _stem_match(u)) is not None:
+                    # Second chance: the exact match failed, try the light stem
+                    unmatched_anims.append(stem_anim)
                 else:
                     logger.warning("UNKNOWN WORD     : %r", u)
                     unmatched_unknowns.append(u)
+                    unmatched_positions.append(len(unmatched_anims))
                     
-            return unmatched_anims, unmatched_unknowns, [], []
+            return unmatched_anims, unmatched_unknowns, [], [], unmatched_positions
 
-    animations, unknown_words, matched_phrases, matched_words = match_segment(0, n)
+    animations, unknown_words, matched_phrases, matched_words, unknown_positions = match_segment(0, n)
 
     if not unknown_words and len(animations) == 1 and matched_phrases and matched_phrases[0] == text_clean:
         logger.info("MATCH TYPE       : FULL SENTENCE")
@@ -157,4 +203,32 @@ def translate_to_animation_names(text):
     return {
         "animations": animations,
         "unknown_words": unknown_words,
-    }
\ No newline at end of file
+        "unknown_positions": unknown_positions,
+    }
+
+
+def splice_resolved(match, resolved):
+    """
+    Merge resolutions of a match's unknown words back into its animations.
+
+    ``resolved`` maps an unknown word to its gloss tokens; each one is
+    inserted where the word stood in the text, not appended after the
+    sign-map animations. Returns ``(animations, unknown_words)``, the
+    latter being the words ``resolved`` has no gloss for.
+    """
+    animations = match["animations"]
+    unknown_words = match["unknown_words"]
+    positions = match.get("unknown_positions") or [len(animations)] * len(unknown_words)
+
+    merged, still_unknown = [], []
+    done = 0
+    for word, position in zip(unknown_words, positions):
+        merged.extend(animations[done:position])
+        done = position
+        gloss = resolved.get(word.strip())
+        if gloss:
+            merged.extend(gloss)
+        else:
+            still_unknown.append(word)
+    merged.extend(animations[done:])
+    return merged, still_unknown
\ No newline at end of file
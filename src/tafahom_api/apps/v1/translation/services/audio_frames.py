@@ -0,0 +1,73 @@
+import struct
+from dataclasses import dataclass
+
+# Binary WebSocket frames sent server → client carry a fixed 14-byte header
+# followed by the payload:
+#
+#   offset  size  field
+#   0       2     magic      b"TA"
+#   2       1     version    1
+#   3       1     kind       FRAME_AUDIO / FRAME_AUDIO_END
+#   4       1     codec      CODEC_MPEG / CODEC_WAV
+#   5       1     flags      FLAG_CACHED
+#   6       4     stream_id  uint32, one per synthesized utterance
+#   10      4     sequence   uint32, 0-based within the stream
+#
+# All integers are big-endian. Video frames travel client → server only, so
+# the header never collides with the existing inbound binary protocol.
+
+MAGIC = b"TA"
+VERSION = 1
+HEADER = struct.Struct("!2sBBBBII")
+
+FRAME_AUDIO = 1
+FRAME_AUDIO_END = 2
+
+CODEC_MPEG = 1
+CODEC_WAV = 2
+
+FLAG_CACHED = 0x01
+
+MIME_TYPES = {CODEC_MPEG: "audio/mpeg", CODEC_WAV: "audio/wav"}
+
+
+@dataclass(frozen=True)
+class AudioFrame:
+    kind: int
+    codec: int
+    flags: int
+    stream_id: int
+    sequence: int
+    payload: bytes
+
+    @property
+    def cached(self) -> bool:
+        return bool(self.flags & FLAG_CACHED)
+
+    @property
+    def mime_type(self) -> str:
+        return MIME_TYPES.get(self.codec, "application/octet-stream")
+
+
+def encode_audio_frame(
+    payload: bytes,
+    *,
+    stream_id: int,
+    sequence: int = 0,
+    kind: int = FRAME_AUDIO,
+    codec: int = CODEC_MPEG,
+    flags: int = 0,
+) -> bytes:
+    header = HEADER.pack(
+        MAGIC, VERSION, kind, codec, flags, stream_id & 0xFFFFFFFF, sequence
+    )
+    return header + payload
+
+
+def decode_audio_frame(data: bytes) -> AudioFrame:
+    if len(data) < HEADER.size:
+        raise ValueError("Frame shorter than header")
+    magic, version, kind, codec, flags, stream_id, sequence = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not an audio frame")
+    return AudioFrame(kind, codec, flags, stream_id, sequence, data[HEADER.size :])
@@ -1,43 +1,209 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Optional
+import logging
+import threading
+import time
+
 from django.core.cache import cache
 from django.conf import settings
-import logging
+
+from tafahom_api.common.cache import CacheNamespace, pack, stable_hash, unpack
+from tafahom_api.common.singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
-CACHE_PREFIX = "translation_ai_"
+CACHE_NAMESPACE = "translation_ai"
 
-def get_cached_translation(normalized_text: str) -> dict | None:
+
+@dataclass(frozen=True)
+class CachedTranslation:
     """
-    Retrieve translation from cache based on normalized text.
+    A cache entry for the hybrid translation endpoint.
+
+    ``negative`` entries record that the AI failed for this text; their value
+    is the sign-matcher fallback served in the meantime.
+    """
+
+    value: dict
+    stored_at: float
+    negative: bool = False
+
+    @property
+    def age(self) -> float:
+        return max(time.time() - self.stored_at, 0.0)
+
+    @property
+    def stale(self) -> bool:
+        return self.age > getattr(settings, "TRANSLATION_CACHE_SOFT_TTL", 60 * 60 * 6)
+
+    @property
+    def status(self) -> str:
+        if self.negative:
+            return "negative"
+        return "stale" if self.stale else "fresh"
+
+
+@lru_cache(maxsize=1)
+def lexicon_fingerprint() -> str:
+    """Short digest of the sign map; editing it changes every cache key."""
+    from tafahom_api.apps.v1.translation.sign_map import ANIMATION_MAP, SYNONYM_MAP
+
+    lexicon = repr((sorted(ANIMATION_MAP.items()), sorted(SYNONYM_MAP.items())))
+    return stable_hash(lexicon)[:12]
+
+
+def _namespace() -> CacheNamespace:
+    version = getattr(settings, "TRANSLATION_CACHE_VERSION", "v1")
+    return CacheNamespace(CACHE_NAMESPACE, f"{version}-{lexicon_fingerprint()}")
+
+
+def _cache_key(normalized_text: str) -> str:
+    return _namespace().key(normalized_text)
+
+
+def invalidate_translation_cache() -> int:
+    """Drop every cached translation at once (e.g. after a model redeploy)."""
+    return _namespace().bump()
+
+
+def get_cached_translation(normalized_text: str) -> Optional[CachedTranslation]:
+    """
+    Retrieve the cache entry for normalized text, fresh, stale or negative.
+    Entries disappear from the cache after the hard TTL (``CACHE_TIMEOUT``).
     """
     if not normalized_text:
         return None
-        
-    cache_key = f"{CACHE_PREFIX}{normalized_text}"
+
     try:
-        result = cache.get(cache_key)
-        if result:
-            logger.info("Cache hit for text: %s", normalized_text)
-            return result
-        else:
-            logger.info("Cache miss for text: %s", normalized_text)
-            return None
+        entry = unpack(cache.get(_cache_key(normalized_text)))
     except Exception as e:
         logger.error("Error retrieving from cache: %s", e)
         return None
 
-def set_cached_translation(normalized_text: str, result: dict) -> None:
+    if not entry or "stored_at" not in entry:
+        logger.info("Cache miss for text: %s", normalized_text)
+        return None
+
+    cached = CachedTranslation(
+        value=entry["value"],
+        stored_at=entry["stored_at"],
+        negative=entry.get("negative", False),
+    )
+    logger.info("Cache %s for text: %s", cached.status, normalized_text)
+    return cached
+
+
+def _store(normalized_text: str, cached: CachedTranslation, timeout: int):
+    entry = {"value": cached.value, "stored_at": cached.stored_at, "negative": cached.negative}
+    try:
+        cache.set(_cache_key(normalized_text), pack(entry), timeout=timeout)
+    except Exception as e:
+        logger.error("Error setting cache: %s", e)
+
+
+def set_cached_translation(normalized_text: str, result: dict) -> CachedTranslation:
     """
-    Cache a successful AI translation.
+    Cache a successful AI translation until the hard TTL.
     """
-    if not normalized_text or not result:
-        return
-        
-    cache_key = f"{CACHE_PREFIX}{normalized_text}"
-    timeout = getattr(settings, 'CACHE_TIMEOUT', 86400)
-    
-    try:
-        cache.set(cache_key, result, timeout=timeout)
+    cached = CachedTranslation(value=result, stored_at=time.time())
+    if normalized_text and result:
+        _store(normalized_text, cached, getattr(settings, "CACHE_TIMEOUT", 86400))
         logger.info("Cached successful translation for text: %s", normalized_text)
+    return cached
+
+
+def set_negative_translation(normalized_text: str, fallback: dict) -> CachedTranslation:
+    """
+    Record an AI failure for a short while so an outage does not make every
+    request wait for the AI timeout; ``fallback`` is served until it expires.
+    """
+    cached = CachedTranslation(value=fallback, stored_at=time.time(), negative=True)
+    if normalized_text and fallback:
+        _store(normalized_text, cached, getattr(settings, "TRANSLATION_NEGATIVE_CACHE_TTL", 60))
+        logger.info("Cached AI failure for text: %s", normalized_text)
+    return cached
+
+
+_flight = SingleFlight(CACHE_NAMESPACE)
+
+
+def compute_once(
+    normalized_text: str, compute: Callable[[], CachedTranslation]
+) -> CachedTranslation:
+    """
+    Fill a missed entry with a single ``compute`` call across all concurrent
+    requests (threads and workers); the others get the entry it cached.
+    ``compute`` must store its result with ``set_cached_translation`` or
+    ``set_negative_translation``.
+    """
+    return _flight.do(
+        _cache_key(normalized_text),
+        lambda: get_cached_translation(normalized_text),
+        compute,
+    )
+
+
+# --------------------------------------------------
+# BACKGROUND REVALIDATION
+# --------------------------------------------------
+
+_refresh_pool: Optional[ThreadPoolExecutor] = None
+_refresh_pool_lock = threading.Lock()
+
+
+def _get_refresh_pool() -> ThreadPoolExecutor:
+    global _refresh_pool
+    if _refresh_pool is None:
+        with _refresh_pool_lock:
+            if _refresh_pool is None:
+                _refresh_pool = ThreadPoolExecutor(
+                    max_workers=getattr(settings, "TRANSLATION_REFRESH_WORKERS", 2),
+                    thread_name_prefix="translation-refresh",
+                )
+    return _refresh_pool
+
+
+def _refresh(normalized_text: str, compute: Callable[[], Optional[dict]]) -> bool:
+    try:
+        result = compute()
     except Exception as e:
-        logger.error("Error setting cache: %s", e)
+        logger.error("Background refresh crashed for text: %s. Error: %s", normalized_text, e)
+        return False
+    if not result:
+        logger.warning("Background refresh failed for text: %s", normalized_text)
+        return False
+    set_cached_translation(normalized_text, result)
+    return True
+
+
+def refresh_in_background(
+    normalized_text: str, compute: Callable[[], Optional[dict]]
+) -> bool:
+    """
+    Recompute a stale entry off the request thread.
+
+    ``cache.add`` acts as a lock shared by every worker, so only one refresh
+    runs per text. The lock is released when the refresh succeeds; after a
+    failure it is left to expire, which spaces out retries while the stale
+    entry keeps being served. Returns whether a refresh was scheduled.
+    """
+    lock_key = f"{_cache_key(normalized_text)}:refreshing"
+    lock_ttl = getattr(settings, "TRANSLATION_REFRESH_LOCK_TTL", 30)
+    try:
+        if not cache.add(lock_key, 1, timeout=lock_ttl):
+            return False
+    except Exception as e:
+        logger.error("Error taking refresh lock: %s", e)
+        return False
+
+    def run():
+        if _refresh(normalized_text, compute):
+            try:
+                cache.delete(lock_key)
+            except Exception as e:
+                logger.error("Error releasing refresh lock: %s", e)
+
+    _get_refresh_pool().submit(run)
+    return True
@@ -0,0 +1,77 @@
+import contextlib
+import contextvars
+import time
+from typing import Dict, Iterator, Optional
+
+
+class DeadlineExceeded(TimeoutError):
+    """The end-to-end pipeline budget ran out before (or during) a stage."""
+
+
+class Deadline:
+    """
+    End-to-end time budget for one pipeline run.
+
+    Stages read the remaining time to size their own timeouts, and record how
+    long they took so the result can report each stage's share of the budget.
+    """
+
+    def __init__(self, seconds: float):
+        self.budget = float(seconds)
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + self.budget
+        self.stages: Dict[str, float] = {}
+
+    def remaining(self) -> float:
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def timeout_for(self, stage_timeout: Optional[float] = None) -> float:
+        """The stage's own timeout, clamped to what is left of the budget."""
+        remaining = self.remaining()
+        if stage_timeout is None:
+            return remaining
+        return min(float(stage_timeout), remaining)
+
+    def record_stage(self, stage: str, elapsed_ms: float):
+        self.stages[stage] = self.stages.get(stage, 0.0) + elapsed_ms
+
+    def usage(self) -> Dict[str, float]:
+        """Fraction of the total budget consumed by each recorded stage."""
+        budget_ms = self.budget * 1000
+        if budget_ms <= 0:
+            return {}
+        return {stage: round(ms / budget_ms, 4) for stage, ms in self.stages.items()}
+
+
+_current_deadline: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar(
+    "pipeline_deadline", default=None
+)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current_deadline.get()
+
+
+@contextlib.contextmanager
+def deadline_scope(seconds: float) -> Iterator[Deadline]:
+    """
+    Run the enclosed code under a deadline ``seconds`` from now.
+
+    A nested scope never extends an enclosing one: if the outer deadline
+    expires sooner, the outer deadline is reused as-is.
+    """
+    outer = _current_deadline.get()
+    if outer is not None and outer.remaining() <= seconds:
+        yield outer
+        return
+
+    deadline = Deadline(seconds)
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 
 @dataclass
@@ -36,6 +36,9 @@ class TranslationPipelineResult:
     total_latency_ms: Optional[float] = None
     cv_retries: int = 0
     nlp_retries: int = 0
+    # End-to-end deadline and the fraction of it each stage consumed
+    budget_ms: Optional[float] = None
+    budget_used: Dict[str, float] = field(default_factory=dict)
 
 
 @dataclass
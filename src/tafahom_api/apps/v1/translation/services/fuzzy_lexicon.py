@@ -0,0 +1,158 @@
+import logging
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Optimal string alignment distance (insertions, deletions, substitutions
+    and adjacent transpositions), or ``max_distance + 1`` once it is certain
+    to exceed ``max_distance``.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def _deletes(word: str, max_distance: int) -> Set[str]:
+    """Every string obtained by removing up to ``max_distance`` characters."""
+    found = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1 :] for w in frontier for i in range(len(w))} - found
+        found |= frontier
+    return found
+
+
+@dataclass(frozen=True)
+class FuzzyMatch:
+    word: str
+    term: str  # lexicon entry it was matched to
+    animation: str
+    distance: int
+
+    @property
+    def length(self) -> int:
+        return max(len(self.word), len(self.term))
+
+
+class FuzzyLexicon:
+    """
+    SymSpell deletion dictionary over the single-word lexicon entries.
+
+    Every entry is indexed under all its variants with up to ``max_distance``
+    characters deleted. A lookup generates the same deletions of the input
+    word and verifies the few entries they hit with the real edit distance,
+    so its cost depends on the word length, not on the lexicon size.
+
+    Each distance has its own threshold: ``distance_lengths[d - 1]`` is the
+    shortest length, of the word or the entry whichever is longer, at which
+    ``d`` edits are accepted. With the defaults a word of at least 4 letters
+    is matched at 1 edit when one side has 5 letters or more (so "مقهر"
+    finds "مقهور" but "كلمه" is not taken for "كليه"), and at 2 edits only
+    from 8 letters on. A match is also rejected when another entry with a
+    different animation is as close: an ambiguous typo is left to the LLM.
+    """
+
+    def __init__(
+        self,
+        words: Dict[str, str],
+        max_distance: int = 2,
+        distance_lengths: Sequence[int] = (5, 8),
+        min_length: int = 4,
+    ):
+        self.words = dict(words)
+        self.max_distance = min(max_distance, len(distance_lengths))
+        self.distance_lengths = tuple(distance_lengths)
+        self.min_length = min_length
+        self._deletes: Dict[str, List[str]] = defaultdict(list)
+        for term in self.words:
+            for variant in _deletes(term, self.max_distance):
+                self._deletes[variant].append(term)
+
+    def __len__(self):
+        return len(self.words)
+
+    def candidates(self, word: str) -> List[FuzzyMatch]:
+        """Entries within ``max_distance`` of ``word``, closest first."""
+        seen: Set[str] = set()
+        matches: List[FuzzyMatch] = []
+        for variant in _deletes(word, self.max_distance):
+            for term in self._deletes.get(variant, ()):
+                if term in seen:
+                    continue
+                seen.add(term)
+                distance = edit_distance(word, term, self.max_distance)
+                if distance <= self.max_distance:
+                    matches.append(FuzzyMatch(word, term, self.words[term], distance))
+        matches.sort(key=lambda m: (m.distance, m.term))
+        return matches
+
+    def lookup(self, word: str) -> Optional[FuzzyMatch]:
+        """The confident, unambiguous match for ``word``, if any."""
+        if len(word) < self.min_length or " " in word:
+            return None
+        matches = self.candidates(word)
+        if not matches:
+            return None
+        best = matches[0]
+        if best.distance and best.length < self.distance_lengths[best.distance - 1]:
+            return None
+        rivals = {m.animation for m in matches if m.distance == best.distance}
+        if len(rivals) > 1:
+            logger.debug("Ambiguous fuzzy match for %r: %s", word, sorted(rivals))
+            return None
+        return best
+
+
+_lexicon: Optional[FuzzyLexicon] = None
+_lexicon_lock = threading.Lock()
+
+
+def get_fuzzy_lexicon() -> FuzzyLexicon:
+    """Process-wide index over the sign map, built on first use."""
+    global _lexicon
+    if _lexicon is None:
+        with _lexicon_lock:
+            if _lexicon is None:
+                from .animation_service import lexicon_words
+
+                _lexicon = FuzzyLexicon(
+                    lexicon_words(),
+                    max_distance=getattr(settings, "FUZZY_LEXICON_MAX_DISTANCE", 2),
+                    distance_lengths=getattr(settings, "FUZZY_LEXICON_DISTANCE_LENGTHS", (5, 8)),
+                    min_length=getattr(settings, "FUZZY_LEXICON_MIN_LENGTH", 4),
+                )
+    return _lexicon
+
+
+def fuzzy_resolve(phrases: Iterable[str]) -> Dict[str, List[str]]:
+    """Animations of the phrases the fuzzy index can match confidently."""
+    if not getattr(settings, "FUZZY_LEXICON_ENABLED", True):
+        return {}
+    lexicon = get_fuzzy_lexicon()
+    resolved: Dict[str, List[str]] = {}
+    for phrase in phrases:
+        match = lexicon.lookup(phrase)
+        if match is not None:
+            logger.info("FUZZY MATCH      : %r -> %r (%s)", phrase, match.term, match.animation)
+            resolved[phrase] = [match.animation]
+    return resolved
@@ -0,0 +1,202 @@
+import asyncio
+import logging
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_worker():
+    """Pool initializer: build the sign-map trie once per worker, not per call."""
+    import tafahom_api.apps.v1.translation.services.animation_service  # noqa: F401
+
+
+def _match_in_worker(text: str, submitted_at: float):
+    from tafahom_api.apps.v1.translation.services.animation_service import (
+        translate_to_animation_names,
+    )
+
+    started_at = time.time()
+    return translate_to_animation_names(text), (started_at - submitted_at) * 1000
+
+
+class SignMatcher:
+    """
+    Facade over ``translate_to_animation_names`` that keeps the event loop free.
+
+    Inputs up to ``offload_words`` words are matched inline (a short sentence
+    costs less than a pool round trip). Longer inputs (transcripts, long NLP
+    gloss output) run on a dedicated process pool whose workers import the
+    sign-map trie when they start, so a big job never holds the GIL of the
+    process serving WebSockets. Time spent waiting for a free worker is
+    tracked and exposed through ``stats()``.
+    """
+
+    def __init__(
+        self,
+        offload_words: Optional[int] = None,
+        workers: Optional[int] = None,
+        executor: Optional[str] = None,
+    ):
+        self.offload_words = offload_words or getattr(
+            settings, "SIGN_MATCHER_OFFLOAD_WORDS", 300
+        )
+        self.workers = workers or getattr(settings, "SIGN_MATCHER_WORKERS", 2)
+        self.executor_kind = executor or getattr(settings, "SIGN_MATCHER_EXECUTOR", "process")
+
+        self._pool: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=512)
+        self.inline = 0
+        self.offloaded = 0
+        self.in_flight = 0
+
+    # --------------------------------------------------
+    # POOL
+    # --------------------------------------------------
+
+    def _make_pool(self) -> Executor:
+        if self.executor_kind == "thread":
+            return ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix="sign-matcher",
+                initializer=_warm_worker,
+            )
+        # spawn, not fork: the server process is multi-threaded
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_worker,
+        )
+
+    @property
+    def pool(self) -> Executor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = self._make_pool()
+        return self._pool
+
+    def warm(self):
+        """Start every worker now (called on ASGI startup) instead of on first use."""
+        futures = [self.pool.submit(_warm_worker) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    # --------------------------------------------------
+    # MATCHING
+    # --------------------------------------------------
+
+    def should_offload(self, text: str) -> bool:
+        return bool(text) and len(text.split()) > self.offload_words
+
+    def _submit(self, text: str):
+        with self._lock:
+            self.offloaded += 1
+            self.in_flight += 1
+        return self.pool.submit(_match_in_worker, text, time.time())
+
+    def _done(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def _record_wait(self, wait_ms: float, words: int):
+        with self._lock:
+            self._waits.append(wait_ms)
+        logger.info(
+            "sign_matcher_offload",
+            extra={"words": words, "queue_wait_ms": round(wait_ms, 1)},
+        )
+
+    def _inline(self, text: str) -> dict:
+        from tafahom_api.apps.v1.translation.services.animation_service import (
+            translate_to_animation_names,
+        )
+
+        with self._lock:
+            self.inline += 1
+        return translate_to_animation_names(text)
+
+    async def match(self, text: str) -> dict:
+        """Async entry point (consumers, async services)."""
+        if not self.should_offload(text):
+            return self._inline(text)
+        try:
+            result, wait_ms = await asyncio.wrap_future(self._submit(text))
+        except BrokenProcessPool:
+            self._restart()
+            return await asyncio.to_thread(self._inline, text)
+        finally:
+            self._done()
+        self._record_wait(wait_ms, len(text.split()))
+        return result
+
+    def match_blocking(self, text: str) -> dict:
+        """Sync entry point (sync views, transcript jobs)."""
+        if not self.should_offload(text):
+            return self._inline(text)
+        try:
+            result, wait_ms = self._submit(text).result()
+        except BrokenProcessPool:
+            self._restart()
+            return self._inline(text)
+        finally:
+            self._done()
+        self._record_wait(wait_ms, len(text.split()))
+        return result
+
+    def _restart(self):
+        logger.error("Sign matcher pool crashed; matching inline and restarting it")
+        self.shutdown()
+
+    def stats(self) -> dict:
+        with self._lock:
+            waits = sorted(self._waits)
+            inline, offloaded, in_flight = self.inline, self.offloaded, self.in_flight
+
+        def pct(q):
+            if not waits:
+                return None
+            return round(waits[min(int(q * len(waits)), len(waits) - 1)], 1)
+
+        return {
+            "executor": self.executor_kind,
+            "workers": self.workers,
+            "offload_words": self.offload_words,
+            "inline": inline,
+            "offloaded": offloaded,
+            "in_flight": in_flight,
+            "queue_wait_ms": {"p50": pct(0.5), "p90": pct(0.9), "max": pct(1.0)},
+        }
+
+
+_matcher: Optional[SignMatcher] = None
+_matcher_lock = threading.Lock()
+
+
+def get_sign_matcher() -> SignMatcher:
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = SignMatcher()
+    return _matcher
+
+
+def shutdown_sign_matcher():
+    """Stop the worker pool; called from the ASGI lifespan shutdown event."""
+    if _matcher is not None:
+        _matcher.shutdown()
@@ -5,15 +5,29 @@ import time
 import uuid
 from typing import Any, Callable, Dict, List, Optional
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
 
+from tafahom_api.apps.v1.ai.clients.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    get_breaker,
+    is_backend_failure,
+    is_caller_error,
+)
 from tafahom_api.apps.v1.ai.clients.cv_ws_client import get_cv_client
 from tafahom_api.apps.v1.ai.clients.nlp_model_client import NLPModelClient
 from tafahom_api.apps.v1.ai.clients.text_to_gloss_client import TextToGlossClient
 from tafahom_api.apps.v1.ai.clients.speech_to_text_client import SpeechToTextClient
 from tafahom_api.apps.v1.ai.clients.text_to_speech_client import TextToSpeechClient
-from tafahom_api.apps.v1.ai.utils.ensure_wav import ensure_wav
+from tafahom_api.apps.v1.ai.telemetry import record_ai_request
+from tafahom_api.apps.v1.ai.utils.audio_ingest import ingest_audio
 
+from tafahom_api.apps.v1.translation.services.deadline import (
+    DeadlineExceeded,
+    current_deadline,
+    deadline_scope,
+)
 from tafahom_api.apps.v1.translation.services.dtos import (
     CVResponse,
     NLPResponse,
@@ -101,6 +115,15 @@ class PredictionStabilizer:
 class RetryHandler:
     """
     Async retry with exponential backoff for AI service calls.
+
+    When a CircuitBreaker is passed to ``execute`` every attempt is reported
+    to it, and an open breaker aborts the remaining attempts immediately.
+    Only transport errors, timeouts and 5xx answers count as failures; caller
+    errors (invalid input, other 4xx) are re-raised at once, without a retry.
+
+    Under a pipeline deadline (see ``deadline_scope``) each attempt's timeout
+    is clamped to the time remaining, and a retry is skipped when the backoff
+    delay plus ``min_attempt_seconds`` no longer fits in the budget.
     """
 
     def __init__(
@@ -109,28 +132,49 @@ class RetryHandler:
         base_delay: float = 0.5,
         max_delay: float = 5.0,
         backoff_factor: float = 2.0,
+        min_attempt_seconds: float = 0.25,
     ):
         self.max_retries = max_retries
         self.base_delay = base_delay
         self.max_delay = max_delay
         self.backoff_factor = backoff_factor
+        self.min_attempt_seconds = min_attempt_seconds
 
     async def execute(
         self,
         coro_factory: Callable,
         service_name: str = "unknown",
         timeout: Optional[float] = None,
+        breaker: Optional[CircuitBreaker] = None,
     ) -> Any:
         last_exc = None
+        deadline = current_deadline()
 
         for attempt in range(1, self.max_retries + 1):
+            attempt_timeout = timeout
+            if deadline:
+                if deadline.expired:
+                    raise DeadlineExceeded(f"{service_name} deadline exceeded")
+                attempt_timeout = deadline.timeout_for(timeout)
+            # Timeouts caused by the caller's budget say nothing about the backend
+            clamped = deadline is not None and (timeout is None or attempt_timeout < timeout)
+
+            if breaker:
+                try:
+                    breaker.before_call()
+                except CircuitOpenError as exc:
+                    logger.warning("%s skipped: %s", service_name, exc)
+                    raise
+
             try:
                 coro = coro_factory()
-                if timeout:
-                    result = await asyncio.wait_for(coro, timeout=timeout)
+                if attempt_timeout:
+                    result = await asyncio.wait_for(coro, timeout=attempt_timeout)
                 else:
                     result = await coro
 
+                if breaker:
+                    breaker.record_success()
                 if attempt > 1:
                     logger.info(
                         "%s succeeded on retry %d",
@@ -140,6 +184,8 @@ class RetryHandler:
                 return result
 
             except asyncio.TimeoutError:
+                if breaker and not clamped:
+                    breaker.record_failure()
                 last_exc = TimeoutError(f"{service_name} timed out")
                 logger.warning(
                     "%s timeout (attempt %d/%d)",
@@ -148,6 +194,10 @@ class RetryHandler:
                     self.max_retries,
                 )
             except Exception as exc:
+                if is_caller_error(exc):
+                    raise
+                if breaker and is_backend_failure(exc):
+                    breaker.record_failure()
                 last_exc = exc
                 logger.warning(
                     "%s failed (attempt %d/%d): %s",
@@ -162,6 +212,13 @@ class RetryHandler:
                     self.base_delay * (self.backoff_factor ** (attempt - 1)),
                     self.max_delay,
                 )
+                if deadline and deadline.remaining() < delay + self.min_attempt_seconds:
+                    logger.warning(
+                        "%s retry skipped: %.2fs left of pipeline budget",
+                        service_name,
+                        deadline.remaining(),
+                    )
+                    break
                 await asyncio.sleep(delay)
 
         raise last_exc or RuntimeError(f"{service_name} failed after {self.max_retries} retries")
@@ -229,6 +286,35 @@ class SignTranslationService:
         Returns:
             TranslationPipelineResult with gloss, text, and timing metadata.
         """
+        with deadline_scope(self.config.pipeline_timeout_seconds) as deadline:
+            result = await self._translate(frames, session_id)
+        return self._with_budget(result, deadline)
+
+    async def translate_landmarks(
+        self, sequence: list, session_id: Optional[str] = None
+    ) -> TranslationPipelineResult:
+        """
+        Run the full CV → NLP translation pipeline on a sequence of landmarks.
+        """
+        with deadline_scope(self.config.pipeline_timeout_seconds) as deadline:
+            result = await self._translate_landmarks(sequence, session_id)
+        return self._with_budget(result, deadline)
+
+    @staticmethod
+    def _record_stage(stage: str, elapsed_ms: float):
+        deadline = current_deadline()
+        if deadline:
+            deadline.record_stage(stage, elapsed_ms)
+
+    @staticmethod
+    def _with_budget(result: TranslationPipelineResult, deadline) -> TranslationPipelineResult:
+        result.budget_ms = round(deadline.budget * 1000, 2)
+        result.budget_used = deadline.usage()
+        return result
+
+    async def _translate(
+        self, frames: List[bytes], session_id: Optional[str] = None
+    ) -> TranslationPipelineResult:
         request_id = session_id or f"tr_{int(time.time() * 1000)}"
         overall_start = time.perf_counter()
         cv_latency: Optional[float] = None
@@ -260,6 +346,7 @@ class SignTranslationService:
             combined_chunk, request_id
         )
         cv_latency = (time.perf_counter() - cv_start) * 1000
+        self._record_stage("cv", cv_latency)
 
         gloss = cv_result.gloss
         gloss_upper = gloss.strip().upper()
@@ -286,6 +373,7 @@ class SignTranslationService:
             gloss_upper, request_id
         )
         nlp_latency = (time.perf_counter() - nlp_start) * 1000
+        self._record_stage("nlp", nlp_latency)
 
         text = nlp_result.text
 
@@ -324,12 +412,11 @@ class SignTranslationService:
             nlp_retries=nlp_retries,
         )
 
-    async def translate_landmarks(
+    async def _translate_landmarks(
         self, sequence: list, session_id: Optional[str] = None
     ) -> TranslationPipelineResult:
         """
-        Run the full CV → NLP translation pipeline on a sequence of landmarks.
-        Includes comprehensive diagnostic logging to compare production vs training input.
+        Landmark pipeline body; includes comprehensive diagnostic logging to compare production vs training input.
         """
         import numpy as np
 
@@ -408,6 +495,7 @@ class SignTranslationService:
         cv_start = time.perf_counter()
         cv_result = await self._call_cv_landmarks_with_retry(sequence, request_id)
         cv_latency = (time.perf_counter() - cv_start) * 1000
+        self._record_stage("cv", cv_latency)
 
         raw_gloss = cv_result.gloss
 
@@ -463,6 +551,7 @@ class SignTranslationService:
         nlp_start = time.perf_counter()
         nlp_result = await self._call_nlp_with_retry(gloss_upper, request_id)
         nlp_latency = (time.perf_counter() - nlp_start) * 1000
+        self._record_stage("nlp", nlp_latency)
 
         text = nlp_result.text
 
@@ -496,12 +585,15 @@ class SignTranslationService:
             await self.cv_client.send_video_chunk(video_chunk)
             return await self.cv_client.receive_gloss()
 
+        start = time.perf_counter()
         try:
             result = await self.retry_handler.execute(
                 _cv_flow,
                 service_name="CV",
                 timeout=timeout,
+                breaker=get_breaker("cv"),
             )
+            record_ai_request("cv", "receive_gloss", "success", (time.perf_counter() - start) * 1000)
             if isinstance(result, CVResponse):
                 return result
             if isinstance(result, dict):
@@ -511,6 +603,13 @@ class SignTranslationService:
                 return CVResponse(gloss=gloss, raw=result)
             return CVResponse(gloss="")
         except Exception as exc:
+            record_ai_request(
+                "cv",
+                "receive_gloss",
+                "timeout" if isinstance(exc, TimeoutError) else "failed",
+                (time.perf_counter() - start) * 1000,
+                error_message=str(exc),
+            )
             logger.error(
                 "cv_failed_after_retries",
                 extra={
@@ -539,15 +638,25 @@ class SignTranslationService:
             else:
                 raise NotImplementedError("CV client does not support passing sequence to receive_gloss")
 
+        start = time.perf_counter()
         try:
             result = await self.retry_handler.execute(
                 _cv_flow,
                 service_name="CV_Landmarks",
                 timeout=timeout,
+                breaker=get_breaker("cv"),
             )
+            record_ai_request("cv", "predict_landmarks", "success", (time.perf_counter() - start) * 1000)
             # receive_gloss always returns CVResponse; no need for isinstance fallbacks
             return result
         except Exception as exc:
+            record_ai_request(
+                "cv",
+                "predict_landmarks",
+                "timeout" if isinstance(exc, TimeoutError) else "failed",
+                (time.perf_counter() - start) * 1000,
+                error_message=str(exc),
+            )
             logger.error(f"cv_landmarks_failed: {exc}")
             await self._emit_event(
                 "translation_error",
@@ -570,6 +679,7 @@ class SignTranslationService:
                 lambda: self.nlp_client.translate_gloss(gloss),
                 service_name="NLP",
                 timeout=timeout,
+                breaker=get_breaker("nlp"),
             )
             if isinstance(result, NLPResponse):
                 return result
@@ -639,20 +749,21 @@ class SignTranslationService:
 
         # Phase 1: Try direct phrase/word match using the unified animation service
         # This handles phrase priorities, synonym replacements, and word boundaries automatically
-        from tafahom_api.apps.v1.translation.services.animation_service import translate_to_animation_names
-        
-        match_result = translate_to_animation_names(text)
+        from tafahom_api.apps.v1.translation.services.matcher_pool import get_sign_matcher
+
+        match_result = await get_sign_matcher().match(text)
         resolved = list(match_result["animations"])
         unmatched = list(match_result["unknown_words"])
 
-        # Phase 2: Send only unmatched words to NLP text-to-gloss
+        # Phase 2: Resolve unmatched words through the unknown-word store;
+        # only the words it has never seen go to NLP text-to-gloss, in one batch.
+        # Their glosses are spliced back where the words stood.
         if unmatched:
-            nlp_resp = await cls._with_timeout(
-                TextToGlossClient().text_to_gloss(" ".join(unmatched))
-            )
-            # This needs slightly adjusted logic because _extract_gloss also attempts dictionary mapping internally
-            nlp_resolved = cls._extract_gloss(nlp_resp)
-            resolved.extend(nlp_resolved)
+            from tafahom_api.apps.v1.translation.services.animation_service import splice_resolved
+            from tafahom_api.apps.v1.translation.services.unknown_words import resolve_unknown_words
+
+            resolution = await cls._with_timeout(resolve_unknown_words(unmatched))
+            resolved, _ = splice_resolved(match_result, resolution.resolved)
 
         # Deduplicate while preserving order
         seen: set = set()
@@ -665,7 +776,8 @@ class SignTranslationService:
         if not gloss:
             raise ValueError(f"No supported sign tokens found for input: {text}")
 
-        video_url = generate_sign_video_from_gloss(gloss)
+        # ffmpeg, or waiting for another request's render, blocks: keep it off the loop
+        video_url = await sync_to_async(generate_sign_video_from_gloss, thread_sensitive=False)(gloss)
         logger.info(
             "text_to_sign_success",
             extra={
@@ -682,8 +794,8 @@ class SignTranslationService:
     async def voice_to_sign(cls, uploaded_file) -> Dict[str, Any]:
         request_id = str(uuid.uuid4())
         start = time.perf_counter()
-        wav_file = ensure_wav(uploaded_file)
-        stt_resp = await cls._with_timeout(SpeechToTextClient().speech_to_text(wav_file))
+        audio = await ingest_audio(uploaded_file)
+        stt_resp = await cls._with_timeout(SpeechToTextClient().speech_to_text(audio))
         text = stt_resp.get("text")
         if not text:
             raise RuntimeError("STT returned empty text")
@@ -693,6 +805,7 @@ class SignTranslationService:
             extra={
                 "request_id": request_id,
                 "gloss": result["gloss"],
+                "audio_transcoded": audio.transcoded,
                 "duration_ms": (time.perf_counter() - start) * 1000,
             },
         )
@@ -3,6 +3,7 @@
 import os
 import subprocess
 import hashlib
+from tafahom_api.common.singleflight import SingleFlight
 from ..sign_map import ANIMATION_MAP, SIGN_MAP
 
 MEDIA_ROOT = "/app/media"
@@ -11,6 +12,9 @@ GENERATED_DIR = os.path.join(MEDIA_ROOT, "generated")
 
 os.makedirs(GENERATED_DIR, exist_ok=True)
 
+# Rendering takes a while; keep the lease longer than a typical ffmpeg run
+_render_flight = SingleFlight("sign_video", lease=120)
+
 
 def generate_sign_video_from_gloss(gloss_tokens: list[str]) -> str:
     if not gloss_tokens:
@@ -29,36 +33,52 @@ def generate_sign_video_from_gloss(gloss_tokens: list[str]) -> str:
 
     sentence_hash = hashlib.md5("_".join(gloss_tokens).encode()).hexdigest()
     output_path = os.path.join(GENERATED_DIR, f"{sentence_hash}.mp4")
+    video_url = f"https://www.tafahom.io/media/generated/{sentence_hash}.mp4"
+
+    def load():
+        return video_url if os.path.exists(output_path) else None
 
-    if os.path.exists(output_path):
-        return f"https://www.tafahom.io/media/generated/{sentence_hash}.mp4"
+    def render():
+        # Render to a private file and move it into place, so a reader never
+        # sees a half-written video
+        tmp_path = f"{output_path}.{os.getpid()}.tmp.mp4"
+        list_file = f"/tmp/{sentence_hash}.{os.getpid()}.txt"
+        with open(list_file, "w") as f:
+            for file in files:
+                f.write(f"file '{file}'\n")
 
-    list_file = f"/tmp/{sentence_hash}.txt"
-    with open(list_file, "w") as f:
-        for file in files:
-            f.write(f"file '{file}'\n")
+        try:
+            subprocess.run(
+                [
+                    "ffmpeg",
+                    "-y",
+                    "-f",
+                    "concat",
+                    "-safe",
+                    "0",
+                    "-i",
+                    list_file,
+                    "-vf",
+                    "scale=720:1280,fps=30",
+                    "-c:v",
+                    "libx264",
+                    "-pix_fmt",
+                    "yuv420p",
+                    "-movflags",
+                    "+faststart",
+                    tmp_path,
+                ],
+                check=True,
+            )
+            os.replace(tmp_path, output_path)
+        finally:
+            for path in (list_file, tmp_path):
+                if os.path.exists(path):
+                    os.remove(path)
+        return video_url
 
-    subprocess.run(
-        [
-            "ffmpeg",
-            "-y",
-            "-f",
-            "concat",
-            "-safe",
-            "0",
-            "-i",
-            list_file,
-            "-vf",
-            "scale=720:1280,fps=30",
-            "-c:v",
-            "libx264",
-            "-pix_fmt",
-            "yuv420p",
-            "-movflags",
-            "+faststart",
-            output_path,
-        ],
-        check=True,
-    )
+    if load():
+        return video_url
 
-    return f"https://www.tafahom.io/media/generated/{sentence_hash}.mp4"
+    # One ffmpeg run per sentence, however many requests ask for it at once
+    return _render_flight.do(sentence_hash, load, render)
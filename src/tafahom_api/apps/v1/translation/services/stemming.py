@@ -0,0 +1,90 @@
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+# Applied to text already passed through normalize_arabic (ة → ه, ى → ي, ...).
+# Longest affixes first; at most one prefix and one suffix are removed.
+PREFIXES = ("وال", "فال", "بال", "كال", "لل", "ال", "و")
+SUFFIXES = ("هما", "ات", "ان", "ون", "ين", "يه", "ها", "هم", "نا", "كم", "ه", "ي")
+
+# Shortest stem kept after stripping; shorter results keep the affix
+MIN_STEM = 3
+
+
+def _strip_prefix(word: str) -> str:
+    for prefix in PREFIXES:
+        if word.startswith(prefix) and len(word) - len(prefix) >= MIN_STEM:
+            return word[len(prefix) :]
+    return word
+
+
+def _strip_suffix(word: str) -> str:
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM:
+            return word[: -len(suffix)]
+    return word
+
+
+@lru_cache(maxsize=8192)
+def light_stem(word: str) -> str:
+    """
+    Light stem of a normalized Arabic word: strip one definite-article or
+    conjunction prefix (ال, وال, بال, لل, و, ...) and one plural, dual,
+    feminine or pronoun suffix (ات, ين, ون, ان, ه, ها, ...).
+
+    No root extraction and no infix handling: the goal is only to bring
+    inflected forms of a lexicon entry back to the stem of that entry.
+    """
+    return _strip_suffix(_strip_prefix(word))
+
+
+@lru_cache(maxsize=8192)
+def stem_candidates(word: str) -> Tuple[str, ...]:
+    """
+    Forms of ``word`` to try against the lexicon, least stripped first:
+    without its prefix, without its suffix, then without both.
+    """
+    candidates = []
+    for form in (_strip_prefix(word), _strip_suffix(word), light_stem(word)):
+        if form != word and form not in candidates:
+            candidates.append(form)
+    return tuple(candidates)
+
+
+class StemIndex:
+    """
+    Second-chance lookup of single words the exact trie match missed.
+
+    Built from the lexicon's single-word entries: each entry is registered
+    under its light stem. A stem shared by entries with different
+    animations is ambiguous and maps to nothing. A word is resolved by
+    trying its stem candidates, first as exact entries (so "الاسعاف" finds
+    "اسعاف" itself), then as registered stems (so "مستشفيات" and
+    "مستشفي" meet at "مستشف").
+    """
+
+    def __init__(self, words: Dict[str, str]):
+        self.words = dict(words)
+        self.stems: Dict[str, Optional[str]] = {}
+        for word, animation in self.words.items():
+            stem = light_stem(word)
+            if self.stems.get(stem, animation) != animation:
+                self.stems[stem] = None
+            else:
+                self.stems[stem] = animation
+
+    def __len__(self):
+        return len(self.stems)
+
+    def lookup(self, word: str) -> Optional[Tuple[str, str]]:
+        """``(canonical entry or stem, animation)`` for ``word``, or ``None``."""
+        if word in self.words:
+            return None  # exact entries belong to the trie, never to the stemmer
+        candidates = stem_candidates(word)
+        for form in candidates:
+            if form in self.words:
+                return form, self.words[form]
+        for form in (*candidates, light_stem(word)):
+            animation = self.stems.get(form)
+            if animation is not None:
+                return form, animation
+        return None
@@ -4,17 +4,25 @@ import asyncio
 import uuid
 import logging
 import base64
+import itertools
 from collections import deque
 from typing import List, Optional, Callable
 
+from django.conf import settings
 from django.utils import timezone
 from channels.db import database_sync_to_async
 
+from .audio_frames import FLAG_CACHED, FRAME_AUDIO_END, encode_audio_frame
+from .deadline import deadline_scope
 from .sign_translation_service import SignTranslationService, PipelineConfig
 
 logger = logging.getLogger(__name__)
 
 
+async def _yield_once(data: bytes):
+    yield data
+
+
 class StreamingTranslationService:
     """
     Stateful Logic for WebSocket Streaming.
@@ -24,6 +32,11 @@ class StreamingTranslationService:
     - Buffer frames
     - Every SEND_INTERVAL → CV → gloss → text
     - When user stops → generate VOICE ONCE
+
+    Voice is delivered either base64 in a JSON ``tts_audio`` message (default)
+    or, when the client starts with ``audio_transport: "binary"``, streamed as
+    binary frames with the header defined in ``audio_frames``: one frame per
+    chunk as the TTS backend produces it, then an end-of-stream frame.
     """
 
     def __init__(
@@ -33,13 +46,18 @@ class StreamingTranslationService:
         send_json,
         close_ws,
         config,
+        send_bytes: Optional[Callable] = None,
         sign_service: Optional[SignTranslationService] = None,
     ):
         self.user = user
         self.send_json = send_json
+        self.send_bytes = send_bytes
         self.close_ws = close_ws
         self.config = config
 
+        self.audio_transport = "json"
+        self._audio_stream_ids = itertools.count(1)
+
         self.session_id = str(uuid.uuid4())
         self.requests_count = 0
 
@@ -147,10 +165,15 @@ class StreamingTranslationService:
     # SESSION MANAGEMENT
     # --------------------------------------------------
 
-    async def start_translation(self, output_type: str):
+    async def start_translation(self, output_type: str, audio_transport: str = "json"):
         if self.running:
             return
 
+        if audio_transport == "binary" and self.send_bytes is not None:
+            self.audio_transport = "binary"
+        else:
+            self.audio_transport = "json"
+
         if self.requests_count >= self.config["MAX_REQUESTS_PER_SESSION"]:
             await self.send_json({"type": "error", "message": "Session quota exceeded"})
             await self.close_ws(code=4011)
@@ -306,9 +329,21 @@ class StreamingTranslationService:
 
     async def _process_batch(self, frames: List[bytes]):
         try:
-            result = await asyncio.wait_for(
-                self.sign_service.translate(frames, session_id=self.session_id),
-                timeout=self.config["PIPELINE_TIMEOUT_SECONDS"],
+            # The deadline is set before wait_for so the pipeline task inherits it:
+            # every stage sizes its timeout and retries from what is left.
+            with deadline_scope(self.config["PIPELINE_TIMEOUT_SECONDS"]) as deadline:
+                result = await asyncio.wait_for(
+                    self.sign_service.translate(frames, session_id=self.session_id),
+                    timeout=deadline.remaining(),
+                )
+
+            logger.info(
+                "pipeline_budget",
+                extra={
+                    "session_id": self.session_id,
+                    "budget_ms": result.budget_ms,
+                    "budget_used": result.budget_used,
+                },
             )
 
             if result.success and result.text:
@@ -371,17 +406,80 @@ class StreamingTranslationService:
         """Fetch ElevenLabs audio and push it to the client as a follow-up event."""
         try:
             from tafahom_api.apps.v1.ai.clients.text_to_speech_client import TextToSpeechClient
-            audio_bytes = await TextToSpeechClient().text_to_speech(text)
+            client = TextToSpeechClient()
+
+            if self.audio_transport == "binary":
+                await self._stream_audio_frames(client, text)
+                return
+
+            # Repeated phrases come straight from the disk cache, no TTS call
+            cached = await client.cached_audio(text)
+            audio_bytes = cached or await client.text_to_speech(text, use_cache=False)
             if audio_bytes:
                 audio_b64 = base64.b64encode(audio_bytes).decode("utf-8")
                 await self.send_json({
                     "type": "tts_audio",
                     "audio_b64": audio_b64,
                     "mime_type": "audio/mpeg",
+                    "cached": bool(cached),
                 })
         except Exception:
             logger.exception("ElevenLabs background TTS failed — native TTS already played")
 
+    async def _stream_audio_frames(self, client, text: str):
+        """
+        Forward TTS audio to the client as it arrives.
+
+        Every chunk becomes one or more sequenced binary frames; the stream is
+        always closed with an empty end-of-stream frame so the client knows to
+        stop waiting, even if the backend failed part-way.
+        """
+        stream_id = next(self._audio_stream_ids)
+        max_frame = getattr(settings, "TTS_STREAM_MAX_FRAME_BYTES", 32 * 1024)
+
+        cached = await client.cached_audio(text)
+        flags = FLAG_CACHED if cached else 0
+        chunks = (
+            _yield_once(cached)
+            if cached
+            else client.stream_text_to_speech(text, use_cache=False)
+        )
+
+        started = time.perf_counter()
+        sequence = 0
+        try:
+            async for chunk in chunks:
+                for offset in range(0, len(chunk), max_frame):
+                    await self.send_bytes(
+                        encode_audio_frame(
+                            chunk[offset : offset + max_frame],
+                            stream_id=stream_id,
+                            sequence=sequence,
+                            flags=flags,
+                        )
+                    )
+                    if sequence == 0:
+                        logger.info(
+                            "tts_first_audio",
+                            extra={
+                                "session_id": self.session_id,
+                                "cached": bool(cached),
+                                "ms": round((time.perf_counter() - started) * 1000, 1),
+                            },
+                        )
+                    sequence += 1
+        finally:
+            if not self.closed:
+                await self.send_bytes(
+                    encode_audio_frame(
+                        b"",
+                        stream_id=stream_id,
+                        sequence=sequence,
+                        kind=FRAME_AUDIO_END,
+                        flags=flags,
+                    )
+                )
+
     # --------------------------------------------------
     # DB HELPERS (ALL LAZY IMPORTS)
     # --------------------------------------------------
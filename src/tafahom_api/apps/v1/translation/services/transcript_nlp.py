@@ -0,0 +1,205 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import httpx
+from django.conf import settings
+
+from .fuzzy_lexicon import fuzzy_resolve
+from .vector_index import vector_resolve
+from .unknown_words import lookup_known, resolve_with_llm
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TranscriptGloss:
+    """Sign-map match of a transcript plus the NLP resolution of its unknowns."""
+
+    animations: List[str] = field(default_factory=list)
+    unknown_words: List[str] = field(default_factory=list)
+    # Gloss of each distinct unknown word that was resolved
+    resolved: Dict[str, List[str]] = field(default_factory=dict)
+    matched: int = 0  # animations found by the sign map itself
+    from_fuzzy: int = 0
+    from_vector: int = 0
+    from_store: int = 0
+    from_llm: int = 0
+    chunks: int = 0
+    failed_chunks: int = 0
+    duration_ms: float = 0.0
+
+    @property
+    def sources(self) -> List[str]:
+        sources = ["sign_map"] if self.matched else []
+        if self.from_fuzzy:
+            sources.append("fuzzy")
+        if self.from_vector:
+            sources.append("vector")
+        if self.from_store:
+            sources.append("store")
+        if self.from_llm:
+            sources.append("nlp")
+        return sources
+
+
+def chunk_phrases(phrases: List[str], max_entries: int, max_chars: int) -> List[List[str]]:
+    """
+    Split ``phrases`` into prompt-sized chunks, in order: at most
+    ``max_entries`` lines and ``max_chars`` characters of input per chunk.
+    A single phrase longer than ``max_chars`` gets a chunk of its own.
+    """
+    chunks: List[List[str]] = []
+    current: List[str] = []
+    size = 0
+    for phrase in phrases:
+        if current and (len(current) >= max_entries or size + len(phrase) + 1 > max_chars):
+            chunks.append(current)
+            current, size = [], 0
+        current.append(phrase)
+        size += len(phrase) + 1
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class TranscriptNLPScheduler:
+    """
+    Sign-map matching and LLM resolution for transcripts of any length.
+
+    The transcript is matched against the sign map first. Its unknown words
+    are deduplicated, matched against the fuzzy lexicon and the n-gram
+    vector index, looked up in the unknown-word store, and only the rest
+    is split into prompt-sized chunks. Chunks run at most ``concurrency`` at
+    a time over one pooled HTTP client, each with its own timeout. A chunk
+    that fails or times out only leaves its own words unknown; the job as a
+    whole is bounded by ``timeout``, after which unfinished chunks are
+    dropped the same way.
+
+    Resolved glosses are spliced back per occurrence where each word stood
+    in the transcript, between the sign-map animations around it, whatever
+    order the chunks finish in.
+    """
+
+    def __init__(
+        self,
+        chunk_entries: Optional[int] = None,
+        chunk_chars: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        chunk_timeout: Optional[float] = None,
+        timeout: Optional[float] = None,
+        client=None,
+    ):
+        self.chunk_entries = chunk_entries or getattr(settings, "TRANSCRIPT_NLP_CHUNK_ENTRIES", 40)
+        self.chunk_chars = chunk_chars or getattr(settings, "TRANSCRIPT_NLP_CHUNK_CHARS", 800)
+        self.concurrency = concurrency or getattr(settings, "TRANSCRIPT_NLP_CONCURRENCY", 4)
+        self.chunk_timeout = chunk_timeout or getattr(settings, "TRANSCRIPT_NLP_CHUNK_TIMEOUT", 10)
+        self.timeout = timeout or getattr(settings, "TRANSCRIPT_NLP_TIMEOUT", 60)
+        self.client = client
+
+    async def run(self, transcript: str) -> TranscriptGloss:
+        from .animation_service import splice_resolved
+        from .matcher_pool import get_sign_matcher
+
+        start = time.perf_counter()
+        match = await get_sign_matcher().match(transcript)
+        result = await self.resolve(match["unknown_words"])
+        result.animations, result.unknown_words = splice_resolved(match, result.resolved)
+        result.matched = len(match["animations"])
+        result.duration_ms = (time.perf_counter() - start) * 1000
+        return result
+
+    async def resolve(self, unknown_words: List[str]) -> TranscriptGloss:
+        """
+        Resolve a list of unknown words, repeats included. ``animations``
+        holds their glosses in list order; ``run`` places them in the text.
+        """
+        occurrences = [w.strip() for w in unknown_words if w and w.strip()]
+        phrases = list(dict.fromkeys(occurrences))
+        result = TranscriptGloss()
+        if not phrases:
+            return result
+
+        known = fuzzy_resolve(phrases)
+        result.from_fuzzy = len(known)
+        nearest = vector_resolve([phrase for phrase in phrases if phrase not in known])
+        known.update(nearest)
+        result.from_vector = len(nearest)
+
+        stored = await lookup_known([phrase for phrase in phrases if phrase not in known])
+        known.update(stored)
+        result.from_store = len(stored)
+
+        missing = [phrase for phrase in phrases if phrase not in known]
+        chunks = chunk_phrases(missing, self.chunk_entries, self.chunk_chars)
+        result.chunks = len(chunks)
+        if chunks:
+            resolved = await self._run_chunks(chunks)
+            result.failed_chunks = sum(1 for r in resolved if r is None)
+            for chunk_result in resolved:
+                if chunk_result is not None:
+                    known.update(chunk_result)
+                    result.from_llm += len(chunk_result)
+
+        result.resolved = {phrase: known[phrase] for phrase in phrases if known.get(phrase)}
+        for word in occurrences:
+            gloss = known.get(word)
+            if gloss:
+                result.animations.extend(gloss)
+            else:
+                result.unknown_words.append(word)
+
+        logger.info(
+            "transcript_nlp words=%s distinct=%s fuzzy=%s vector=%s store=%s chunks=%s failed=%s",
+            len(occurrences),
+            len(phrases),
+            result.from_fuzzy,
+            result.from_vector,
+            result.from_store,
+            result.chunks,
+            result.failed_chunks,
+        )
+        return result
+
+    async def _run_chunks(self, chunks: List[List[str]]) -> List[Optional[Dict[str, List[str]]]]:
+        from tafahom_api.apps.v1.ai.clients.text_to_gloss_client import TextToGlossClient
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        limits = httpx.Limits(
+            max_connections=self.concurrency, max_keepalive_connections=self.concurrency
+        )
+
+        async with httpx.AsyncClient(timeout=self.chunk_timeout, limits=limits) as http:
+            client = self.client
+            if client is None:
+                client = TextToGlossClient()
+                client.http = http
+
+            async def run_chunk(index: int, chunk: List[str]):
+                async with semaphore:
+                    try:
+                        return await asyncio.wait_for(
+                            resolve_with_llm(chunk, client=client), timeout=self.chunk_timeout
+                        )
+                    except asyncio.TimeoutError:
+                        logger.warning("transcript_nlp chunk %s timed out", index)
+                    except Exception as e:
+                        logger.warning("transcript_nlp chunk %s failed: %s: %s", index, type(e).__name__, e)
+                    return None
+
+            tasks = [asyncio.ensure_future(run_chunk(i, chunk)) for i, chunk in enumerate(chunks)]
+            done, pending = await asyncio.wait(tasks, timeout=self.timeout)
+            for task in pending:
+                task.cancel()
+            if pending:
+                logger.warning("transcript_nlp: %s chunks dropped at the %ss deadline", len(pending), self.timeout)
+                await asyncio.gather(*pending, return_exceptions=True)
+
+            return [task.result() if task in done else None for task in tasks]
+
+
+async def gloss_transcript(transcript: str) -> TranscriptGloss:
+    """Run a transcript through a scheduler configured from settings."""
+    return await TranscriptNLPScheduler().run(transcript)
@@ -2,6 +2,8 @@ import httpx
 import logging
 from django.conf import settings
 
+from tafahom_api.apps.v1.ai.clients.base import shared_http_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,15 +20,15 @@ class UnitySignMatcherClient:
             return []
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    self.base_url,
-                    json={"sentence": sentence.strip()},
-                    headers={"Content-Type": "application/json"},
-                )
-                response.raise_for_status()
-                data = response.json()
-                return data.get("animations", [])
+            response = await shared_http_client().post(
+                self.base_url,
+                json={"sentence": sentence.strip()},
+                headers={"Content-Type": "application/json"},
+                timeout=10.0,
+            )
+            response.raise_for_status()
+            data = response.json()
+            return data.get("animations", [])
 
         except httpx.TimeoutException:
             logger.warning("Unity SignMatcher timed out")
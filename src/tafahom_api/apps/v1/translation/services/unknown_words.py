@@ -0,0 +1,324 @@
+import ast
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+from tafahom_api.common.cache import CacheNamespace, stable_hash
+
+from .cache_service import lexicon_fingerprint
+from .fuzzy_lexicon import fuzzy_resolve
+from .vector_index import vector_resolve
+
+logger = logging.getLogger(__name__)
+
+CACHE_NAMESPACE = "unknown_words"
+
+# Cached in place of a resolution to remember that the database has none
+_ABSENT = "__absent__"
+
+# "PHASE 1 (sign map): animations=[...] unknown=[...]" lines of the translate views
+_LOG_RE = re.compile(r"unknown=(\[.*?\])\s*$")
+
+
+class UnknownWordStore:
+    """
+    Persistent map of words the sign map does not know → their gloss tokens.
+
+    Rows live in ``UnknownWordResolution``; lookups go through the default
+    cache first (Redis in PROD), so a word resolved once is never sent to the
+    LLM again by any worker. An empty gloss is the "no sign" marker. Words
+    missing from the database are cached as absent for a short while so a
+    run of unknown words does not query the table on every request.
+
+    Resolutions made against another version of the sign map (other than
+    manual ones) are ignored and re-resolved, since the gloss tokens were
+    validated against the old dictionary.
+    """
+
+    def _namespace(self) -> CacheNamespace:
+        return CacheNamespace(CACHE_NAMESPACE, lexicon_fingerprint())
+
+    @staticmethod
+    def _model():
+        from tafahom_api.apps.v1.translation.models import UnknownWordResolution
+
+        return UnknownWordResolution
+
+    def _stored_phrase(self, phrase: str) -> str:
+        """
+        The form ``phrase`` is stored and cached under. Phrases longer than
+        the column keep a prefix plus a digest of the whole phrase, so the
+        write and read paths agree and two long phrases never share a row.
+        """
+        max_length = self._model()._meta.get_field("phrase").max_length
+        if len(phrase) <= max_length:
+            return phrase
+        digest = stable_hash(phrase)
+        return f"{phrase[: max_length - len(digest) - 1]}#{digest}"
+
+    def _keys(self, phrases: Iterable[str]) -> Dict[str, str]:
+        namespace = self._namespace()
+        generation = namespace.generation()
+        return {namespace.key(phrase, generation=generation): phrase for phrase in phrases}
+
+    # --------------------------------------------------
+    # READ
+    # --------------------------------------------------
+
+    def lookup_many(self, phrases: Iterable[str]) -> Dict[str, List[str]]:
+        """Stored gloss of each known phrase; unknown phrases are left out."""
+        originals = {self._stored_phrase(p): p for p in phrases if p}
+        keys = self._keys(originals)
+        if not keys:
+            return {}
+
+        found: Dict[str, List[str]] = {}
+        try:
+            cached = cache.get_many(list(keys))
+        except Exception as e:
+            logger.error("Unknown-word cache read failed: %s", e)
+            cached = {}
+        for key, value in cached.items():
+            if value != _ABSENT:
+                found[keys[key]] = list(value)
+
+        missing = [key for key in keys if key not in cached]
+        if not missing:
+            return {originals[phrase]: gloss for phrase, gloss in found.items()}
+
+        by_phrase = {keys[key]: key for key in missing}
+        fingerprint = lexicon_fingerprint()
+        rows = self._model().objects.filter(phrase__in=list(by_phrase))
+        loaded: Dict[str, List[str]] = {}
+        for row in rows:
+            if row.source == "manual" or row.lexicon_version == fingerprint:
+                loaded[row.phrase] = list(row.gloss)
+        found.update(loaded)
+
+        try:
+            cache.set_many(
+                {by_phrase[phrase]: gloss for phrase, gloss in loaded.items()},
+                timeout=getattr(settings, "UNKNOWN_WORD_CACHE_TTL", 60 * 60 * 24 * 7),
+            )
+            cache.set_many(
+                {key: _ABSENT for phrase, key in by_phrase.items() if phrase not in loaded},
+                timeout=getattr(settings, "UNKNOWN_WORD_ABSENT_TTL", 60),
+            )
+        except Exception as e:
+            logger.error("Unknown-word cache write failed: %s", e)
+        return {originals[phrase]: gloss for phrase, gloss in found.items()}
+
+    # --------------------------------------------------
+    # WRITE
+    # --------------------------------------------------
+
+    def save_many(self, resolutions: Dict[str, List[str]], source: str = "llm") -> int:
+        """
+        Upsert resolutions and cache them. Manual rows are never overwritten
+        by LLM or offline answers. Returns the number of rows written.
+        """
+        Model = self._model()
+        resolutions = {
+            self._stored_phrase(phrase): list(gloss)
+            for phrase, gloss in resolutions.items()
+            if phrase
+        }
+        if source != "manual":
+            manual = set(
+                Model.objects.filter(
+                    phrase__in=list(resolutions), source="manual"
+                ).values_list("phrase", flat=True)
+            )
+            resolutions = {p: g for p, g in resolutions.items() if p not in manual}
+        if not resolutions:
+            return 0
+
+        fingerprint = lexicon_fingerprint()
+        Model.objects.bulk_create(
+            [
+                Model(phrase=phrase, gloss=gloss, source=source, lexicon_version=fingerprint)
+                for phrase, gloss in resolutions.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["phrase"],
+            update_fields=["gloss", "source", "lexicon_version", "updated_at"],
+        )
+
+        keys = {phrase: key for key, phrase in self._keys(resolutions).items()}
+        try:
+            cache.set_many(
+                {keys[phrase]: gloss for phrase, gloss in resolutions.items()},
+                timeout=getattr(settings, "UNKNOWN_WORD_CACHE_TTL", 60 * 60 * 24 * 7),
+            )
+        except Exception as e:
+            logger.error("Unknown-word cache write failed: %s", e)
+        return len(resolutions)
+
+    def forget(self, phrases: Iterable[str]):
+        """Drop cached entries, e.g. after a row was edited in the admin."""
+        try:
+            cache.delete_many(list(self._keys(self._stored_phrase(p) for p in phrases)))
+        except Exception as e:
+            logger.error("Unknown-word cache delete failed: %s", e)
+
+    def clear_cache(self) -> int:
+        """Orphan every cached resolution at once; the rows stay."""
+        return self._namespace().bump()
+
+    # --------------------------------------------------
+    # ASYNC
+    # --------------------------------------------------
+
+    async def alookup_many(self, phrases: Iterable[str]) -> Dict[str, List[str]]:
+        return await sync_to_async(self.lookup_many)(list(phrases))
+
+    async def asave_many(self, resolutions: Dict[str, List[str]], source: str = "llm") -> int:
+        return await sync_to_async(self.save_many)(resolutions, source)
+
+
+_store: Optional[UnknownWordStore] = None
+
+
+def get_unknown_word_store() -> UnknownWordStore:
+    global _store
+    if _store is None:
+        _store = UnknownWordStore()
+    return _store
+
+
+# --------------------------------------------------
+# RESOLUTION
+# --------------------------------------------------
+
+
+@dataclass
+class UnknownWordsResult:
+    """Outcome of resolving the words the sign map left unmatched."""
+
+    animations: List[str] = field(default_factory=list)
+    unknown_words: List[str] = field(default_factory=list)
+    # Gloss of each word that was resolved, for splicing back in place
+    resolved: Dict[str, List[str]] = field(default_factory=dict)
+    from_fuzzy: int = 0
+    from_vector: int = 0
+    from_store: int = 0
+    from_llm: int = 0
+
+    @property
+    def sources(self) -> List[str]:
+        sources = []
+        if self.from_fuzzy:
+            sources.append("fuzzy")
+        if self.from_vector:
+            sources.append("vector")
+        if self.from_store:
+            sources.append("store")
+        if self.from_llm:
+            sources.append("nlp")
+        return sources
+
+
+async def resolve_with_llm(
+    phrases: List[str],
+    client=None,
+    source: str = "llm",
+) -> Optional[Dict[str, List[str]]]:
+    """
+    Ask the LLM for ``phrases`` in one prompt, validate each answer against
+    the sign map and store the results. Returns ``None``, storing nothing,
+    when the call failed or its answer could not be aligned with the input.
+    """
+    from tafahom_api.apps.v1.ai.clients.text_to_gloss_client import TextToGlossClient
+    from .matcher_pool import get_sign_matcher
+
+    answers = await (client or TextToGlossClient()).text_to_gloss_batch(phrases)
+    if answers is None:
+        return None
+
+    resolved: Dict[str, List[str]] = {}
+    matcher = get_sign_matcher()
+    for phrase, answer in zip(phrases, answers):
+        matched = await matcher.match(answer) if answer else None
+        resolved[phrase] = list(matched["animations"]) if matched else []
+    try:
+        await get_unknown_word_store().asave_many(resolved, source=source)
+    except Exception as e:
+        logger.error("Unknown-word store write failed: %s", e)
+    return resolved
+
+
+async def lookup_known(phrases: List[str]) -> Dict[str, List[str]]:
+    """Store lookup that degrades to "nothing known" on errors."""
+    try:
+        return await get_unknown_word_store().alookup_many(phrases)
+    except Exception as e:
+        logger.error("Unknown-word store lookup failed: %s", e)
+        return {}
+
+
+async def resolve_unknown_words(
+    words: List[str],
+    client=None,
+    source: str = "llm",
+) -> UnknownWordsResult:
+    """
+    Resolve unmatched words locally, then through the store, then with one
+    batched LLM call.
+
+    Near-misses of lexicon entries (typos) are matched by the fuzzy index,
+    then inflected or otherwise close forms by the n-gram vector index,
+    without any network call. Only the words neither it nor the store knows
+    are sent to the LLM, in a single
+    prompt. Each answer is validated against the sign map before it is
+    stored, so an answer outside the dictionary becomes a "no sign" entry.
+    If the call fails, nothing is stored and those words stay unknown.
+    """
+    phrases = list(dict.fromkeys(w.strip() for w in words if w and w.strip()))
+    result = UnknownWordsResult()
+    if not phrases:
+        return result
+
+    known = fuzzy_resolve(phrases)
+    result.from_fuzzy = len(known)
+    nearest = vector_resolve([phrase for phrase in phrases if phrase not in known])
+    known.update(nearest)
+    result.from_vector = len(nearest)
+
+    stored = await lookup_known([phrase for phrase in phrases if phrase not in known])
+    known.update(stored)
+    result.from_store = len(stored)
+
+    missing = [phrase for phrase in phrases if phrase not in known]
+    if missing:
+        resolved = await resolve_with_llm(missing, client=client, source=source)
+        if resolved is not None:
+            known.update(resolved)
+            result.from_llm = len(resolved)
+
+    for phrase in phrases:
+        gloss = known.get(phrase)
+        if gloss:
+            result.animations.extend(gloss)
+            result.resolved[phrase] = gloss
+        else:
+            result.unknown_words.append(phrase)
+    return result
+
+
+def unknown_words_from_log(path: str) -> Iterator[List[str]]:
+    """Unknown words of each request logged by the translate views, one list per request."""
+    with open(path, encoding="utf-8", errors="replace") as log:
+        for line in log:
+            match = _LOG_RE.search(line)
+            if not match:
+                continue
+            try:
+                words = ast.literal_eval(match.group(1))
+            except (ValueError, SyntaxError):
+                continue
+            yield [w for w in words if isinstance(w, str)]
@@ -0,0 +1,242 @@
+import logging
+import math
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _grams(text: str, n_min: int, n_max: int) -> Counter:
+    """Character n-grams of each word, padded with spaces at the word edges."""
+    grams: Counter = Counter()
+    for word in text.split():
+        padded = f" {word} "
+        for n in range(n_min, n_max + 1):
+            grams.update(padded[i : i + n] for i in range(len(padded) - n + 1))
+    return grams
+
+
+def lexicon_phrases() -> Dict[str, str]:
+    """Every lexicon entry, single words and phrases, as the matcher sees it."""
+    from ..sign_map import ANIMATION_MAP
+    from .animation_service import lexicon_words
+    from .normalization import apply_synonyms, normalize_arabic
+
+    phrases = dict(lexicon_words())
+    for phrase, animation in ANIMATION_MAP.items():
+        normalized = apply_synonyms(normalize_arabic(phrase))
+        if normalized:
+            phrases.setdefault(normalized, animation)
+    return phrases
+
+
+@dataclass(frozen=True)
+class VectorMatch:
+    text: str
+    entry: str
+    animation: str
+    score: float  # cosine similarity
+
+
+class SignVectorIndex:
+    """
+    Character n-gram TF-IDF vectors of the lexicon entries.
+
+    Entries are rows of a dense, L2-normalized ``float16`` matrix (a few MB
+    for the whole sign map). A query is vectorized the same way and scored
+    against every entry with one matrix-vector product, restricted to the
+    columns of the n-grams it actually contains; the best cosine above
+    ``min_score`` among entries with the same number of words wins.
+
+    Built offline by ``build_lexicon_index`` (``save`` / ``load``), or in
+    process from the sign map when no up-to-date file exists.
+    """
+
+    def __init__(
+        self,
+        entries: List[str],
+        animations: List[str],
+        vocabulary: Dict[str, int],
+        idf: np.ndarray,
+        matrix: np.ndarray,
+        n_min: int = 2,
+        n_max: int = 4,
+        fingerprint: str = "",
+    ):
+        self.entries = entries
+        self.animations = animations
+        self.vocabulary = vocabulary
+        self.idf = idf.astype(np.float32)
+        self.matrix = matrix.astype(np.float16)
+        self.n_min = n_min
+        self.n_max = n_max
+        self.fingerprint = fingerprint
+        self.lengths = np.array([len(entry.split()) for entry in entries], dtype=np.int16)
+
+    def __len__(self):
+        return len(self.entries)
+
+    @classmethod
+    def build(cls, phrases: Dict[str, str], n_min: int = 2, n_max: int = 4, fingerprint: str = ""):
+        entries = sorted(phrases)
+        counts = [_grams(entry, n_min, n_max) for entry in entries]
+
+        document_frequency: Counter = Counter()
+        for grams in counts:
+            document_frequency.update(grams.keys())
+        vocabulary = {gram: i for i, gram in enumerate(sorted(document_frequency))}
+
+        # Smoothed IDF, as in scikit-learn
+        idf = np.ones(len(vocabulary), dtype=np.float32)
+        for gram, df in document_frequency.items():
+            idf[vocabulary[gram]] = math.log((1 + len(entries)) / (1 + df)) + 1
+
+        matrix = np.zeros((len(entries), len(vocabulary)), dtype=np.float32)
+        for row, grams in enumerate(counts):
+            for gram, count in grams.items():
+                matrix[row, vocabulary[gram]] = count * idf[vocabulary[gram]]
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms == 0, 1, norms)
+
+        return cls(
+            entries,
+            [phrases[entry] for entry in entries],
+            vocabulary,
+            idf,
+            matrix,
+            n_min,
+            n_max,
+            fingerprint,
+        )
+
+    # --------------------------------------------------
+    # PERSISTENCE
+    # --------------------------------------------------
+
+    def save(self, path):
+        grams = sorted(self.vocabulary, key=self.vocabulary.get)
+        np.savez_compressed(
+            path,
+            entries=np.array(self.entries),
+            animations=np.array(self.animations),
+            grams=np.array(grams),
+            idf=self.idf,
+            matrix=self.matrix,
+            ngram_range=np.array([self.n_min, self.n_max]),
+            fingerprint=np.array(self.fingerprint),
+        )
+
+    @classmethod
+    def load(cls, path) -> "SignVectorIndex":
+        with np.load(path, allow_pickle=False) as data:
+            grams = data["grams"].tolist()
+            n_min, n_max = (int(n) for n in data["ngram_range"])
+            return cls(
+                data["entries"].tolist(),
+                data["animations"].tolist(),
+                {gram: i for i, gram in enumerate(grams)},
+                data["idf"],
+                data["matrix"],
+                n_min,
+                n_max,
+                str(data["fingerprint"]),
+            )
+
+    # --------------------------------------------------
+    # QUERY
+    # --------------------------------------------------
+
+    def _query(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Column ids and normalized weights of the query's known n-grams."""
+        columns, weights = [], []
+        for gram, count in _grams(text, self.n_min, self.n_max).items():
+            column = self.vocabulary.get(gram)
+            if column is not None:
+                columns.append(column)
+                weights.append(count * self.idf[column])
+        weights = np.asarray(weights, dtype=np.float32)
+        norm = np.linalg.norm(weights)
+        return np.asarray(columns, dtype=np.intp), weights / norm if norm else weights
+
+    def scores(self, text: str) -> np.ndarray:
+        """Cosine similarity of ``text`` with every entry."""
+        columns, weights = self._query(text)
+        if not len(columns):
+            return np.zeros(len(self.entries), dtype=np.float32)
+        return self.matrix[:, columns].astype(np.float32) @ weights
+
+    def nearest(self, text: str, min_score: float) -> Optional[VectorMatch]:
+        """
+        The most similar entry with as many words as ``text``, if its
+        similarity reaches ``min_score``. A single word never resolves to a
+        phrase that merely contains it.
+        """
+        scores = self.scores(text)
+        scores[self.lengths != len(text.split())] = 0
+        if not len(scores):
+            return None
+        best = int(np.argmax(scores))
+        score = float(scores[best])
+        if score < min_score:
+            return None
+        return VectorMatch(text, self.entries[best], self.animations[best], round(score, 4))
+
+
+# --------------------------------------------------
+# PROCESS-WIDE INDEX
+# --------------------------------------------------
+
+_index: Optional[SignVectorIndex] = None
+_index_lock = threading.Lock()
+
+
+def build_vector_index() -> SignVectorIndex:
+    """Build the index from the current sign map."""
+    from .cache_service import lexicon_fingerprint
+
+    n_min, n_max = getattr(settings, "SIGN_VECTOR_NGRAM_RANGE", (2, 4))
+    return SignVectorIndex.build(lexicon_phrases(), n_min, n_max, lexicon_fingerprint())
+
+
+def get_vector_index() -> SignVectorIndex:
+    """
+    The index written by ``build_lexicon_index`` when it matches the current
+    sign map, otherwise one built in process on first use.
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                from .cache_service import lexicon_fingerprint
+
+                index = None
+                path = getattr(settings, "SIGN_VECTOR_INDEX_PATH", None)
+                if path:
+                    try:
+                        index = SignVectorIndex.load(path)
+                    except (OSError, KeyError, ValueError) as e:
+                        logger.info("No prebuilt sign vector index at %s (%s); building it", path, e)
+                if index is None or index.fingerprint != lexicon_fingerprint():
+                    index = build_vector_index()
+                _index = index
+    return _index
+
+
+def vector_resolve(phrases: Iterable[str]) -> Dict[str, List[str]]:
+    """Animations of the phrases whose nearest lexicon entry is similar enough."""
+    if not getattr(settings, "SIGN_VECTOR_INDEX_ENABLED", True):
+        return {}
+    min_score = getattr(settings, "SIGN_VECTOR_MIN_SCORE", 0.65)
+    index = get_vector_index()
+    resolved: Dict[str, List[str]] = {}
+    for phrase in phrases:
+        match = index.nearest(phrase, min_score)
+        if match is not None:
+            logger.info("NEAREST SIGN     : %r -> %r (%s, %.2f)", phrase, match.entry, match.animation, match.score)
+            resolved[phrase] = [match.animation]
+    return resolved
@@ -1,14 +1,14 @@
 import asyncio
 import logging
 import os
-import subprocess
 import time
 import httpx
 
-from asgiref.sync import async_to_sync
+from asgiref.sync import async_to_sync, sync_to_async
 from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import transaction
+from django.utils.translation import gettext_lazy as _
 from rest_framework import generics, status
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.permissions import IsAuthenticated, AllowAny
@@ -33,13 +33,23 @@ from .services.youtube_service import (
 )
 
 from tafahom_api.apps.v1.ai.clients.speech_to_text_client import SpeechToTextClient
-from tafahom_api.apps.v1.ai.clients.text_to_gloss_client import TextToGlossClient
+from tafahom_api.apps.v1.ai.utils.audio_ingest import ingest_audio
 from tafahom_api.apps.v1.billing.models import Subscription, SubscriptionPlan
 from tafahom_api.apps.v1.billing.services import consume_translation_token, consume_generation_token, consume_history_save_token
 from tafahom_api.common.decorators import require_token_and_plan
-from tafahom_api.apps.v1.translation.services.animation_service import translate_to_animation_names
+from tafahom_api.common.views import AsyncAPIView, AsyncGenericAPIView
+from tafahom_api.apps.v1.translation.services.sign_translation_service import SignTranslationService
+from tafahom_api.apps.v1.translation.services.matcher_pool import get_sign_matcher
+from tafahom_api.apps.v1.translation.services.unknown_words import resolve_unknown_words
+from tafahom_api.apps.v1.translation.services.animation_service import splice_resolved
 from tafahom_api.apps.v1.translation.services.sign_matcher_service import match_sign, normalize_arabic_text
-from tafahom_api.apps.v1.translation.services.cache_service import get_cached_translation, set_cached_translation
+from tafahom_api.apps.v1.translation.services.cache_service import (
+    compute_once,
+    get_cached_translation,
+    refresh_in_background,
+    set_cached_translation,
+    set_negative_translation,
+)
 from tafahom_api.apps.v1.translation.services.ai_service import call_ai_translation
 
 logger = logging.getLogger(__name__)
@@ -73,8 +83,13 @@ class SpeechToTextView(APIView):
 
         client = SpeechToTextClient()
 
+        async def transcribe():
+            # Decode once, then send the PCM16 WAV straight to STT
+            audio = await ingest_audio(audio_file)
+            return await client.speech_to_text(audio)
+
         try:
-            result = async_to_sync(client.speech_to_text)(audio_file)
+            result = async_to_sync(transcribe)()
         except Exception as exc:
             logger.exception("STT client failure")
             return Response(
@@ -160,7 +175,7 @@ class TranslationRequestCreateView(generics.CreateAPIView):
 # =====================================================
 
 
-class TranslateToSignView(generics.GenericAPIView):
+class TranslateToSignView(AsyncGenericAPIView):
     """
     Text → Sign Language (Video)
     """
@@ -169,7 +184,7 @@ class TranslateToSignView(generics.GenericAPIView):
     serializer_class = TextToSignSerializer
 
     @require_token_and_plan(token_cost=7, min_plan="free", feature_name="Sign Generation")
-    def post(self, request):
+    async def post(self, request):
         subscription = request.subscription
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -178,29 +193,34 @@ class TranslateToSignView(generics.GenericAPIView):
 
         # 1️⃣ Text → Sign (sign-map + NLP fallback)
         try:
-            ai_result = asyncio.run(SignTranslationService.text_to_sign(text))
+            ai_result = await SignTranslationService.text_to_sign(text)
             video_url = ai_result["video"]
         except ValueError as e:
             return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
         # 2️⃣ Save + Consume Tokens
-        with transaction.atomic():
-            consume_generation_token(subscription)
+        @sync_to_async
+        def save():
+            with transaction.atomic():
+                consume_generation_token(subscription)
+
+                translation = TranslationRequest.objects.create(
+                    user=request.user,
+                    direction="to_sign",
+                    status="completed",
+                    input_text=text,
+                    output_video=video_url,
+                )
+            return translation, subscription.remaining_tokens()
 
-            translation = TranslationRequest.objects.create(
-                user=request.user,
-                direction="to_sign",
-                status="completed",
-                input_text=text,
-                output_video=video_url,
-            )
+        translation, remaining = await save()
 
         return Response(
             {
                 "id": translation.id,
                 "status": translation.status,
                 "video": video_url,
-                "remaining_tokens": subscription.remaining_tokens(),
+                "remaining_tokens": remaining,
             },
             status=status.HTTP_201_CREATED,
         )
@@ -211,13 +231,13 @@ class TranslateToSignView(generics.GenericAPIView):
 # =====================================================
 
 
-class YouTubeTranslateView(APIView):
+class YouTubeTranslateView(AsyncAPIView):
     """
     YouTube URL → Extract Audio → Speech-to-Text → Text-to-Sign → Sign Video
     """
     permission_classes = [IsAuthenticated]
 
-    def post(self, request):
+    async def post(self, request):
         youtube_url = request.data.get("youtube_url")
         if not youtube_url:
             return Response(
@@ -227,35 +247,42 @@ class YouTubeTranslateView(APIView):
 
         # 0️⃣ Get video info for token cost calculation
         try:
-            video_info = get_youtube_video_info(youtube_url)
+            video_info = await asyncio.to_thread(get_youtube_video_info, youtube_url)
             token_cost = calculate_youtube_token_cost(video_info["duration"])
         except ValueError as e:
             # Fall back to default cost if info fetch fails
             token_cost = 12
 
-        subscription = getattr(request.user, "subscription", None)
-        if not subscription:
-            return Response(
-                {"detail": _("No active subscription found.")},
-                status=status.HTTP_403_FORBIDDEN,
-            )
+        @sync_to_async
+        def check_access():
+            subscription = getattr(request.user, "subscription", None)
+            if not subscription:
+                return None, Response(
+                    {"detail": _("No active subscription found.")},
+                    status=status.HTTP_403_FORBIDDEN,
+                )
 
-        plan_rank = {"free": 0, "basic": 1, "go": 2, "enterprise": 3}
-        if plan_rank.get(subscription.plan.plan_type, 0) < plan_rank.get("basic", 0):
-            return Response(
-                {"detail": _("YouTube Translation is available on BASIC plans and above.")},
-                status=status.HTTP_403_FORBIDDEN,
-            )
+            plan_rank = {"free": 0, "basic": 1, "go": 2, "enterprise": 3}
+            if plan_rank.get(subscription.plan.plan_type, 0) < plan_rank.get("basic", 0):
+                return None, Response(
+                    {"detail": _("YouTube Translation is available on BASIC plans and above.")},
+                    status=status.HTTP_403_FORBIDDEN,
+                )
 
-        if not subscription.can_consume(token_cost):
-            return Response(
-                {"detail": _(f"Not enough tokens. YouTube Translation requires {token_cost} tokens.")},
-                status=status.HTTP_403_FORBIDDEN,
-            )
+            if not subscription.can_consume(token_cost):
+                return None, Response(
+                    {"detail": _(f"Not enough tokens. YouTube Translation requires {token_cost} tokens.")},
+                    status=status.HTTP_403_FORBIDDEN,
+                )
+            return subscription, None
+
+        subscription, denied = await check_access()
+        if denied is not None:
+            return denied
 
         # 1️⃣ Download audio from YouTube
         try:
-            audio_path = download_youtube_audio(youtube_url)
+            audio_path = await asyncio.to_thread(download_youtube_audio, youtube_url)
         except ValueError as e:
             return Response(
                 {"detail": str(e)},
@@ -263,32 +290,11 @@ class YouTubeTranslateView(APIView):
             )
 
         # 2️⃣ Speech-to-Text (extract spoken text)
-        wav_path = None
         try:
-            # Convert to WAV using ffmpeg
-            wav_path = audio_path.replace(".mp3", ".wav")
-            subprocess.run(
-                ["ffmpeg", "-i", audio_path, "-ar", "16000", "-ac", "1", "-y", wav_path],
-                capture_output=True,
-                timeout=30,
-            )
-
-            with open(wav_path, "rb") as f:
-                wav_data = f.read()
-
-            # Call STT service
-            stt_client = SpeechToTextClient()
-            files = {"file": ("audio.wav", wav_data, "audio/wav")}
-            data = {"language": "ar", "task": "transcribe"}
-
-            response = httpx.post(
-                stt_client.base_url + "/",
-                files=files,
-                data=data,
-                timeout=60,
-            )
-            response.raise_for_status()
-            transcribed_text = response.json().get("text", "")
+            # Decode to PCM16 mono 16 kHz WAV over ffmpeg pipes, then call STT
+            audio = await ingest_audio(audio_path)
+            stt_result = await SpeechToTextClient().speech_to_text(audio)
+            transcribed_text = stt_result.get("text", "")
 
             if not transcribed_text:
                 return Response(
@@ -299,7 +305,7 @@ class YouTubeTranslateView(APIView):
         except Exception as e:
             return Response(
                 {"detail": _("Failed to transcribe audio: ") + str(e)},
-                status=status.HTTP_500_INTERNAL_ERROR,
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
         finally:
             # Cleanup temp files and their parent directories completely
@@ -313,29 +319,34 @@ class YouTubeTranslateView(APIView):
 
         # 3️⃣ Text-to-Sign (sign-map + NLP fallback)
         try:
-            ai_result = asyncio.run(SignTranslationService.text_to_sign(transcribed_text))
+            ai_result = await SignTranslationService.text_to_sign(transcribed_text)
             video_url = ai_result["video"]
         except ValueError as e:
             return Response(
                 {"detail": str(e)},
-                status=status.HTTP_500_INTERNAL_ERROR,
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
         # 4️⃣ Save + Consume Tokens
-        with transaction.atomic():
-            subscription.consume(token_cost)
+        @sync_to_async
+        def save():
+            with transaction.atomic():
+                subscription.consume(token_cost)
+
+                translation = TranslationRequest.objects.create(
+                    user=request.user,
+                    direction="youtube_to_sign",
+                    input_type="youtube_url",
+                    input_text=youtube_url,
+                    output_type="video",
+                    output_text=transcribed_text,
+                    output_video=video_url,
+                    status="completed",
+                    tokens_used=token_cost,
+                )
+            return translation, subscription.remaining_tokens()
 
-            translation = TranslationRequest.objects.create(
-                user=request.user,
-                direction="youtube_to_sign",
-                input_type="youtube_url",
-                input_text=youtube_url,
-                output_type="video",
-                output_text=transcribed_text,
-                output_video=video_url,
-                status="completed",
-                tokens_used=token_cost,
-            )
+        translation, remaining = await save()
 
         return Response(
             {
@@ -343,12 +354,14 @@ class YouTubeTranslateView(APIView):
                 "status": translation.status,
                 "transcribed_text": transcribed_text,
                 "video": video_url,
-                "remaining_tokens": subscription.remaining_tokens(),
+                "remaining_tokens": remaining,
                 "tokens_used": token_cost,
             },
             status=status.HTTP_201_CREATED,
         )
-class UnityTranslateView(APIView):
+
+
+class UnityTranslateView(AsyncAPIView):
 
     permission_classes = [IsAuthenticated]
 
@@ -361,7 +374,7 @@ class UnityTranslateView(APIView):
     @require_token_and_plan(
         token_cost=10, min_plan="free", feature_name="Sign Generation"
     )
-    def post(self, request):
+    async def post(self, request):
 
         subscription = request.subscription
         text = request.data.get("text", "")
@@ -379,37 +392,26 @@ class UnityTranslateView(APIView):
             return Response(empty)
 
         # Phase 1: Direct ANIMATION_MAP lookup first — never send known words to NLP
-        result = translate_to_animation_names(text)
+        result = await get_sign_matcher().match(text)
         source_parts = ["sign_map"] if result["animations"] else []
         logger.info("PHASE 1 (sign map): animations=%s unknown=%s", result["animations"], result["unknown_words"])
 
-        # Phase 2: NLP only on words the sign map could NOT match
+        # Phase 2: Unknown-word store, then one batched NLP call for the words it has never seen
         if result["unknown_words"]:
-            unknown_text = " ".join(result["unknown_words"])
-            logger.info("PHASE 2 (NLP on unknowns): %r", unknown_text)
+            logger.info("PHASE 2 (NLP on unknowns): %r", result["unknown_words"])
             try:
                 nlp_timeout = min(getattr(settings, 'AI_TIMEOUT', 30), 10)
-                t2g_client = TextToGlossClient()
-                ai_result = asyncio.run(
-                    asyncio.wait_for(
-                        t2g_client.text_to_gloss(unknown_text),
-                        timeout=nlp_timeout,
-                    )
+                resolution = await asyncio.wait_for(
+                    resolve_unknown_words(result["unknown_words"]),
+                    timeout=nlp_timeout,
                 )
-                logger.info("NLP RAW OUTPUT: %s", ai_result)
-                raw = (
-                    ai_result.get("gloss_translation")
-                    or ai_result.get("gloss")
-                    or ai_result.get("text")
-                    or ""
+                if resolution.animations:
+                    source_parts.extend(resolution.sources)
+                    logger.info("NLP added animations: %s", resolution.animations)
+                # Each resolved word goes back where it stood in the sentence
+                result["animations"], result["unknown_words"] = splice_resolved(
+                    result, resolution.resolved
                 )
-                if raw.strip():
-                    nlp_matched = translate_to_animation_names(str(raw))
-                    if nlp_matched["animations"]:
-                        result["animations"].extend(nlp_matched["animations"])
-                        source_parts.append("nlp")
-                        logger.info("NLP added animations: %s", nlp_matched["animations"])
-                    result["unknown_words"] = nlp_matched["unknown_words"]
             except asyncio.TimeoutError:
                 logger.warning("NLP timed out after %ss, skipping", nlp_timeout)
             except Exception as e:
@@ -421,7 +423,7 @@ class UnityTranslateView(APIView):
             try:
                 from .services.unity_sign_matcher_client import UnitySignMatcherClient
                 client = UnitySignMatcherClient()
-                animations = asyncio.run(client.match(" ".join(result["unknown_words"])))
+                animations = await client.match(" ".join(result["unknown_words"]))
                 logger.info("SIGN MATCHER : %s", animations)
                 if animations:
                     result["animations"].extend(animations)
@@ -429,11 +431,16 @@ class UnityTranslateView(APIView):
             except Exception as e:
                 logger.warning("SignMatcher failed: %s", e)
 
+        result.pop("unknown_positions", None)
         result["source"] = "+".join(source_parts) if source_parts else "none"
 
-        with transaction.atomic():
-            consume_generation_token(subscription)
-        result["remaining_tokens"] = subscription.remaining_tokens()
+        @sync_to_async
+        def consume():
+            with transaction.atomic():
+                consume_generation_token(subscription)
+            return subscription.remaining_tokens()
+
+        result["remaining_tokens"] = await consume()
         logger.info("TOKENS       : consumed 10, %s remaining", result["remaining_tokens"])
         logger.info("FINAL RESP   : %s", result)
         logger.info("=" * 50)
@@ -463,27 +470,32 @@ class TranslationAPIView(APIView):
         logger.info("Translation request received for text: '%s'", text)
         
         normalized_text = normalize_arabic_text(text)
-        
-        # Step 1: Check Cache
-        cached_result = get_cached_translation(normalized_text)
-        if cached_result:
-            cached_result['source'] = 'cache'
-            return Response(cached_result, status=status.HTTP_200_OK)
-            
-        # Step 2: Call AI Service
-        ai_result = call_ai_translation(text)
-        
-        if ai_result:
-            # Step 3: AI success -> Save to cache and return
-            set_cached_translation(normalized_text, ai_result)
-            return Response(ai_result, status=status.HTTP_200_OK)
-            
-        # Step 4: AI failed/timeout -> Fallback to Sign Matcher
+
+        # Step 1: Check Cache (fresh, stale or a recent AI failure)
+        cached = get_cached_translation(normalized_text)
+        if cached is not None:
+            if cached.stale and not cached.negative:
+                # Serve the stale entry now; one background call refreshes it
+                refresh_in_background(normalized_text, lambda: call_ai_translation(text))
+            return Response(self._cached_response(cached), status=status.HTTP_200_OK)
+
+        # Step 2: Miss -> one caller per text runs the AI (concurrent ones wait for it)
+        computed = False
+
+        def compute():
+            nonlocal computed
+            computed = True
+            ai_result = call_ai_translation(text)
+            if ai_result:
+                # Step 3: AI success -> Save to cache
+                return set_cached_translation(normalized_text, ai_result)
+
+            # Step 4: AI failed/timeout -> Fallback to Sign Matcher, and
+            # remember the failure briefly so the next click skips the AI timeout
+            return set_negative_translation(normalized_text, match_sign(text))
+
         try:
-            fallback_result = match_sign(text)
-            # Cache the fallback result so the next click is instant
-            set_cached_translation(normalized_text, fallback_result)
-            return Response(fallback_result, status=status.HTTP_200_OK)
+            entry = compute_once(normalized_text, compute)
         except Exception as e:
             logger.error("Sign Matcher failed for text: %s. Error: %s", text, e)
             return Response(
@@ -491,13 +503,35 @@ class TranslationAPIView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+        if not computed:
+            return Response(self._cached_response(entry), status=status.HTTP_200_OK)
+        return Response(
+            self._with_cache_info(entry.value, "miss", 0),
+            status=status.HTTP_200_OK,
+        )
+
+    def _cached_response(self, cached) -> dict:
+        # Negative entries keep the fallback's own source ("sign_matcher")
+        source = None if cached.negative else "cache"
+        return self._with_cache_info(cached.value, cached.status, cached.age, source=source)
+
+    @staticmethod
+    def _with_cache_info(result: dict, cache_status: str, age: float, source=None) -> dict:
+        body = dict(result)
+        if source:
+            body["source"] = source
+        body["origin"] = result.get("source")
+        body["cache_status"] = cache_status
+        body["cache_age"] = int(age)
+        return body
+
 
 # =====================================================
 # 🧪 TEST GLOSS — NLP Pipeline Tester
 # =====================================================
 
 
-class TestGlossView(APIView):
+class TestGlossView(AsyncAPIView):
     """
     Temporary testing endpoint for the NLP gloss-to-text pipeline.
 
@@ -509,7 +543,7 @@ class TestGlossView(APIView):
     """
     permission_classes = [AllowAny]
 
-    def post(self, request):
+    async def post(self, request):
         gloss = request.data.get("gloss", "").strip()
 
         if not gloss:
@@ -527,7 +561,7 @@ class TestGlossView(APIView):
         
         try:
             client = NLPModelClient()
-            result = asyncio.run(client.translate_gloss(gloss))
+            result = await client.translate_gloss(gloss)
             
             logger.info("NLP translation result: %r", result.text)
             logger.info("=" * 60)
@@ -667,7 +701,7 @@ class ModalPredictView(APIView):
 # 🌐 TRANSLATE GLOSS ENDPOINT (SESSION LEVEL NLP)
 # =====================================================
 
-class TranslateGlossView(APIView):
+class TranslateGlossView(AsyncAPIView):
     """
     Receives a full gloss string and calls the NLP model to return natural Arabic text.
     POST /api/v1/sign-language/translate-gloss/
@@ -675,7 +709,7 @@ class TranslateGlossView(APIView):
     permission_classes = [IsAuthenticated]
 
     @require_token_and_plan(token_cost=5, min_plan="free", feature_name="Gloss Translation")
-    def post(self, request):
+    async def post(self, request):
         gloss = request.data.get("gloss")
         
         if not gloss or not gloss.strip():
@@ -687,17 +721,21 @@ class TranslateGlossView(APIView):
         try:
             from tafahom_api.apps.v1.ai.clients.nlp_model_client import NLPModelClient
             nlp_client = NLPModelClient()
-            nlp_res = asyncio.run(nlp_client.translate_gloss(gloss))
+            nlp_res = await nlp_client.translate_gloss(gloss)
             translation_text = nlp_res.text
             
             # Consume tokens on success
             subscription = request.subscription
-            with transaction.atomic():
-                consume_translation_token(subscription)
+
+            @sync_to_async
+            def consume():
+                with transaction.atomic():
+                    consume_translation_token(subscription)
+                return subscription.remaining_tokens()
 
             return Response({
                 "text": translation_text,
-                "remaining_tokens": subscription.remaining_tokens(),
+                "remaining_tokens": await consume(),
             }, status=status.HTTP_200_OK)
             
         except TimeoutError:
@@ -3,7 +3,7 @@ from django.db import transaction
 from asgiref.sync import async_to_sync
 
 from tafahom_api.apps.v1.youtube.models import YouTubeTranslation
-from tafahom_api.apps.v1.translation.services.animation_service import translate_to_animation_names
+from tafahom_api.apps.v1.translation.services.matcher_pool import get_sign_matcher
 from tafahom_api.apps.v1.translation.services.sign_translation_service import normalize_arabic
 from tafahom_api.apps.v1.ai.clients.text_to_gloss_client import TextToGlossClient
 
@@ -33,11 +33,11 @@ def process_browser_transcript(transcript, user, video_id="", title="", language
         logger.warning(f"NLP failed for browser transcript: {e}")
         gloss_tokens = [t for t in normalized.split() if t]
 
-    animations_result = translate_to_animation_names(" ".join(gloss_tokens))
+    animations_result = get_sign_matcher().match_blocking(" ".join(gloss_tokens))
     animations = animations_result.get("animations", [])
 
     if not animations:
-        animations_result = translate_to_animation_names(normalized)
+        animations_result = get_sign_matcher().match_blocking(normalized)
         animations = animations_result.get("animations", [])
 
     with transaction.atomic():
@@ -4,8 +4,8 @@ import asyncio
 from django.db import transaction
 from tafahom_api.apps.v1.youtube.models import YouTubeTranslation
 from tafahom_api.apps.v1.notifications.models import Notification
-from tafahom_api.apps.v1.translation.services.animation_service import translate_to_animation_names
-from tafahom_api.apps.v1.ai.clients.text_to_gloss_client import TextToGlossClient
+from tafahom_api.apps.v1.translation.services.matcher_pool import get_sign_matcher
+from tafahom_api.apps.v1.translation.services.transcript_nlp import gloss_transcript
 from tafahom_api.apps.v1.youtube.services.extraction import extract_transcript
 from django.conf import settings
 from asgiref.sync import async_to_sync
@@ -47,10 +47,19 @@ def process_youtube_translation_task(translation_id):
         animations_data = None
         
         try:
-            # Try NLP first
-            ai_result = async_to_sync(TextToGlossClient().text_to_gloss)(transcript)
-            raw = ai_result.get("gloss_translation") or ai_result.get("gloss") or ai_result.get("text") or transcript
-            animations_data = translate_to_animation_names(str(raw))
+            # Sign map first; only its unknown words go to NLP, deduplicated and chunked
+            gloss = async_to_sync(gloss_transcript)(transcript)
+            logger.info(
+                "Transcript NLP: %s animations, %s unknown, %s/%s chunks failed",
+                len(gloss.animations),
+                len(gloss.unknown_words),
+                gloss.failed_chunks,
+                gloss.chunks,
+            )
+            if gloss.animations:
+                animations_data = {"animations": gloss.animations, "unknown_words": gloss.unknown_words}
+            else:
+                raise ValueError("no animations for the transcript")
         except Exception as e:
             logger.warning(f"NLP failed for youtube translation: {e}, falling back to SignMatcher")
             try:
@@ -64,7 +73,7 @@ def process_youtube_translation_task(translation_id):
 
         if not animations_data:
             # Final fallback
-            animations_data = translate_to_animation_names(transcript)
+            animations_data = get_sign_matcher().match_blocking(transcript)
 
         # Step 3: Update DB and Consume Tokens
         with transaction.atomic():
@@ -5,7 +5,6 @@ from rest_framework.permissions import IsAuthenticated
 from django.db import transaction
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
-import asyncio
 
 from .models import YouTubeTranslation
 from .serializers import (
@@ -20,6 +19,7 @@ from .services.translation import start_youtube_translation
 from .services.extraction import fetch_transcript_with_segments
 from tafahom_api.apps.v1.notifications.models import Notification
 from tafahom_api.common.decorators import require_token_and_plan
+from tafahom_api.common.views import AsyncAPIView
 
 from tafahom_api.apps.v1.translation.services.youtube_service import (
     get_youtube_video_info,
@@ -30,8 +30,10 @@ from tafahom_api.apps.v1.translation.services.youtube_service import (
 )
 from tafahom_api.apps.v1.youtube.services.extraction import extract_transcript
 from tafahom_api.apps.v1.translation.services.sign_translation_service import normalize_arabic
-from tafahom_api.apps.v1.translation.services.animation_service import translate_to_animation_names
-from asgiref.sync import async_to_sync
+from tafahom_api.apps.v1.translation.services.matcher_pool import get_sign_matcher
+from tafahom_api.apps.v1.translation.services.animation_service import splice_resolved
+from tafahom_api.apps.v1.translation.services.transcript_nlp import TranscriptNLPScheduler
+from asgiref.sync import async_to_sync, sync_to_async
 
 from tafahom_api.apps.v1.ai.clients.speech_to_text_client import SpeechToTextClient
 from tafahom_api.apps.v1.ai.clients.text_to_gloss_client import TextToGlossClient
@@ -206,11 +208,11 @@ class YouTubeSignTranslateView(APIView):
             gloss_tokens = [t for t in normalize_arabic(transcript).split() if t]
 
         # Step 3: Gloss → Animations
-        animations_result = translate_to_animation_names(" ".join(gloss_tokens))
+        animations_result = get_sign_matcher().match_blocking(" ".join(gloss_tokens))
         animations = animations_result.get("animations", [])
 
         if not animations:
-            animations_result = translate_to_animation_names(transcript)
+            animations_result = get_sign_matcher().match_blocking(transcript)
             animations = animations_result.get("animations", [])
 
         # Step 4: Consume tokens
@@ -304,16 +306,16 @@ class TranscriptCheckView(APIView):
             )
 
 
-class ProcessTranscriptView(APIView):
+class ProcessTranscriptView(AsyncAPIView):
     """
     Accepts pre-extracted transcript from the browser extension.
-    Runs NLP → Gloss → Animation pipeline synchronously (same as unity-sign).
+    Runs NLP → Gloss → Animation pipeline within the request (same as unity-sign).
     Does NOT call extract_transcript(), YouTubeTranscriptApi, or yt-dlp.
     """
     permission_classes = [IsAuthenticated]
 
     @require_token_and_plan(token_cost=10, min_plan="basic", feature_name="YouTube Translation")
-    def post(self, request):
+    async def post(self, request):
         transcript = request.data.get("transcript", "").strip()
         video_id = request.data.get("video_id", "")
         title = request.data.get("title", "")
@@ -337,49 +339,36 @@ class ProcessTranscriptView(APIView):
             )
 
         subscription = request.subscription
-        if not subscription.can_consume(10):
+        if not await sync_to_async(subscription.can_consume)(10):
             return Response(
                 {"success": False, "requires_upload": True, "error": "Not enough tokens."},
                 status=status.HTTP_403_FORBIDDEN,
             )
 
         # Phase 1: Direct ANIMATION_MAP lookup first — never send known words to NLP
-        result = translate_to_animation_names(transcript)
+        result = await get_sign_matcher().match(transcript)
         source_parts = ["sign_map"] if result["animations"] else []
         logger.info("PHASE 1 (sign map): animations=%s unknown=%s", result["animations"], result["unknown_words"])
 
-        # Phase 2: NLP only on words that the sign map could NOT match
+        # Phase 2: Unknown-word store, then chunked concurrent NLP for the words it has never seen
         if result["unknown_words"]:
-            unknown_text = " ".join(result["unknown_words"])
-            logger.info("PHASE 2 (NLP on unknowns): %r", unknown_text)
+            logger.info("PHASE 2 (NLP on %s unknowns)", len(result["unknown_words"]))
             try:
+                # Same request budget as before chunking: chunks still running
+                # at the deadline are dropped, the finished ones are kept
                 nlp_timeout = min(getattr(settings, 'AI_TIMEOUT', 30), 10)
-                t2g_client = TextToGlossClient()
-                ai_result = asyncio.run(
-                    asyncio.wait_for(
-                        t2g_client.text_to_gloss(unknown_text),
-                        timeout=nlp_timeout,
-                    )
+                resolution = await TranscriptNLPScheduler(timeout=nlp_timeout).resolve(
+                    result["unknown_words"]
                 )
-                logger.info("NLP RAW OUTPUT: %s", ai_result)
-                raw = (
-                    ai_result.get("gloss_translation")
-                    or ai_result.get("gloss")
-                    or ai_result.get("text")
-                    or ""
+                if resolution.animations:
+                    source_parts.extend(resolution.sources)
+                    logger.info("NLP added animations: %s", resolution.animations)
+                if resolution.failed_chunks:
+                    logger.warning("NLP failed for %s of %s chunks", resolution.failed_chunks, resolution.chunks)
+                # Each resolved word goes back where it stood in the transcript
+                result["animations"], result["unknown_words"] = splice_resolved(
+                    result, resolution.resolved
                 )
-                if raw.strip():
-                    # Match NLP output against sign map
-                    nlp_matched = translate_to_animation_names(str(raw))
-                    if nlp_matched["animations"]:
-                        result["animations"].extend(nlp_matched["animations"])
-                        source_parts.append("nlp")
-                        logger.info("NLP added animations: %s", nlp_matched["animations"])
-                    result["unknown_words"] = nlp_matched["unknown_words"]
-                else:
-                    logger.warning("NLP returned empty output")
-            except asyncio.TimeoutError:
-                logger.warning("NLP timed out after %ss, skipping", nlp_timeout)
             except Exception as e:
                 logger.warning("NLP failed: %s: %s", type(e).__name__, e)
 
@@ -389,7 +378,7 @@ class ProcessTranscriptView(APIView):
             try:
                 from tafahom_api.apps.v1.translation.services.unity_sign_matcher_client import UnitySignMatcherClient
                 client = UnitySignMatcherClient()
-                animations = asyncio.run(client.match(" ".join(result["unknown_words"])))
+                animations = await client.match(" ".join(result["unknown_words"]))
                 logger.info("SIGN MATCHER : %s", animations)
                 if animations:
                     result["animations"].extend(animations)
@@ -397,29 +386,35 @@ class ProcessTranscriptView(APIView):
             except Exception as e:
                 logger.warning("SignMatcher failed: %s", e)
 
+        result.pop("unknown_positions", None)
         result["source"] = "+".join(source_parts) if source_parts else "none"
 
         # Save record and consume tokens
-        with transaction.atomic():
-            subscription.consume(10)
-            translation = YouTubeTranslation.objects.create(
-                user=request.user,
-                youtube_url=f"https://youtube.com/watch?v={video_id}" if video_id else "",
-                video_id=video_id,
-                title=title,
-                transcript=transcript,
-                source=source,
-                segments=segments,
-                language=language,
-                status="completed",
-                tokens_used=10,
-                animation_data=result.get("animations", []),
-            )
+        @sync_to_async
+        def save():
+            with transaction.atomic():
+                subscription.consume(10)
+                translation = YouTubeTranslation.objects.create(
+                    user=request.user,
+                    youtube_url=f"https://youtube.com/watch?v={video_id}" if video_id else "",
+                    video_id=video_id,
+                    title=title,
+                    transcript=transcript,
+                    source=source,
+                    segments=segments,
+                    language=language,
+                    status="completed",
+                    tokens_used=10,
+                    animation_data=result.get("animations", []),
+                )
+            return translation, subscription.remaining_tokens()
+
+        translation, remaining = await save()
 
         result["translation_id"] = translation.id
         result["transcript"] = transcript
         result["tokens_used"] = 10
-        result["remaining_tokens"] = subscription.remaining_tokens()
+        result["remaining_tokens"] = remaining
 
         logger.info("FINAL RESP   : %s", result)
         logger.info("=" * 50)
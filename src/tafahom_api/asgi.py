@@ -32,11 +32,38 @@ for r in websocket_urlpatterns:
     _log.info("  • %s → %s", r.pattern, r.callback.__name__ if hasattr(r.callback, "__name__") else type(r.callback).__name__)
 
 
+async def lifespan_app(scope, receive, send):
+    """Start the sign-matcher workers on startup; drain telemetry and stop them on shutdown."""
+    from asgiref.sync import sync_to_async
+    from tafahom_api.apps.v1.ai.telemetry import shutdown_telemetry_sink
+    from tafahom_api.apps.v1.translation.services.matcher_pool import (
+        get_sign_matcher,
+        shutdown_sign_matcher,
+    )
+
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            try:
+                await sync_to_async(get_sign_matcher().warm, thread_sensitive=False)()
+            except Exception:
+                _log.exception("Sign matcher pool failed to start; it will start on first use")
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await sync_to_async(shutdown_telemetry_sink, thread_sensitive=False)()
+            shutdown_sign_matcher()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
 # ✅ FINAL APPLICATION
 application = ProtocolTypeRouter({
     # 🌐 HTTP (Django)
     "http": django_asgi_app,
 
+    # ♻️ Lifespan (startup / shutdown hooks)
+    "lifespan": lifespan_app,
+
     # 🔌 WebSocket
     "websocket": OriginValidator(
         JWTAuthMiddlewareStack(
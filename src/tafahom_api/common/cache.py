@@ -0,0 +1,116 @@
+import hashlib
+import logging
+import pickle
+import threading
+import time
+import zlib
+from typing import Any, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+_COMPRESSED = "__zlib__"
+
+# generation key -> (generation, monotonic time it may be reused until)
+_generations: Dict[str, Tuple[int, float]] = {}
+_generations_lock = threading.Lock()
+
+
+def stable_hash(text: str) -> str:
+    """Fixed-length digest of arbitrary (e.g. Arabic, multi-KB) input."""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def pack(value: Any) -> Any:
+    """
+    Compress values whose pickled size exceeds ``CACHE_COMPRESS_MIN_BYTES``.
+    Small values are returned unchanged; ``unpack`` reverses either form.
+    """
+    blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    if len(blob) < getattr(settings, "CACHE_COMPRESS_MIN_BYTES", 1024):
+        return value
+    return {_COMPRESSED: zlib.compress(blob, getattr(settings, "CACHE_COMPRESS_LEVEL", 6))}
+
+
+def unpack(stored: Any) -> Any:
+    if isinstance(stored, dict) and _COMPRESSED in stored:
+        return pickle.loads(zlib.decompress(stored[_COMPRESSED]))
+    return stored
+
+
+class CacheNamespace:
+    """
+    Key scheme for a family of cache entries.
+
+    Keys look like ``<name>:<version>:<generation>:<sha1 of the parts>``, so
+    they have a fixed length whatever the input. ``version`` is static
+    (settings, or a fingerprint of the data the entries are derived from);
+    ``generation`` is a counter kept in the cache itself. Changing either
+    orphans every existing entry at once. Orphans are never read again and
+    age out through their TTL.
+
+    The counter starts from the clock (microseconds) rather than 1: if the
+    cache evicts it, it comes back larger than any value it had before, so
+    entries a ``bump()`` invalidated can never be read again. Each process
+    reuses the value it read for ``CACHE_GENERATION_MEMO_TTL`` seconds, so a
+    lookup costs one round trip; another process's ``bump()`` is therefore
+    seen up to that long after it happened.
+    """
+
+    def __init__(self, name: str, version: str = "v1"):
+        self.name = name
+        self.version = version
+
+    @property
+    def generation_key(self) -> str:
+        return f"{self.name}:generation"
+
+    @staticmethod
+    def _seed() -> int:
+        return time.time_ns() // 1000
+
+    def _remember(self, generation: int) -> int:
+        ttl = getattr(settings, "CACHE_GENERATION_MEMO_TTL", 5)
+        with _generations_lock:
+            _generations[self.generation_key] = (generation, time.monotonic() + ttl)
+        return generation
+
+    def generation(self) -> int:
+        with _generations_lock:
+            memo = _generations.get(self.generation_key)
+        if memo and memo[1] > time.monotonic():
+            return memo[0]
+
+        try:
+            generation = cache.get(self.generation_key)
+            if generation is None:
+                # First use, or evicted: the first process to re-seed wins
+                cache.add(self.generation_key, self._seed(), timeout=None)
+                generation = cache.get(self.generation_key)
+        except Exception as e:
+            logger.error("Error reading cache generation for %s: %s", self.name, e)
+            return memo[0] if memo else 0
+        if generation is None:
+            return memo[0] if memo else 0
+        return self._remember(generation)
+
+    def bump(self) -> int:
+        """Invalidate every key of the namespace; returns the new generation."""
+        try:
+            cache.add(self.generation_key, self._seed(), timeout=None)
+            return self._remember(cache.incr(self.generation_key))
+        except Exception as e:
+            logger.error("Error bumping cache generation for %s: %s", self.name, e)
+            return self.generation()
+
+    def key(self, *parts: str, generation: Optional[int] = None) -> str:
+        """
+        Build the key for ``parts``. Pass ``generation`` when building many
+        keys at once to read the counter only once.
+        """
+        if generation is None:
+            generation = self.generation()
+        digest = stable_hash("\x1f".join(parts))
+        return f"{self.name}:{self.version}:{generation}:{digest}"
@@ -1,11 +1,14 @@
 from functools import wraps
 from datetime import timedelta
 
+from asgiref.sync import iscoroutinefunction
+
 from django.utils import timezone
 from rest_framework.response import Response
 from rest_framework import status
 from django.core.exceptions import ObjectDoesNotExist
 from tafahom_api.apps.v1.billing.models import Subscription, SubscriptionPlan
+from tafahom_api.common.views import checks_to_async
 
 
 TOKEN_COSTS = {
@@ -16,56 +19,79 @@ TOKEN_COSTS = {
 }
 
 
+def _check_token_and_plan(request, token_cost, min_plan, feature_name, cost_type):
+    """
+    Plan and balance check shared by sync and async views.
+    Returns an error Response, or None after attaching ``request.subscription``.
+    """
+    user = request.user
+    if not user.is_authenticated:
+        return Response({"detail": "Authentication required"}, status=status.HTTP_401_UNAUTHORIZED)
+
+    # Get subscription (wallet)
+    try:
+        subscription = user.subscription
+    except ObjectDoesNotExist:
+        return Response(
+            {"detail": "Your account is not fully configured for billing yet."},
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+    # Determine token cost
+    actual_cost = TOKEN_COSTS.get(cost_type, token_cost) if cost_type else token_cost
+
+    # 1. Plan Check
+    plan_rank = {"free": 0, "basic": 1, "go": 2, "enterprise": 3}
+    if plan_rank.get(subscription.plan.plan_type, 0) < plan_rank.get(min_plan, 0):
+        return Response(
+            {"detail": f"This feature ({feature_name or 'feature'}) is available on {min_plan.upper()} plans and above."},
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+    # 2. Token Check
+    if not subscription.can_consume(actual_cost):
+        next_reset = timezone.now() + timedelta(days=7)
+        return Response(
+            {
+                "detail": "Not enough credits.",
+                "remaining_tokens": subscription.remaining_tokens(),
+                "next_reset": next_reset.isoformat(),
+                "plan_type": subscription.plan.plan_type,
+                "weekly_tokens_limit": subscription.plan.weekly_tokens_limit,
+            },
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+    # Store subscription in request for easy access in the view if needed
+    request.subscription = subscription
+    return None
+
+
 def require_token_and_plan(token_cost=0, min_plan="free", feature_name=None, cost_type=None):
     """
     Decorator to check if user has enough tokens and the correct plan for a feature.
     cost_type: key from TOKEN_COSTS dict for configurable costs.
     If cost_type is provided, token_cost is ignored.
+    Works on both sync and ``async def`` handlers; for async handlers the
+    checks run in a single ``checks_to_async`` hop.
     """
     def decorator(view_func):
-        @wraps(view_func)
-        def _wrapped_view(view_instance, request, *args, **kwargs):
-            user = request.user
-            if not user.is_authenticated:
-                return Response({"detail": "Authentication required"}, status=status.HTTP_401_UNAUTHORIZED)
-
-            # Get subscription (wallet)
-            try:
-                subscription = user.subscription
-            except ObjectDoesNotExist:
-                return Response(
-                    {"detail": "Your account is not fully configured for billing yet."},
-                    status=status.HTTP_403_FORBIDDEN
-                )
-
-            # Determine token cost
-            actual_cost = TOKEN_COSTS.get(cost_type, token_cost) if cost_type else token_cost
-
-            # 1. Plan Check
-            plan_rank = {"free": 0, "basic": 1, "go": 2, "enterprise": 3}
-            if plan_rank.get(subscription.plan.plan_type, 0) < plan_rank.get(min_plan, 0):
-                return Response(
-                    {"detail": f"This feature ({feature_name or 'feature'}) is available on {min_plan.upper()} plans and above."},
-                    status=status.HTTP_403_FORBIDDEN
-                )
-
-            # 2. Token Check
-            if not subscription.can_consume(actual_cost):
-                next_reset = timezone.now() + timedelta(days=7)
-                return Response(
-                    {
-                        "detail": "Not enough credits.",
-                        "remaining_tokens": subscription.remaining_tokens(),
-                        "next_reset": next_reset.isoformat(),
-                        "plan_type": subscription.plan.plan_type,
-                        "weekly_tokens_limit": subscription.plan.weekly_tokens_limit,
-                    },
-                    status=status.HTTP_403_FORBIDDEN
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def _wrapped_async_view(view_instance, request, *args, **kwargs):
+                denied = await checks_to_async(_check_token_and_plan)(
+                    request, token_cost, min_plan, feature_name, cost_type
                 )
+                if denied is not None:
+                    return denied
+                return await view_func(view_instance, request, *args, **kwargs)
+            return _wrapped_async_view
 
-            # Store subscription in request for easy access in the view if needed
-            request.subscription = subscription
-            
+        @wraps(view_func)
+        def _wrapped_view(view_instance, request, *args, **kwargs):
+            denied = _check_token_and_plan(request, token_cost, min_plan, feature_name, cost_type)
+            if denied is not None:
+                return denied
             return view_func(view_instance, request, *args, **kwargs)
         return _wrapped_view
-    return decorator
\ No newline at end of file
+    return decorator
@@ -0,0 +1,340 @@
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------
+# DISTRIBUTED LEASE LOCKS
+# --------------------------------------------------
+
+
+class CacheFlightLock:
+    """
+    Lease lock on the default Django cache (``SET NX EX`` on Redis).
+
+    Waiters are not notified; they poll the lock with backoff until the
+    holder releases it or the lease expires. Used wherever the raw Redis
+    client is not available (DEV / tests, where the cache is per-process).
+    """
+
+    POLL_MIN = 0.01
+    POLL_MAX = 0.2
+
+    def acquire(self, lock_key: str, token: str, lease: float) -> bool:
+        return cache.add(lock_key, token, timeout=lease)
+
+    def release(self, lock_key: str, token: str):
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+
+    def wait(self, lock_key: str, timeout: float):
+        deadline = time.monotonic() + timeout
+        delay = self.POLL_MIN
+        while cache.get(lock_key) is not None and time.monotonic() < deadline:
+            time.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+            delay = min(delay * 2, self.POLL_MAX)
+
+    async def await_release(self, lock_key: str, timeout: float):
+        deadline = time.monotonic() + timeout
+        delay = self.POLL_MIN
+        while await asyncio.to_thread(cache.get, lock_key) is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, self.POLL_MAX)
+
+
+# KEYS: lock, channel   ARGV: token
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    redis.call('PUBLISH', KEYS[2], '1')
+    return 1
+end
+return 0
+"""
+
+
+class RedisFlightLock:
+    """
+    Lease lock in Redis with waiter notification.
+
+    The holder releases with a compare-and-delete script that also publishes
+    on the lock's channel, so waiters wake up as soon as the value is cached
+    instead of polling. A holder that dies simply lets the lease expire;
+    waiters re-check the lock every ``RECHECK`` seconds to notice that.
+    """
+
+    RECHECK = 1.0
+
+    def __init__(self, url: Optional[str] = None):
+        self.url = url or getattr(
+            settings,
+            "SINGLE_FLIGHT_REDIS_URL",
+            f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}/1",
+        )
+        self._client = None
+        self._async_client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            import redis
+
+            self._client = redis.from_url(self.url, decode_responses=True)
+        return self._client
+
+    @property
+    def async_client(self):
+        if self._async_client is None:
+            import redis.asyncio as redis
+
+            self._async_client = redis.from_url(self.url, decode_responses=True)
+        return self._async_client
+
+    @staticmethod
+    def channel(lock_key: str) -> str:
+        return f"{lock_key}:released"
+
+    def acquire(self, lock_key: str, token: str, lease: float) -> bool:
+        return bool(self.client.set(lock_key, token, nx=True, px=int(lease * 1000)))
+
+    def release(self, lock_key: str, token: str):
+        self.client.eval(_RELEASE_SCRIPT, 2, lock_key, self.channel(lock_key), token)
+
+    def wait(self, lock_key: str, timeout: float):
+        deadline = time.monotonic() + timeout
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        try:
+            pubsub.subscribe(self.channel(lock_key))
+            # Subscribe first, then check: a release in between is not missed
+            while self.client.exists(lock_key):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                # None is also returned for the (ignored) subscribe
+                # confirmation, so only a real message ends the wait
+                message = pubsub.get_message(timeout=min(remaining, self.RECHECK))
+                if message is not None and message["type"] == "message":
+                    return
+        finally:
+            pubsub.close()
+
+    async def await_release(self, lock_key: str, timeout: float):
+        deadline = time.monotonic() + timeout
+        pubsub = self.async_client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(self.channel(lock_key))
+            while await self.async_client.exists(lock_key):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                message = await pubsub.get_message(timeout=min(remaining, self.RECHECK))
+                if message is not None and message["type"] == "message":
+                    return
+        finally:
+            await pubsub.aclose()
+
+
+_flight_lock = None
+
+
+def get_flight_lock():
+    """Redis-backed in PROD (shared by every worker), cache-backed otherwise."""
+    global _flight_lock
+    if _flight_lock is None:
+        if getattr(settings, "ENVIRONMENT", "") == "PROD":
+            _flight_lock = RedisFlightLock()
+        else:
+            _flight_lock = CacheFlightLock()
+    return _flight_lock
+
+
+# --------------------------------------------------
+# SINGLE FLIGHT
+# --------------------------------------------------
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+    def result(self):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class SingleFlight:
+    """
+    Collapse concurrent cache misses for the same key into one computation.
+
+    Callers check their cache first and only call ``do`` / ``ado`` on a miss,
+    passing:
+
+    - ``load``: reads the cache again, returns ``None`` on a miss;
+    - ``compute``: the expensive call; it must store its result where
+      ``load`` finds it.
+
+    Within one process, concurrent callers wait for the first one (threads
+    on a ``threading.Event``, coroutines on a future of the same loop)
+    without touching Redis. Across processes, the first caller takes a
+    lease lock; the others wait for its release, then ``load``. If the
+    holder failed, or the wait exceeds ``wait_timeout``, the waiter competes
+    for the lock again or, past the deadline, computes without it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        lease: Optional[float] = None,
+        wait_timeout: Optional[float] = None,
+        lock=None,
+    ):
+        self.name = name
+        self.lease = lease or getattr(settings, "SINGLE_FLIGHT_LEASE", 30)
+        self.wait_timeout = wait_timeout or getattr(
+            settings, "SINGLE_FLIGHT_WAIT_TIMEOUT", self.lease
+        )
+        self._lock = lock
+        self._mutex = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._futures: Dict[str, asyncio.Future] = {}
+
+    @property
+    def lock(self):
+        return self._lock or get_flight_lock()
+
+    def lock_key(self, key: str) -> str:
+        return f"singleflight:{self.name}:{key}"
+
+    # --------------------------------------------------
+    # SYNC
+    # --------------------------------------------------
+
+    def do(self, key: str, load: Callable[[], Any], compute: Callable[[], Any]):
+        with self._mutex:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            return call.result()
+
+        try:
+            call.value = self._do_locked(key, load, compute)
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._mutex:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+
+    def _do_locked(self, key, load, compute):
+        lock_key = self.lock_key(key)
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.wait_timeout
+
+        while True:
+            if self._try(self.lock.acquire, lock_key, token, self.lease, default=True):
+                try:
+                    value = load()
+                    return value if value is not None else compute()
+                finally:
+                    self._try(self.lock.release, lock_key, token)
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning("single-flight %s: lock wait timed out for %s", self.name, key)
+                return compute()
+            self._try(self.lock.wait, lock_key, remaining)
+            value = load()
+            if value is not None:
+                return value
+
+    # --------------------------------------------------
+    # ASYNC
+    # --------------------------------------------------
+
+    async def ado(
+        self,
+        key: str,
+        load: Callable[[], Awaitable[Any]],
+        compute: Callable[[], Awaitable[Any]],
+    ):
+        loop = asyncio.get_running_loop()
+
+        # Futures are bound to their loop; only coalesce within the same one
+        inflight = self._futures.get(key)
+        if inflight is not None and inflight.get_loop() is loop:
+            return await asyncio.shield(inflight)
+
+        future = loop.create_future()
+        self._futures[key] = future
+        try:
+            value = await self._ado_locked(key, load, compute)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an un-awaited future does not log a warning
+            future.exception()
+            raise
+        finally:
+            if self._futures.get(key) is future:
+                del self._futures[key]
+
+    async def _ado_locked(self, key, load, compute):
+        lock_key = self.lock_key(key)
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.wait_timeout
+
+        while True:
+            acquired = await asyncio.to_thread(
+                self._try, self.lock.acquire, lock_key, token, self.lease, default=True
+            )
+            if acquired:
+                try:
+                    value = await load()
+                    return value if value is not None else await compute()
+                finally:
+                    await asyncio.to_thread(self._try, self.lock.release, lock_key, token)
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning("single-flight %s: lock wait timed out for %s", self.name, key)
+                return await compute()
+            try:
+                await self.lock.await_release(lock_key, remaining)
+            except Exception as e:
+                logger.error("single-flight %s: waiting for %s failed: %s", self.name, key, e)
+            value = await load()
+            if value is not None:
+                return value
+
+    # --------------------------------------------------
+
+    def _try(self, fn, *args, default=None):
+        """Lock errors degrade to "no coordination", never to a failed request."""
+        try:
+            return fn(*args)
+        except Exception as e:
+            logger.error("single-flight %s: %s failed: %s", self.name, fn.__name__, e)
+            return default
@@ -0,0 +1,70 @@
+import asyncio
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from rest_framework.generics import GenericAPIView
+from rest_framework.views import APIView
+
+
+def checks_to_async(func):
+    """
+    ``sync_to_async`` for the short, read-only request checks of async views
+    (authentication, permissions, throttles, plan and balance).
+
+    They run on the shared thread pool rather than the single thread-
+    sensitive thread, which every request would otherwise queue for. Each
+    pool thread keeps its own DB connection, so stale ones are closed before
+    and after the call, as Django does around a sync request. Writes stay on
+    thread-sensitive ``sync_to_async``.
+    """
+
+    @wraps(func)
+    def run(*args, **kwargs):
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return sync_to_async(run, thread_sensitive=False)
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView whose handlers are ``async def``.
+
+    Django serves such a view on the ASGI event loop instead of a worker
+    thread. DRF's own ``dispatch`` is sync, so it is replaced here: the
+    authentication / permission / throttle checks (which may hit the DB) run
+    in one ``checks_to_async`` hop, then the handler is awaited. Handlers must
+    keep ORM access behind ``sync_to_async`` as well.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await checks_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class AsyncGenericAPIView(AsyncAPIView, GenericAPIView):
+    """``GenericAPIView`` (serializer helpers) with async handlers."""
@@ -101,6 +101,18 @@ CACHES = {
     )
 }
 CACHE_TIMEOUT = 86400  # 24 hours
+# Values larger than this (pickled) are zlib-compressed before caching
+CACHE_COMPRESS_MIN_BYTES = 1024
+CACHE_COMPRESS_LEVEL = 6
+# Bump to invalidate a whole cache namespace (keys are hashed and versioned)
+TRANSLATION_CACHE_VERSION = "v1"  # hybrid translation; the sign-map fingerprint is added
+LOCALIZATION_CACHE_VERSION = "v1"
+# Seconds each process reuses a namespace's generation counter before
+# re-reading it; another worker's invalidation is seen this late
+CACHE_GENERATION_MEMO_TTL = 5
+# Single-flight: concurrent misses for one key wait for a single computation
+SINGLE_FLIGHT_LEASE = 30  # seconds a crashed holder can block a key
+SINGLE_FLIGHT_WAIT_TIMEOUT = 30  # then waiters compute without the lock
 # =============================================================================
 # APPLICATIONS
 # =============================================================================
@@ -132,6 +144,7 @@ MIDDLEWARE = [
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
+    "tafahom_api.apps.v1.ai.middleware.TelemetryUserMiddleware",
 ]
 
 # =============================================================================
@@ -222,6 +235,13 @@ WS_MAX_CONNECTION_TIME = WS_MAX_CONNECTION_TIME
 # =============================================================================
 AI_TIMEOUT_SECONDS = 1.5
 
+# Hybrid translation cache: entries older than the soft TTL are served stale
+# while one background call refreshes them; CACHE_TIMEOUT is the hard TTL.
+TRANSLATION_CACHE_SOFT_TTL = 60 * 60 * 6
+TRANSLATION_NEGATIVE_CACHE_TTL = 60  # AI failures are remembered this long
+TRANSLATION_REFRESH_LOCK_TTL = 30  # also the retry backoff after a failed refresh
+TRANSLATION_REFRESH_WORKERS = 2
+
 # =============================================================================
 # SIGN TRANSLATION PIPELINE (CV + NLP)
 # =============================================================================
@@ -234,6 +254,114 @@ MAX_CV_RETRIES = 3
 NLP_RETRIES = 3
 MOCK_CV = MOCK_CV
 
+# Text → gloss LLM prompt: only the dictionary entries nearest to the input
+# words (character trigram index) are embedded; 0 sends the whole sign map
+TEXT_TO_GLOSS_PROMPT_TOP_K = 40
+TEXT_TO_GLOSS_PROMPT_BATCH_MAX = 200  # batch prompts: TOP_K per entry, capped here
+TEXT_TO_GLOSS_PROMPT_PER_WORD = 6  # nearest dictionary words kept per input word
+TEXT_TO_GLOSS_PROMPT_MIN_SCORE = 0.35  # trigram Dice similarity
+
+# Light stemmer: second-chance lookup of inflected forms (ال / و / بال
+# prefixes, ات / ين / ه suffixes, ...) of single-word entries, run only on
+# words the exact sign-map match left over
+ARABIC_STEMMER_ENABLED = True
+
+# Fuzzy lexicon: unknown words within a small edit distance of a single-word
+# entry (typos, swapped or missing letters) are matched locally, before the
+# unknown-word store and the LLM. Each distance needs a minimum length,
+# counted on the word or the entry, whichever is longer.
+FUZZY_LEXICON_ENABLED = True
+FUZZY_LEXICON_MAX_DISTANCE = 2
+FUZZY_LEXICON_DISTANCE_LENGTHS = (5, 8)  # 1 edit from 5 letters, 2 from 8
+FUZZY_LEXICON_MIN_LENGTH = 4
+
+# Sign vector index: character n-gram TF-IDF vectors of every lexicon entry
+# (float16 matrix); the nearest entry with the same number of words resolves
+# an unknown word when its cosine similarity reaches the cutoff. Tier between
+# the fuzzy lexicon and the LLM. Built by `manage.py build_lexicon_index`.
+SIGN_VECTOR_INDEX_ENABLED = True
+SIGN_VECTOR_INDEX_PATH = BASE_DIR / "sign_vectors.npz"
+SIGN_VECTOR_NGRAM_RANGE = (2, 4)
+SIGN_VECTOR_MIN_SCORE = 0.65
+
+# Unknown-word store: resolutions of words the sign map does not know are kept
+# in the database and cached here, so each word reaches the LLM only once
+UNKNOWN_WORD_CACHE_TTL = 60 * 60 * 24 * 7  # 7 days
+UNKNOWN_WORD_ABSENT_TTL = 60  # "not in the database" is remembered this long
+
+# Transcript NLP: unknown words of long transcripts are deduplicated and sent
+# in prompt-sized chunks, a few at a time; a failed chunk only loses its words
+TRANSCRIPT_NLP_CHUNK_ENTRIES = 40  # words / phrases per prompt
+TRANSCRIPT_NLP_CHUNK_CHARS = 800  # input characters per prompt
+TRANSCRIPT_NLP_CONCURRENCY = 4
+TRANSCRIPT_NLP_CHUNK_TIMEOUT = 10
+TRANSCRIPT_NLP_TIMEOUT = 60  # whole transcript; unfinished chunks are dropped
+
+# Gloss → text cache (in-process LRU in front of the default cache)
+NLP_MODEL_SET_VERSION = "v1"  # bump when mbart / mt5 / nllb are redeployed
+NLP_GLOSS_CACHE_TTL = 60 * 60 * 24 * 7  # 7 days
+NLP_GLOSS_CACHE_MAX_ENTRIES = 2048
+
+# NLP model dispatch: "hedged" (best model first, hedge after its p90) or "race"
+NLP_DISPATCH_MODE = "hedged"
+NLP_HEDGE_SHADOW_RATE = 0.05  # fraction of requests that still race every model
+NLP_HEDGE_WINDOW = 200  # rolling samples per model, seeded from metrics
+NLP_HEDGE_DEFAULT_DELAY_MS = 1500
+NLP_HEDGE_MIN_DELAY_MS = 50
+
+# Buffered AI telemetry (AIRequest / MultiModelTranslationMetric) writer
+TELEMETRY_MAX_QUEUE = 10000  # rows beyond this are dropped, never blocking callers
+TELEMETRY_BATCH_SIZE = 200
+TELEMETRY_FLUSH_INTERVAL_MS = 1000
+
+# Per-backend circuit breakers (cv, nlp, tts, stt, text_to_gloss), shared process-wide
+CIRCUIT_BREAKER_WINDOW_SECONDS = 30  # rolling failure window
+CIRCUIT_BREAKER_MIN_CALLS = 5  # outcomes needed in the window before it can open
+CIRCUIT_BREAKER_FAILURE_RATIO = 0.5
+CIRCUIT_BREAKER_OPEN_SECONDS = 30  # fail fast for this long, then half-open
+CIRCUIT_BREAKER_HALF_OPEN_CALLS = 1
+
+# Text-to-speech audio cache (content-addressed by text + voice + model)
+TTS_VOICE_ID = ""  # empty → backend default voice
+TTS_MODEL_ID = ""
+TTS_AUDIO_CACHE_DIR = "/app/media/tts_cache"
+TTS_AUDIO_CACHE_MAX_BYTES = 512 * 1024 * 1024  # LRU-evicted beyond this
+TTS_STREAM_MAX_FRAME_BYTES = 32 * 1024  # larger backend chunks are split across frames
+
+# Speech-to-text input transcoding (ffmpeg over pipes → PCM16 mono 16 kHz WAV)
+STT_FFMPEG_MAX_CONCURRENCY = 4  # ffmpeg processes per worker process
+STT_FFMPEG_TIMEOUT = 30
+
+# Meeting audio: per-participant VAD gates STT (energy + zero-crossing rate)
+MEETING_VAD_FRAME_MS = 30
+MEETING_VAD_ENERGY_THRESHOLD = 0.01  # RMS, full scale = 1.0
+MEETING_VAD_NOISE_RATIO = 3.0  # voiced frames must also exceed noise floor × this
+MEETING_VAD_ZCR_MAX = 0.35
+MEETING_VAD_SILENCE_MS = 600  # silence that closes an utterance
+MEETING_VAD_MIN_UTTERANCE_MS = 300  # shorter bursts are dropped as clicks
+MEETING_VAD_MAX_UTTERANCE_MS = 15000
+MEETING_VAD_PREROLL_MS = 200
+MEETING_STT_DRAIN_TIMEOUT = 5  # seconds a leaving speaker's pending STT may still take
+
+# Meeting participant → channel_name registry (Redis hash per meeting in PROD)
+MEETING_REDIS_URL = f"redis://{REDIS_HOST}:{REDIS_PORT}/2"
+MEETING_REGISTRY_TTL = 60 * 60 * 6  # abandoned meetings expire after this
+
+# Trickle-ICE batching: candidates per target are coalesced for this window
+MEETING_ICE_BATCHING_ENABLED = True  # off: one channel-layer message per candidate
+MEETING_ICE_BATCH_WINDOW_MS = 30
+MEETING_ICE_BATCH_MAX = 32  # flush immediately once this many are queued
+
+# Meeting presence: roster lives in Redis, meeting metadata in the cache
+MEETING_META_CACHE_TTL = 300
+MEETING_PRESENCE_TTL = 90  # members without a heartbeat for this long are pruned
+MEETING_PRESENCE_HEARTBEAT = 30
+
+# Sign-map matching: inputs longer than this many words run on a worker pool
+SIGN_MATCHER_OFFLOAD_WORDS = 300
+SIGN_MATCHER_WORKERS = 2
+SIGN_MATCHER_EXECUTOR = "process"  # "process" | "thread"
+
 
 # =============================================================================
 # STATIC FILES
@@ -1,5 +1,7 @@
 import pytest
 from rest_framework_simplejwt.tokens import AccessToken
+from tafahom_api.apps.v1.ai import telemetry
+from tafahom_api.apps.v1.ai.clients import audio_cache, circuit_breaker
 from tafahom_api.apps.v1.users.models import User
 
 
@@ -12,6 +14,36 @@ def django_db_setup(django_db_setup, django_db_blocker):
         call_command("loaddata", "translations")
 
 
+@pytest.fixture(autouse=True)
+def telemetry_sink(monkeypatch):
+    """
+    Keep AI telemetry on the test thread instead of the background flusher
+    """
+    sink = telemetry.TelemetrySink(start_thread=False)
+    monkeypatch.setattr(telemetry, "_sink", sink)
+    return sink
+
+
+@pytest.fixture(autouse=True)
+def circuit_breakers(monkeypatch):
+    """
+    Fresh breaker registry so failures in one test never open a breaker in another
+    """
+    breakers = {}
+    monkeypatch.setattr(circuit_breaker, "_breakers", breakers)
+    return breakers
+
+
+@pytest.fixture(autouse=True)
+def tts_audio_cache(monkeypatch, tmp_path):
+    """
+    Per-test TTS audio cache under tmp_path instead of MEDIA_ROOT
+    """
+    cache = audio_cache.TTSAudioCache(root=tmp_path / "tts_cache")
+    monkeypatch.setattr(audio_cache, "_cache", cache)
+    return cache
+
+
 @pytest.fixture
 def existing_user(db) -> User:
     """
@@ -0,0 +1,138 @@
+import time
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from tafahom_api.apps.v1.ai.clients.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    InvalidRequestError,
+    breaker_states,
+)
+from tafahom_api.apps.v1.translation.services.sign_translation_service import (
+    RetryHandler,
+)
+
+
+@pytest.fixture
+def breaker():
+    return CircuitBreaker(
+        "test", window_seconds=10, min_calls=3, failure_ratio=0.5, open_seconds=0.05
+    )
+
+
+class TestCircuitBreaker:
+    def test_opens_after_failure_ratio(self, breaker):
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+
+        breaker.record_failure()
+        assert breaker.state == OPEN
+
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+    def test_half_open_allows_single_probe(self, breaker):
+        for _ in range(3):
+            breaker.record_failure()
+        time.sleep(0.06)
+
+        assert breaker.state == HALF_OPEN
+        breaker.before_call()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+    def test_probe_success_closes(self, breaker):
+        for _ in range(3):
+            breaker.record_failure()
+        time.sleep(0.06)
+
+        breaker.before_call()
+        breaker.record_success()
+        assert breaker.state == CLOSED
+
+    def test_probe_failure_reopens(self, breaker):
+        for _ in range(3):
+            breaker.record_failure()
+        time.sleep(0.06)
+
+        breaker.before_call()
+        breaker.record_failure()
+        assert breaker.state == OPEN
+
+    def test_registry_lists_every_backend(self):
+        assert {"cv", "nlp", "tts", "stt", "text_to_gloss"} <= set(breaker_states())
+
+
+class TestRetryHandlerWithBreaker:
+    @pytest.mark.asyncio
+    async def test_open_breaker_fails_fast(self, breaker):
+        handler = RetryHandler(max_retries=3, base_delay=0.01)
+        for _ in range(3):
+            breaker.record_failure()
+        mock_coro = AsyncMock(return_value={"ok": True})
+
+        with pytest.raises(CircuitOpenError):
+            await handler.execute(lambda: mock_coro(), service_name="test", breaker=breaker)
+
+        assert mock_coro.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_failures_open_breaker_mid_retry(self, breaker):
+        handler = RetryHandler(max_retries=5, base_delay=0.01, max_delay=0.01)
+        mock_coro = AsyncMock(side_effect=ConnectionError("down"))
+
+        with pytest.raises(CircuitOpenError):
+            await handler.execute(lambda: mock_coro(), service_name="test", breaker=breaker)
+
+        assert mock_coro.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_caller_errors_are_not_retried_or_counted(self, breaker):
+        handler = RetryHandler(max_retries=3, base_delay=0.01)
+        mock_coro = AsyncMock(side_effect=InvalidRequestError("Text is empty"))
+
+        for _ in range(5):
+            with pytest.raises(InvalidRequestError):
+                await handler.execute(lambda: mock_coro(), service_name="test", breaker=breaker)
+
+        assert mock_coro.call_count == 5
+        assert breaker.state == CLOSED
+        assert breaker.snapshot()["failures_in_window"] == 0
+
+    @pytest.mark.asyncio
+    async def test_http_4xx_is_a_caller_error_and_5xx_a_failure(self, breaker):
+        def status_error(code):
+            request = httpx.Request("POST", "http://backend/translate")
+            return httpx.HTTPStatusError(
+                str(code), request=request, response=httpx.Response(code, request=request)
+            )
+
+        handler = RetryHandler(max_retries=2, base_delay=0.01)
+        bad_request = AsyncMock(side_effect=status_error(422))
+        with pytest.raises(httpx.HTTPStatusError):
+            await handler.execute(lambda: bad_request(), service_name="test", breaker=breaker)
+        assert bad_request.call_count == 1
+        assert breaker.snapshot()["failures_in_window"] == 0
+
+        server_error = AsyncMock(side_effect=status_error(503))
+        with pytest.raises(httpx.HTTPStatusError):
+            await handler.execute(lambda: server_error(), service_name="test", breaker=breaker)
+        assert server_error.call_count == 2
+        assert breaker.snapshot()["failures_in_window"] == 2
+
+    @pytest.mark.asyncio
+    async def test_other_errors_are_retried_but_not_counted(self, breaker):
+        handler = RetryHandler(max_retries=3, base_delay=0.01)
+        mock_coro = AsyncMock(side_effect=ValueError("CV model returned empty gloss"))
+
+        with pytest.raises(ValueError):
+            await handler.execute(lambda: mock_coro(), service_name="test", breaker=breaker)
+
+        assert mock_coro.call_count == 3
+        assert breaker.snapshot()["failures_in_window"] == 0
@@ -0,0 +1,240 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from django.core.cache import cache as django_cache
+
+from tafahom_api.apps.v1.ai.clients.base import shared_http_client
+from tafahom_api.apps.v1.ai.clients.gloss_cache import (
+    GlossTranslationCache,
+    normalize_gloss,
+)
+from tafahom_api.apps.v1.ai.clients.hedging import HedgingScheduler
+from tafahom_api.apps.v1.ai.clients.nlp_model_client import NLPModelClient
+
+
+@pytest.fixture
+def gloss_cache():
+    cache = GlossTranslationCache(max_entries=4, default_ttl=60, version="test")
+    yield cache
+    cache.clear()
+    django_cache.clear()
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = HedgingScheduler(shadow_rate=0.0, default_delay_ms=50)
+    scheduler._seeded = True
+    return scheduler
+
+
+@pytest.fixture
+def nlp_client(gloss_cache, scheduler):
+    client = NLPModelClient(cache=gloss_cache, scheduler=scheduler)
+    client.mbart_url = "http://mbart"
+    client.mt5_url = ""
+    client.nllb_url = ""
+    return client
+
+
+def _model_result(text="مرحبا"):
+    return {"model": "mbart", "text": text, "latency_ms": 12, "raw": {"text": text}}
+
+
+class TestGlossTranslationCache:
+    def test_normalize_gloss(self):
+        assert normalize_gloss("  hello   you ") == "HELLO YOU"
+
+    def test_key_is_shared_by_equivalent_glosses(self, gloss_cache):
+        assert gloss_cache.make_key("hello you") == gloss_cache.make_key(" HELLO  YOU")
+
+    def test_key_changes_with_version(self, gloss_cache):
+        other = GlossTranslationCache(version="other")
+        assert gloss_cache.make_key("HELLO") != other.make_key("HELLO")
+
+    @pytest.mark.asyncio
+    async def test_lru_evicts_oldest(self, gloss_cache):
+        for i in range(5):
+            gloss_cache._local_set(f"k{i}", {"text": str(i)}, 60)
+        assert gloss_cache._local_get("k0") is None
+        assert gloss_cache._local_get("k4") == {"text": "4"}
+
+    @pytest.mark.asyncio
+    async def test_per_entry_ttl(self, gloss_cache):
+        gloss_cache._local_set("short", {"text": "x"}, -1)
+        assert gloss_cache._local_get("short") is None
+
+    @pytest.mark.asyncio
+    async def test_single_flight_collapses_concurrent_misses(self, gloss_cache):
+        calls = 0
+
+        async def factory():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return {"text": "شكرا", "model": "nllb"}
+
+        results = await asyncio.gather(
+            *[gloss_cache.get_or_compute("THANK YOU", factory) for _ in range(10)]
+        )
+
+        assert calls == 1
+        assert {entry["text"] for entry, _ in results} == {"شكرا"}
+        assert sorted(source for _, source in results).count("miss") == 1
+
+
+@pytest.mark.django_db(transaction=True)
+class TestNLPModelClientCache:
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_model_race(self, nlp_client):
+        with patch.object(
+            nlp_client, "_post_to_model", AsyncMock(return_value=_model_result())
+        ) as post:
+            first = await nlp_client.translate_gloss("HELLO")
+            second = await nlp_client.translate_gloss("hello ")
+
+        assert post.call_count == 1
+        assert first.text == second.text == "مرحبا"
+        assert first.raw["cache"] == "miss"
+        assert second.raw["cache"] == "memory"
+        assert second.raw["winner_model"] == "mbart"
+
+
+class TestHedgingScheduler:
+    def test_rank_prefers_fast_reliable_model(self, scheduler):
+        for _ in range(20):
+            scheduler.record("mbart", 900, True)
+            scheduler.record("mt5", 200, True)
+            scheduler.record("nllb", 150, False)
+
+        assert scheduler.rank(["mbart", "mt5", "nllb"])[0] == "mt5"
+
+    def test_hedge_delay_is_p90(self, scheduler):
+        for latency in range(100, 1100, 100):
+            scheduler.record("mbart", latency, True)
+
+        assert scheduler.hedge_delay("mbart") == pytest.approx(0.9)
+
+    def test_early_cancelled_loser_does_not_improve_its_rank(self, scheduler):
+        for _ in range(20):
+            scheduler.record("mt5", 200, True)
+            scheduler.record("nllb", 400, True)
+        delay = scheduler.hedge_delay("nllb")
+
+        # nllb started as the backup and was cancelled a few ms later
+        for _ in range(30):
+            scheduler.record_censored("nllb", 5)
+
+        assert scheduler.rank(["nllb", "mt5"]) == ["mt5", "nllb"]
+        assert scheduler.hedge_delay("nllb") == delay
+        scheduler.record_censored("nllb", 900)
+        assert max(scheduler._stats["nllb"].latencies) == 900
+
+    def test_stats_report_saved_load(self, scheduler):
+        scheduler.record_dispatch(available=3, started=1, shadow=False)
+        scheduler.record_dispatch(available=3, started=2, shadow=False)
+
+        stats = scheduler.stats()
+        assert stats["calls_saved"] == 3
+        assert stats["load_saved_ratio"] == pytest.approx(0.5)
+
+
+@pytest.mark.django_db(transaction=True)
+class TestNLPModelClientHedging:
+    @pytest.fixture
+    def multi_client(self, nlp_client):
+        nlp_client.mt5_url = "http://mt5"
+        nlp_client.nllb_url = "http://nllb"
+        return nlp_client
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_starts_one_model(self, multi_client, scheduler):
+        for _ in range(10):
+            scheduler.record("mt5", 10, True)
+
+        async def fake_post(name, url, gloss):
+            return {"model": name, "text": name, "latency_ms": 1, "raw": {}}
+
+        with patch.object(multi_client, "_post_to_model", side_effect=fake_post) as post:
+            result = await multi_client.translate_gloss("HELLO")
+
+        assert post.call_count == 1
+        assert result.text == "mt5"
+        assert result.raw["dispatch"] == "hedged"
+        assert result.raw["models_started"] == 1
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged(self, multi_client, scheduler):
+        for _ in range(10):
+            scheduler.record("mbart", 10, True)
+
+        async def fake_post(name, url, gloss):
+            if name == "mbart":
+                await asyncio.sleep(1)
+            return {"model": name, "text": name, "latency_ms": 1, "raw": {}}
+
+        with patch.object(multi_client, "_post_to_model", side_effect=fake_post):
+            result = await multi_client.translate_gloss("GOODBYE")
+
+        assert result.text != "mbart"
+        assert result.raw["models_started"] == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_loser_is_recorded_as_censored_latency(self, multi_client, scheduler):
+        for _ in range(10):
+            scheduler.record("mbart", 10, True)
+
+        async def fake_post(name, url, gloss):
+            if name == "mbart":
+                await asyncio.sleep(1)
+            return {"model": name, "text": name, "latency_ms": 1, "raw": {}}
+
+        with patch.object(multi_client, "_post_to_model", side_effect=fake_post):
+            await multi_client.translate_gloss("WELCOME")
+
+        stats = scheduler.stats()["models"]["mbart"]
+        # Still 10 outcomes (a cancellation is not a failure), but the loser's
+        # elapsed time, past the 50 ms hedge delay, is now a latency sample.
+        assert stats["samples"] == 10
+        assert stats["error_rate"] == 0
+        assert max(scheduler._stats["mbart"].latencies) >= 50
+
+    @pytest.mark.asyncio
+    async def test_failed_primary_starts_next_immediately(self, multi_client, scheduler):
+        for _ in range(10):
+            scheduler.record("nllb", 10, True)
+
+        async def fake_post(name, url, gloss):
+            if name == "nllb":
+                raise RuntimeError("nllb failed: boom|3")
+            return {"model": name, "text": name, "latency_ms": 1, "raw": {}}
+
+        with patch.object(multi_client, "_post_to_model", side_effect=fake_post):
+            result = await multi_client.translate_gloss("THANKS")
+
+        assert result.text in ("mbart", "mt5")
+        assert scheduler.stats()["models"]["nllb"]["error_rate"] > 0
+
+
+class TestSharedHttpClient:
+    @pytest.mark.asyncio
+    async def test_model_calls_reuse_one_client(self, nlp_client):
+        seen = []
+
+        async def fake_post(self, url, **kwargs):
+            seen.append(self)
+            return httpx.Response(200, json={"text": "مرحبا"}, request=httpx.Request("POST", url))
+
+        with patch("httpx.AsyncClient.post", fake_post):
+            await nlp_client._post_to_model("mbart", "http://mbart", "HELLO")
+            await nlp_client._post_to_model("mbart", "http://mbart", "THANKS")
+
+        assert len(seen) == 2
+        assert seen[0] is seen[1] is shared_http_client()
+
+    def test_each_event_loop_gets_its_own_client(self):
+        async def current():
+            return shared_http_client()
+
+        assert asyncio.run(current()) is not asyncio.run(current())
@@ -0,0 +1,74 @@
+import threading
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from tafahom_api.apps.v1.ai.models import AIRequest, MultiModelTranslationMetric
+from tafahom_api.apps.v1.ai.telemetry import TelemetrySink, record_ai_request, telemetry_user
+
+
+@pytest.fixture
+def sink():
+    return TelemetrySink(max_queue=3, batch_size=2, start_thread=False)
+
+
+@pytest.mark.django_db
+class TestTelemetrySink:
+    def test_flush_bulk_creates_each_model(self, sink):
+        sink.record(AIRequest(service="nlp", endpoint="translate_gloss", status="success", latency_ms=10))
+        sink.record(MultiModelTranslationMetric(gloss="HELLO", winner_model="mbart", winner_latency_ms=10))
+        sink.record(AIRequest(service="cv", endpoint="receive_gloss", status="failed", latency_ms=20))
+
+        sink.flush()
+
+        assert AIRequest.objects.count() == 2
+        assert MultiModelTranslationMetric.objects.count() == 1
+        assert sink.stats() == {"queued": 0, "written": 3, "dropped": 0}
+
+    def test_full_queue_drops_instead_of_blocking(self, sink):
+        for _ in range(3):
+            assert sink.record(AIRequest(service="nlp", endpoint="x", status="success", latency_ms=1))
+
+        assert sink.record(AIRequest(service="nlp", endpoint="x", status="success", latency_ms=1)) is False
+        assert sink.stats()["dropped"] == 1
+
+    def test_close_drains_and_rejects_new_rows(self, sink):
+        sink.record(AIRequest(service="speech", endpoint="text_to_speech", status="timeout", latency_ms=5))
+
+        sink.close()
+
+        assert AIRequest.objects.count() == 1
+        assert sink.record(AIRequest(service="nlp", endpoint="x", status="success", latency_ms=1)) is False
+
+    def test_drop_counter_is_exact_under_concurrent_producers(self):
+        sink = TelemetrySink(max_queue=1, start_thread=False)
+        sink.record(AIRequest(service="nlp", endpoint="x", status="success", latency_ms=1))
+
+        def produce():
+            for _ in range(500):
+                sink.record(AIRequest(service="nlp", endpoint="x", status="success", latency_ms=1))
+
+        threads = [threading.Thread(target=produce) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sink.stats()["dropped"] == 4000
+
+
+@pytest.mark.django_db
+class TestTelemetryUser:
+    def test_row_belongs_to_bound_user(self, sink):
+        user = get_user_model().objects.create_user(
+            username="telemetry", email="telemetry@example.com", password="x"
+        )
+
+        with patch("tafahom_api.apps.v1.ai.telemetry.get_telemetry_sink", return_value=sink):
+            with telemetry_user(lambda: user):
+                record_ai_request("nlp", "translate_gloss", "success", 12)
+            record_ai_request("nlp", "translate_gloss", "success", 12)
+        sink.flush()
+
+        assert list(AIRequest.objects.order_by("id").values_list("user_id", flat=True)) == [user.id, None]
@@ -0,0 +1,100 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from tafahom_api.apps.v1.ai.clients.prompt_lexicon import char_ngrams, get_lexicon_index
+from tafahom_api.apps.v1.ai.clients.text_to_gloss_client import (
+    TextToGlossClient,
+    _SYSTEM_PROMPT,
+    build_batch_prompt,
+    build_prompt,
+)
+
+
+class TestLexiconIndex:
+    def test_trigrams_are_padded(self):
+        assert char_ngrams("ق") == {" ق "}
+        assert " جر" in char_ngrams("جرح")
+
+    def test_exact_words_are_candidates(self):
+        lexicon = get_lexicon_index().candidates("مقهور جرح", top_k=40)
+        assert {"مقهور", "جرح"} <= set(lexicon.animation_keys)
+
+    def test_synonyms_and_variants_are_candidates(self):
+        lexicon = get_lexicon_index().candidates("حرائق في الإسعاف", top_k=40)
+        assert lexicon.synonyms["حرائق"] == "حريق"
+        assert "اسعاف" in lexicon.sign_keys
+
+    def test_top_k_caps_the_result(self):
+        assert len(get_lexicon_index().candidates("انا مبسوط جدا", top_k=5)) <= 5
+
+    def test_unrelated_input_has_no_candidates(self):
+        assert len(get_lexicon_index().candidates("xyz qwerty", top_k=40)) == 0
+
+
+class TestBuildPrompt:
+    def test_filtered_prompt_is_much_smaller(self):
+        prompt, filtered = build_prompt("في نار في البيت")
+
+        assert filtered
+        assert len(prompt) < len(_SYSTEM_PROMPT) / 3
+        assert '"نار": "حريق"' in prompt
+        assert "User Input:\nفي نار في البيت\n" in prompt
+
+    def test_no_candidates_falls_back_to_full_dictionary(self):
+        prompt, filtered = build_prompt("xyz")
+        assert not filtered
+        assert prompt.startswith(_SYSTEM_PROMPT)
+
+    def test_retrieval_can_be_disabled(self, settings):
+        settings.TEXT_TO_GLOSS_PROMPT_TOP_K = 0
+        prompt, filtered = build_prompt("مقهور جرح")
+        assert not filtered
+        assert prompt.startswith(_SYSTEM_PROMPT)
+
+
+class TestBuildBatchPrompt:
+    def test_every_entry_has_candidates(self):
+        index = get_lexicon_index()
+        words = [
+            key for kind, key in index.entries if kind != "synonym" and len(key) >= 3 and " " not in key
+        ]
+        entries = [f"{word}ين" for word in words[:40]]
+
+        prompt = build_batch_prompt(entries)
+        dictionary = f" {' '.join(prompt.split('BATCH MODE:')[0].split())} "
+
+        for entry in entries:
+            best = index.candidates(entry, top_k=1)
+            assert best.animation_keys + best.sign_keys, entry
+            assert any(f" {key} " in dictionary for key in best.animation_keys + best.sign_keys), entry
+
+    def test_batch_dictionary_is_capped(self):
+        lexicon = get_lexicon_index().candidates_many(
+            ["مقهور", "جرح", "حريق", "اسعاف"], top_k=40, max_entries=10
+        )
+        assert len(lexicon) == 10
+        assert {"مقهور", "جرح"} <= set(lexicon.animation_keys)
+
+
+class TestTextToGlossClient:
+    @pytest.mark.asyncio
+    async def test_sends_filtered_prompt(self):
+        client = TextToGlossClient()
+        with patch.object(client, "_post_json", AsyncMock(return_value={"gloss": "حريق"})) as post:
+            result = await client.text_to_gloss("في نار")
+
+        assert result == {"gloss": "حريق"}
+        assert post.call_count == 1
+        assert len(post.call_args.kwargs["json"]["prompt"]) < len(_SYSTEM_PROMPT)
+
+    @pytest.mark.asyncio
+    async def test_empty_output_retries_with_full_dictionary(self):
+        client = TextToGlossClient()
+        post = AsyncMock(side_effect=[{"gloss": ""}, {"gloss": "حريق"}])
+        with patch.object(client, "_post_json", post):
+            result = await client.text_to_gloss("في نار")
+
+        assert result == {"gloss": "حريق"}
+        assert post.call_count == 2
+        assert post.call_args.kwargs["json"]["prompt"].startswith(_SYSTEM_PROMPT)
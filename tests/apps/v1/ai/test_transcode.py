@@ -0,0 +1,196 @@
+import asyncio
+import struct
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from tafahom_api.apps.v1.ai.clients.speech_to_text_client import SpeechToTextClient
+from tafahom_api.apps.v1.ai.utils import transcode
+from tafahom_api.apps.v1.ai.utils.audio_ingest import IngestedAudio, ingest_audio
+from tafahom_api.apps.v1.ai.utils.transcode import (
+    ProcessLimiter,
+    TranscodeError,
+    is_stt_wav,
+    transcode_to_stt_wav,
+    wav_header,
+)
+
+
+def _wav(channels=1, rate=16000, bits=16, pcm=b"\x00\x01" * 8, extra_chunk=False):
+    fmt = struct.pack(
+        "<HHIIHH", 1, channels, rate, rate * channels * bits // 8, channels * bits // 8, bits
+    )
+    body = b"WAVE"
+    if extra_chunk:
+        body += b"LIST" + struct.pack("<I", 3) + b"abc\x00"
+    body += b"fmt " + struct.pack("<I", len(fmt)) + fmt
+    body += b"data" + struct.pack("<I", len(pcm)) + pcm
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    limiter = ProcessLimiter(limit=2)
+    monkeypatch.setattr(transcode, "_limiter", limiter)
+    return limiter
+
+
+def _fake_ffmpeg(stdout=b"\x01\x00" * 4, returncode=0, stderr=b"", delay=0.0):
+    async def communicate(input=None):
+        await asyncio.sleep(delay)
+        return stdout, stderr
+
+    proc = MagicMock(returncode=returncode, communicate=communicate, wait=AsyncMock())
+    return AsyncMock(return_value=proc)
+
+
+class TestWavHeader:
+    def test_target_format_is_detected(self):
+        assert is_stt_wav(_wav())
+        assert is_stt_wav(_wav(extra_chunk=True))
+
+    @pytest.mark.parametrize(
+        "data",
+        [_wav(channels=2), _wav(rate=44100), _wav(bits=8), b"ID3\x03mp3 data", b""],
+    )
+    def test_other_inputs_need_transcoding(self, data):
+        assert not is_stt_wav(data)
+
+    def test_generated_header_round_trips(self):
+        assert is_stt_wav(wav_header(16) + b"\x00" * 16)
+
+
+class TestTranscode:
+    @pytest.mark.asyncio
+    async def test_target_wav_skips_ffmpeg(self, limiter):
+        data = _wav()
+        with patch("asyncio.create_subprocess_exec") as spawn:
+            assert await transcode_to_stt_wav(data) is data
+        spawn.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_pipes_bytes_through_ffmpeg(self, limiter):
+        spawn = _fake_ffmpeg()
+        with patch("asyncio.create_subprocess_exec", spawn):
+            wav = await transcode_to_stt_wav(b"webm bytes")
+
+        args = spawn.call_args.args
+        assert "pipe:0" in args and "pipe:1" in args
+        assert is_stt_wav(wav)
+        assert wav.endswith(b"\x01\x00" * 4)
+
+    @pytest.mark.asyncio
+    async def test_ffmpeg_failure_raises(self, limiter):
+        spawn = _fake_ffmpeg(stdout=b"", returncode=1, stderr=b"Invalid data")
+        with patch("asyncio.create_subprocess_exec", spawn):
+            with pytest.raises(TranscodeError, match="Invalid data"):
+                await transcode_to_stt_wav(b"garbage")
+        assert limiter.active == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped(self, limiter):
+        peak = 0
+
+        async def communicate(input=None):
+            nonlocal peak
+            peak = max(peak, limiter.active)
+            await asyncio.sleep(0.01)
+            return b"\x00\x00", b""
+
+        proc = MagicMock(returncode=0, communicate=communicate)
+        with patch("asyncio.create_subprocess_exec", AsyncMock(return_value=proc)):
+            await asyncio.gather(*[transcode_to_stt_wav(b"x") for _ in range(6)])
+
+        assert peak == 2
+        assert limiter.active == 0
+        assert limiter.waited > 0
+
+    @pytest.mark.asyncio
+    async def test_timeout_survives_ffmpeg_having_exited(self, limiter):
+        async def communicate(input=None):
+            await asyncio.sleep(1)
+
+        proc = MagicMock(
+            returncode=0,
+            communicate=communicate,
+            kill=MagicMock(side_effect=ProcessLookupError),
+            wait=AsyncMock(),
+        )
+        with patch("asyncio.create_subprocess_exec", AsyncMock(return_value=proc)):
+            with pytest.raises(asyncio.TimeoutError):
+                await transcode_to_stt_wav(b"x", timeout=0.01)
+        assert limiter.active == 0
+
+
+@pytest.mark.django_db
+class TestSpeechToTextClient:
+    @pytest.mark.asyncio
+    async def test_posts_wav_bytes_without_temp_files(self, limiter):
+        client = SpeechToTextClient()
+        data = _wav()
+
+        post = AsyncMock(return_value={"text": "مرحبا"})
+        with patch.object(client, "_post_file", post):
+            with patch("tempfile.NamedTemporaryFile") as tmp:
+                result = await client.speech_to_text(data)
+
+        tmp.assert_not_called()
+        assert result == {"text": "مرحبا"}
+        assert post.call_args.kwargs["files"]["file"][1] == data
+
+
+class TestAudioIngest:
+    @pytest.mark.asyncio
+    async def test_duration_from_pcm_size(self, limiter):
+        audio = await ingest_audio(_wav(pcm=b"\x00" * 32000))
+        assert not audio.transcoded
+        assert audio.duration_seconds == pytest.approx(1.0)
+
+    @pytest.mark.asyncio
+    async def test_extra_chunks_are_not_taken_for_samples(self, limiter):
+        pcm = b"\x01\x02" * 16000
+        with patch("asyncio.create_subprocess_exec") as spawn:
+            audio = await ingest_audio(_wav(pcm=pcm, extra_chunk=True))
+
+        spawn.assert_not_called()
+        assert not audio.transcoded
+        assert audio.pcm == pcm
+        assert audio.duration_seconds == pytest.approx(1.0)
+        assert is_stt_wav(audio.wav)
+
+    @pytest.mark.asyncio
+    async def test_disk_upload_is_decoded_by_path(self, limiter):
+        upload = MagicMock(temporary_file_path=MagicMock(return_value="/tmp/upload.webm"))
+        spawn = _fake_ffmpeg()
+        with patch("asyncio.create_subprocess_exec", spawn):
+            audio = await ingest_audio(upload)
+
+        upload.read.assert_not_called()
+        assert "/tmp/upload.webm" in spawn.call_args.args
+        assert audio.transcoded
+
+    @pytest.mark.asyncio
+    async def test_voice_to_sign_decodes_once(self, limiter):
+        from tafahom_api.apps.v1.translation.services.sign_translation_service import (
+            SignTranslationService,
+        )
+
+        spawn = _fake_ffmpeg()
+        post = AsyncMock(return_value={"text": "مرحبا"})
+        text_to_sign = AsyncMock(return_value={"gloss": ["HELLO"], "video": None})
+
+        with patch.object(SpeechToTextClient, "_post_file", post):
+            with patch.object(SignTranslationService, "text_to_sign", text_to_sign):
+                with patch("asyncio.create_subprocess_exec", spawn):
+                    result = await SignTranslationService.voice_to_sign(b"webm bytes")
+
+        assert spawn.call_count == 1
+        assert result["text"] == "مرحبا"
+        assert is_stt_wav(post.call_args.kwargs["files"]["file"][1])
+
+    @pytest.mark.asyncio
+    async def test_ingested_audio_is_not_decoded_again(self, limiter):
+        audio = IngestedAudio(wav=b"already decoded", transcoded=True)
+        with patch("asyncio.create_subprocess_exec") as spawn:
+            assert await ingest_audio(audio) is audio
+        spawn.assert_not_called()
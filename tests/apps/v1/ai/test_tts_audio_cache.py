@@ -0,0 +1,161 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from tafahom_api.apps.v1.ai.clients.audio_cache import TTSAudioCache
+from tafahom_api.apps.v1.ai.clients.text_to_speech_client import TextToSpeechClient
+from tafahom_api.apps.v1.translation.services.audio_frames import (
+    FRAME_AUDIO,
+    FRAME_AUDIO_END,
+    decode_audio_frame,
+)
+from tafahom_api.apps.v1.translation.services.streaming_translation_service import (
+    StreamingTranslationService,
+)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return TTSAudioCache(root=tmp_path / "tts", max_bytes=10)
+
+
+class TestTTSAudioCache:
+    def test_key_covers_text_voice_and_model(self, cache):
+        key = cache.make_key("مرحبا  بك", "v1", "m1")
+        assert key == cache.make_key(" مرحبا بك ", "v1", "m1")
+        assert key != cache.make_key("مرحبا بك", "v2", "m1")
+        assert key != cache.make_key("مرحبا بك", "v1", "m2")
+
+    def test_round_trip(self, cache):
+        cache.set("hello", b"abc", voice="v")
+        assert cache.get("hello", voice="v") == b"abc"
+        assert cache.get("hello", voice="other") is None
+
+    def test_lru_eviction_respects_size_budget(self, cache):
+        cache.set("a", b"1234")
+        cache.set("b", b"1234")
+        cache.get("a")  # "b" is now least recently used
+        cache.set("c", b"1234")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == b"1234"
+        assert cache.stats()["bytes"] <= 10
+        assert cache.stats()["evictions"] == 1
+
+    def test_entries_written_by_another_process_are_served(self, cache):
+        cache.set("hello", b"abc")
+        reopened = TTSAudioCache(root=cache.root, max_bytes=10)
+        assert reopened.get("hello") == b"abc"
+        assert reopened.stats()["hits"] == 1
+
+    def test_workers_sharing_a_directory_share_one_budget(self, cache):
+        other_worker = TTSAudioCache(root=cache.root, max_bytes=10)
+        cache.set("a", b"1234")
+        cache.set("b", b"1234")
+
+        # The other worker never saw "a" or "b" but evicts from the directory
+        other_worker.set("c", b"1234")
+
+        assert cache.get("a") is None
+        assert cache.get("b") == b"1234"
+        assert other_worker.stats()["bytes"] == 8
+        assert sum(f.stat().st_size for f in cache.root.glob("*/*.mp3")) <= 10
+
+
+@pytest.mark.django_db
+class TestTextToSpeechClientCache:
+    @pytest.mark.asyncio
+    async def test_repeated_phrase_skips_backend(self, tts_audio_cache):
+        client = TextToSpeechClient()
+        client.base_url = "http://tts"
+        response = MagicMock(content=b"mp3", raise_for_status=MagicMock())
+
+        with patch("httpx.AsyncClient.post", AsyncMock(return_value=response)) as post:
+            first = await client.text_to_speech("شكرا")
+            second = await client.text_to_speech("شكرا")
+
+        assert first == second == b"mp3"
+        assert post.call_count == 1
+        assert post.call_args.kwargs["timeout"] == client.timeout
+        assert tts_audio_cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_chunks_and_caches_whole_body(self, tts_audio_cache):
+        async def body():
+            for part in (b"aa", b"bb", b"cc"):
+                yield part
+
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body()))
+        client = TextToSpeechClient()
+        client.base_url = "http://tts"
+
+        async with httpx.AsyncClient(transport=transport) as http:
+            with patch(
+                "tafahom_api.apps.v1.ai.clients.text_to_speech_client.shared_http_client",
+                return_value=http,
+            ):
+                chunks = [chunk async for chunk in client.stream_text_to_speech("مرحبا")]
+
+        assert b"".join(chunks) == b"aabbcc"
+        assert await client.cached_audio("مرحبا") == b"aabbcc"
+
+
+@pytest.fixture
+def streaming_service():
+    service = StreamingTranslationService(
+        user=MagicMock(),
+        send_json=AsyncMock(),
+        send_bytes=AsyncMock(),
+        close_ws=AsyncMock(),
+        config={"MAX_BUFFER_SIZE": 10},
+        sign_service=MagicMock(),
+    )
+    service.audio_transport = "binary"
+    return service
+
+
+def _sent_frames(service):
+    return [decode_audio_frame(call.args[0]) for call in service.send_bytes.call_args_list]
+
+
+class TestBinaryAudioDelivery:
+    @pytest.mark.asyncio
+    async def test_cached_audio_is_sent_as_binary_frame(self, streaming_service, tts_audio_cache):
+        tts_audio_cache.set("مرحبا", b"mp3-bytes")
+
+        await streaming_service._send_elevenlabs_audio("مرحبا")
+
+        streaming_service.send_json.assert_not_called()
+        audio, end = _sent_frames(streaming_service)
+        assert audio.payload == b"mp3-bytes"
+        assert audio.cached
+        assert audio.mime_type == "audio/mpeg"
+        assert end.kind == FRAME_AUDIO_END
+
+    @pytest.mark.asyncio
+    async def test_stream_chunks_are_forwarded_in_sequence(self, streaming_service):
+        async def fake_stream(self, text, use_cache=True):
+            for part in (b"one", b"two", b"three"):
+                yield part
+
+        with patch.object(TextToSpeechClient, "stream_text_to_speech", fake_stream):
+            await streaming_service._send_elevenlabs_audio("مرحبا")
+
+        frames = _sent_frames(streaming_service)
+        assert [f.kind for f in frames] == [FRAME_AUDIO] * 3 + [FRAME_AUDIO_END]
+        assert [f.sequence for f in frames] == [0, 1, 2, 3]
+        assert len({f.stream_id for f in frames}) == 1
+        assert b"".join(f.payload for f in frames) == b"onetwothree"
+        assert not frames[0].cached
+
+    @pytest.mark.asyncio
+    async def test_failed_stream_still_ends(self, streaming_service):
+        async def broken_stream(self, text, use_cache=True):
+            yield b"partial"
+            raise RuntimeError("backend dropped")
+
+        with patch.object(TextToSpeechClient, "stream_text_to_speech", broken_stream):
+            await streaming_service._send_elevenlabs_audio("مرحبا")
+
+        assert _sent_frames(streaming_service)[-1].kind == FRAME_AUDIO_END
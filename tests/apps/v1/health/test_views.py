@@ -0,0 +1,38 @@
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db
+class TestHealthAPI:
+    def test_health_only_reports_liveness(self, client: APIClient):
+        response = client.get("/health/health/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.data) == {"status", "environment"}
+
+    def test_readiness_does_not_expose_backend_state(self, client: APIClient):
+        response = client.get("/health/ready/")
+
+        assert set(response.data) == {"status", "checks"}
+
+
+@pytest.mark.django_db
+class TestDiagnosticsAPI:
+    def test_anonymous_is_rejected(self, client: APIClient):
+        response = client.get("/health/diagnostics/")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_non_admin_forbidden(self, client: APIClient, jwt_user_token: str):
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_user_token}")
+
+        response = client.get("/health/diagnostics/")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_admin_sees_backend_stats(self, client: APIClient, jwt_admin_token: str):
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {jwt_admin_token}")
+
+        response = client.get("/health/diagnostics/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert {"nlp_dispatch", "circuit_breakers", "sign_matcher"} <= set(response.data)
@@ -0,0 +1,80 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+
+from tafahom_api.apps.v1.localization.services.translationkey_service import (
+    TranslationKeyService,
+)
+
+
+class TestTranslationKeyCache:
+    def setup_method(self):
+        cache.clear()
+
+    def test_cache_keys_are_hashed(self):
+        key = TranslationKeyService._cache_key("auth.login.title " * 50, "ar")
+        assert len(key) < 100
+        assert "auth.login" not in key
+
+    def test_values_are_served_from_cache(self, translation_key_en_ar):
+        assert TranslationKeyService.get_translation("test_welcome_message", "ar") == "مرحبا"
+
+        translation_key_en_ar.text_ar = "أهلا"
+        translation_key_en_ar.save()
+        assert TranslationKeyService.get_translation("test_welcome_message", "ar") == "مرحبا"
+
+    def test_clear_all_invalidates_every_entry(self, translation_key_en_ar, translation_key_auth):
+        keys = [translation_key_en_ar.key, translation_key_auth.key]
+        TranslationKeyService.get_bulk_translations(keys, "en")
+
+        translation_key_en_ar.text_en = "Hello"
+        translation_key_en_ar.save()
+        TranslationKeyService.clear_all_translation_cache()
+
+        assert TranslationKeyService.get_bulk_translations(keys, "en")[translation_key_en_ar.key] == "Hello"
+
+    def test_clear_single_key(self, translation_key_en_ar):
+        TranslationKeyService.get_translation("test_welcome_message", "en")
+        translation_key_en_ar.text_en = "Hello"
+        translation_key_en_ar.save()
+
+        TranslationKeyService.clear_translation_cache("test_welcome_message")
+        assert TranslationKeyService.get_translation("test_welcome_message", "en") == "Hello"
+
+    def test_bulk_uses_one_cache_round_trip(self, translation_key_en_ar, translation_key_auth):
+        keys = [translation_key_en_ar.key, translation_key_auth.key, "missing_key"]
+        TranslationKeyService.get_bulk_translations(keys, "ar")
+
+        with patch.object(cache, "get_many", wraps=cache.get_many) as get_many:
+            result = TranslationKeyService.get_bulk_translations(keys, "ar")
+
+        # Cached keys, then one re-read for the key that is not in the database
+        assert get_many.call_count == 2
+        assert result == {
+            translation_key_en_ar.key: "مرحبا",
+            translation_key_auth.key: "تسجيل الدخول",
+            "missing_key": "missing_key",
+        }
+
+    def test_bulk_fills_misses_with_set_many(self, translation_key_en_ar, translation_key_auth):
+        keys = [translation_key_en_ar.key, translation_key_auth.key]
+
+        with patch.object(cache, "set_many", wraps=cache.set_many) as set_many:
+            TranslationKeyService.get_bulk_translations(keys, "en")
+
+        assert set_many.call_count == 1
+        assert len(set_many.call_args.args[0]) == 2
+
+    def test_clear_single_key_drops_stored_values(self, db):
+        from tafahom_api.apps.v1.localization.models import TranslationKey
+
+        obj = TranslationKey.objects.create(key="Admin.Title", text_en="Title", text_ar="")
+        assert TranslationKeyService.get_stored_translations(["Admin.Title"], "en") == {"Admin.Title": "Title"}
+        # Resolved lookups are cached apart and lower-case the key
+        assert TranslationKeyService.get_bulk_translations(["Admin.Title"], "en") == {"admin.title": "admin.title"}
+
+        obj.text_en = "New title"
+        obj.save()
+        TranslationKeyService.clear_translation_cache(obj.key)
+
+        assert TranslationKeyService.get_stored_translations(["Admin.Title"], "en") == {"Admin.Title": "New title"}
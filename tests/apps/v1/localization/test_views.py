@@ -1,9 +1,14 @@
+from unittest.mock import patch
+
 import pytest
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.test import APIClient
 
 from tafahom_api.apps.v1.localization.models import TranslationKey
+from tafahom_api.apps.v1.localization.services.translationkey_service import (
+    TranslationKeyService,
+)
 from tafahom_api.apps.v1.users.models import User
 
 
@@ -139,6 +144,23 @@ class TestBulkTranslationAPI:
         # API should return the key itself if translation is missing
         assert response.data["translations"][missing_key] == missing_key
 
+    def test_bulk_translation_keeps_stored_values_as_is(self, client: APIClient):
+        from django.core.cache import cache
+
+        cache.clear()
+        # Keys created in the admin skip the serializer's lower-casing
+        TranslationKey.objects.create(key="Admin.Title", text_en="Title", text_ar="")
+
+        for language, expected in (("en", "Title"), ("ar", "")):
+            response = client.post(
+                "/localization/translations/bulk/",
+                {"keys": ["Admin.Title"], "language": language},
+                format="json",
+            )
+
+            assert response.status_code == status.HTTP_200_OK
+            assert response.data["translations"] == {"Admin.Title": expected}
+
     def test_bulk_translation_empty_keys(self, client: APIClient):
         response = client.post(
             "/localization/translations/bulk/",
@@ -248,3 +270,89 @@ class TestLocalizationPermissions:
             format="json",
         )
         assert response.status_code == status.HTTP_200_OK
+
+
+# =====================================================
+# LANGUAGE BUNDLE
+# =====================================================
+
+
+@pytest.mark.django_db
+class TestTranslationBundleAPI:
+    url = "/localization/translations/bundle/{}/"
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        TranslationKeyService._bundles.clear()
+
+    def test_bundle_contains_every_key(
+        self, client: APIClient, translation_key_en_ar: TranslationKey, translation_key_auth: TranslationKey
+    ):
+        response = client.get(self.url.format("ar"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["language"] == "ar"
+        assert response.data["translations"][translation_key_en_ar.key] == translation_key_en_ar.text_ar
+        assert response.data["translations"][translation_key_auth.key] == translation_key_auth.text_ar
+        assert response["ETag"]
+        assert response["Cache-Control"] == "no-cache"
+
+    def test_unchanged_bundle_returns_304(self, client: APIClient, translation_key_en_ar: TranslationKey):
+        etag = client.get(self.url.format("en"))["ETag"]
+
+        response = client.get(self.url.format("en"), HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response["ETag"] == etag
+        assert not response.content
+
+    def test_bundle_is_served_from_memory(self, client: APIClient, translation_key_en_ar: TranslationKey):
+        client.get(self.url.format("en"))
+
+        with patch.object(TranslationKey.objects, "only") as query:
+            response = client.get(self.url.format("en"))
+
+        query.assert_not_called()
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_update_invalidates_bundle(
+        self, client: APIClient, admin_user: User, translation_key_en_ar: TranslationKey
+    ):
+        etag = client.get(self.url.format("en"))["ETag"]
+
+        client.force_authenticate(user=admin_user)
+        client.patch(
+            f"/localization/keys/{translation_key_en_ar.id}/",
+            {"text_en": "Welcome Updated"},
+            format="json",
+        )
+        client.force_authenticate(user=None)
+
+        response = client.get(self.url.format("en"), HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+        assert response.data["translations"][translation_key_en_ar.key] == "Welcome Updated"
+
+    @pytest.mark.parametrize("bulk", [False, True])
+    def test_admin_delete_invalidates_bundle(
+        self, client: APIClient, rf, translation_key_en_ar: TranslationKey, bulk
+    ):
+        from django.contrib import admin
+
+        assert translation_key_en_ar.key in client.get(self.url.format("en")).data["translations"]
+
+        model_admin = admin.site._registry[TranslationKey]
+        if bulk:
+            model_admin.delete_queryset(rf.post("/"), TranslationKey.objects.filter(pk=translation_key_en_ar.pk))
+        else:
+            model_admin.delete_model(rf.post("/"), translation_key_en_ar)
+
+        assert translation_key_en_ar.key not in client.get(self.url.format("en")).data["translations"]
+
+    def test_unsupported_language(self, client: APIClient):
+        response = client.get(self.url.format("xx"))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from tafahom_api.apps.v1.meetings import presence, registry
+from tafahom_api.apps.v1.meetings.vad import SAMPLE_RATE
+
+
+def _pcm(signal: np.ndarray) -> bytes:
+    return (np.clip(signal, -1, 1) * 32767).astype("<i2").tobytes()
+
+
+@pytest.fixture
+def tone():
+    """PCM16 sine: voiced-looking audio."""
+
+    def make(ms, freq=220.0, amplitude=0.3):
+        t = np.arange(SAMPLE_RATE * ms // 1000) / SAMPLE_RATE
+        return _pcm(amplitude * np.sin(2 * np.pi * freq * t))
+
+    return make
+
+
+@pytest.fixture
+def silence():
+    """PCM16 near-silence (low-level noise)."""
+    rng = np.random.default_rng(0)
+    return lambda ms: _pcm(rng.normal(0, 0.001, SAMPLE_RATE * ms // 1000))
+
+
+@pytest.fixture
+def hiss():
+    """PCM16 broadband noise: loud but not speech-like."""
+    rng = np.random.default_rng(1)
+    return lambda ms: _pcm(rng.uniform(-0.3, 0.3, SAMPLE_RATE * ms // 1000))
+
+
+@pytest.fixture(autouse=True)
+def channel_registry(monkeypatch):
+    """Fresh in-memory participant → channel registry per test."""
+    fresh = registry.InMemoryChannelRegistry()
+    monkeypatch.setattr(registry, "_registry", fresh)
+    return fresh
+
+
+@pytest.fixture(autouse=True)
+def presence_store(monkeypatch):
+    """Fresh in-memory meeting presence per test."""
+    fresh = presence.InMemoryPresenceStore(member_ttl=90)
+    monkeypatch.setattr(presence, "_store", fresh)
+    return fresh
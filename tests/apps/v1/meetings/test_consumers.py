@@ -0,0 +1,239 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from tafahom_api.apps.v1.ai.clients.speech_to_text_client import SpeechToTextClient
+from tafahom_api.apps.v1.meetings.consumers import MeetingConsumer
+from tafahom_api.apps.v1.meetings.ice import IceBatcher
+from tafahom_api.apps.v1.meetings.vad import UtteranceSegmenter, VoiceActivityDetector
+
+
+@pytest.fixture
+def consumer():
+    consumer = MeetingConsumer()
+    consumer.user = MagicMock(username="alice")
+    consumer.meeting_code = "ABC123"
+    consumer.room_group_name = "meeting_ABC123"
+    consumer.channel_name = "specific.alice"
+    consumer.channel_layer = MagicMock(group_send=AsyncMock(), send=AsyncMock())
+    consumer.audio_format = "pcm16"
+    consumer.segmenter = UtteranceSegmenter(
+        vad=VoiceActivityDetector(frame_ms=30), silence_ms=300, min_utterance_ms=150
+    )
+    consumer._stt_tasks = set()
+    consumer.ice_batching = False
+    consumer.ice_batcher = IceBatcher(consumer._send_ice_batch, window_ms=20)
+    consumer.send = AsyncMock()
+    return consumer
+
+
+def _sent(consumer):
+    return [json.loads(call.kwargs["text_data"]) for call in consumer.send.call_args_list]
+
+
+def _broadcasts(consumer):
+    return [call.args[1]["message"] for call in consumer.channel_layer.group_send.call_args_list]
+
+
+class TestMeetingAudio:
+    @pytest.mark.asyncio
+    async def test_silence_never_reaches_stt(self, consumer, silence):
+        with patch.object(SpeechToTextClient, "speech_to_text", AsyncMock()) as stt:
+            for _ in range(10):
+                await consumer._handle_audio(silence(200))
+
+        stt.assert_not_called()
+        assert _broadcasts(consumer) == []
+
+    @pytest.mark.asyncio
+    async def test_one_stt_call_per_utterance(self, consumer, tone, silence):
+        stt = AsyncMock(return_value={"text": "مرحبا"})
+        with patch.object(SpeechToTextClient, "speech_to_text", stt):
+            for chunk in (tone(300), tone(300), silence(600)):
+                await consumer._handle_audio(chunk)
+            await asyncio.gather(*consumer._stt_tasks)
+
+        assert stt.call_count == 1
+        assert [m["type"] for m in _broadcasts(consumer)] == [
+            "speaking_start",
+            "speaking_stop",
+            "speech_result",
+        ]
+        assert _broadcasts(consumer)[-1]["text"] == "مرحبا"
+
+
+    @pytest.mark.asyncio
+    async def test_disconnect_transcribes_the_last_utterance(self, consumer, tone):
+        consumer.presence_joined = True
+        consumer._heartbeat_task = MagicMock()
+        consumer.ice_batcher = MagicMock(close=AsyncMock())
+        consumer.channel_layer.group_discard = AsyncMock()
+
+        async def slow_stt(self, audio):
+            await asyncio.sleep(0.05)
+            return {"text": "مع السلامة"}
+
+        with patch.object(SpeechToTextClient, "speech_to_text", slow_stt):
+            for chunk in (tone(300), tone(300)):
+                await consumer._handle_audio(chunk)
+            await consumer.disconnect(1000)
+
+        types = [m["type"] for m in _broadcasts(consumer)]
+        assert types[:3] == ["speaking_start", "speaking_stop", "speech_result"]
+        assert _broadcasts(consumer)[2]["text"] == "مع السلامة"
+
+
+class TestTargetedSignaling:
+    @pytest.mark.asyncio
+    async def test_offer_goes_only_to_target_channel(self, consumer, channel_registry):
+        await channel_registry.register("ABC123", "bob", "specific.bob")
+
+        await consumer.receive(text_data='{"type": "offer", "target": "bob", "data": {"sdp": "x"}}')
+
+        consumer.channel_layer.group_send.assert_not_called()
+        channel, event = consumer.channel_layer.send.call_args.args
+        assert channel == "specific.bob"
+        assert event["message"]["type"] == "offer"
+        assert event["message"]["user"] == "alice"
+
+    @pytest.mark.asyncio
+    async def test_unknown_target_falls_back_to_group(self, consumer):
+        await consumer.receive(text_data='{"type": "answer", "target": "carol", "data": {}}')
+
+        consumer.channel_layer.send.assert_not_called()
+        assert _broadcasts(consumer)[0]["type"] == "answer"
+
+    @pytest.mark.asyncio
+    async def test_stale_disconnect_keeps_new_registration(self, channel_registry):
+        await channel_registry.register("ABC123", "bob", "specific.old")
+        await channel_registry.register("ABC123", "bob", "specific.new")
+        await channel_registry.unregister("ABC123", "bob", "specific.old")
+
+        assert await channel_registry.lookup("ABC123", "bob") == "specific.new"
+
+
+class TestIceBatching:
+    @pytest.mark.asyncio
+    async def test_burst_crosses_channel_layer_once(self, consumer, channel_registry):
+        await channel_registry.register("ABC123", "bob", "specific.bob")
+
+        for i in range(10):
+            await consumer.receive(
+                text_data=json.dumps({"type": "ice_candidate", "target": "bob", "data": {"c": i}})
+            )
+        await asyncio.sleep(0.05)
+
+        assert consumer.channel_layer.send.call_count == 1
+        channel, event = consumer.channel_layer.send.call_args.args
+        assert event["type"] == "ice_batch"
+        assert [c["c"] for c in event["message"]["candidates"]] == list(range(10))
+
+    @pytest.mark.asyncio
+    async def test_batching_can_be_switched_off(self, consumer, channel_registry):
+        await channel_registry.register("ABC123", "bob", "specific.bob")
+        consumer.ice_batcher = IceBatcher(consumer._send_ice_batch, enabled=False)
+
+        for i in range(3):
+            await consumer.receive(
+                text_data=json.dumps({"type": "ice_candidate", "target": "bob", "data": {"c": i}})
+            )
+
+        assert consumer.channel_layer.send.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_timer_flush_is_logged(self):
+        batcher = IceBatcher(AsyncMock(side_effect=RuntimeError("layer down")), window_ms=5)
+
+        with patch("tafahom_api.apps.v1.meetings.ice.logger") as logger:
+            await batcher.add("bob", {"c": 1})
+            await asyncio.sleep(0.03)
+
+        logger.exception.assert_called_once()
+        assert not batcher._timers
+
+    @pytest.mark.asyncio
+    async def test_answer_flushes_queued_candidates_first(self, consumer, channel_registry):
+        await channel_registry.register("ABC123", "bob", "specific.bob")
+
+        await consumer.receive(text_data='{"type": "ice_candidate", "target": "bob", "data": {}}')
+        await consumer.receive(text_data='{"type": "answer", "target": "bob", "data": {}}')
+
+        kinds = [call.args[1]["message"]["type"] for call in consumer.channel_layer.send.call_args_list]
+        assert kinds == ["ice_candidates", "answer"]
+
+    @pytest.mark.asyncio
+    async def test_capable_client_receives_one_message(self, consumer):
+        consumer.ice_batching = True
+        await consumer.ice_batch(
+            {"message": {"type": "ice_candidates", "candidates": [1, 2, 3], "user": "bob", "target": "alice"}}
+        )
+        assert [m["type"] for m in _sent(consumer)] == ["ice_candidates"]
+
+    @pytest.mark.asyncio
+    async def test_legacy_client_receives_individual_candidates(self, consumer):
+        await consumer.ice_batch(
+            {"message": {"type": "ice_candidates", "candidates": [1, 2, 3], "user": "bob", "target": "alice"}}
+        )
+        sent = _sent(consumer)
+        assert [m["type"] for m in sent] == ["ice_candidate"] * 3
+        assert [m["data"] for m in sent] == [1, 2, 3]
+        assert sent[0]["user"] == "bob"
+
+
+class TestPresence:
+    META = {
+        "id": "m1",
+        "title": "Standup",
+        "host": "host",
+        "is_active": True,
+        "participants": {"host": {"id": 1, "role": "host"}},
+    }
+
+    @pytest.fixture
+    def connecting(self, consumer):
+        consumer.scope = {"user": consumer.user, "url_route": {"kwargs": {"code": "ABC123"}}}
+        consumer.user.is_anonymous = False
+        consumer.channel_layer.group_add = AsyncMock()
+        consumer.channel_layer.group_discard = AsyncMock()
+        consumer.accept = AsyncMock()
+        consumer.close = AsyncMock()
+        return consumer
+
+    @pytest.mark.asyncio
+    async def test_join_reports_online_roster(self, connecting, presence_store):
+        await presence_store.join("ABC123", "host", "host")
+        with patch.object(MeetingConsumer, "_admit", AsyncMock(return_value=(self.META, None, None))):
+            await connecting.connect()
+
+        welcome = _sent(connecting)[0]
+        assert welcome["type"] == "connection_established"
+        assert welcome["participants"] == [
+            {"id": 1, "user__username": "host", "role": "host"},
+            {"id": None, "user__username": "alice", "role": "participant"},
+        ]
+        assert _broadcasts(connecting)[-1] == {"type": "user_joined", "user": "alice", "role": "participant"}
+
+        await connecting.disconnect(1000)
+        assert connecting._heartbeat_task.cancelled() or connecting._heartbeat_task.cancelling()
+        assert [m["username"] for m in await presence_store.participants("ABC123")] == ["host"]
+
+    @pytest.mark.asyncio
+    async def test_inactive_meeting_is_rejected_without_joining(self, connecting, presence_store):
+        with patch.object(MeetingConsumer, "_admit", AsyncMock(return_value=(None, 4004, None))):
+            await connecting.connect()
+
+        connecting.close.assert_awaited_once_with(code=4004)
+        assert await presence_store.participants("ABC123") == []
+
+    @pytest.mark.asyncio
+    async def test_rejected_user_never_announces_leaving(self, connecting, channel_registry):
+        await channel_registry.register("ABC123", "alice", "specific.other-tab")
+        with patch.object(MeetingConsumer, "_admit", AsyncMock(return_value=(None, 4003, "No tokens"))):
+            await connecting.connect()
+        await connecting.disconnect(4003)
+
+        assert _broadcasts(connecting) == []
+        connecting.channel_layer.group_discard.assert_not_called()
+        assert await channel_registry.lookup("ABC123", "alice") == "specific.other-tab"
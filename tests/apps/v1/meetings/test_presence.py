@@ -0,0 +1,86 @@
+import time
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tafahom_api.apps.v1.meetings.models import Meeting, Participant
+from tafahom_api.apps.v1.meetings.presence import (
+    invalidate_meeting_meta,
+    load_meeting_meta,
+    role_for,
+)
+from tafahom_api.apps.v1.users.models import User
+
+
+class TestPresenceStore:
+    async def test_join_returns_online_roster(self, presence_store):
+        await presence_store.join("ABC123", "host", "host")
+        roster = await presence_store.join("ABC123", "alice", "participant")
+
+        assert roster == [
+            {"username": "host", "role": "host"},
+            {"username": "alice", "role": "participant"},
+        ]
+
+    async def test_user_stays_online_until_last_connection_leaves(self, presence_store):
+        await presence_store.join("ABC123", "alice", "participant")
+        await presence_store.join("ABC123", "alice", "participant")
+
+        assert await presence_store.leave("ABC123", "alice") == 1
+        assert await presence_store.participants("ABC123") == [
+            {"username": "alice", "role": "participant"}
+        ]
+        assert await presence_store.leave("ABC123", "alice") == 0
+        assert await presence_store.participants("ABC123") == []
+
+    async def test_members_without_heartbeat_are_pruned(self, presence_store):
+        await presence_store.join("ABC123", "ghost", "participant")
+        await presence_store.join("ABC123", "alice", "participant")
+        presence_store._meetings["ABC123"]["ghost"]["seen"] = time.time() - 120
+
+        await presence_store.heartbeat("ABC123", "alice")
+        roster = await presence_store.join("ABC123", "bob", "participant")
+
+        assert [m["username"] for m in roster] == ["alice", "bob"]
+
+
+@pytest.fixture
+def meeting(db):
+    cache.clear()
+    host = User.objects.create_user(
+        username="hostuser", email="host@example.com", password="pass", role="organization"
+    )
+    meeting = Meeting.objects.create(title="Standup", host=host, meeting_code="ABC123")
+    Participant.objects.create(user=host, meeting=meeting, role="host")
+    yield meeting
+    cache.clear()
+
+
+class TestMeetingMeta:
+    def test_metadata_is_loaded_once(self, meeting):
+        meta = load_meeting_meta("ABC123")
+        with CaptureQueriesContext(connection) as queries:
+            assert load_meeting_meta("ABC123") == meta
+
+        assert len(queries) == 0
+        assert meta["is_active"] is True
+        assert role_for(meta, "hostuser") == "host"
+        assert role_for(meta, "someone") == "participant"
+
+    def test_unknown_meeting_is_cached_as_missing(self, db):
+        cache.clear()
+        assert load_meeting_meta("NOPE00") is None
+        with CaptureQueriesContext(connection) as queries:
+            assert load_meeting_meta("NOPE00") is None
+        assert len(queries) == 0
+
+    def test_invalidate_picks_up_changes(self, meeting):
+        load_meeting_meta("ABC123")
+        meeting.is_active = False
+        meeting.save()
+
+        assert load_meeting_meta("ABC123")["is_active"] is True
+        invalidate_meeting_meta("ABC123")
+        assert load_meeting_meta("ABC123")["is_active"] is False
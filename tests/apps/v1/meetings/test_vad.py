@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from tafahom_api.apps.v1.meetings.vad import (
+    SAMPLE_RATE,
+    UtteranceSegmenter,
+    VoiceActivityDetector,
+)
+
+
+@pytest.fixture
+def segmenter():
+    return UtteranceSegmenter(
+        vad=VoiceActivityDetector(frame_ms=30),
+        silence_ms=300,
+        min_utterance_ms=150,
+        max_utterance_ms=3000,
+        preroll_ms=60,
+    )
+
+
+class TestVoiceActivityDetector:
+    def test_tone_is_voiced_and_silence_is_not(self, tone, silence):
+        vad = VoiceActivityDetector(frame_ms=30)
+        samples = np.frombuffer(silence(300) + tone(300), dtype="<i2")
+        voiced = vad.classify(samples)
+        assert not voiced[:10].any()
+        assert voiced[10:].all()
+
+    def test_broadband_noise_is_rejected_by_zcr(self, hiss):
+        vad = VoiceActivityDetector(frame_ms=30)
+        assert not vad.classify(np.frombuffer(hiss(300), dtype="<i2")).any()
+
+
+class TestUtteranceSegmenter:
+    def test_silence_produces_no_events(self, segmenter, tone, silence):
+        assert segmenter.feed(silence(2000)) == []
+        assert segmenter.stt_saved_ratio == 1.0
+
+    def test_utterance_is_bounded_bysilence(self, segmenter, tone, silence):
+        events = segmenter.feed(silence(300) + tone(600) + silence(600))
+
+        assert [e.kind for e in events] == ["speaking_start", "speaking_stop"]
+        utterance = events[1].utterance
+        # 600 ms of speech plus pre-roll, trailing silence trimmed
+        assert 600 <= len(utterance) / (SAMPLE_RATE * 2) * 1000 <= 700
+        assert 0 < segmenter.stt_saved_ratio < 1
+
+    def test_chunks_split_mid_frame_are_reassembled(self, segmenter, tone, silence):
+        audio = tone(600) + silence(600)
+        events = []
+        for i in range(0, len(audio), 1001):
+            events.extend(segmenter.feed(audio[i : i + 1001]))
+        assert [e.kind for e in events] == ["speaking_start", "speaking_stop"]
+
+    def test_short_click_is_not_sent_to_stt(self, segmenter, tone, silence):
+        events = segmenter.feed(tone(60) + silence(600))
+        assert [e.kind for e in events] == ["speaking_start", "speaking_stop"]
+        assert events[1].utterance == b""
+
+    def test_long_speech_is_cut_at_max_length(self, segmenter, tone, silence):
+        events = segmenter.feed(tone(7000))
+        kinds = [e.kind for e in events]
+        assert kinds[0] == "speaking_start"
+        assert kinds.count("utterance") == 2
+        assert segmenter.speaking
@@ -1,6 +1,8 @@
 import pytest
 from unittest.mock import MagicMock
 
+from tafahom_api.apps.v1.ai.utils.audio_ingest import IngestedAudio
+
 from tafahom_api.apps.v1.translation.services.sign_translation_service import (
     SignTranslationService,
     normalize_arabic,
@@ -60,8 +62,8 @@ async def test_text_to_sign_empty_text_raises():
 @pytest.mark.asyncio
 async def test_voice_to_sign_success(mocker, fake_audio_file):
     mocker.patch(
-        "tafahom_api.apps.v1.translation.services.sign_translation_service.ensure_wav",
-        return_value=fake_audio_file,
+        "tafahom_api.apps.v1.translation.services.sign_translation_service.ingest_audio",
+        return_value=IngestedAudio(wav=b"wav bytes", transcoded=True),
     )
     mocker.patch.object(
         SignTranslationService,
@@ -90,8 +92,8 @@ async def test_voice_to_sign_success(mocker, fake_audio_file):
 @pytest.mark.asyncio
 async def test_voice_to_sign_stt_failure(mocker, fake_audio_file):
     mocker.patch(
-        "tafahom_api.apps.v1.translation.services.sign_translation_service.ensure_wav",
-        return_value=fake_audio_file,
+        "tafahom_api.apps.v1.translation.services.sign_translation_service.ingest_audio",
+        return_value=IngestedAudio(wav=b"wav bytes", transcoded=True),
     )
     mocker.patch(
         "tafahom_api.apps.v1.translation.services.sign_translation_service.SpeechToTextClient.speech_to_text",
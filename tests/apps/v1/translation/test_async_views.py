@@ -0,0 +1,131 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from asgiref.sync import iscoroutinefunction
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from tafahom_api.apps.v1.ai.clients.nlp_model_client import NLPModelClient
+from tafahom_api.apps.v1.ai.clients.text_to_gloss_client import TextToGlossClient
+from tafahom_api.apps.v1.billing.models import SubscriptionPlan
+from tafahom_api.apps.v1.translation import views
+from tafahom_api.apps.v1.translation.services.sign_translation_service import SignTranslationService
+from tafahom_api.apps.v1.translation.models import TranslationRequest
+from tafahom_api.apps.v1.translation.services.unknown_words import get_unknown_word_store
+from tafahom_api.apps.v1.users.models import User
+from tafahom_api.apps.v1.youtube.views import ProcessTranscriptView
+
+
+@pytest.fixture
+def user(db):
+    SubscriptionPlan.objects.get_or_create(
+        plan_type="free",
+        defaults={"name": "Free", "weekly_tokens_limit": 50, "price": 0},
+    )
+    return User.objects.create_user(
+        username="asyncuser",
+        email="async@example.com",
+        password="pass",
+        is_verified=True,
+        role="basic_user",
+    )
+
+
+@pytest.fixture
+def auth_client(user):
+    client = APIClient()
+    token = RefreshToken.for_user(user).access_token
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client
+
+
+@pytest.mark.parametrize(
+    "view",
+    [
+        views.TranslateToSignView,
+        views.UnityTranslateView,
+        views.TestGlossView,
+        views.TranslateGlossView,
+        views.YouTubeTranslateView,
+        ProcessTranscriptView,
+    ],
+)
+def test_views_are_served_natively_async(view):
+    assert view.view_is_async
+    assert iscoroutinefunction(view.as_view())
+
+
+# The request checks run on pool threads with their own DB connections,
+# which cannot see data inside a per-test transaction
+@pytest.mark.django_db(transaction=True)
+class TestAsyncViews:
+    def test_translate_gloss_consumes_tokens(self, auth_client, user):
+        nlp = AsyncMock(return_value=SimpleNamespace(text="مرحبا بك", raw={}))
+        with patch.object(NLPModelClient, "translate_gloss", nlp):
+            response = auth_client.post(
+                "/api/v1/sign-language/translate-gloss/", {"gloss": "مرحبا"}, format="json"
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {"text": "مرحبا بك", "remaining_tokens": 45}
+        nlp.assert_awaited_once_with("مرحبا")
+
+    def test_decorator_rejects_before_handler_runs(self, auth_client, user):
+        user.subscription.tokens_used = 50
+        user.subscription.save()
+        nlp = AsyncMock()
+        with patch.object(NLPModelClient, "translate_gloss", nlp):
+            response = auth_client.post(
+                "/api/v1/sign-language/translate-gloss/", {"gloss": "مرحبا"}, format="json"
+            )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert response.data["detail"] == "Not enough credits."
+        nlp.assert_not_awaited()
+
+    def test_translate_to_sign_saves_request(self, auth_client, user):
+        text_to_sign = AsyncMock(return_value={"video": "https://cdn/sign.mp4"})
+        with patch.object(SignTranslationService, "text_to_sign", text_to_sign):
+            response = auth_client.post(
+                "/api/v1/translation/to-sign/", {"text": "مرحبا"}, format="json"
+            )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["remaining_tokens"] == 43
+        assert TranslationRequest.objects.get(id=response.data["id"]).output_video == (
+            "https://cdn/sign.mp4"
+        )
+
+    def test_process_transcript_keeps_resolved_words_in_place(self, auth_client, user):
+        plan, _ = SubscriptionPlan.objects.get_or_create(
+            plan_type="basic",
+            defaults={"name": "Basic", "weekly_tokens_limit": 200, "price": 0},
+        )
+        user.subscription.plan = plan
+        user.subscription.save()
+        cache.clear()
+        get_unknown_word_store().save_many({"اول": ["gr7"]})
+
+        async def text_to_gloss_batch(self, entries):
+            return ["قديم" if entry == "ثاني" else "-" for entry in entries]
+
+        with patch.object(TextToGlossClient, "text_to_gloss_batch", text_to_gloss_batch):
+            response = auth_client.post(
+                "/api/v1/youtube/process-transcript/",
+                {"transcript": "اول مقهور ثاني زعلاني قديم ثاني"},
+                format="json",
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["animations"] == ["gr7", "m2hor", "2adem", "2adem", "2adem"]
+        assert response.data["unknown_words"] == ["زعلاني"]
+        assert "unknown_positions" not in response.data
+
+    def test_anonymous_request_is_rejected(self):
+        response = APIClient().post(
+            "/api/v1/sign-language/translate-gloss/", {"gloss": "x"}, format="json"
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,118 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from tafahom_api.apps.v1.ai.clients.circuit_breaker import CircuitBreaker
+from tafahom_api.apps.v1.translation.services.deadline import (
+    DeadlineExceeded,
+    current_deadline,
+    deadline_scope,
+)
+from tafahom_api.apps.v1.translation.services.dtos import (
+    CVResponse,
+    NLPResponse,
+    PipelineConfig,
+)
+from tafahom_api.apps.v1.translation.services.sign_translation_service import (
+    RetryHandler,
+    SignTranslationService,
+)
+
+
+class TestDeadlineScope:
+    def test_scope_sets_and_resets_contextvar(self):
+        assert current_deadline() is None
+        with deadline_scope(5) as deadline:
+            assert current_deadline() is deadline
+            assert 0 < deadline.remaining() <= 5
+        assert current_deadline() is None
+
+    def test_nested_scope_never_extends_outer(self):
+        with deadline_scope(1) as outer:
+            with deadline_scope(10) as inner:
+                assert inner is outer
+            with deadline_scope(0.5) as tighter:
+                assert tighter is not outer
+                assert tighter.remaining() <= 0.5
+
+    def test_timeout_for_clamps_to_remaining(self):
+        with deadline_scope(2) as deadline:
+            assert deadline.timeout_for(30) <= 2
+            assert deadline.timeout_for(0.1) == pytest.approx(0.1)
+
+
+class TestRetryHandlerDeadline:
+    @pytest.mark.asyncio
+    async def test_attempt_timeout_clamped_to_budget(self):
+        handler = RetryHandler(max_retries=3, base_delay=0.01)
+
+        async def slow():
+            await asyncio.sleep(5)
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        with deadline_scope(0.2):
+            with pytest.raises(TimeoutError):
+                await handler.execute(lambda: slow(), service_name="test", timeout=30)
+
+        assert loop.time() - start < 1
+
+    @pytest.mark.parametrize("timeout", [None, 30])
+    @pytest.mark.asyncio
+    async def test_budget_timeouts_are_not_breaker_failures(self, timeout):
+        handler = RetryHandler(max_retries=1)
+        breaker = CircuitBreaker("test", min_calls=1, failure_ratio=0.5)
+
+        async def slow():
+            await asyncio.sleep(5)
+
+        with deadline_scope(0.05):
+            with pytest.raises(TimeoutError):
+                await handler.execute(lambda: slow(), service_name="test", timeout=timeout, breaker=breaker)
+
+        assert breaker.snapshot()["failures_in_window"] == 0
+
+    @pytest.mark.asyncio
+    async def test_retry_skipped_when_it_cannot_fit(self):
+        handler = RetryHandler(max_retries=3, base_delay=1.0, min_attempt_seconds=0.1)
+        mock_coro = AsyncMock(side_effect=ValueError("fail"))
+
+        with deadline_scope(0.5):
+            with pytest.raises(ValueError):
+                await handler.execute(lambda: mock_coro(), service_name="test", timeout=5)
+
+        assert mock_coro.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_deadline_raises_before_calling(self):
+        handler = RetryHandler(max_retries=3)
+        mock_coro = AsyncMock(return_value="ok")
+
+        with deadline_scope(0):
+            with pytest.raises(DeadlineExceeded):
+                await handler.execute(lambda: mock_coro(), service_name="test")
+
+        assert mock_coro.call_count == 0
+
+
+class TestPipelineBudgetReporting:
+    @pytest.mark.asyncio
+    async def test_result_reports_stage_budget_usage(self):
+        cv_client = AsyncMock()
+        cv_client.receive_gloss = AsyncMock(return_value=CVResponse(gloss="HELLO"))
+        nlp_client = AsyncMock()
+        nlp_client.translate_gloss = AsyncMock(return_value=NLPResponse(text="مرحبا"))
+
+        service = SignTranslationService(
+            cv_client=cv_client,
+            nlp_client=nlp_client,
+            retry_handler=RetryHandler(max_retries=1),
+            config=PipelineConfig(pipeline_timeout_seconds=10),
+        )
+
+        result = await service.translate([b"frame"])
+
+        assert result.budget_ms == 10000
+        assert set(result.budget_used) == {"cv", "nlp"}
+        assert all(0 <= used < 1 for used in result.budget_used.values())
@@ -0,0 +1,80 @@
+import time
+
+import pytest
+
+from tafahom_api.apps.v1.translation.services.animation_service import lexicon_words
+from tafahom_api.apps.v1.translation.services.fuzzy_lexicon import (
+    FuzzyLexicon,
+    edit_distance,
+    fuzzy_resolve,
+    get_fuzzy_lexicon,
+)
+from tafahom_api.apps.v1.translation.services.unknown_words import resolve_unknown_words
+
+
+class TestEditDistance:
+    @pytest.mark.parametrize(
+        "a, b, distance",
+        [
+            ("مقهور", "مقهور", 0),
+            ("مقهر", "مقهور", 1),  # missing letter
+            ("مقهوور", "مقهور", 1),  # extra letter
+            ("مقهزر", "مقهور", 1),  # wrong letter
+            ("مهقور", "مقهور", 1),  # swapped letters
+            ("مهر", "مقهور", 2),
+        ],
+    )
+    def test_distances(self, a, b, distance):
+        assert edit_distance(a, b, 2) == distance
+
+    def test_stops_past_the_maximum(self):
+        assert edit_distance("ابتثج", "حخدذر", 2) == 3
+
+
+class TestFuzzyLexicon:
+    def test_typos_of_entries_are_matched(self):
+        lexicon = get_fuzzy_lexicon()
+        for typo in ("مقهر", "مقهوور", "مهقور"):
+            match = lexicon.lookup(typo)
+            assert (match.term, match.animation) == ("مقهور", "m2hor")
+
+    def test_short_words_are_rejected(self):
+        lexicon = FuzzyLexicon({"كليه": "kolya", "عربيه": "car"})
+
+        assert lexicon.lookup("كلمه") is None  # 1 edit, 4 letters on both sides
+        assert lexicon.lookup("عربه").animation == "car"  # 1 edit from a 5-letter entry
+        assert FuzzyLexicon({"قلب": "2lb"}, min_length=4).lookup("قلم") is None
+
+    def test_each_distance_has_its_own_length_threshold(self):
+        lexicon = FuzzyLexicon({"مستشفي": "hospital", "مستشفيات": "hospitals"})
+
+        assert lexicon.lookup("مستشفا").animation == "hospital"  # 1 edit, 6 letters
+        assert lexicon.lookup("مصتشفياث").animation == "hospitals"  # 2 edits, 8 letters
+        assert lexicon.lookup("مصتشفا") is None  # 2 edits, 6 letters
+
+    def test_ambiguous_typos_are_rejected(self):
+        lexicon = FuzzyLexicon({"سالمه": "a", "سالمي": "b"})
+        assert lexicon.lookup("سالمو") is None
+
+    def test_ordinary_words_are_left_to_the_llm(self):
+        assert fuzzy_resolve(["يعني", "كلمه", "اتعورت", "النهارده"]) == {}
+
+    def test_lookups_are_sub_millisecond(self):
+        lexicon = get_fuzzy_lexicon()
+        words = [w for w in lexicon_words() if len(w) >= 4][:200]
+        start = time.perf_counter()
+        for word in words:
+            lexicon.lookup(word[:-1] + "ز")
+        assert (time.perf_counter() - start) / len(words) < 0.001
+
+
+@pytest.mark.django_db(transaction=True)
+async def test_fuzzy_matches_skip_store_and_llm():
+    class Client:
+        async def text_to_gloss_batch(self, entries):
+            raise AssertionError("LLM must not be called")
+
+    result = await resolve_unknown_words(["مقهوور"], client=Client())
+
+    assert result.animations == ["m2hor"]
+    assert result.sources == ["fuzzy"]
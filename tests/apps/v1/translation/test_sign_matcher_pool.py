@@ -0,0 +1,48 @@
+import pytest
+
+from tafahom_api.apps.v1.translation.services.animation_service import translate_to_animation_names
+from tafahom_api.apps.v1.translation.services.matcher_pool import SignMatcher
+
+SENTENCE = "انا اسمي محمد ابن العم ام مرحبا"
+
+
+@pytest.fixture
+def matcher():
+    matcher = SignMatcher(offload_words=10, workers=2, executor="thread")
+    yield matcher
+    matcher.shutdown()
+
+
+class TestSignMatcher:
+    async def test_short_input_stays_inline(self, matcher):
+        result = await matcher.match(SENTENCE)
+
+        assert result == translate_to_animation_names(SENTENCE)
+        assert matcher.stats()["inline"] == 1
+        assert matcher.stats()["offloaded"] == 0
+
+    async def test_long_input_is_offloaded(self, matcher):
+        text = " ".join([SENTENCE] * 20)
+
+        result = await matcher.match(text)
+
+        assert result == translate_to_animation_names(text)
+        stats = matcher.stats()
+        assert stats["offloaded"] == 1
+        assert stats["in_flight"] == 0
+        assert stats["queue_wait_ms"]["max"] is not None
+
+    def test_blocking_entry_point_matches(self, matcher):
+        text = " ".join([SENTENCE] * 20)
+
+        assert matcher.match_blocking(text) == translate_to_animation_names(text)
+        assert matcher.stats()["offloaded"] == 1
+
+    def test_process_pool_is_prewarmed(self):
+        matcher = SignMatcher(offload_words=10, workers=1, executor="process")
+        try:
+            matcher.warm()
+            text = " ".join([SENTENCE] * 20)
+            assert matcher.match_blocking(text) == translate_to_animation_names(text)
+        finally:
+            matcher.shutdown()
@@ -1,4 +1,5 @@
 import asyncio
+import threading
 import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -257,6 +258,29 @@ class TestSignTranslationService:
         assert result.text == "مرحباً"
 
 
+    @pytest.mark.asyncio
+    async def test_text_to_sign_renders_off_the_event_loop(self):
+        matcher = MagicMock(match=AsyncMock(return_value={"animations": ["hello"], "unknown_words": []}))
+        loop_thread = threading.get_ident()
+        render_threads = []
+
+        def render(gloss):
+            render_threads.append(threading.get_ident())
+            return "https://cdn/sign.mp4"
+
+        with patch(
+            "tafahom_api.apps.v1.translation.services.matcher_pool.get_sign_matcher",
+            return_value=matcher,
+        ), patch(
+            "tafahom_api.apps.v1.translation.services.sign_translation_service.generate_sign_video_from_gloss",
+            render,
+        ):
+            result = await SignTranslationService.text_to_sign("مرحبا")
+
+        assert result == {"gloss": ["hello"], "video": "https://cdn/sign.mp4"}
+        assert render_threads and render_threads[0] != loop_thread
+
+
 class TestSignTranslationServiceDI:
     """
     Tests verifying that dependency injection works correctly.
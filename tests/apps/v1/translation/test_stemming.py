@@ -0,0 +1,105 @@
+import pytest
+
+from tafahom_api.apps.v1.translation.services.animation_service import (
+    lexicon_words,
+    translate_to_animation_names,
+)
+from tafahom_api.apps.v1.translation.services.stemming import (
+    StemIndex,
+    light_stem,
+    stem_candidates,
+)
+from tafahom_api.apps.v1.translation.sign_map import ANIMATION_MAP
+
+SENTENCES = [
+    "انا جعان و مش عارف اكل ايه",
+    "مقهور جرح",
+    "في نار في البيت والشرطه جات بسرعه",
+    "ممكن تساعدني اروح المستشفى",
+    "اخويا تعبان ومحتاج دكتور",
+    "انا اسمي محمد",
+]
+
+
+class TestLightStem:
+    @pytest.mark.parametrize(
+        "word, stem",
+        [
+            ("المستشفيات", "مستشفي"),
+            ("والكتاب", "كتاب"),
+            ("بالبيت", "بيت"),
+            ("للولد", "ولد"),
+            ("معلمين", "معلم"),
+            ("قلبها", "قلب"),
+            ("قلب", "قلب"),  # too short to strip anything
+            ("ولد", "ولد"),
+        ],
+    )
+    def test_stems(self, word, stem):
+        assert light_stem(word) == stem
+
+    def test_candidates_go_from_least_to_most_stripped(self):
+        assert stem_candidates("بالمستشفيات") == ("مستشفيات", "بالمستشفي", "مستشفي")
+        assert stem_candidates("قلب") == ()
+
+    def test_stems_are_memoized(self):
+        light_stem.cache_clear()
+        light_stem("المدرسين")
+        light_stem("المدرسين")
+        assert light_stem.cache_info().hits == 1
+
+
+class TestStemIndex:
+    def test_inflected_forms_map_back_to_the_entry(self):
+        index = StemIndex({"مستشفي": "hospital", "معلم": "teacher"})
+
+        assert index.lookup("المستشفيات") == ("مستشفي", "hospital")
+        assert index.lookup("والمعلمين") == ("معلم", "teacher")
+
+    def test_ambiguous_stems_resolve_to_nothing(self):
+        index = StemIndex({"كاتب": "writer", "كاتبه": "secretary"})
+        assert index.lookup("الكاتبين") == ("كاتب", "writer")  # exact entry wins
+        assert index.lookup("كاتبون") == ("كاتب", "writer")
+        assert StemIndex({"سالمه": "a", "سالمي": "b"}).lookup("سالمون") is None
+
+    def test_exact_entries_are_left_to_the_trie(self):
+        assert StemIndex({"معلم": "teacher"}).lookup("معلم") is None
+
+
+class TestSecondChanceLookup:
+    def test_inflected_word_is_matched_without_the_llm(self):
+        assert translate_to_animation_names("المستشفيات")["animations"] == [
+            lexicon_words()["مستشفي"]
+        ]
+
+    def test_stemmer_can_be_disabled(self, settings):
+        settings.ARABIC_STEMMER_ENABLED = False
+        assert translate_to_animation_names("المستشفيات")["unknown_words"] == ["المستشفيات"]
+
+
+class TestExactMatchesNeverChange:
+    """The stemmer only sees words the exact trie match left over."""
+
+    @staticmethod
+    def _both(settings, text):
+        settings.ARABIC_STEMMER_ENABLED = False
+        without = translate_to_animation_names(text)
+        settings.ARABIC_STEMMER_ENABLED = True
+        return without, translate_to_animation_names(text)
+
+    def test_every_lexicon_entry(self, settings):
+        changed = []
+        for phrase in ANIMATION_MAP:
+            without, with_stemmer = self._both(settings, phrase)
+            if without["unknown_words"] == [] and with_stemmer != without:
+                changed.append(phrase)
+        assert changed == []
+
+    @pytest.mark.parametrize("text", SENTENCES)
+    def test_exact_matches_in_sentences_are_kept(self, settings, text):
+        without, with_stemmer = self._both(settings, text)
+
+        # Everything matched before is still matched, in the same order
+        remaining = iter(with_stemmer["animations"])
+        assert all(animation in remaining for animation in without["animations"])
+        assert set(with_stemmer["unknown_words"]) <= set(without["unknown_words"])
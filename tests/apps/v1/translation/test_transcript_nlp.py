@@ -0,0 +1,120 @@
+import asyncio
+import random
+
+import pytest
+from django.core.cache import cache
+
+from tafahom_api.apps.v1.translation.services.transcript_nlp import (
+    TranscriptNLPScheduler,
+    chunk_phrases,
+)
+from tafahom_api.apps.v1.translation.services.unknown_words import get_unknown_word_store
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+class FakeGlossClient:
+    """Answers each entry with a gloss from ``answers``; tracks concurrency."""
+
+    def __init__(self, answers, fail_on=(), delay=0.0):
+        self.answers = answers
+        self.fail_on = set(fail_on)
+        self.delay = delay
+        self.http = None
+        self.batches = []
+        self.active = self.max_active = 0
+
+    async def text_to_gloss_batch(self, entries):
+        self.batches.append(list(entries))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay or random.uniform(0, 0.02))
+            if self.fail_on & set(entries):
+                raise RuntimeError("model unavailable")
+            return [self.answers.get(entry, "-") for entry in entries]
+        finally:
+            self.active -= 1
+
+
+class TestChunking:
+    def test_chunks_respect_entry_and_char_limits(self):
+        phrases = [f"كلمه{i}" for i in range(10)]
+
+        assert chunk_phrases(phrases, max_entries=4, max_chars=1000) == [
+            phrases[0:4],
+            phrases[4:8],
+            phrases[8:10],
+        ]
+        assert all(
+            sum(len(p) + 1 for p in chunk) <= 20 for chunk in chunk_phrases(phrases, 40, 20)
+        )
+
+    def test_oversized_phrase_gets_its_own_chunk(self):
+        assert chunk_phrases(["ا" * 50, "ب"], max_entries=40, max_chars=10) == [["ا" * 50], ["ب"]]
+
+
+class TestScheduler:
+    async def test_unknowns_are_deduplicated_and_merged_in_order(self):
+        words = [f"كلمه{i}" for i in range(12)]
+        answers = {words[i]: "مقهور" if i % 2 else "جرح" for i in range(12)}
+        client = FakeGlossClient(answers)
+        scheduler = TranscriptNLPScheduler(chunk_entries=3, concurrency=2, client=client)
+
+        result = await scheduler.resolve(words + words[:3])
+
+        assert sorted(len(b) for b in client.batches) == [3, 3, 3, 3]
+        assert sum(client.batches, []).count(words[0]) == 1
+        assert client.max_active <= 2
+        expected = ["m2hor" if i % 2 else "gr7" for i in list(range(12)) + [0, 1, 2]]
+        assert result.animations == expected
+        assert (result.chunks, result.failed_chunks, result.from_llm) == (4, 0, 12)
+
+    async def test_failed_chunk_only_loses_its_own_words(self):
+        client = FakeGlossClient({"اول": "جرح", "ثاني": "مقهور"}, fail_on={"ثاني"})
+        scheduler = TranscriptNLPScheduler(chunk_entries=1, client=client)
+
+        result = await scheduler.resolve(["اول", "ثاني"])
+
+        assert result.animations == ["gr7"]
+        assert result.unknown_words == ["ثاني"]
+        assert result.failed_chunks == 1
+        assert await get_unknown_word_store().alookup_many(["اول", "ثاني"]) == {"اول": ["gr7"]}
+
+    async def test_slow_chunks_time_out_individually(self):
+        client = FakeGlossClient({}, delay=0.5)
+        scheduler = TranscriptNLPScheduler(chunk_entries=1, chunk_timeout=0.05, client=client)
+
+        result = await scheduler.resolve(["اول", "ثاني"])
+
+        assert result.failed_chunks == 2
+        assert result.unknown_words == ["اول", "ثاني"]
+
+    async def test_stored_words_skip_the_llm(self):
+        await get_unknown_word_store().asave_many({"اول": ["gr7"]})
+        client = FakeGlossClient({"ثاني": "مقهور"})
+
+        result = await TranscriptNLPScheduler(client=client).run("مقهور اول ثاني")
+
+        assert client.batches == [["ثاني"]]
+        assert result.animations == ["m2hor", "gr7", "m2hor"]
+        assert result.sources == ["sign_map", "store", "nlp"]
+
+    async def test_resolved_words_keep_their_place_in_the_transcript(self):
+        await get_unknown_word_store().asave_many({"اول": ["gr7"]})
+        client = FakeGlossClient({"ثاني": "قديم"})
+
+        result = await TranscriptNLPScheduler(client=client).run(
+            "اول مقهور ثاني زعلاني قديم ثاني"
+        )
+
+        assert result.animations == ["gr7", "m2hor", "2adem", "2adem", "2adem"]
+        assert result.unknown_words == ["زعلاني"]
+        assert result.matched == 2
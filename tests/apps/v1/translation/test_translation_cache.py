@@ -0,0 +1,211 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from tafahom_api.apps.v1.translation.services import cache_service
+from tafahom_api.apps.v1.translation.services.cache_service import (
+    get_cached_translation,
+    invalidate_translation_cache,
+    refresh_in_background,
+    set_cached_translation,
+    set_negative_translation,
+)
+from tafahom_api.common.cache import pack, unpack
+
+URL = "/api/v1/translation/translate/"
+AI_RESULT = {"source": "ai", "animations": ["hello"]}
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _age(normalized_text, seconds):
+    key = cache_service._cache_key(normalized_text)
+    entry = cache.get(key)
+    entry["stored_at"] -= seconds
+    cache.set(key, entry)
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestCacheEntries:
+    def test_fresh_then_stale_after_soft_ttl(self, settings):
+        settings.TRANSLATION_CACHE_SOFT_TTL = 60
+        set_cached_translation("نص", AI_RESULT)
+
+        cached = get_cached_translation("نص")
+        assert cached.value == AI_RESULT
+        assert cached.status == "fresh"
+
+        _age("نص", 120)
+        assert get_cached_translation("نص").status == "stale"
+
+    def test_negative_entry_uses_short_ttl(self, settings):
+        settings.TRANSLATION_NEGATIVE_CACHE_TTL = 5
+        fallback = {"source": "sign_matcher", "animations": ["x"]}
+        with patch.object(cache_service.cache, "set", wraps=cache.set) as cache_set:
+            set_negative_translation("نص", fallback)
+
+        assert cache_set.call_args.kwargs["timeout"] == 5
+        cached = get_cached_translation("نص")
+        assert cached.negative and cached.value == fallback
+
+    def test_entries_from_the_old_format_are_misses(self):
+        cache.set(cache_service._cache_key("نص"), {"source": "ai", "animations": []})
+        assert get_cached_translation("نص") is None
+
+
+class TestCacheKeys:
+    def test_keys_are_hashed_and_fixed_length(self):
+        short = cache_service._cache_key("نص")
+        long = cache_service._cache_key("كلمة " * 5000)
+
+        assert len(short) == len(long) < 100
+        assert "نص" not in short
+        assert short.startswith("translation_ai:v1-")
+
+    def test_large_values_are_compressed(self, settings):
+        settings.CACHE_COMPRESS_MIN_BYTES = 1024
+        small = {"animations": ["a"]}
+        large = {"animations": ["hello"] * 2000}
+
+        assert pack(small) is small
+        packed = pack(large)
+        assert len(packed["__zlib__"]) < 1024
+        assert unpack(packed) == large
+
+        set_cached_translation("طويل", large)
+        assert get_cached_translation("طويل").value == large
+
+    def test_version_setting_invalidates_everything(self, settings):
+        set_cached_translation("نص", AI_RESULT)
+        settings.TRANSLATION_CACHE_VERSION = "v2"
+        assert get_cached_translation("نص") is None
+
+    def test_lexicon_change_invalidates_everything(self):
+        set_cached_translation("نص", AI_RESULT)
+        with patch.object(cache_service, "lexicon_fingerprint", return_value="edited"):
+            assert get_cached_translation("نص") is None
+        assert get_cached_translation("نص") is not None
+
+    def test_generation_bump_invalidates_everything(self):
+        set_cached_translation("نص", AI_RESULT)
+        set_cached_translation("كلمة", AI_RESULT)
+        before = cache_service._namespace().generation()
+
+        assert invalidate_translation_cache() > before
+        assert get_cached_translation("نص") is None
+        assert get_cached_translation("كلمة") is None
+
+    def test_evicted_generation_does_not_resurrect_entries(self, settings):
+        settings.CACHE_GENERATION_MEMO_TTL = 0
+        set_cached_translation("نص", AI_RESULT)
+        invalidated = invalidate_translation_cache()
+        cache.delete(cache_service._namespace().generation_key)  # LRU eviction
+
+        assert get_cached_translation("نص") is None
+        assert cache_service._namespace().generation() > invalidated
+
+    def test_generation_read_once_per_memo_window(self):
+        set_cached_translation("نص", AI_RESULT)
+        with patch.object(cache_service.cache, "get", wraps=cache.get) as get:
+            get_cached_translation("نص")
+            get_cached_translation("نص")
+
+        assert get.call_count == 2  # the entries only
+
+
+class TestBackgroundRefresh:
+    def test_one_refresh_per_text(self):
+        set_cached_translation("نص", AI_RESULT)
+        compute = MagicMock(return_value={"source": "ai", "animations": ["new"]})
+
+        assert refresh_in_background("نص", compute) is True
+        assert _wait_for(lambda: get_cached_translation("نص").value["animations"] == ["new"])
+        assert _wait_for(lambda: refresh_in_background("نص", compute))
+        assert refresh_in_background("نص", compute) is False
+
+    def test_failed_refresh_keeps_entry_and_lock(self):
+        set_cached_translation("نص", AI_RESULT)
+        compute = MagicMock(return_value=None)
+
+        assert refresh_in_background("نص", compute) is True
+        assert _wait_for(lambda: compute.called)
+        time.sleep(0.05)
+
+        assert get_cached_translation("نص").value == AI_RESULT
+        assert refresh_in_background("نص", compute) is False
+
+
+@pytest.mark.django_db
+class TestTranslationAPIViewCaching:
+    @pytest.fixture
+    def client(self):
+        return APIClient()
+
+    def test_miss_then_fresh_hit(self, client):
+        with patch("tafahom_api.apps.v1.translation.views.call_ai_translation", return_value=AI_RESULT) as ai:
+            first = client.post(URL, {"text": "مرحبا بك"}, format="json").json()
+            second = client.post(URL, {"text": "مرحبا بك"}, format="json").json()
+
+        assert ai.call_count == 1
+        assert (first["source"], first["cache_status"], first["cache_age"]) == ("ai", "miss", 0)
+        assert (second["source"], second["origin"], second["cache_status"]) == ("cache", "ai", "fresh")
+        assert second["animations"] == ["hello"]
+
+    def test_stale_entry_is_served_while_refreshing(self, client, settings):
+        settings.TRANSLATION_CACHE_SOFT_TTL = 60
+        set_cached_translation("مرحبا بك", AI_RESULT)
+        _age("مرحبا بك", 120)
+
+        with patch("tafahom_api.apps.v1.translation.views.call_ai_translation") as ai, patch(
+            "tafahom_api.apps.v1.translation.views.refresh_in_background"
+        ) as refresh:
+            body = client.post(URL, {"text": "مرحبا بك"}, format="json").json()
+
+        ai.assert_not_called()
+        refresh.assert_called_once()
+        assert body["cache_status"] == "stale"
+        assert body["cache_age"] >= 120
+        assert body["animations"] == ["hello"]
+
+    def test_ai_failure_is_negatively_cached(self, client):
+        with patch("tafahom_api.apps.v1.translation.views.call_ai_translation", return_value=None) as ai:
+            first = client.post(URL, {"text": "كيف حالك"}, format="json").json()
+            second = client.post(URL, {"text": "كيف حالك"}, format="json").json()
+
+        assert ai.call_count == 1
+        assert first["source"] == "sign_matcher"
+        assert second["cache_status"] == "negative"
+        assert second["animations"] == first["animations"]
+
+
+class TestMissCoalescing:
+    def test_concurrent_misses_share_one_ai_call(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.05)
+            return set_cached_translation("نص", AI_RESULT)
+
+        with ThreadPoolExecutor(max_workers=20) as pool:
+            entries = list(pool.map(lambda _: cache_service.compute_once("نص", compute), range(20)))
+
+        assert len(calls) == 1
+        assert {tuple(entry.value["animations"]) for entry in entries} == {("hello",)}
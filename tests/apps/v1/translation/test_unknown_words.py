@@ -0,0 +1,151 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+
+from tafahom_api.apps.v1.ai.clients.text_to_gloss_client import (
+    TextToGlossClient,
+    build_batch_prompt,
+)
+from tafahom_api.apps.v1.translation.models import UnknownWordResolution
+from tafahom_api.apps.v1.translation.services.unknown_words import (
+    get_unknown_word_store,
+    resolve_unknown_words,
+)
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _client(answers):
+    client = AsyncMock()
+    client.text_to_gloss_batch.return_value = answers
+    return client
+
+
+class TestUnknownWordStore:
+    def test_round_trip_and_no_sign_marker(self):
+        store = get_unknown_word_store()
+        store.save_many({"زعلان": ["m2hor"], "يعني": []})
+
+        assert store.lookup_many(["زعلان", "يعني", "جديد"]) == {"زعلان": ["m2hor"], "يعني": []}
+        assert UnknownWordResolution.objects.get(phrase="يعني").has_sign is False
+
+    def test_lookups_are_served_from_cache(self, django_assert_num_queries):
+        store = get_unknown_word_store()
+        store.save_many({"زعلان": ["m2hor"]})
+        store.lookup_many(["جديد"])  # caches the absence
+
+        with django_assert_num_queries(0):
+            assert store.lookup_many(["زعلان", "جديد"]) == {"زعلان": ["m2hor"]}
+
+    def test_manual_rows_are_not_overwritten(self):
+        store = get_unknown_word_store()
+        store.save_many({"زعلان": ["m2hor"]}, source="manual")
+        store.save_many({"زعلان": []}, source="offline")
+
+        assert store.lookup_many(["زعلان"]) == {"زعلان": ["m2hor"]}
+
+    def test_rows_from_another_sign_map_are_ignored(self):
+        UnknownWordResolution.objects.create(phrase="زعلان", gloss=["m2hor"], lexicon_version="old")
+        UnknownWordResolution.objects.create(
+            phrase="يعني", gloss=[], source="manual", lexicon_version="old"
+        )
+
+        assert get_unknown_word_store().lookup_many(["زعلان", "يعني"]) == {"يعني": []}
+
+    def test_phrases_longer_than_the_column_round_trip(self):
+        store = get_unknown_word_store()
+        first, second = "كلمة " * 60 + "اولى", "كلمة " * 60 + "ثانية"
+        store.save_many({first: ["m2hor"], second: []})
+        cache.clear()
+
+        assert store.lookup_many([first, second]) == {first: ["m2hor"], second: []}
+        assert UnknownWordResolution.objects.count() == 2
+
+    @pytest.mark.parametrize("bulk", [False, True])
+    def test_admin_delete_forgets_cached_resolution(self, rf, bulk):
+        from django.contrib import admin
+
+        store = get_unknown_word_store()
+        store.save_many({"زعلان": ["m2hor"]})
+        model_admin = admin.site._registry[UnknownWordResolution]
+        row = UnknownWordResolution.objects.get(phrase="زعلان")
+
+        if bulk:
+            model_admin.delete_queryset(rf.post("/"), UnknownWordResolution.objects.filter(pk=row.pk))
+        else:
+            model_admin.delete_model(rf.post("/"), row)
+
+        assert store.lookup_many(["زعلان"]) == {}
+
+
+class TestResolveUnknownWords:
+    async def test_only_new_words_reach_the_llm_in_one_batch(self):
+        await get_unknown_word_store().asave_many({"زعلان": ["m2hor"]})
+        client = _client(["مقهور جرح", "-"])
+
+        result = await resolve_unknown_words(["زعلان", "اتعورت", "يعني", "اتعورت"], client=client)
+
+        client.text_to_gloss_batch.assert_awaited_once_with(["اتعورت", "يعني"])
+        assert result.animations == ["m2hor", "m2hor", "gr7"]
+        assert result.unknown_words == ["يعني"]
+        assert result.sources == ["store", "nlp"]
+
+        client = _client(None)
+        again = await resolve_unknown_words(["اتعورت", "يعني"], client=client)
+        client.text_to_gloss_batch.assert_not_awaited()
+        assert again.animations == ["m2hor", "gr7"]
+
+    async def test_answers_outside_the_sign_map_are_stored_as_no_sign(self):
+        result = await resolve_unknown_words(["كلمه"], client=_client(["شيء غريب"]))
+
+        assert result.unknown_words == ["كلمه"]
+        assert await get_unknown_word_store().alookup_many(["كلمه"]) == {"كلمه": []}
+
+    async def test_failed_batch_stores_nothing(self):
+        result = await resolve_unknown_words(["كلمه"], client=_client(None))
+
+        assert result.unknown_words == ["كلمه"]
+        assert await get_unknown_word_store().alookup_many(["كلمه"]) == {}
+
+
+class TestBatchClient:
+    def test_prompt_lists_one_entry_per_line(self):
+        prompt = build_batch_prompt(["في نار", "اسعاف"])
+        assert prompt.endswith("User Input:\nفي نار\nاسعاف\n")
+        assert "one line per input line" in prompt
+
+    async def test_misaligned_answer_is_discarded(self):
+        client = TextToGlossClient()
+        with patch.object(client, "_post_json", AsyncMock(return_value={"gloss": "حريق"})):
+            assert await client.text_to_gloss_batch(["نار", "اسعاف"]) is None
+        with patch.object(client, "_post_json", AsyncMock(return_value={"gloss": "حريق\n-"})):
+            assert await client.text_to_gloss_batch(["نار", "كلمه"]) == ["حريق", ""]
+
+
+class TestFillCommand:
+    def test_fills_most_frequent_unknowns_from_logs(self, tmp_path, capsys):
+        log = tmp_path / "app.log"
+        log.write_text(
+            "INFO PHASE 1 (sign map): animations=[] unknown=['اتعورت', 'يعني']\n"
+            "INFO PHASE 1 (sign map): animations=['gr7'] unknown=['يعني']\n"
+            "INFO unrelated line\n",
+            encoding="utf-8",
+        )
+        batch = AsyncMock(return_value=["-", "مقهور"])
+
+        with patch.object(TextToGlossClient, "text_to_gloss_batch", batch):
+            call_command("fill_unknown_words", "--from-log", str(log))
+
+        assert batch.await_args.args[0] == ["يعني", "اتعورت"]
+        row = UnknownWordResolution.objects.get(phrase="اتعورت")
+        assert (row.gloss, row.source) == (["m2hor"], "offline")
+        assert "Stored 2 resolutions (1 with a sign" in capsys.readouterr().out
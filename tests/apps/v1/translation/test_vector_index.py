@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from django.core.management import call_command
+
+from tafahom_api.apps.v1.translation.services import vector_index
+from tafahom_api.apps.v1.translation.services.unknown_words import resolve_unknown_words
+from tafahom_api.apps.v1.translation.services.vector_index import (
+    SignVectorIndex,
+    build_vector_index,
+    get_vector_index,
+    vector_resolve,
+)
+
+PHRASES = {"مستشفي": "most4fa", "مقهور": "m2hor", "قرار صعب": "krar_s3b", "تعلم بسرعه": "learn"}
+
+
+@pytest.fixture
+def fresh_index(monkeypatch):
+    monkeypatch.setattr(vector_index, "_index", None)
+
+
+class TestSignVectorIndex:
+    def test_matrix_is_normalized_float16(self):
+        index = SignVectorIndex.build(PHRASES)
+
+        assert index.matrix.dtype == np.float16
+        assert index.matrix.shape == (4, len(index.vocabulary))
+        np.testing.assert_allclose(np.linalg.norm(index.matrix.astype(np.float32), axis=1), 1, atol=1e-2)
+
+    def test_nearest_entry_for_inflected_forms(self):
+        index = SignVectorIndex.build(PHRASES)
+
+        assert index.nearest("ومستشفياتهم", 0.5).animation == "most4fa"
+        assert index.nearest("قرار صعبه", 0.5).entry == "قرار صعب"
+        assert index.nearest("مستشفي", 0.5).score == pytest.approx(1, abs=1e-2)
+
+    def test_cutoff_and_word_count(self):
+        index = SignVectorIndex.build(PHRASES)
+
+        assert index.nearest("ومستشفياتهم", 0.99) is None
+        assert index.nearest("xyz", 0.1) is None
+        # A single word never resolves to a phrase containing it
+        assert index.nearest("بسرعه", 0.1) is None
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        index = SignVectorIndex.build(PHRASES, fingerprint="abc")
+        index.save(tmp_path / "index.npz")
+        loaded = SignVectorIndex.load(tmp_path / "index.npz")
+
+        assert loaded.fingerprint == "abc"
+        assert loaded.entries == index.entries
+        np.testing.assert_array_equal(loaded.scores("مقهورين"), index.scores("مقهورين"))
+
+
+class TestProcessIndex:
+    def test_lexicon_build_writes_a_loadable_index(self, tmp_path, settings, fresh_index):
+        settings.SIGN_VECTOR_INDEX_PATH = tmp_path / "sign_vectors.npz"
+        call_command("build_lexicon_index")
+
+        index = get_vector_index()
+        assert len(index) == len(build_vector_index())
+        assert (tmp_path / "sign_vectors.npz").exists()
+
+    def test_stale_file_is_rebuilt(self, tmp_path, settings, fresh_index):
+        settings.SIGN_VECTOR_INDEX_PATH = tmp_path / "sign_vectors.npz"
+        SignVectorIndex.build(PHRASES, fingerprint="old").save(settings.SIGN_VECTOR_INDEX_PATH)
+
+        assert len(get_vector_index()) > len(PHRASES)
+
+    def test_common_words_are_left_to_the_llm(self):
+        assert vector_resolve(["يعني", "النهارده", "بكره", "محتاج"]) == {}
+
+
+@pytest.mark.django_db(transaction=True)
+async def test_vector_tier_runs_before_the_llm():
+    class Client:
+        async def text_to_gloss_batch(self, entries):
+            raise AssertionError("LLM must not be called")
+
+    result = await resolve_unknown_words(["ومستشفياتهم"], client=Client())
+
+    assert result.animations == ["most4fa"]
+    assert result.sources == ["vector"]
@@ -0,0 +1,231 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.core.cache import cache
+
+from tafahom_api.common.singleflight import CacheFlightLock, RedisFlightLock, SingleFlight
+
+
+class _Backend:
+    """Slow backend that stores its result where ``load`` finds it."""
+
+    def __init__(self, key="popular"):
+        self.key = key
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def load(self):
+        return cache.get(self.key)
+
+    def compute(self):
+        with self._lock:
+            self.calls += 1
+        time.sleep(0.1)
+        cache.set(self.key, "value")
+        return "value"
+
+    async def aload(self):
+        return await asyncio.to_thread(cache.get, self.key)
+
+    async def acompute(self):
+        self.calls += 1
+        await asyncio.sleep(0.1)
+        cache.set(self.key, "value")
+        return "value"
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _fire(flight, backend, n):
+    with ThreadPoolExecutor(max_workers=n) as pool:
+        futures = [
+            pool.submit(flight.do, backend.key, backend.load, backend.compute) for _ in range(n)
+        ]
+        return [f.result() for f in futures]
+
+
+class TestSingleFlight:
+    def test_100_concurrent_misses_make_one_backend_call(self):
+        backend = _Backend()
+        results = _fire(SingleFlight("test"), backend, 100)
+
+        assert backend.calls == 1
+        assert results == ["value"] * 100
+
+    async def test_100_concurrent_async_misses_make_one_backend_call(self):
+        backend = _Backend()
+        flight = SingleFlight("test")
+
+        results = await asyncio.gather(
+            *[flight.ado(backend.key, backend.aload, backend.acompute) for _ in range(100)]
+        )
+
+        assert backend.calls == 1
+        assert results == ["value"] * 100
+
+    def test_workers_coordinate_through_the_lease_lock(self):
+        # Two instances stand in for two worker processes sharing the cache
+        backend = _Backend()
+        lock = CacheFlightLock()
+        workers = [SingleFlight("test", lock=lock), SingleFlight("test", lock=lock)]
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(lambda flight: _fire(flight, backend, 50), workers))
+
+        assert backend.calls == 1
+        assert results == [["value"] * 50] * 2
+        assert cache.get(workers[0].lock_key(backend.key)) is None
+
+    def test_leader_failure_reaches_followers_and_is_not_cached(self):
+        flight = SingleFlight("test")
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.05)
+            raise RuntimeError("backend down")
+
+        with ThreadPoolExecutor(max_workers=10) as pool:
+            futures = [pool.submit(flight.do, "k", lambda: None, compute) for _ in range(10)]
+            errors = [f.exception() for f in futures]
+
+        assert len(calls) == 1
+        assert all(isinstance(e, RuntimeError) for e in errors)
+        assert flight.do("k", lambda: None, lambda: "recovered") == "recovered"
+
+    def test_lock_errors_degrade_to_computing(self):
+        class BrokenLock(CacheFlightLock):
+            def acquire(self, *args):
+                raise ConnectionError("redis down")
+
+        flight = SingleFlight("test", lock=BrokenLock())
+        assert flight.do("k", lambda: None, lambda: "value") == "value"
+
+    def test_waiter_computes_after_wait_timeout(self):
+        flight = SingleFlight("test", wait_timeout=0.1)
+        cache.add(flight.lock_key("k"), "someone-else", timeout=60)
+
+        started = time.monotonic()
+        assert flight.do("k", lambda: None, lambda: "value") == "value"
+        assert time.monotonic() - started < 1
+
+
+class _FakeRedis:
+    """
+    The calls RedisFlightLock makes, with redis-py's pubsub behaviour: with
+    ``ignore_subscribe_messages`` the subscribe confirmation is read as
+    ``None`` at once, then ``get_message`` blocks until a message or its
+    timeout.
+    """
+
+    def __init__(self):
+        self.locked = True
+        self.exists_calls = 0
+        self.published = threading.Event()
+
+    def exists(self, key):
+        self.exists_calls += 1
+        return self.locked
+
+    def release(self, delay, publish=True):
+        def run():
+            time.sleep(delay)
+            self.locked = False
+            if publish:
+                self.published.set()
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        return _FakePubSub(self)
+
+
+class _FakePubSub:
+    def __init__(self, redis):
+        self.redis = redis
+        self.confirmation = True
+
+    def subscribe(self, channel):
+        pass
+
+    def get_message(self, timeout):
+        if self.confirmation:
+            self.confirmation = False
+            return None
+        if self.redis.published.wait(timeout):
+            return {"type": "message", "data": "1"}
+        return None
+
+    def close(self):
+        pass
+
+
+class _AsyncFakeRedis(_FakeRedis):
+    async def exists(self, key):
+        return super().exists(key)
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        return _AsyncFakePubSub(self)
+
+
+class _AsyncFakePubSub(_FakePubSub):
+    async def subscribe(self, channel):
+        pass
+
+    async def get_message(self, timeout):
+        return await asyncio.to_thread(super().get_message, timeout)
+
+    async def aclose(self):
+        pass
+
+
+@pytest.fixture
+def redis_lock():
+    lock = RedisFlightLock(url="redis://unused")
+    lock._client = _FakeRedis()
+    lock._async_client = _AsyncFakeRedis()
+    return lock
+
+
+class TestRedisFlightLock:
+    def test_wait_blocks_past_subscribe_confirmation_until_release(self, redis_lock):
+        redis_lock.client.release(0.2)
+
+        started = time.monotonic()
+        redis_lock.wait("k", timeout=5)
+
+        assert 0.2 <= time.monotonic() - started < 1
+        assert redis_lock.client.exists_calls <= 3
+
+    def test_wait_gives_up_at_the_deadline(self, redis_lock):
+        started = time.monotonic()
+        redis_lock.wait("k", timeout=0.3)
+
+        assert 0.3 <= time.monotonic() - started < 1
+        assert redis_lock.client.exists_calls <= 3
+
+    def test_wait_notices_an_expired_lease(self, redis_lock):
+        redis_lock.RECHECK = 0.05
+        redis_lock.client.release(0.1, publish=False)
+
+        started = time.monotonic()
+        redis_lock.wait("k", timeout=5)
+
+        assert time.monotonic() - started < 1
+
+    async def test_await_release_blocks_until_release(self, redis_lock):
+        redis_lock.async_client.release(0.2)
+
+        started = time.monotonic()
+        await redis_lock.await_release("k", timeout=5)
+
+        assert 0.2 <= time.monotonic() - started < 1
+        assert redis_lock.async_client.exists_calls <= 3